@@ -0,0 +1,223 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Write-coalescing heartbeat store for endpoint agents.
+
+Agents heartbeat every minute; writing each heartbeat to the agents table
+costs four queries per call. Instead:
+
+- Liveness is recorded in a Redis sorted set (member = agent id, score =
+  heartbeat timestamp). flush_heartbeats() writes last_heartbeat_at/status
+  to the database in bulk every 30 seconds (Celery beat) and drops the
+  flushed entries.
+- "Any pending tasks?" is answered from a per-agent Redis counter, which
+  create_task() increments and the database path of process_heartbeat()
+  re-synchronises. Only agents with work (or an unknown counter) query the
+  database.
+
+A counter only exists for agents that passed the database path, so unknown
+agent ids still get Agent.DoesNotExist. Counters expire after
+AGENT_HEARTBEAT_STATE_TTL_SECONDS, which bounds how long a lost increment
+can hide a task.
+
+The store needs the raw Redis client behind the default cache; with any
+other cache backend, or with AGENT_HEARTBEAT_COALESCING off, every heartbeat
+takes the database path.
+"""
+import logging
+import time
+from datetime import datetime, timezone as dt_timezone
+from typing import Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from apps.core.cache_locks import new_lock_token, release_lock
+from apps.core.metrics import record_heartbeats_flushed
+
+from .models import Agent
+
+logger = logging.getLogger(__name__)
+
+HEARTBEATS_KEY = "agent-heartbeats"
+PENDING_KEY_PREFIX = "agent-pending"
+FLUSH_LOCK_KEY = "agent-heartbeats:flush-lock"
+FLUSH_LOCK_SECONDS = 120
+FLUSH_BATCH_SIZE = 1000
+
+# Decrement an existing pending-task counter by ARGV[1], never below zero, keeping its
+# TTL; a counter that expired meanwhile stays unknown rather than being recreated
+DECREMENT_PENDING_SCRIPT = """
+local value = redis.call("get", KEYS[1])
+if not value then
+    return nil
+end
+local remaining = math.max(tonumber(value) - tonumber(ARGV[1]), 0)
+redis.call("set", KEYS[1], remaining, "KEEPTTL")
+return remaining
+"""
+
+
+class HeartbeatStore:
+    """Heartbeat timestamps and pending-task counters kept in Redis."""
+
+    def __init__(self, client, state_ttl: Optional[int] = None):
+        """
+        Initialize heartbeat store.
+
+        Args:
+            client: Redis client
+            state_ttl: Seconds a pending-task counter is trusted (defaults to AGENT_HEARTBEAT_STATE_TTL_SECONDS)
+        """
+        self.client = client
+        self.state_ttl = state_ttl or settings.AGENT_HEARTBEAT_STATE_TTL_SECONDS
+
+    @staticmethod
+    def _pending_key(agent_id: str) -> str:
+        return f"{PENDING_KEY_PREFIX}:{agent_id}"
+
+    def record(self, agent_id: str, timestamp: Optional[float] = None) -> None:
+        """Record a heartbeat, replacing any unflushed earlier one."""
+        self.client.zadd(HEARTBEATS_KEY, {agent_id: timestamp or time.time()})
+
+    def pending(self, agent_id: str) -> Optional[int]:
+        """Pending-task count, or None if unknown."""
+        value = self.client.get(self._pending_key(agent_id))
+        return int(value) if value is not None else None
+
+    def sync_pending(self, agent_id: str, observed: Optional[int], remaining: int) -> None:
+        """
+        Store the pending-task count after the database path.
+
+        Args:
+            agent_id: Agent UUID
+            observed: Counter value read before querying the database
+            remaining: Pending tasks left in the database
+
+        Increments made while the database was queried are kept: a known
+        counter is decremented by what the database path consumed, and an
+        unknown one is only set if no increment created it meanwhile. A
+        counter that expired while the database was queried is left unknown.
+        """
+        key = self._pending_key(agent_id)
+        if observed is None:
+            self.client.set(key, remaining, ex=self.state_ttl, nx=True)
+        elif observed != remaining:
+            self.client.eval(DECREMENT_PENDING_SCRIPT, 1, key, observed - remaining)
+
+    def add_pending(self, agent_id: str, count: int = 1) -> None:
+        """Count newly created tasks for an agent."""
+        key = self._pending_key(agent_id)
+        if self.client.incrby(key, count) == count:
+            # New key: expire it like one set by the database path
+            self.client.expire(key, self.state_ttl)
+
+    def add_pending_many(self, agent_ids: Iterable[str]) -> None:
+        """Count one new task for each agent, pipelined for fan-outs."""
+        agent_ids = list(agent_ids)
+        for start in range(0, len(agent_ids), FLUSH_BATCH_SIZE):
+            keys = [self._pending_key(agent_id) for agent_id in agent_ids[start : start + FLUSH_BATCH_SIZE]]
+            pipe = self.client.pipeline(transaction=False)
+            for key in keys:
+                pipe.incrby(key, 1)
+            created = [key for key, value in zip(keys, pipe.execute()) if value == 1]
+            if created:
+                pipe = self.client.pipeline(transaction=False)
+                for key in created:
+                    pipe.expire(key, self.state_ttl)
+                pipe.execute()
+
+    def forget(self, agent_ids: Iterable[str]) -> None:
+        """Drop pending-task counters so the agents' next heartbeats take the database path."""
+        keys = [self._pending_key(agent_id) for agent_id in agent_ids]
+        for start in range(0, len(keys), FLUSH_BATCH_SIZE):
+            self.client.delete(*keys[start : start + FLUSH_BATCH_SIZE])
+
+    def due(self, cutoff: float) -> List[Tuple[str, float]]:
+        """Unflushed heartbeats recorded up to cutoff."""
+        entries = self.client.zrangebyscore(HEARTBEATS_KEY, "-inf", cutoff, withscores=True)
+        return [(member.decode() if isinstance(member, bytes) else member, score) for member, score in entries]
+
+    def clear(self, cutoff: float) -> None:
+        """Drop heartbeats recorded up to cutoff (later ones are kept for the next flush)."""
+        self.client.zremrangebyscore(HEARTBEATS_KEY, "-inf", cutoff)
+
+
+def get_heartbeat_store() -> Optional[HeartbeatStore]:
+    """Heartbeat store on the default cache's Redis, or None if heartbeats are not coalesced."""
+    if not settings.AGENT_HEARTBEAT_COALESCING:
+        return None
+    if not settings.CACHES["default"]["BACKEND"].startswith("django_redis."):
+        return None
+    from django_redis import get_redis_connection
+
+    return HeartbeatStore(get_redis_connection("default"))
+
+
+def note_pending_tasks(agent_ids: Iterable[str]) -> None:
+    """Count a new task for each agent so their next heartbeats fetch them."""
+    store = get_heartbeat_store()
+    if store is None:
+        return
+    agent_ids = [str(agent_id) for agent_id in agent_ids]
+    try:
+        store.add_pending_many(agent_ids)
+    except Exception as e:
+        logger.warning(f"Heartbeat store: could not count pending tasks for {len(agent_ids)} agents ({e})")
+
+
+def forget_agents(agent_ids: Iterable[str]) -> None:
+    """Make the agents' next heartbeats take the database path."""
+    store = get_heartbeat_store()
+    if store is None:
+        return
+    try:
+        store.forget([str(agent_id) for agent_id in agent_ids])
+    except Exception as e:
+        logger.warning(f"Heartbeat store: could not reset agent state ({e})")
+
+
+def flush_heartbeats(store: Optional[HeartbeatStore] = None) -> Optional[int]:
+    """
+    Write coalesced heartbeats to the agents table in bulk.
+
+    Args:
+        store: Heartbeat store (defaults to get_heartbeat_store())
+
+    Returns:
+        Number of agents flushed, or None if another flush holds the lock
+        (its heartbeats may not be in the database yet)
+    """
+    store = store or get_heartbeat_store()
+    if store is None:
+        return 0
+    # One flush at a time cluster-wide; an overrunning flush must not release its successor's lock
+    token = new_lock_token()
+    if not cache.add(FLUSH_LOCK_KEY, token, timeout=FLUSH_LOCK_SECONDS):
+        return None
+
+    try:
+        cutoff = time.time()
+        entries = store.due(cutoff)
+        now = timezone.now()
+        for start in range(0, len(entries), FLUSH_BATCH_SIZE):
+            agents = [
+                Agent(
+                    id=agent_id,
+                    last_heartbeat_at=datetime.fromtimestamp(score, tz=dt_timezone.utc),
+                    status="ONLINE",
+                    updated_at=now,
+                )
+                for agent_id, score in entries[start : start + FLUSH_BATCH_SIZE]
+            ]
+            Agent.objects.bulk_update(agents, ["last_heartbeat_at", "status", "updated_at"])
+        # Only drop entries once they are in the database; a failed flush is retried next time
+        store.clear(cutoff)
+    finally:
+        release_lock(FLUSH_LOCK_KEY, token)
+
+    if entries:
+        record_heartbeats_flushed(len(entries))
+        logger.info(f"Flushed {len(entries)} agent heartbeats")
+    return len(entries)
@@ -0,0 +1,201 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Batched ingest of agent telemetry and task-status records.
+
+Agents upload a mixed array of records, typically buffered while they were
+offline:
+
+    {"type": "telemetry", "cpu_usage_percent": 12.5, ..., "collected_at": "..."}
+    {"type": "task_status", "task_id": "...", "status": "COMPLETED", "occurred_at": "...", ...}
+
+Records are validated in one pass without per-record serializers; invalid
+records are reported by index and skipped. Telemetry goes through
+telemetry_store.store_samples(). Task transitions are applied in memory in
+upload order (one SELECT for all referenced tasks) and written with a single
+bulk_update, so only each task's final state is written.
+"""
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from datetime import timezone as dt_timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Agent, AgentTask
+from .telemetry_store import store_samples
+
+BATCH_SIZE = 1000
+
+TELEMETRY_PERCENT_FIELDS = ("cpu_usage_percent", "memory_usage_percent", "disk_usage_percent")
+TELEMETRY_COUNT_FIELDS = ("network_bytes_sent", "network_bytes_received", "process_count")
+TASK_STATUSES = {"IN_PROGRESS", "COMPLETED", "FAILED", "CANCELLED"}
+FINAL_TASK_STATUSES = {"COMPLETED", "FAILED", "TIMEOUT", "CANCELLED"}
+TASK_UPDATE_FIELDS = ["status", "result", "error_message", "exit_code", "started_at", "completed_at", "updated_at"]
+
+
+@dataclass
+class IngestResult:
+    """Outcome of one ingest request."""
+
+    telemetry: int = 0
+    task_updates: int = 0
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "telemetry": self.telemetry,
+            "task_updates": self.task_updates,
+            "rejected": len(self.errors),
+            "errors": self.errors,
+        }
+
+
+def _parse_timestamp(value: Any) -> Optional[datetime]:
+    if value is None:
+        return None
+    parsed = parse_datetime(value) if isinstance(value, str) else None
+    if parsed is None:
+        raise ValueError("must be an ISO 8601 datetime")
+    return parsed if timezone.is_aware(parsed) else timezone.make_aware(parsed, dt_timezone.utc)
+
+
+def _validate_telemetry(record: Dict[str, Any]) -> Dict[str, Any]:
+    sample = {}
+    for name in TELEMETRY_PERCENT_FIELDS:
+        value = record.get(name)
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not 0 <= value <= 100:
+            raise ValueError(f"{name} must be a number between 0 and 100")
+        sample[name] = float(value)
+    for name in TELEMETRY_COUNT_FIELDS:
+        value = record.get(name, 0)
+        if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+            raise ValueError(f"{name} must be a non-negative integer")
+        sample[name] = value
+    software = record.get("installed_software")
+    if software is not None and not isinstance(software, (list, dict)):
+        raise ValueError("installed_software must be a list")
+    sample["installed_software"] = software
+    sample["collected_at"] = _parse_timestamp(record.get("collected_at"))
+    return sample
+
+
+def _validate_task_status(record: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        task_id = uuid.UUID(str(record.get("task_id")))
+    except ValueError:
+        raise ValueError("task_id must be a UUID")
+    status = record.get("status")
+    if status not in TASK_STATUSES:
+        raise ValueError(f"status must be one of {sorted(TASK_STATUSES)}")
+    exit_code = record.get("exit_code")
+    if exit_code is not None and (isinstance(exit_code, bool) or not isinstance(exit_code, int)):
+        raise ValueError("exit_code must be an integer")
+    error_message = record.get("error_message")
+    if error_message is not None and not isinstance(error_message, str):
+        raise ValueError("error_message must be a string")
+    return {
+        "task_id": task_id,
+        "status": status,
+        "result": record.get("result"),
+        "error_message": error_message,
+        "exit_code": exit_code,
+        "occurred_at": _parse_timestamp(record.get("occurred_at")),
+    }
+
+
+def validate_records(records: List[Any]) -> Tuple[List[Dict], List[Tuple[int, Dict]], List[Dict[str, Any]]]:
+    """
+    Validate a mixed record array.
+
+    Returns:
+        (telemetry samples, (index, task status update) pairs, errors)
+    """
+    samples, updates, errors = [], [], []
+    for index, record in enumerate(records):
+        try:
+            if not isinstance(record, dict):
+                raise ValueError("record must be an object")
+            record_type = record.get("type")
+            if record_type == "telemetry":
+                samples.append(_validate_telemetry(record))
+            elif record_type == "task_status":
+                updates.append((index, _validate_task_status(record)))
+            else:
+                raise ValueError("type must be 'telemetry' or 'task_status'")
+        except ValueError as e:
+            errors.append({"index": index, "error": str(e)})
+    return samples, updates, errors
+
+
+def _apply_transition(task: AgentTask, update: Dict[str, Any], now: datetime) -> None:
+    """Apply one status transition the way update_task_status() does."""
+    occurred_at = update["occurred_at"] or now
+    task.status = update["status"]
+    if update["result"] is not None:
+        task.result = update["result"]
+    if update["error_message"] is not None:
+        task.error_message = update["error_message"]
+    if update["exit_code"] is not None:
+        task.exit_code = update["exit_code"]
+    if task.status == "IN_PROGRESS" and not task.started_at:
+        task.started_at = occurred_at
+    elif task.status in FINAL_TASK_STATUSES:
+        task.completed_at = occurred_at
+    task.updated_at = now
+
+
+def apply_task_updates(agent: Agent, updates: List[Tuple[int, Dict[str, Any]]]) -> Tuple[int, List[Dict[str, Any]]]:
+    """
+    Apply task status transitions of one agent in bulk.
+
+    Transitions of a task that already reached a final state are rejected,
+    so a late upload cannot reopen it.
+
+    Returns:
+        (number of tasks written, errors)
+    """
+    task_ids = {update["task_id"] for _, update in updates}
+    tasks = {task.id: task for task in AgentTask.objects.filter(agent=agent, id__in=task_ids)}
+    now = timezone.now()
+    changed = {}
+    errors = []
+    for index, update in updates:
+        task = tasks.get(update["task_id"])
+        if task is None:
+            errors.append({"index": index, "error": "task not found for this agent"})
+        elif task.status in FINAL_TASK_STATUSES:
+            errors.append({"index": index, "error": f"task is already {task.status}"})
+        else:
+            _apply_transition(task, update, now)
+            changed[task.id] = task
+    if changed:
+        AgentTask.objects.bulk_update(list(changed.values()), TASK_UPDATE_FIELDS, batch_size=BATCH_SIZE)
+    return len(changed), errors
+
+
+def ingest_records(agent: Agent, records: List[Any], correlation_id: Optional[str] = None) -> IngestResult:
+    """
+    Validate and apply an agent's uploaded records.
+
+    Args:
+        agent: Uploading agent
+        records: Mixed telemetry and task_status records
+        correlation_id: Correlation ID for tracing
+
+    Returns:
+        IngestResult
+    """
+    samples, updates, errors = validate_records(records)
+    result = IngestResult(errors=errors)
+    with transaction.atomic():
+        if samples:
+            result.telemetry = len(store_samples(agent, samples, correlation_id=correlation_id))
+        if updates:
+            result.task_updates, task_errors = apply_task_updates(agent, updates)
+            result.errors.extend(task_errors)
+    result.errors.sort(key=lambda error: error["index"])
+    return result
@@ -0,0 +1,97 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Management command to benchmark fleet task fan-out at scale.
+
+Seeds synthetic agents (a fifth of them offline) inside a transaction that
+is rolled back afterwards, then times fan_out_task() against the whole ring
+and, for comparison, per-agent create_task() calls on a sample.
+"""
+import time
+import uuid
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from apps.agent_management.models import Agent
+from apps.agent_management.services import AgentManagementService
+
+SEED_BATCH_SIZE = 5000
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Benchmark bulk task fan-out throughput at 10k/100k agents (rolled back)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=[10_000, 100_000],
+            help="Number of agents to seed and target per run",
+        )
+        parser.add_argument(
+            "--sample", type=int, default=500, help="Agents to target with per-agent create_task() for comparison"
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{'agents':>10} {'fan-out':>10} {'tasks/s':>10} {'queued':>8} {'per-agent tasks/s':>18} {'speedup':>8}"
+        )
+        for size in options["sizes"]:
+            try:
+                with transaction.atomic():
+                    self.stdout.write(self._run(size, options["sample"]))
+                    raise _Rollback
+            except _Rollback:
+                pass
+
+    def _run(self, size: int, sample: int) -> str:
+        ring = f"bench-{uuid.uuid4().hex[:8]}"
+        agent_ids = self._seed(size, ring)
+        service = AgentManagementService()
+
+        start = time.perf_counter()
+        result = service.fan_out_task(task_type="HEALTHCHECK", payload={"benchmark": True}, ring=ring)
+        fan_out = time.perf_counter() - start
+
+        sample_ids = agent_ids[: min(sample, size)]
+        start = time.perf_counter()
+        for agent_id in sample_ids:
+            service.create_task(agent_id=agent_id, task_type="HEALTHCHECK", payload={"benchmark": True})
+        per_agent_rate = len(sample_ids) / (time.perf_counter() - start)
+
+        fan_out_rate = result["tasks_created"] / fan_out
+        return (
+            f"{size:>10} {fan_out:>9.2f}s {fan_out_rate:>10.0f} {result['queued_offline']:>8} "
+            f"{per_agent_rate:>18.0f} {fan_out_rate / per_agent_rate:>7.1f}x"
+        )
+
+    def _seed(self, size: int, ring: str) -> list:
+        now = timezone.now()
+        offline_at = now - timedelta(hours=1)
+        agent_ids = []
+        for offset in range(0, size, SEED_BATCH_SIZE):
+            agents = Agent.objects.bulk_create(
+                Agent(
+                    hostname=f"{ring}-{offset + i}",
+                    platform="windows",
+                    platform_version="11",
+                    agent_version="1.0.0",
+                    registration_key=f"{ring}-{offset + i}",
+                    status="ONLINE" if (offset + i) % 5 else "OFFLINE",
+                    last_heartbeat_at=now if (offset + i) % 5 else offline_at,
+                    ip_address="10.0.0.1",
+                    mac_address="00:00:00:00:00:00",
+                    tags={"ring": ring},
+                )
+                for i in range(min(SEED_BATCH_SIZE, size - offset))
+            )
+            agent_ids.extend(str(agent.id) for agent in agents)
+        return agent_ids
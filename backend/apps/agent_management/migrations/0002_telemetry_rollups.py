@@ -0,0 +1,87 @@
+# Generated by Django 5.0.14 on 2026-10-16 00:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("agent_management", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="agenttelemetry",
+            name="software_hash",
+            field=models.CharField(blank=True, default="", max_length=64),
+        ),
+        migrations.CreateModel(
+            name="AgentTelemetryRollup",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                (
+                    "resolution",
+                    models.CharField(choices=[("1m", "1 minute"), ("1h", "1 hour"), ("1d", "1 day")], max_length=2),
+                ),
+                ("bucket_start", models.DateTimeField()),
+                ("sample_count", models.IntegerField(default=0)),
+                ("cpu_sum", models.FloatField(default=0)),
+                ("cpu_max", models.FloatField(default=0)),
+                ("memory_sum", models.FloatField(default=0)),
+                ("memory_max", models.FloatField(default=0)),
+                ("disk_sum", models.FloatField(default=0)),
+                ("disk_max", models.FloatField(default=0)),
+                ("network_bytes_sent", models.BigIntegerField(default=0)),
+                ("network_bytes_received", models.BigIntegerField(default=0)),
+                ("process_count_max", models.IntegerField(default=0)),
+                (
+                    "agent",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="telemetry_rollups",
+                        to="agent_management.agent",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "agent_telemetry_rollups",
+                "ordering": ["-bucket_start"],
+                "indexes": [
+                    models.Index(fields=["resolution", "bucket_start"], name="agent_telem_resolut_0ea958_idx"),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("agent", "resolution", "bucket_start"), name="agent_telemetry_rollup_bucket_unique"
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="AgentSoftwareInventory",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("content_hash", models.CharField(max_length=64)),
+                ("installed_software", models.JSONField(default=list)),
+                ("package_count", models.IntegerField(default=0)),
+                ("collected_at", models.DateTimeField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "agent",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="software_inventories",
+                        to="agent_management.agent",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "agent_software_inventory",
+                "ordering": ["-collected_at"],
+                "indexes": [
+                    models.Index(fields=["agent", "collected_at"], name="agent_softw_agent_i_8e9810_idx"),
+                    models.Index(fields=["content_hash"], name="agent_softw_content_c31a3e_idx"),
+                ],
+            },
+        ),
+    ]
@@ -192,8 +192,10 @@ class AgentTelemetry(models.Model):
     # Process metrics
     process_count = models.IntegerField(default=0)
 
-    # Software inventory (JSON list of installed packages)
+    # Software inventory (JSON list of installed packages); only set on rows stored before software_hash
     installed_software = models.JSONField(default=list, blank=True)
+    # Content hash of the inventory reported with this sample (see AgentSoftwareInventory)
+    software_hash = models.CharField(max_length=64, blank=True, default="")
 
     # Timestamp
     collected_at = models.DateTimeField()
@@ -214,6 +216,88 @@ class AgentTelemetry(models.Model):
         return f"Telemetry for {self.agent.hostname} at {self.collected_at}"
 
 
+class AgentTelemetryRollup(models.Model):
+    """
+    Telemetry metrics of one agent aggregated over a time bucket.
+
+    Raw AgentTelemetry samples are rolled up into 1-minute buckets, those
+    into 1-hour buckets and those into 1-day buckets. Sums and counts are
+    kept rather than averages so coarser tiers aggregate exactly.
+    """
+
+    RESOLUTION_CHOICES = [
+        ("1m", "1 minute"),
+        ("1h", "1 hour"),
+        ("1d", "1 day"),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    agent = models.ForeignKey(Agent, on_delete=models.CASCADE, related_name="telemetry_rollups")
+    resolution = models.CharField(max_length=2, choices=RESOLUTION_CHOICES)
+    bucket_start = models.DateTimeField()
+
+    sample_count = models.IntegerField(default=0)
+    cpu_sum = models.FloatField(default=0)
+    cpu_max = models.FloatField(default=0)
+    memory_sum = models.FloatField(default=0)
+    memory_max = models.FloatField(default=0)
+    disk_sum = models.FloatField(default=0)
+    disk_max = models.FloatField(default=0)
+    network_bytes_sent = models.BigIntegerField(default=0)
+    network_bytes_received = models.BigIntegerField(default=0)
+    process_count_max = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = "agent_telemetry_rollups"
+        ordering = ["-bucket_start"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["agent", "resolution", "bucket_start"], name="agent_telemetry_rollup_bucket_unique"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["resolution", "bucket_start"]),
+        ]
+
+    def __str__(self):
+        return f"{self.resolution} telemetry for {self.agent_id} at {self.bucket_start}"
+
+    @property
+    def cpu_avg(self):
+        return self.cpu_sum / self.sample_count if self.sample_count else 0.0
+
+    @property
+    def memory_avg(self):
+        return self.memory_sum / self.sample_count if self.sample_count else 0.0
+
+    @property
+    def disk_avg(self):
+        return self.disk_sum / self.sample_count if self.sample_count else 0.0
+
+
+class AgentSoftwareInventory(models.Model):
+    """Software inventory of an agent, stored only when its content changes."""
+
+    id = models.BigAutoField(primary_key=True)
+    agent = models.ForeignKey(Agent, on_delete=models.CASCADE, related_name="software_inventories")
+    content_hash = models.CharField(max_length=64)
+    installed_software = models.JSONField(default=list)
+    package_count = models.IntegerField(default=0)
+    collected_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "agent_software_inventory"
+        ordering = ["-collected_at"]
+        indexes = [
+            models.Index(fields=["agent", "collected_at"]),
+            models.Index(fields=["content_hash"]),
+        ]
+
+    def __str__(self):
+        return f"Software inventory for {self.agent_id} ({self.package_count} packages)"
+
+
 class AgentDeploymentStatus(models.Model):
     """Track deployment status per agent."""
 
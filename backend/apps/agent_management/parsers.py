@@ -0,0 +1,60 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Request parsers for agent uploads.
+"""
+import io
+import zlib
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError, UnsupportedMediaType
+from rest_framework.parsers import JSONParser
+
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on installed extras
+    ZSTD_AVAILABLE = False
+
+
+def decompress(body: bytes, encoding: str, max_size: int) -> bytes:
+    """
+    Decompress a request body, refusing output larger than max_size.
+
+    Args:
+        body: Compressed body
+        encoding: Content-Encoding ('gzip' or 'zstd')
+        max_size: Maximum decompressed size in bytes
+
+    Raises:
+        UnsupportedMediaType: If the encoding is not supported
+        ParseError: If the body is corrupt or decompresses to more than max_size
+    """
+    if encoding == "gzip":
+        try:
+            data = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS).decompress(body, max_size + 1)
+        except zlib.error as e:
+            raise ParseError(f"Invalid gzip body: {e}")
+    elif encoding == "zstd" and ZSTD_AVAILABLE:
+        try:
+            data = zstandard.ZstdDecompressor().stream_reader(io.BytesIO(body)).read(max_size + 1)
+        except zstandard.ZstdError as e:
+            raise ParseError(f"Invalid zstd body: {e}")
+    else:
+        raise UnsupportedMediaType(f"Content-Encoding {encoding}")
+    if len(data) > max_size:
+        raise ParseError(f"Decompressed body exceeds {max_size} bytes")
+    return data
+
+
+class CompressedJSONParser(JSONParser):
+    """JSON parser accepting gzip- or zstd-compressed bodies (per Content-Encoding)."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        request = (parser_context or {}).get("request")
+        encoding = request.META.get("HTTP_CONTENT_ENCODING", "").strip().lower() if request is not None else ""
+        if encoding in ("", "identity") or stream is None:
+            return super().parse(stream, media_type, parser_context)
+        body = decompress(stream.read(), encoding, settings.AGENT_INGEST_MAX_BYTES)
+        return super().parse(io.BytesIO(body), media_type, parser_context)
@@ -0,0 +1,220 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Push delivery of new tasks to endpoint agents over Redis pub/sub.
+
+Agents hold a long-poll request (GET /agents/{id}/tasks/poll/) open instead of
+waiting for their next heartbeat. Each agent has a channel
+"agent-tasks:{agent_id}"; wake_agents() publishes to it once new tasks are
+committed, and the waiting request claims them from the database. Only the
+wake-up travels over Redis, so a message lost while an agent was
+reconnecting is recovered by its next poll or heartbeat.
+
+Waiting requests on one event loop share a pub/sub connection
+(TaskWakeupListener), so under the ASGI server thousands of connected agents
+cost one Redis connection per worker process rather than one per agent. The
+connection is closed when the last waiting request on its loop finishes; a
+server that runs each async view on its own loop (WSGI) therefore opens and
+closes one connection per poll. Fan-out publishes are pipelined
+(WAKE_BATCH_SIZE per round trip).
+
+Push needs the Redis behind the default cache; with any other cache backend,
+or with AGENT_TASK_PUSH off, polls return immediately and agents pick up
+tasks on their heartbeats.
+"""
+import asyncio
+import logging
+import weakref
+from typing import Iterable, Optional
+
+from django.conf import settings
+
+from apps.core.metrics import record_agent_wakeups
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "agent-tasks"
+WAKE_BATCH_SIZE = 1000
+READ_TIMEOUT_SECONDS = 1.0
+
+
+def channel_name(agent_id: str) -> str:
+    """Pub/sub channel an agent's long-poll listens on."""
+    return f"{CHANNEL_PREFIX}:{agent_id}"
+
+
+def push_enabled() -> bool:
+    """Whether task wake-ups are published over the default cache's Redis."""
+    return settings.AGENT_TASK_PUSH and settings.CACHES["default"]["BACKEND"].startswith("django_redis.")
+
+
+def publish_wakeups(client, agent_ids: Iterable[str]) -> int:
+    """
+    Publish a wake-up to each agent's channel.
+
+    Args:
+        client: Redis client
+        agent_ids: Agent UUIDs
+
+    Returns:
+        Number of agents with a waiting long-poll
+    """
+    agent_ids = [str(agent_id) for agent_id in agent_ids]
+    delivered = 0
+    for start in range(0, len(agent_ids), WAKE_BATCH_SIZE):
+        pipe = client.pipeline(transaction=False)
+        for agent_id in agent_ids[start : start + WAKE_BATCH_SIZE]:
+            pipe.publish(channel_name(agent_id), "1")
+        delivered += sum(1 for receivers in pipe.execute() if receivers)
+    return delivered
+
+
+def wake_agents(agent_ids: Iterable[str]) -> int:
+    """
+    Wake the long-polls of agents that have new tasks.
+
+    Call once the tasks are committed (transaction.on_commit), so the woken
+    request can see them. Failures are logged; agents then get the tasks on
+    their next poll or heartbeat.
+
+    Returns:
+        Number of agents woken
+    """
+    if not push_enabled():
+        return 0
+    agent_ids = list(agent_ids)
+    try:
+        from django_redis import get_redis_connection
+
+        delivered = publish_wakeups(get_redis_connection("default"), agent_ids)
+    except Exception as e:
+        logger.warning(f"Task push: could not wake {len(agent_ids)} agents ({e})")
+        return 0
+    record_agent_wakeups(len(agent_ids), delivered)
+    return delivered
+
+
+class TaskWakeupListener:
+    """Waits for agent wake-ups on one shared pub/sub connection."""
+
+    def __init__(self, pubsub, client=None):
+        """
+        Initialize listener.
+
+        Args:
+            pubsub: redis.asyncio PubSub
+            client: redis.asyncio client owning the pub/sub, closed with it
+        """
+        self.pubsub = pubsub
+        self.client = client
+        self.closed = False
+        self._waiters = {}
+        self._reader = None
+
+    async def wait(self, agent_id: str, timeout: float, ready=None) -> bool:
+        """
+        Wait for a wake-up of one agent.
+
+        Args:
+            agent_id: Agent UUID
+            timeout: Max seconds to wait
+            ready: Optional coroutine function run once subscribed; a truthy
+                result (e.g. tasks already pending) ends the wait early
+
+        Returns:
+            True if the agent was woken or ready() returned a truthy value
+        """
+        channel = channel_name(agent_id)
+        event = asyncio.Event()
+        waiters = self._waiters.setdefault(channel, set())
+        waiters.add(event)
+        try:
+            try:
+                if len(waiters) == 1:
+                    await self.pubsub.subscribe(channel)
+                if self._reader is None:
+                    self._reader = asyncio.ensure_future(self._read())
+            except Exception as e:
+                # Answer from the database only; the agent polls again
+                logger.warning(f"Task push: could not subscribe {channel} ({e})")
+                timeout = 0
+            if ready is not None and await ready():
+                return True
+            try:
+                await asyncio.wait_for(event.wait(), timeout)
+            except asyncio.TimeoutError:
+                return False
+            return True
+        finally:
+            waiters.discard(event)
+            if not waiters:
+                del self._waiters[channel]
+                await self._unsubscribe(channel)
+                if not self._waiters:
+                    await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the pub/sub connection; the next poll on this loop opens a new listener."""
+        if self.closed:
+            return
+        # Detach before awaiting so concurrent polls never pick up a closing listener
+        self.closed = True
+        loop = asyncio.get_running_loop()
+        if _listeners.get(loop) is self:
+            del _listeners[loop]
+        if self._reader is not None:
+            self._reader.cancel()
+        try:
+            await self.pubsub.aclose()
+            if self.client is not None:
+                await self.client.aclose()
+        except Exception as e:
+            logger.warning(f"Task push: could not close pub/sub connection ({e})")
+
+    async def _unsubscribe(self, channel: str) -> None:
+        try:
+            await self.pubsub.unsubscribe(channel)
+        except Exception as e:
+            logger.warning(f"Task push: could not unsubscribe {channel} ({e})")
+
+    async def _read(self) -> None:
+        """Dispatch messages to waiters until none are left."""
+        try:
+            while self._waiters:
+                try:
+                    message = await self.pubsub.get_message(
+                        ignore_subscribe_messages=True, timeout=READ_TIMEOUT_SECONDS
+                    )
+                except Exception as e:
+                    # Wake everyone: their requests re-check the database and the agents poll again
+                    logger.warning(f"Task push: pub/sub connection failed ({e})")
+                    message = None
+                    for waiters in self._waiters.values():
+                        for event in waiters:
+                            event.set()
+                    await asyncio.sleep(READ_TIMEOUT_SECONDS)
+                if message is None or message.get("type") != "message":
+                    continue
+                channel = message["channel"]
+                channel = channel.decode() if isinstance(channel, bytes) else channel
+                for event in self._waiters.get(channel, ()):
+                    event.set()
+        finally:
+            self._reader = None
+
+
+_listeners = weakref.WeakKeyDictionary()
+
+
+def get_wakeup_listener() -> Optional[TaskWakeupListener]:
+    """Wake-up listener of the running event loop, or None if push is disabled."""
+    if not push_enabled():
+        return None
+    loop = asyncio.get_running_loop()
+    listener = _listeners.get(loop)
+    if listener is None:
+        import redis.asyncio
+
+        client = redis.asyncio.Redis.from_url(settings.CACHES["default"]["LOCATION"])
+        listener = _listeners[loop] = TaskWakeupListener(client.pubsub(), client)
+    return listener
@@ -3,9 +3,16 @@
 """
 Serializers for agent management REST API.
 """
+import re
+
+from django.conf import settings
+from django.db import models
 from rest_framework import serializers
 
-from .models import Agent, AgentDeploymentStatus, AgentTask, AgentTelemetry
+from .models import Agent, AgentDeploymentStatus, AgentTask, AgentTelemetry, AgentTelemetryRollup
+from .telemetry_store import software_inventories
+
+TAG_KEY_PATTERN = re.compile(r"^[A-Za-z0-9_-]+$")
 
 
 class AgentRegistrationSerializer(serializers.Serializer):
@@ -94,6 +101,30 @@ class AgentTaskCreateSerializer(serializers.Serializer):
     timeout_seconds = serializers.IntegerField(default=3600, min_value=60, max_value=86400)
 
 
+class AgentTaskFanOutSerializer(serializers.Serializer):
+    """Serializer for creating a task on every agent matching a selector."""
+
+    platform = serializers.ChoiceField(choices=["windows", "macos", "linux"], required=False)
+    ring = serializers.CharField(max_length=50, required=False)
+    tags = serializers.DictField(required=False)
+    task_type = serializers.ChoiceField(choices=["DEPLOY", "REMEDIATE", "COLLECT", "UPDATE", "HEALTHCHECK"])
+    payload = serializers.JSONField()
+    timeout_seconds = serializers.IntegerField(default=3600, min_value=60, max_value=86400)
+
+    def validate_tags(self, value):
+        """Tag keys become JSON key lookups, so only plain names are allowed."""
+        for key in value:
+            if not TAG_KEY_PATTERN.match(key) or "__" in key:
+                raise serializers.ValidationError(f"Invalid tag key: {key}")
+        return value
+
+    def validate(self, data):
+        """Refuse fan-outs without a selector."""
+        if not (data.get("platform") or data.get("ring") or data.get("tags")):
+            raise serializers.ValidationError("At least one of platform, ring or tags is required")
+        return data
+
+
 class AgentTaskStatusUpdateSerializer(serializers.Serializer):
     """Serializer for updating task status."""
 
@@ -103,13 +134,30 @@ class AgentTaskStatusUpdateSerializer(serializers.Serializer):
     exit_code = serializers.IntegerField(required=False, allow_null=True)
 
 
+class AgentTelemetryListSerializer(serializers.ListSerializer):
+    """Loads the software inventories of all listed samples in one query."""
+
+    def to_representation(self, data):
+        rows = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        self._context = {**self.context, "software_inventories": software_inventories(rows)}
+        return super().to_representation(rows)
+
+
 class AgentTelemetrySerializer(serializers.ModelSerializer):
-    """Serializer for telemetry data."""
+    """
+    Serializer for telemetry data.
+
+    installed_software is read from the deduplicated AgentSoftwareInventory
+    through software_hash; rows stored before inventories were deduplicated
+    still carry their own list.
+    """
 
     agent_hostname = serializers.CharField(source="agent.hostname", read_only=True)
+    installed_software = serializers.SerializerMethodField()
 
     class Meta:
         model = AgentTelemetry
+        list_serializer_class = AgentTelemetryListSerializer
         fields = [
             "id",
             "agent",
@@ -121,17 +169,51 @@ class AgentTelemetrySerializer(serializers.ModelSerializer):
             "network_bytes_received",
             "process_count",
             "installed_software",
+            "software_hash",
             "collected_at",
             "received_at",
             "correlation_id",
         ]
-        read_only_fields = ["id", "agent_hostname", "received_at"]
+        read_only_fields = ["id", "agent_hostname", "software_hash", "received_at"]
 
+    def get_installed_software(self, obj):
+        if not obj.software_hash:
+            return obj.installed_software
+        inventories = self.context.get("software_inventories")
+        if inventories is None:
+            inventories = software_inventories([obj])
+        return inventories.get((obj.agent_id, obj.software_hash), [])
 
-class AgentTelemetrySubmitSerializer(serializers.Serializer):
-    """Serializer for submitting telemetry."""
 
-    agent_id = serializers.UUIDField()
+class AgentTelemetryRollupSerializer(serializers.ModelSerializer):
+    """Serializer for telemetry rollup buckets."""
+
+    cpu_avg = serializers.FloatField(read_only=True)
+    memory_avg = serializers.FloatField(read_only=True)
+    disk_avg = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = AgentTelemetryRollup
+        fields = [
+            "bucket_start",
+            "resolution",
+            "sample_count",
+            "cpu_avg",
+            "cpu_max",
+            "memory_avg",
+            "memory_max",
+            "disk_avg",
+            "disk_max",
+            "network_bytes_sent",
+            "network_bytes_received",
+            "process_count_max",
+        ]
+        read_only_fields = fields
+
+
+class AgentTelemetrySampleSerializer(serializers.Serializer):
+    """Serializer for one telemetry sample."""
+
     cpu_usage_percent = serializers.FloatField(min_value=0, max_value=100)
     memory_usage_percent = serializers.FloatField(min_value=0, max_value=100)
     disk_usage_percent = serializers.FloatField(min_value=0, max_value=100)
@@ -142,6 +224,30 @@ class AgentTelemetrySubmitSerializer(serializers.Serializer):
     collected_at = serializers.DateTimeField(required=False)
 
 
+class AgentTelemetrySubmitSerializer(AgentTelemetrySampleSerializer):
+    """Serializer for submitting telemetry."""
+
+    agent_id = serializers.UUIDField()
+
+
+class AgentTelemetryBatchSubmitSerializer(serializers.Serializer):
+    """Serializer for submitting a batch of telemetry samples from one agent."""
+
+    agent_id = serializers.UUIDField()
+    samples = AgentTelemetrySampleSerializer(many=True, allow_empty=False, max_length=1000)
+
+
+class AgentIngestSerializer(serializers.Serializer):
+    """
+    Serializer for a batched agent upload.
+
+    Records are only checked for shape here; ingest.validate_records()
+    validates their contents in one pass.
+    """
+
+    records = serializers.ListField(allow_empty=False, max_length=settings.AGENT_INGEST_MAX_RECORDS)
+
+
 class AgentDeploymentStatusSerializer(serializers.ModelSerializer):
     """Serializer for deployment status."""
 
@@ -7,18 +7,26 @@ Handles agent registration, task assignment, offline queue management,
 and telemetry processing.
 """
 import logging
+import uuid
 from datetime import timedelta
 from typing import Dict, List, Optional
 
 from django.db import transaction
 from django.utils import timezone
 
+from apps.core.metrics import record_agent_heartbeat
 from apps.core.structured_logging import StructuredLogger
 
+from . import ingest
+from .heartbeats import flush_heartbeats, forget_agents, get_heartbeat_store, note_pending_tasks
 from .models import Agent, AgentDeploymentStatus, AgentOfflineQueue, AgentTask, AgentTelemetry
+from .push import wake_agents
+from .telemetry_store import store_samples
 
 logger = StructuredLogger(__name__, user="system")
 
+FANOUT_BATCH_SIZE = 1000
+
 
 class AgentManagementService:
     """Service for agent lifecycle management."""
@@ -124,6 +132,9 @@ class AgentManagementService:
         """
         Process agent heartbeat and return pending tasks.
 
+        Heartbeats of agents known to have no pending tasks are only recorded
+        in Redis and flushed to the database in bulk (see heartbeats.py).
+
         Args:
             agent_id: Agent UUID
             correlation_id: Correlation ID for tracing
@@ -134,6 +145,19 @@ class AgentManagementService:
         Raises:
             Agent.DoesNotExist: If agent not found
         """
+        store = get_heartbeat_store()
+        observed = None
+        if store is not None:
+            try:
+                observed = store.pending(agent_id)
+                if observed == 0:
+                    store.record(agent_id)
+                    record_agent_heartbeat("coalesced")
+                    return {"status": "ok", "pending_tasks": 0, "tasks": []}
+            except Exception as e:
+                logger.warning(f"Heartbeat store unavailable, using database ({e})", extra={"agent_id": agent_id})
+                store = None
+
         agent = Agent.objects.get(id=agent_id)
 
         # Update heartbeat
@@ -141,17 +165,25 @@ class AgentManagementService:
         agent.status = "ONLINE"
         agent.save(update_fields=["last_heartbeat_at", "status", "updated_at"])
 
-        # Get pending tasks (limit to 10)
-        pending_tasks = AgentTask.objects.filter(agent=agent, status="PENDING").select_related("created_by")[:10]
-
-        # Mark tasks as assigned
-        task_ids = [task.id for task in pending_tasks]
-        AgentTask.objects.filter(id__in=task_ids).update(status="ASSIGNED", assigned_at=timezone.now())
+        # Get pending tasks (limit to 10) and mark them as assigned
+        pending_tasks = self._claim_pending_tasks(agent)
 
         # Replay offline queue if any
         if agent.offline_queue.filter(delivered_at__isnull=True).exists():
             self._replay_offline_queue(agent, correlation_id)
 
+        if store is not None:
+            remaining = 0
+            if len(pending_tasks) == 10:
+                remaining = AgentTask.objects.filter(agent=agent, status="PENDING").count()
+            try:
+                # Keep an unflushed earlier heartbeat from overwriting this one
+                store.record(str(agent.id))
+                store.sync_pending(str(agent.id), observed, remaining)
+            except Exception as e:
+                logger.warning(f"Heartbeat store: could not update agent state ({e})", extra={"agent_id": agent_id})
+        record_agent_heartbeat("database")
+
         logger.connector_event(
             "agent_management",
             "HEARTBEAT_PROCESSED",
@@ -165,6 +197,41 @@ class AgentManagementService:
             "tasks": [self._serialize_task(task) for task in pending_tasks],
         }
 
+    def claim_tasks(
+        self,
+        agent_id: str,
+        correlation_id: Optional[str] = None,
+    ) -> Dict:
+        """
+        Claim pending tasks for an agent's long-poll.
+
+        Unlike process_heartbeat(), this does not record liveness.
+
+        Args:
+            agent_id: Agent UUID
+            correlation_id: Correlation ID for tracing
+
+        Returns:
+            Dict with claimed tasks
+
+        Raises:
+            Agent.DoesNotExist: If agent not found
+        """
+        agent = Agent.objects.only("id").get(id=agent_id)
+        tasks = self._claim_pending_tasks(agent)
+
+        if tasks:
+            # The agent's pending-task counter no longer matches; its next heartbeat re-counts
+            forget_agents([agent.id])
+            logger.connector_event(
+                "agent_management",
+                "TASKS_PUSHED",
+                "SUCCESS",
+                {"agent_id": str(agent.id), "task_count": len(tasks), "correlation_id": correlation_id},
+            )
+
+        return {"pending_tasks": len(tasks), "tasks": [self._serialize_task(task) for task in tasks]}
+
     def create_task(
         self,
         agent_id: str,
@@ -208,6 +275,9 @@ class AgentManagementService:
         if not agent.is_online:
             self._queue_task_for_offline_agent(agent, task, correlation_id)
 
+        # Once the task is visible, wake the agent's long-poll and route its next heartbeat to the database path
+        transaction.on_commit(lambda: self._announce_tasks([str(agent.id)]))
+
         logger.audit_event(
             action="AGENT_TASK_CREATED",
             resource_type="AgentTask",
@@ -218,6 +288,130 @@ class AgentManagementService:
 
         return task
 
+    def select_agents(
+        self,
+        platform: Optional[str] = None,
+        ring: Optional[str] = None,
+        tags: Optional[Dict] = None,
+    ):
+        """
+        Agents matching a target selector.
+
+        Args:
+            platform: Agent platform
+            ring: Deployment ring (the agent's "ring" tag)
+            tags: Tag values every matching agent must have
+
+        Returns:
+            Agent QuerySet
+        """
+        queryset = Agent.objects.all()
+        if platform:
+            queryset = queryset.filter(platform=platform)
+        if ring:
+            queryset = queryset.filter(tags__ring=ring)
+        for key, value in (tags or {}).items():
+            queryset = queryset.filter(**{f"tags__{key}": value})
+        return queryset
+
+    def fan_out_task(
+        self,
+        task_type: str,
+        payload: Dict,
+        platform: Optional[str] = None,
+        ring: Optional[str] = None,
+        tags: Optional[Dict] = None,
+        created_by=None,
+        timeout_seconds: int = 3600,
+        correlation_id: Optional[str] = None,
+    ) -> Dict:
+        """
+        Create one task for every agent matching a selector.
+
+        Targets are resolved in one query, and tasks and offline-queue
+        entries are bulk-created in chunks of FANOUT_BATCH_SIZE, each in its
+        own transaction. The agents of a chunk are woken once it commits; a
+        single audit event covers the whole fan-out. A fan-out interrupted
+        part-way leaves the committed chunks (found by correlation ID).
+
+        Args:
+            task_type: Type of task (DEPLOY, REMEDIATE, COLLECT, UPDATE, HEALTHCHECK)
+            payload: Task payload dict, shared by all tasks
+            platform: Agent platform
+            ring: Deployment ring (the agent's "ring" tag)
+            tags: Tag values every targeted agent must have
+            created_by: User who created the tasks
+            timeout_seconds: Task timeout in seconds
+            correlation_id: Correlation ID shared by all tasks (generated if not given)
+
+        Returns:
+            Dict with correlation ID and task counts
+        """
+        correlation_id = correlation_id or str(uuid.uuid4())
+        targets = list(
+            self.select_agents(platform=platform, ring=ring, tags=tags)
+            .order_by()
+            .values_list("id", "last_heartbeat_at")
+        )
+        now = timezone.now()
+        online_cutoff = now - timedelta(minutes=5)
+
+        queued_offline = 0
+        for start in range(0, len(targets), FANOUT_BATCH_SIZE):
+            chunk = targets[start : start + FANOUT_BATCH_SIZE]
+            with transaction.atomic():
+                tasks = AgentTask.objects.bulk_create(
+                    [
+                        AgentTask(
+                            agent_id=agent_id,
+                            task_type=task_type,
+                            payload=payload,
+                            timeout_seconds=timeout_seconds,
+                            correlation_id=correlation_id,
+                            created_by=created_by,
+                            status="PENDING",
+                        )
+                        for agent_id, _ in chunk
+                    ]
+                )
+                # Queue tasks of offline agents, as create_task() does
+                queue = [
+                    AgentOfflineQueue(
+                        agent_id=task.agent_id,
+                        task=task,
+                        correlation_id=correlation_id,
+                        next_retry_at=now + timedelta(minutes=5),
+                    )
+                    for task, (_, last_heartbeat_at) in zip(tasks, chunk)
+                    if last_heartbeat_at < online_cutoff
+                ]
+                AgentOfflineQueue.objects.bulk_create(queue)
+                queued_offline += len(queue)
+
+                agent_ids = [str(agent_id) for agent_id, _ in chunk]
+                transaction.on_commit(lambda agent_ids=agent_ids: self._announce_tasks(agent_ids))
+
+        logger.audit_event(
+            action="AGENT_TASKS_FANNED_OUT",
+            resource_type="AgentTask",
+            resource_id=correlation_id,
+            outcome="SUCCESS",
+            details={
+                "selector": {"platform": platform, "ring": ring, "tags": tags or {}},
+                "task_type": task_type,
+                "target_count": len(targets),
+                "queued_offline": queued_offline,
+                "correlation_id": correlation_id,
+            },
+        )
+
+        return {
+            "correlation_id": correlation_id,
+            "target_count": len(targets),
+            "tasks_created": len(targets),
+            "queued_offline": queued_offline,
+        }
+
     def update_task_status(
         self,
         task_id: str,
@@ -306,17 +500,21 @@ class AgentManagementService:
         """
         agent = Agent.objects.get(id=agent_id)
 
-        telemetry = AgentTelemetry.objects.create(
-            agent=agent,
-            cpu_usage_percent=cpu_usage_percent,
-            memory_usage_percent=memory_usage_percent,
-            disk_usage_percent=disk_usage_percent,
-            network_bytes_sent=network_bytes_sent,
-            network_bytes_received=network_bytes_received,
-            process_count=process_count,
-            installed_software=installed_software or [],
-            collected_at=collected_at or timezone.now(),
-            correlation_id=correlation_id or "",
+        [telemetry] = store_samples(
+            agent,
+            [
+                {
+                    "cpu_usage_percent": cpu_usage_percent,
+                    "memory_usage_percent": memory_usage_percent,
+                    "disk_usage_percent": disk_usage_percent,
+                    "network_bytes_sent": network_bytes_sent,
+                    "network_bytes_received": network_bytes_received,
+                    "process_count": process_count,
+                    "installed_software": installed_software,
+                    "collected_at": collected_at,
+                }
+            ],
+            correlation_id=correlation_id,
         )
 
         logger.connector_event(
@@ -333,6 +531,78 @@ class AgentManagementService:
 
         return telemetry
 
+    def store_telemetry_batch(
+        self,
+        agent_id: str,
+        samples: List[Dict],
+        correlation_id: Optional[str] = None,
+    ) -> List[AgentTelemetry]:
+        """
+        Store a batch of telemetry samples from an agent.
+
+        Args:
+            agent_id: Agent UUID
+            samples: Sample dicts with the store_telemetry() metric arguments
+            correlation_id: Correlation ID for tracing
+
+        Returns:
+            Created AgentTelemetry rows
+
+        Raises:
+            Agent.DoesNotExist: If agent not found
+        """
+        agent = Agent.objects.get(id=agent_id)
+
+        rows = store_samples(agent, samples, correlation_id=correlation_id)
+
+        logger.connector_event(
+            "agent_management",
+            "TELEMETRY_BATCH_STORED",
+            "SUCCESS",
+            {"agent_id": str(agent.id), "samples": len(rows)},
+        )
+
+        return rows
+
+    def ingest_records(
+        self,
+        agent_id: str,
+        records: List,
+        correlation_id: Optional[str] = None,
+    ) -> Dict:
+        """
+        Apply a batched upload of telemetry and task-status records from an agent.
+
+        Args:
+            agent_id: Agent UUID
+            records: Mixed telemetry and task_status records (see ingest.py)
+            correlation_id: Correlation ID for tracing
+
+        Returns:
+            Dict with applied counts and per-record errors
+
+        Raises:
+            Agent.DoesNotExist: If agent not found
+        """
+        agent = Agent.objects.get(id=agent_id)
+
+        result = ingest.ingest_records(agent, records, correlation_id=correlation_id)
+
+        logger.connector_event(
+            "agent_management",
+            "AGENT_RECORDS_INGESTED",
+            "SUCCESS" if not result.errors else "PARTIAL",
+            {
+                "agent_id": str(agent.id),
+                "records": len(records),
+                "telemetry": result.telemetry,
+                "task_updates": result.task_updates,
+                "rejected": len(result.errors),
+            },
+        )
+
+        return result.as_dict()
+
     def _queue_task_for_offline_agent(
         self,
         agent: Agent,
@@ -395,6 +665,25 @@ class AgentManagementService:
                 {"agent_id": str(agent.id), "delivered_count": delivered_count},
             )
 
+    def _claim_pending_tasks(self, agent: Agent, limit: int = 10) -> List[AgentTask]:
+        """Mark up to limit pending tasks as assigned and return them."""
+        with transaction.atomic():
+            # Skip rows a concurrent heartbeat or long-poll is claiming, so no task is handed out twice
+            tasks = list(
+                AgentTask.objects.filter(agent=agent, status="PENDING")
+                .select_related("created_by")
+                .select_for_update(skip_locked=True, of=("self",))[:limit]
+            )
+            AgentTask.objects.filter(id__in=[task.id for task in tasks]).update(
+                status="ASSIGNED", assigned_at=timezone.now()
+            )
+        return tasks
+
+    def _announce_tasks(self, agent_ids: List[str]):
+        """Tell agents about a new committed task each."""
+        note_pending_tasks(agent_ids)
+        wake_agents(agent_ids)
+
     def _serialize_task(self, task: AgentTask) -> Dict:
         """Serialize task for API response."""
         return {
@@ -408,12 +697,24 @@ class AgentManagementService:
 
     def check_agent_health(self):
         """Check agent health and mark offline agents (run via Celery)."""
+        # Write coalesced heartbeats first so live agents are not marked offline
+        if flush_heartbeats() is None:
+            # Another flush is still writing heartbeats; sweep on the next run instead
+            logger.connector_event(
+                "agent_management", "AGENTS_MARKED_OFFLINE", "SKIPPED", {"reason": "flush_in_progress"}
+            )
+            return {"marked_offline": 0}
+
         cutoff = timezone.now() - timedelta(minutes=5)
 
         # Mark agents offline if no heartbeat for 5 minutes
-        offline_count = Agent.objects.filter(last_heartbeat_at__lt=cutoff, status="ONLINE").update(status="OFFLINE")
+        stale_agents = Agent.objects.filter(last_heartbeat_at__lt=cutoff, status="ONLINE")
+        offline_ids = list(stale_agents.values_list("id", flat=True))
+        offline_count = Agent.objects.filter(id__in=offline_ids, status="ONLINE").update(status="OFFLINE")
 
         if offline_count > 0:
+            # Their next heartbeats go through the database, marking them online and replaying queued tasks
+            forget_agents(offline_ids)
             logger.connector_event("agent_management", "AGENTS_MARKED_OFFLINE", "SUCCESS", {"count": offline_count})
 
         # Alert on critical offline agents
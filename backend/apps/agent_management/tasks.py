@@ -5,11 +5,16 @@ Celery tasks for agent management.
 
 Periodic tasks for:
 - Agent health monitoring
+- Coalesced heartbeat flushes
+- Telemetry rollups and retention
 - Stale task timeouts
 - Offline queue processing
 """
 from celery import shared_task
+from django.utils.dateparse import parse_datetime
 
+from . import telemetry_store
+from .heartbeats import flush_heartbeats
 from .services import AgentManagementService
 
 
@@ -24,6 +29,16 @@ def check_agent_health():
     return service.check_agent_health()
 
 
+@shared_task
+def flush_agent_heartbeats():
+    """
+    Write heartbeats coalesced in Redis to the database in bulk.
+
+    Runs every 30 seconds via Celery Beat.
+    """
+    return {"flushed": flush_heartbeats() or 0}
+
+
 @shared_task
 def timeout_stale_tasks():
     """
@@ -33,3 +48,29 @@ def timeout_stale_tasks():
     """
     service = AgentManagementService()
     return service.timeout_stale_tasks()
+
+
+@shared_task
+def rollup_agent_telemetry(resolution="1m"):
+    """
+    Recompute recent telemetry rollup buckets of one tier.
+
+    Runs via Celery Beat: 1m every minute, 1h every 15 minutes, 1d hourly.
+    """
+    return {"resolution": resolution, "buckets": telemetry_store.rollup_recent(resolution)}
+
+
+@shared_task
+def rollup_agent_telemetry_range(agent_id, start, end):
+    """Roll up late-arriving telemetry of one agent over an ISO 8601 range."""
+    return telemetry_store.rollup_range(agent_id, parse_datetime(start), parse_datetime(end))
+
+
+@shared_task
+def apply_agent_telemetry_retention():
+    """
+    Delete telemetry samples and rollups past their tier's retention.
+
+    Runs daily via Celery Beat.
+    """
+    return telemetry_store.apply_retention()
@@ -0,0 +1,382 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Tiered telemetry storage for endpoint agents.
+
+Storing one AgentTelemetry row per sample, each with the full software
+inventory, grew the agent_telemetry table by gigabytes per day. Instead:
+
+- Samples are written in batches. Raw rows keep only numeric metrics and
+  the hash of the reported software inventory, and are kept for
+  AGENT_TELEMETRY_RAW_RETENTION_DAYS.
+- Numeric metrics are rolled up into AgentTelemetryRollup buckets of
+  1 minute (from raw samples), 1 hour (from 1-minute buckets) and 1 day
+  (from 1-hour buckets), each tier with its own retention. Rollups are
+  recomputed over a short lookback window by Celery beat; batches older
+  than that window (agents uploading after being offline) are rolled up
+  for their own range.
+- Software inventories are deduplicated by content hash: a new
+  AgentSoftwareInventory row is stored only when an agent's inventory
+  changes.
+
+query_telemetry() picks the finest tier that covers a requested range
+within TELEMETRY_MAX_POINTS.
+"""
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max, Sum
+from django.db.models.functions import TruncDay, TruncHour, TruncMinute
+from django.utils import timezone
+
+from .models import Agent, AgentSoftwareInventory, AgentTelemetry, AgentTelemetryRollup
+
+logger = logging.getLogger(__name__)
+
+RAW = "raw"
+MINUTE, HOUR, DAY = "1m", "1h", "1d"
+TELEMETRY_TIERS = (RAW, MINUTE, HOUR, DAY)
+BUCKET_SIZES = {MINUTE: timedelta(minutes=1), HOUR: timedelta(hours=1), DAY: timedelta(days=1)}
+# Tier each rollup is computed from
+ROLLUP_SOURCES = {MINUTE: RAW, HOUR: MINUTE, DAY: HOUR}
+# Window recomputed by the periodic rollup of each tier
+ROLLUP_LOOKBACK = {MINUTE: timedelta(minutes=5), HOUR: timedelta(hours=2), DAY: timedelta(days=2)}
+# Most points query_telemetry() returns before switching to a coarser tier
+TELEMETRY_MAX_POINTS = 1440
+# Raw samples are only served for short ranges
+RAW_MAX_SPAN = timedelta(hours=2)
+
+BATCH_SIZE = 1000
+SOFTWARE_HASH_CACHE_KEY = "agent-software-hash:{agent_id}"
+SOFTWARE_HASH_CACHE_TTL = 86400
+
+ROLLUP_FIELDS = [
+    "sample_count",
+    "cpu_sum",
+    "cpu_max",
+    "memory_sum",
+    "memory_max",
+    "disk_sum",
+    "disk_max",
+    "network_bytes_sent",
+    "network_bytes_received",
+    "process_count_max",
+]
+
+_TRUNC = {MINUTE: TruncMinute, HOUR: TruncHour, DAY: TruncDay}
+
+
+def _raw_aggregates() -> Dict[str, Any]:
+    return {
+        "sample_count": Count("id"),
+        "cpu_sum": Sum("cpu_usage_percent"),
+        "cpu_max": Max("cpu_usage_percent"),
+        "memory_sum": Sum("memory_usage_percent"),
+        "memory_max": Max("memory_usage_percent"),
+        "disk_sum": Sum("disk_usage_percent"),
+        "disk_max": Max("disk_usage_percent"),
+        "network_bytes_sent": Sum("network_bytes_sent"),
+        "network_bytes_received": Sum("network_bytes_received"),
+        "process_count_max": Max("process_count"),
+    }
+
+
+def _rollup_aggregates() -> Dict[str, Any]:
+    return {field: (Max(field) if field.endswith("_max") else Sum(field)) for field in ROLLUP_FIELDS}
+
+
+def retention(tier: str) -> timedelta:
+    """How long a tier's rows are kept."""
+    days = {
+        RAW: settings.AGENT_TELEMETRY_RAW_RETENTION_DAYS,
+        MINUTE: settings.AGENT_TELEMETRY_1M_RETENTION_DAYS,
+        HOUR: settings.AGENT_TELEMETRY_1H_RETENTION_DAYS,
+        DAY: settings.AGENT_TELEMETRY_1D_RETENTION_DAYS,
+    }[tier]
+    return timedelta(days=days)
+
+
+def bucket_floor(value: datetime, resolution: str) -> datetime:
+    """Start of the UTC bucket containing value."""
+    value = value.astimezone(dt_timezone.utc)
+    if resolution == MINUTE:
+        return value.replace(second=0, microsecond=0)
+    if resolution == HOUR:
+        return value.replace(minute=0, second=0, microsecond=0)
+    return value.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def software_hash(installed_software: Any) -> str:
+    """SHA-256 over a software inventory, independent of package order."""
+    if isinstance(installed_software, list):
+        installed_software = sorted(json.dumps(item, sort_keys=True, default=str) for item in installed_software)
+    payload = json.dumps(installed_software, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _package_count(installed_software: Any) -> int:
+    if isinstance(installed_software, dict):
+        installed_software = installed_software.get("packages", [])
+    return len(installed_software) if isinstance(installed_software, list) else 0
+
+
+def software_inventories(rows: Iterable[AgentTelemetry]) -> Dict[Tuple[Any, str], Any]:
+    """
+    Inventories referenced by telemetry rows, in one query.
+
+    Returns:
+        {(agent_id, software_hash): installed_software}
+    """
+    keys = {(row.agent_id, row.software_hash) for row in rows if row.software_hash}
+    if not keys:
+        return {}
+    inventories = AgentSoftwareInventory.objects.filter(
+        agent_id__in={agent_id for agent_id, _ in keys}, content_hash__in={digest for _, digest in keys}
+    ).values_list("agent_id", "content_hash", "installed_software")
+    return {(agent_id, digest): software for agent_id, digest, software in inventories}
+
+
+def _latest_software_hash(agent: Agent) -> Optional[str]:
+    key = SOFTWARE_HASH_CACHE_KEY.format(agent_id=agent.id)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+    latest = (
+        AgentSoftwareInventory.objects.filter(agent=agent)
+        .order_by("-collected_at")
+        .values_list("content_hash", flat=True)
+        .first()
+    )
+    if latest is not None:
+        cache.set(key, latest, SOFTWARE_HASH_CACHE_TTL)
+    return latest
+
+
+def store_samples(
+    agent: Agent,
+    samples: Iterable[Dict[str, Any]],
+    correlation_id: Optional[str] = None,
+) -> List[AgentTelemetry]:
+    """
+    Store a batch of telemetry samples for one agent.
+
+    Args:
+        agent: Reporting agent
+        samples: Dicts with the AgentTelemetry metric fields, optional
+            installed_software and optional collected_at
+        correlation_id: Correlation ID for tracing
+
+    Returns:
+        Created AgentTelemetry rows, in collected_at order
+    """
+    now = timezone.now()
+    samples = sorted(samples, key=lambda sample: sample.get("collected_at") or now)
+
+    rows = []
+    inventories = []
+    latest_hash = _latest_software_hash(agent)
+    for sample in samples:
+        collected_at = sample.get("collected_at") or now
+        digest = ""
+        software = sample.get("installed_software")
+        if software:
+            digest = software_hash(software)
+            # Only inventory changes are stored
+            if digest != latest_hash:
+                inventories.append(
+                    AgentSoftwareInventory(
+                        agent=agent,
+                        content_hash=digest,
+                        installed_software=software,
+                        package_count=_package_count(software),
+                        collected_at=collected_at,
+                    )
+                )
+                latest_hash = digest
+        rows.append(
+            AgentTelemetry(
+                agent=agent,
+                cpu_usage_percent=sample["cpu_usage_percent"],
+                memory_usage_percent=sample["memory_usage_percent"],
+                disk_usage_percent=sample["disk_usage_percent"],
+                network_bytes_sent=sample.get("network_bytes_sent", 0),
+                network_bytes_received=sample.get("network_bytes_received", 0),
+                process_count=sample.get("process_count", 0),
+                software_hash=digest,
+                collected_at=collected_at,
+                correlation_id=correlation_id or "",
+            )
+        )
+    if not rows:
+        return []
+
+    with transaction.atomic():
+        AgentTelemetry.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+        if inventories:
+            AgentSoftwareInventory.objects.bulk_create(inventories, batch_size=BATCH_SIZE)
+    if inventories:
+        # A late batch may not hold the newest inventory; the next lookup re-reads it
+        cache.delete(SOFTWARE_HASH_CACHE_KEY.format(agent_id=agent.id))
+
+    # Samples older than the periodic rollup window are rolled up for their own range
+    oldest = rows[0].collected_at
+    if oldest < now - ROLLUP_LOOKBACK[MINUTE]:
+        start, end = oldest.isoformat(), rows[-1].collected_at.isoformat()
+        transaction.on_commit(lambda: _schedule_range_rollup(str(agent.id), start, end))
+
+    return rows
+
+
+def _schedule_range_rollup(agent_id: str, start: str, end: str) -> None:
+    from .tasks import rollup_agent_telemetry_range
+
+    try:
+        rollup_agent_telemetry_range.delay(agent_id, start, end)
+    except Exception as e:
+        logger.warning(f"Could not schedule telemetry rollup for agent {agent_id} ({e})")
+
+
+def rollup(resolution: str, start: datetime, end: datetime, agent_ids: Optional[List[str]] = None) -> int:
+    """
+    Recompute a tier's buckets overlapping [start, end) from the tier below.
+
+    Args:
+        resolution: Target tier ('1m', '1h' or '1d')
+        start: Range start (floored to the bucket)
+        end: Range end
+        agent_ids: Limit to these agents (all agents if None)
+
+    Returns:
+        Number of buckets written
+    """
+    start = bucket_floor(start, resolution)
+    trunc = _TRUNC[resolution]
+    source = ROLLUP_SOURCES[resolution]
+    if source == RAW:
+        queryset = AgentTelemetry.objects.filter(collected_at__gte=start, collected_at__lt=end)
+        time_field, aggregates = "collected_at", _raw_aggregates()
+    else:
+        queryset = AgentTelemetryRollup.objects.filter(resolution=source, bucket_start__gte=start, bucket_start__lt=end)
+        time_field, aggregates = "bucket_start", _rollup_aggregates()
+    if agent_ids is not None:
+        queryset = queryset.filter(agent_id__in=agent_ids)
+
+    buckets = (
+        queryset.order_by()
+        .annotate(bucket=trunc(time_field, tzinfo=dt_timezone.utc))
+        .values("agent_id", "bucket")
+        .annotate(**aggregates)
+    )
+
+    written = 0
+    batch = []
+    for row in buckets.iterator(chunk_size=BATCH_SIZE):
+        batch.append(
+            AgentTelemetryRollup(
+                agent_id=row["agent_id"],
+                resolution=resolution,
+                bucket_start=row["bucket"],
+                **{field: row[field] or 0 for field in ROLLUP_FIELDS},
+            )
+        )
+        if len(batch) >= BATCH_SIZE:
+            written += _write_rollups(batch)
+            batch = []
+    if batch:
+        written += _write_rollups(batch)
+    return written
+
+
+def _write_rollups(batch: List[AgentTelemetryRollup]) -> int:
+    AgentTelemetryRollup.objects.bulk_create(
+        batch,
+        update_conflicts=True,
+        unique_fields=["agent", "resolution", "bucket_start"],
+        update_fields=ROLLUP_FIELDS,
+    )
+    return len(batch)
+
+
+def rollup_recent(resolution: str, now: Optional[datetime] = None) -> int:
+    """Recompute a tier over its lookback window (run via Celery beat)."""
+    now = now or timezone.now()
+    written = rollup(resolution, now - ROLLUP_LOOKBACK[resolution], now)
+    logger.info(f"Rolled up {written} {resolution} agent telemetry buckets")
+    return written
+
+
+def rollup_range(agent_id: str, start: datetime, end: datetime) -> Dict[str, int]:
+    """Recompute all tiers of one agent over a range (for late-arriving samples)."""
+    written = {}
+    for resolution in (MINUTE, HOUR, DAY):
+        # Coarser buckets span beyond the range; extend it so they are recomputed whole
+        range_end = bucket_floor(end, resolution) + BUCKET_SIZES[resolution]
+        written[resolution] = rollup(resolution, start, range_end, agent_ids=[agent_id])
+    return written
+
+
+def _delete_in_batches(queryset) -> int:
+    deleted = 0
+    while True:
+        ids = list(queryset.values_list("pk", flat=True)[: BATCH_SIZE * 10])
+        if not ids:
+            return deleted
+        deleted += queryset.model.objects.filter(pk__in=ids).delete()[0]
+
+
+def apply_retention(now: Optional[datetime] = None) -> Dict[str, int]:
+    """Delete raw samples and rollups older than their tier's retention."""
+    now = now or timezone.now()
+    deleted = {RAW: _delete_in_batches(AgentTelemetry.objects.filter(collected_at__lt=now - retention(RAW)))}
+    for resolution in (MINUTE, HOUR, DAY):
+        deleted[resolution] = _delete_in_batches(
+            AgentTelemetryRollup.objects.filter(resolution=resolution, bucket_start__lt=now - retention(resolution))
+        )
+    logger.info("Applied agent telemetry retention", extra={"deleted": deleted})
+    return deleted
+
+
+def select_tier(start: datetime, end: datetime, now: Optional[datetime] = None) -> str:
+    """Finest tier retaining start that covers [start, end) within TELEMETRY_MAX_POINTS."""
+    now = now or timezone.now()
+    span = end - start
+    if span <= RAW_MAX_SPAN and start >= now - retention(RAW):
+        return RAW
+    for resolution in (MINUTE, HOUR):
+        if span / BUCKET_SIZES[resolution] <= TELEMETRY_MAX_POINTS and start >= now - retention(resolution):
+            return resolution
+    return DAY
+
+
+def query_telemetry(agent: Agent, start: datetime, end: datetime, resolution: Optional[str] = None) -> Tuple[str, Any]:
+    """
+    Telemetry of an agent over [start, end) from the appropriate tier.
+
+    Args:
+        agent: Agent
+        start: Range start
+        end: Range end
+        resolution: Tier to use ('raw', '1m', '1h', '1d'); chosen from the range if None
+
+    Returns:
+        (tier, queryset ordered by time) - AgentTelemetry rows for 'raw',
+        AgentTelemetryRollup rows otherwise
+    """
+    resolution = resolution or select_tier(start, end)
+    if resolution == RAW:
+        queryset = AgentTelemetry.objects.filter(agent=agent, collected_at__gte=start, collected_at__lt=end)
+        return resolution, queryset.order_by("collected_at")
+    queryset = AgentTelemetryRollup.objects.filter(
+        agent=agent,
+        resolution=resolution,
+        bucket_start__gte=bucket_floor(start, resolution),
+        bucket_start__lt=end,
+    )
+    return resolution, queryset.order_by("bucket_start")
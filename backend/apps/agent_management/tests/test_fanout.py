@@ -0,0 +1,155 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Tests for bulk task fan-out to agent selectors.
+"""
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.agent_management.models import Agent, AgentOfflineQueue, AgentTask
+from apps.agent_management.services import AgentManagementService
+
+User = get_user_model()
+
+
+def _agent(hostname, platform="windows", online=True, **tags):
+    return Agent.objects.create(
+        hostname=hostname,
+        platform=platform,
+        platform_version="11",
+        agent_version="1.0.0",
+        registration_key=f"reg-{hostname}",
+        ip_address="10.0.1.1",
+        mac_address="00:00:00:00:00:01",
+        last_heartbeat_at=timezone.now() - (timedelta(0) if online else timedelta(hours=1)),
+        tags=tags,
+    )
+
+
+class TaskFanOutTests(TestCase):
+    """Tests for AgentManagementService.fan_out_task."""
+
+    def setUp(self):
+        """Set up service and a small fleet."""
+        self.service = AgentManagementService()
+        self.user = User.objects.create_user(username="fanout", password="testpass123")
+        self.canary = [_agent(f"canary-{i}", online=i % 2 == 0, ring="CANARY", site="lab") for i in range(4)]
+        self.other = [
+            _agent("canary-mac", platform="macos", ring="CANARY", site="lab"),
+            _agent("global-win", ring="GLOBAL", site="lab"),
+            _agent("canary-office", ring="CANARY", site="office"),
+        ]
+
+    def test_selector_targets_matching_agents(self):
+        """Test platform, ring and tags combine and offline targets are queued."""
+        with patch("apps.agent_management.services.wake_agents") as wake:
+            with self.captureOnCommitCallbacks(execute=True):
+                result = self.service.fan_out_task(
+                    task_type="DEPLOY",
+                    payload={"package": "firefox"},
+                    platform="windows",
+                    ring="CANARY",
+                    tags={"site": "lab"},
+                    created_by=self.user,
+                    correlation_id="fanout-1",
+                )
+
+        expected = {str(agent.id) for agent in self.canary}
+        self.assertEqual(result["target_count"], 4)
+        self.assertEqual(result["queued_offline"], 2)
+        tasks = AgentTask.objects.filter(correlation_id="fanout-1")
+        self.assertEqual({str(agent_id) for agent_id in tasks.values_list("agent_id", flat=True)}, expected)
+        self.assertTrue(all(task.status == "PENDING" and task.created_by == self.user for task in tasks))
+        self.assertEqual(
+            {str(item.agent_id) for item in AgentOfflineQueue.objects.filter(correlation_id="fanout-1")},
+            {str(agent.id) for agent in self.canary[1::2]},
+        )
+        self.assertEqual(set(wake.call_args.args[0]), expected)
+
+    def test_inserts_batched_and_committed_per_chunk(self):
+        """Test a fan-out writes each chunk with bulk inserts in its own transaction."""
+        for i in range(40):
+            _agent(f"bulk-{i}", online=i % 4 != 0, ring="BULK")
+
+        with (
+            patch("apps.agent_management.services.FANOUT_BATCH_SIZE", 10),
+            patch("apps.agent_management.services.wake_agents") as wake,
+            CaptureQueriesContext(connection) as queries,
+            self.captureOnCommitCallbacks(execute=True) as callbacks,
+        ):
+            result = self.service.fan_out_task(task_type="COLLECT", payload={}, ring="BULK")
+
+        self.assertEqual(result["target_count"], 40)
+        self.assertEqual(result["queued_offline"], 10)
+        inserts = [query["sql"] for query in queries if query["sql"].startswith("INSERT")]
+        task_inserts = [sql for sql in inserts if f'"{AgentTask._meta.db_table}"' in sql.split("(")[0]]
+        # One task insert per chunk, plus at most one offline-queue insert per chunk
+        self.assertEqual(len(task_inserts), 4)
+        self.assertLessEqual(len(inserts), 8)
+        # Agents are woken chunk by chunk as each one commits
+        self.assertEqual(len(callbacks), 4)
+        self.assertEqual(sorted(len(call.args[0]) for call in wake.call_args_list), [10, 10, 10, 10])
+
+    def test_correlation_id_generated(self):
+        """Test tasks of one fan-out share a generated correlation ID."""
+        result = self.service.fan_out_task(task_type="COLLECT", payload={}, ring="CANARY")
+
+        self.assertTrue(result["correlation_id"])
+        self.assertEqual(AgentTask.objects.filter(correlation_id=result["correlation_id"]).count(), 6)
+
+
+class TaskFanOutAPITests(TransactionTestCase):
+    """
+    Tests for POST /api/v1/agent-management/tasks/fan-out/.
+
+    The route runs outside ATOMIC_REQUESTS, so requests are not wrapped in
+    the savepoint a TestCase relies on to survive a rolled-back request.
+    """
+
+    url = "/api/v1/agent-management/tasks/fan-out/"
+
+    def setUp(self):
+        """Set up client and agents."""
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="fanout-api", password="testpass123")
+        self.client.force_authenticate(user=self.user)
+        self.agents = [_agent(f"api-{i}", ring="PILOT") for i in range(3)]
+
+    def test_fan_out(self):
+        """Test a ring fan-out creates one task per agent."""
+        response = self.client.post(
+            self.url,
+            {"ring": "PILOT", "task_type": "HEALTHCHECK", "payload": {}},
+            format="json",
+            HTTP_X_CORRELATION_ID="pilot-check",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["tasks_created"], 3)
+        self.assertEqual(AgentTask.objects.filter(correlation_id="pilot-check").count(), 3)
+
+    def test_fan_out_runs_outside_request_transaction(self):
+        """Test only the fan-out route is excluded from ATOMIC_REQUESTS so chunks commit on their own."""
+        fan_out_view = resolve(self.url).func
+        create_view = resolve("/api/v1/agent-management/tasks/").func
+
+        self.assertIn("default", getattr(fan_out_view, "_non_atomic_requests", set()))
+        self.assertNotIn("default", getattr(create_view, "_non_atomic_requests", set()))
+
+    def test_invalid_selectors_rejected(self):
+        """Test fan-outs without a selector or with lookup-like tag keys return 400."""
+        for selector in ({}, {"tags": {"ring__contains": "P"}}):
+            response = self.client.post(
+                self.url, {**selector, "task_type": "HEALTHCHECK", "payload": {}}, format="json"
+            )
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(AgentTask.objects.count(), 0)
@@ -0,0 +1,277 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Tests for the write-coalescing heartbeat pipeline.
+
+Redis is replaced by a small in-memory client implementing the commands
+the heartbeat store uses.
+"""
+import time
+import uuid
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.agent_management.heartbeats import FLUSH_LOCK_KEY, HeartbeatStore, flush_heartbeats
+from apps.agent_management.models import Agent
+from apps.agent_management.services import AgentManagementService
+
+User = get_user_model()
+
+
+class FakeRedis:
+    """In-memory stand-in for the Redis commands used by HeartbeatStore."""
+
+    def __init__(self):
+        self.values = {}
+        self.zsets = {}
+
+    def get(self, key):
+        value = self.values.get(key)
+        return str(value).encode() if value is not None else None
+
+    def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.values:
+            return None
+        self.values[key] = int(value)
+        return True
+
+    def incrby(self, key, amount):
+        self.values[key] = self.values.get(key, 0) + amount
+        return self.values[key]
+
+    def eval(self, script, numkeys, key, amount):
+        # Only DECREMENT_PENDING_SCRIPT is run by the store
+        if key not in self.values:
+            return None
+        self.values[key] = max(self.values[key] - amount, 0)
+        return self.values[key]
+
+    def expire(self, key, seconds):
+        return key in self.values
+
+    def delete(self, *keys):
+        return sum(self.values.pop(key, None) is not None for key in keys)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    def zrangebyscore(self, key, minimum, maximum, withscores=False):
+        entries = sorted(self.zsets.get(key, {}).items(), key=lambda item: item[1])
+        return [(member.encode(), score) for member, score in entries if score <= maximum]
+
+    def zremrangebyscore(self, key, minimum, maximum):
+        zset = self.zsets.get(key, {})
+        for member in [member for member, score in zset.items() if score <= maximum]:
+            del zset[member]
+
+
+class FakePipeline:
+    """Queues FakeRedis commands and runs them on execute()."""
+
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.commands.append((getattr(self.client, name), args, kwargs))
+
+    def execute(self):
+        return [command(*args, **kwargs) for command, args, kwargs in self.commands]
+
+
+class HeartbeatStoreTests(SimpleTestCase):
+    """Tests for the Redis-side counters and liveness set."""
+
+    def setUp(self):
+        """Set up store on a fake client."""
+        self.store = HeartbeatStore(FakeRedis(), state_ttl=60)
+
+    def test_unknown_counter_set_after_database_path(self):
+        """Test the first database pass sets the pending count."""
+        self.assertIsNone(self.store.pending("a-1"))
+
+        self.store.sync_pending("a-1", observed=None, remaining=0)
+
+        self.assertEqual(self.store.pending("a-1"), 0)
+
+    def test_increment_during_database_path_is_kept(self):
+        """Test a task created while the database was queried is not lost."""
+        # First pass: a task is created between reading the counter and storing it
+        self.store.add_pending("a-1")
+        self.store.sync_pending("a-1", observed=None, remaining=0)
+        self.assertEqual(self.store.pending("a-1"), 1)
+
+        # Second pass consumed that task, while one more was created
+        self.store.add_pending("a-1")
+        self.store.sync_pending("a-1", observed=1, remaining=0)
+        self.assertEqual(self.store.pending("a-1"), 1)
+
+    def test_expired_counter_is_not_recreated(self):
+        """Test a counter that expired during the database path stays unknown instead of going negative."""
+        self.store.sync_pending("a-1", observed=2, remaining=0)
+
+        self.assertIsNone(self.store.pending("a-1"))
+
+    def test_counter_never_drops_below_zero(self):
+        """Test a decrement larger than the counter clamps it at zero."""
+        self.store.sync_pending("a-1", observed=None, remaining=1)
+
+        self.store.sync_pending("a-1", observed=3, remaining=0)
+
+        self.assertEqual(self.store.pending("a-1"), 0)
+
+    def test_fan_out_counts_each_agent(self):
+        """Test a fan-out increments known counters and creates missing ones."""
+        self.store.sync_pending("a-1", observed=None, remaining=2)
+
+        self.store.add_pending_many(["a-1", "a-2"])
+
+        self.assertEqual(self.store.pending("a-1"), 3)
+        self.assertEqual(self.store.pending("a-2"), 1)
+
+    def test_forget_drops_counters(self):
+        """Test forgotten agents go back to an unknown count."""
+        self.store.sync_pending("a-1", observed=None, remaining=0)
+
+        self.store.forget(["a-1"])
+
+        self.assertIsNone(self.store.pending("a-1"))
+
+    def test_clear_keeps_heartbeats_after_cutoff(self):
+        """Test a heartbeat recorded during a flush survives it."""
+        self.store.record("a-1", timestamp=100.0)
+        self.store.record("a-2", timestamp=200.0)
+
+        self.assertEqual(self.store.due(150.0), [("a-1", 100.0)])
+        self.store.clear(150.0)
+
+        self.assertEqual(self.store.due(300.0), [("a-2", 200.0)])
+
+
+def _agent(hostname, status="ONLINE", last_heartbeat_at=None):
+    return Agent.objects.create(
+        hostname=hostname,
+        platform="windows",
+        platform_version="11",
+        agent_version="1.0.0",
+        registration_key=f"reg-{hostname}",
+        ip_address="10.0.1.1",
+        mac_address="00:00:00:00:00:01",
+        status=status,
+        last_heartbeat_at=last_heartbeat_at or timezone.now(),
+    )
+
+
+class CoalescedHeartbeatTests(TestCase):
+    """Tests for process_heartbeat and flushes with a heartbeat store."""
+
+    def setUp(self):
+        """Set up service, agent and heartbeat store."""
+        self.service = AgentManagementService()
+        self.user = User.objects.create_user(username="heartbeat", password="testpass123")
+        self.agent = _agent("hb-agent", status="OFFLINE")
+        self.agent_id = str(self.agent.id)
+        self.store = HeartbeatStore(FakeRedis(), state_ttl=60)
+        for target in ("services", "heartbeats"):
+            patcher = patch(f"apps.agent_management.{target}.get_heartbeat_store", return_value=self.store)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_idle_agent_skips_database(self):
+        """Test only the first heartbeat of an idle agent queries the database."""
+        first = self.service.process_heartbeat(agent_id=self.agent_id)
+        self.agent.refresh_from_db()
+        self.assertEqual(self.agent.status, "ONLINE")
+        self.assertEqual(first["pending_tasks"], 0)
+
+        with CaptureQueriesContext(connection) as queries:
+            second = self.service.process_heartbeat(agent_id=self.agent_id)
+
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(second, {"status": "ok", "pending_tasks": 0, "tasks": []})
+        self.assertEqual([agent_id for agent_id, _ in self.store.due(time.time())], [self.agent_id])
+
+    def test_new_task_reaches_idle_agent(self):
+        """Test a task created for an idle agent is returned by its next heartbeat."""
+        self.service.process_heartbeat(agent_id=self.agent_id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            task = self.service.create_task(
+                agent_id=self.agent_id, task_type="COLLECT", payload={}, created_by=self.user
+            )
+        result = self.service.process_heartbeat(agent_id=self.agent_id)
+
+        self.assertEqual([t["id"] for t in result["tasks"]], [str(task.id)])
+        self.assertEqual(self.store.pending(self.agent_id), 0)
+
+    def test_unknown_agent_still_raises(self):
+        """Test heartbeats from unknown agents are not coalesced."""
+        with self.assertRaises(Agent.DoesNotExist):
+            self.service.process_heartbeat(agent_id=str(uuid.uuid4()))
+
+    def test_flush_writes_heartbeats_in_bulk(self):
+        """Test coalesced heartbeats are written in one batch and removed from Redis."""
+        agents = [_agent(f"hb-{i}", last_heartbeat_at=timezone.now() - timedelta(hours=1)) for i in range(3)]
+        seen_at = time.time()
+        for agent in agents:
+            self.store.record(str(agent.id), timestamp=seen_at)
+
+        flushed = flush_heartbeats()
+
+        self.assertEqual(flushed, 3)
+        self.assertEqual(self.store.due(time.time()), [])
+        for agent in agents:
+            agent.refresh_from_db()
+            self.assertAlmostEqual(agent.last_heartbeat_at.timestamp(), seen_at, places=3)
+
+    def test_flush_outliving_lock_leaves_new_holder_lock(self):
+        """Test a flush that outlives its lock does not release the lock another flusher took since."""
+        self.store.record(self.agent_id)
+        due = self.store.due
+
+        def slow_due(cutoff):
+            # The lock TTL passes mid-flush and another flusher takes the lock
+            cache.delete(FLUSH_LOCK_KEY)
+            cache.add(FLUSH_LOCK_KEY, "other-flusher", timeout=None)
+            return due(cutoff)
+
+        self.addCleanup(cache.delete, FLUSH_LOCK_KEY)
+        with patch.object(self.store, "due", side_effect=slow_due):
+            self.assertEqual(flush_heartbeats(), 1)
+        self.assertEqual(cache.get(FLUSH_LOCK_KEY), "other-flusher")
+
+    def test_health_check_skipped_while_flush_in_progress(self):
+        """Test agents are not marked offline while another flush may still hold their heartbeats."""
+        alive = _agent("hb-alive", last_heartbeat_at=timezone.now() - timedelta(minutes=10))
+        self.store.record(str(alive.id))
+        cache.add(FLUSH_LOCK_KEY, "other-flusher", timeout=None)
+        self.addCleanup(cache.delete, FLUSH_LOCK_KEY)
+
+        self.assertIsNone(flush_heartbeats())
+        self.assertEqual(self.service.check_agent_health(), {"marked_offline": 0})
+        alive.refresh_from_db()
+        self.assertEqual(alive.status, "ONLINE")
+
+    def test_health_check_flushes_before_marking_offline(self):
+        """Test an agent alive only in Redis is not marked offline, and offline agents are forgotten."""
+        alive = _agent("hb-alive", last_heartbeat_at=timezone.now() - timedelta(minutes=10))
+        gone = _agent("hb-gone", last_heartbeat_at=timezone.now() - timedelta(minutes=10))
+        self.store.record(str(alive.id))
+        self.store.sync_pending(str(gone.id), observed=None, remaining=0)
+
+        result = self.service.check_agent_health()
+
+        self.assertEqual(result["marked_offline"], 1)
+        alive.refresh_from_db()
+        self.assertEqual(alive.status, "ONLINE")
+        self.assertIsNone(self.store.pending(str(gone.id)))
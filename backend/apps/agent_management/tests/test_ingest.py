@@ -0,0 +1,156 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Tests for batched agent record ingest.
+"""
+import gzip
+import json
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.exceptions import ParseError, UnsupportedMediaType
+from rest_framework.test import APIClient
+
+from apps.agent_management.ingest import validate_records
+from apps.agent_management.models import Agent, AgentTask, AgentTelemetry
+from apps.agent_management.parsers import decompress
+
+User = get_user_model()
+
+
+def _telemetry(cpu=10.0, **extra):
+    return {
+        "type": "telemetry",
+        "cpu_usage_percent": cpu,
+        "memory_usage_percent": 50.0,
+        "disk_usage_percent": 60.0,
+        **extra,
+    }
+
+
+class IngestValidationTests(SimpleTestCase):
+    """Tests for bulk record validation and body decompression."""
+
+    def test_invalid_records_reported_by_index(self):
+        """Test valid records are kept and each invalid one is reported."""
+        task_id = str(uuid.uuid4())
+        records = [
+            _telemetry(collected_at="2026-10-16T10:00:00Z"),
+            _telemetry(cpu=150),
+            {"type": "task_status", "task_id": task_id, "status": "COMPLETED", "exit_code": 0},
+            {"type": "task_status", "task_id": "not-a-uuid", "status": "COMPLETED"},
+            {"type": "task_status", "task_id": task_id, "status": "PENDING"},
+            {"type": "inventory"},
+            "telemetry",
+        ]
+
+        samples, updates, errors = validate_records(records)
+
+        self.assertEqual(len(samples), 1)
+        self.assertEqual(samples[0]["collected_at"].isoformat(), "2026-10-16T10:00:00+00:00")
+        self.assertEqual([index for index, _ in updates], [2])
+        self.assertEqual([error["index"] for error in errors], [1, 3, 4, 5, 6])
+
+    def test_gzip_body_decompressed(self):
+        """Test gzip bodies decompress and oversized or unknown encodings are refused."""
+        body = json.dumps({"records": [_telemetry()] * 100}).encode()
+        compressed = gzip.compress(body)
+
+        self.assertEqual(decompress(compressed, "gzip", max_size=len(body)), body)
+        with self.assertRaises(ParseError):
+            decompress(compressed, "gzip", max_size=len(body) - 1)
+        with self.assertRaises(ParseError):
+            decompress(b"not gzip", "gzip", max_size=1024)
+        with self.assertRaises(UnsupportedMediaType):
+            decompress(compressed, "br", max_size=len(body))
+
+
+class AgentIngestAPITests(TestCase):
+    """Tests for POST /api/v1/agent-management/agents/{id}/ingest/."""
+
+    def setUp(self):
+        """Set up client, agent and tasks."""
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="ingest", password="testpass123")
+        self.client.force_authenticate(user=self.user)
+        self.agent = Agent.objects.create(
+            hostname="ingest-agent",
+            platform="windows",
+            platform_version="11",
+            agent_version="1.0.0",
+            registration_key="reg-key-ingest",
+            ip_address="10.0.1.1",
+            mac_address="00:00:00:00:00:01",
+        )
+        self.tasks = [
+            AgentTask.objects.create(agent=self.agent, task_type="DEPLOY", payload={}, status="ASSIGNED")
+            for _ in range(3)
+        ]
+        self.url = f"/api/v1/agent-management/agents/{self.agent.id}/ingest/"
+
+    def _post(self, records, **headers):
+        body = gzip.compress(json.dumps({"records": records}).encode())
+        return self.client.post(
+            self.url, body, content_type="application/json", HTTP_CONTENT_ENCODING="gzip", **headers
+        )
+
+    def test_buffered_upload_applied_in_bulk(self):
+        """Test a gzip upload of mixed records is applied with a fixed number of queries."""
+        records = [_telemetry(cpu=i % 100, collected_at=f"2026-10-16T10:{i % 60:02d}:00Z") for i in range(500)]
+        for task in self.tasks:
+            records.append({"type": "task_status", "task_id": str(task.id), "status": "IN_PROGRESS"})
+            records.append({"type": "task_status", "task_id": str(task.id), "status": "COMPLETED", "exit_code": 0})
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self._post(records)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["telemetry"], 500)
+        self.assertEqual(response.data["task_updates"], 3)
+        self.assertEqual(response.data["rejected"], 0)
+        self.assertLess(len(queries), 20)
+        self.assertEqual(AgentTelemetry.objects.filter(agent=self.agent).count(), 500)
+        for task in self.tasks:
+            task.refresh_from_db()
+            self.assertEqual(task.status, "COMPLETED")
+            self.assertEqual(task.exit_code, 0)
+            self.assertIsNotNone(task.started_at)
+            self.assertIsNotNone(task.completed_at)
+
+    def test_finished_and_foreign_tasks_rejected(self):
+        """Test a late upload cannot reopen a finished task or touch another agent's task."""
+        finished = self.tasks[0]
+        finished.status = "FAILED"
+        finished.save()
+        other_agent = Agent.objects.create(
+            hostname="other-agent",
+            platform="linux",
+            platform_version="22.04",
+            agent_version="1.0.0",
+            registration_key="reg-key-other",
+            ip_address="10.0.1.2",
+            mac_address="00:00:00:00:00:02",
+        )
+        foreign = AgentTask.objects.create(agent=other_agent, task_type="DEPLOY", payload={}, status="ASSIGNED")
+
+        response = self._post(
+            [
+                {"type": "task_status", "task_id": str(finished.id), "status": "IN_PROGRESS"},
+                {"type": "task_status", "task_id": str(foreign.id), "status": "COMPLETED"},
+            ]
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["rejected"], 2)
+        foreign.refresh_from_db()
+        self.assertEqual(foreign.status, "ASSIGNED")
+
+    def test_unknown_agent(self):
+        """Test uploads for unknown agents return 404."""
+        self.url = f"/api/v1/agent-management/agents/{uuid.uuid4()}/ingest/"
+
+        self.assertEqual(self._post([_telemetry()]).status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,190 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Tests for push delivery of tasks to agents.
+
+Redis pub/sub is replaced by small in-memory clients implementing the
+commands the push module uses.
+"""
+import asyncio
+import uuid
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+from apps.agent_management.models import Agent, AgentTask
+from apps.agent_management.push import TaskWakeupListener, channel_name, publish_wakeups
+from apps.agent_management.services import AgentManagementService
+
+User = get_user_model()
+
+
+class FakePubSub:
+    """In-memory stand-in for redis.asyncio PubSub."""
+
+    def __init__(self):
+        self.channels = set()
+        self.messages = asyncio.Queue()
+        self.closed = False
+
+    async def subscribe(self, channel):
+        self.channels.add(channel)
+
+    async def unsubscribe(self, channel):
+        self.channels.discard(channel)
+
+    async def get_message(self, ignore_subscribe_messages=False, timeout=0.0):
+        try:
+            return await asyncio.wait_for(self.messages.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def aclose(self):
+        self.closed = True
+
+    def publish(self, channel):
+        if channel not in self.channels:
+            return 0
+        self.messages.put_nowait({"type": "message", "channel": channel.encode(), "data": b"1"})
+        return 1
+
+
+class FakePipeline:
+    """In-memory stand-in for a non-transactional Redis pipeline."""
+
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def publish(self, channel, message):
+        self.commands.append(channel)
+
+    def execute(self):
+        self.client.round_trips += 1
+        return [1 if channel in self.client.subscribed else 0 for channel in self.commands]
+
+
+class FakeRedis:
+    """Sync client recording pipelined publishes."""
+
+    def __init__(self, subscribed=()):
+        self.subscribed = set(subscribed)
+        self.round_trips = 0
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class TaskWakeupListenerTests(SimpleTestCase):
+    """Tests for waiting on agent wake-ups."""
+
+    def setUp(self):
+        """Set up listener on a fake pub/sub."""
+        self.pubsub = FakePubSub()
+        self.listener = TaskWakeupListener(self.pubsub)
+
+    async def test_publish_wakes_waiting_agents(self):
+        """Test a publish wakes every wait on that agent and no other."""
+        waits = [asyncio.ensure_future(self.listener.wait(agent_id, timeout=5)) for agent_id in ("a-1", "a-1", "a-2")]
+        await asyncio.sleep(0)
+
+        self.assertEqual(self.pubsub.publish(channel_name("a-1")), 1)
+        results = await asyncio.gather(*waits[:2])
+        self.assertEqual(results, [True, True])
+        self.assertFalse(waits[2].done())
+        self.assertEqual(self.pubsub.channels, {channel_name("a-2")})
+
+        self.pubsub.publish(channel_name("a-2"))
+        self.assertTrue(await waits[2])
+        self.assertEqual(self.pubsub.channels, set())
+
+    async def test_timeout_unsubscribes(self):
+        """Test a wait without a wake-up times out and drops its subscription."""
+        self.assertFalse(await self.listener.wait("a-1", timeout=0.05))
+        self.assertEqual(self.pubsub.channels, set())
+
+    async def test_closed_after_last_wait(self):
+        """Test the pub/sub connection stays open while any wait runs and closes after the last."""
+        first = asyncio.ensure_future(self.listener.wait("a-1", timeout=5))
+        await asyncio.sleep(0)
+        self.assertFalse(await self.listener.wait("a-2", timeout=0.01))
+        self.assertFalse(self.pubsub.closed)
+
+        self.pubsub.publish(channel_name("a-1"))
+        self.assertTrue(await first)
+        self.assertTrue(self.pubsub.closed)
+        self.assertTrue(self.listener.closed)
+
+    async def test_ready_checked_after_subscribing(self):
+        """Test tasks found once subscribed end the wait without a wake-up."""
+        subscribed = []
+
+        async def ready():
+            subscribed.append(channel_name("a-1") in self.pubsub.channels)
+            return ["task"]
+
+        self.assertTrue(await self.listener.wait("a-1", timeout=5, ready=ready))
+        self.assertEqual(subscribed, [True])
+
+    def test_publish_wakeups_pipelined(self):
+        """Test fan-out publishes are batched and only waiting agents count as delivered."""
+        agent_ids = [f"a-{i}" for i in range(2500)]
+        client = FakeRedis(subscribed=[channel_name("a-1"), channel_name("a-2000")])
+
+        self.assertEqual(publish_wakeups(client, agent_ids), 2)
+        self.assertEqual(client.round_trips, 3)
+
+
+class AgentTaskPollTests(TestCase):
+    """Tests for the task long-poll endpoint and task wake-ups."""
+
+    def setUp(self):
+        """Set up user and agent, with requests wrapped in transactions as in production."""
+        atomic_requests = patch.dict(connection.settings_dict, {"ATOMIC_REQUESTS": True})
+        atomic_requests.start()
+        self.addCleanup(atomic_requests.stop)
+        self.service = AgentManagementService()
+        self.user = User.objects.create_user(username="push", password="testpass123")
+        self.client.force_login(self.user)
+        self.agent = Agent.objects.create(
+            hostname="push-agent",
+            platform="windows",
+            platform_version="11",
+            agent_version="1.0.0",
+            registration_key="reg-key-push",
+            ip_address="10.0.1.1",
+            mac_address="00:00:00:00:00:01",
+        )
+        self.url = f"/api/v1/agent-management/agents/{self.agent.id}/tasks/poll/"
+
+    def test_create_task_wakes_agent_on_commit(self):
+        """Test a new task wakes its agent only once committed."""
+        with patch("apps.agent_management.services.wake_agents") as wake:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.service.create_task(agent_id=str(self.agent.id), task_type="COLLECT", payload={})
+                wake.assert_not_called()
+
+        wake.assert_called_once_with([str(self.agent.id)])
+
+    def test_pending_tasks_returned_at_once(self):
+        """Test a poll claims pending tasks without waiting."""
+        task = AgentTask.objects.create(agent=self.agent, task_type="DEPLOY", payload={}, status="PENDING")
+
+        response = self.client.get(self.url, {"timeout": 5})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([t["id"] for t in response.json()["tasks"]], [str(task.id)])
+        task.refresh_from_db()
+        self.assertEqual(task.status, "ASSIGNED")
+        # Claimed tasks are not handed out again
+        self.assertEqual(self.client.get(self.url, {"timeout": 0}).json()["tasks"], [])
+
+    def test_unknown_agent_and_anonymous_poll(self):
+        """Test polls for unknown agents return 404 and anonymous polls 403."""
+        unknown = f"/api/v1/agent-management/agents/{uuid.uuid4()}/tasks/poll/"
+        self.assertEqual(self.client.get(unknown, {"timeout": 0}).status_code, 404)
+
+        self.client.logout()
+        self.assertEqual(self.client.get(self.url).status_code, 403)
@@ -0,0 +1,237 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Tests for tiered telemetry storage, rollups and retention.
+"""
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.agent_management import telemetry_store
+from apps.agent_management.models import Agent, AgentSoftwareInventory, AgentTelemetry, AgentTelemetryRollup
+
+User = get_user_model()
+
+NOW = datetime(2026, 10, 16, 12, 30, 45, tzinfo=dt_timezone.utc)
+
+
+def _sample(cpu, collected_at, software=None):
+    return {
+        "cpu_usage_percent": cpu,
+        "memory_usage_percent": 50.0,
+        "disk_usage_percent": 60.0,
+        "network_bytes_sent": 100,
+        "network_bytes_received": 200,
+        "process_count": 80,
+        "installed_software": software,
+        "collected_at": collected_at,
+    }
+
+
+class TelemetryHelpersTests(SimpleTestCase):
+    """Tests for hashing, bucketing and tier selection."""
+
+    def test_software_hash_ignores_package_order(self):
+        """Test reordered inventories hash the same and changed ones differ."""
+        inventory = [{"name": "firefox", "version": "2.0"}, {"name": "vim", "version": "9.0"}]
+
+        self.assertEqual(
+            telemetry_store.software_hash(inventory), telemetry_store.software_hash(list(reversed(inventory)))
+        )
+        self.assertNotEqual(telemetry_store.software_hash(inventory), telemetry_store.software_hash(inventory[:1]))
+
+    def test_bucket_floor(self):
+        """Test timestamps are floored to UTC bucket starts."""
+        self.assertEqual(telemetry_store.bucket_floor(NOW, "1m"), NOW.replace(second=0))
+        self.assertEqual(telemetry_store.bucket_floor(NOW, "1h"), NOW.replace(minute=0, second=0))
+        self.assertEqual(telemetry_store.bucket_floor(NOW, "1d"), NOW.replace(hour=0, minute=0, second=0))
+
+    def test_select_tier_by_span_and_retention(self):
+        """Test the finest tier covering the range within the point limit is chosen."""
+        self.assertEqual(telemetry_store.select_tier(NOW - timedelta(hours=1), NOW, now=NOW), "raw")
+        self.assertEqual(telemetry_store.select_tier(NOW - timedelta(hours=12), NOW, now=NOW), "1m")
+        self.assertEqual(telemetry_store.select_tier(NOW - timedelta(days=30), NOW, now=NOW), "1h")
+        self.assertEqual(telemetry_store.select_tier(NOW - timedelta(days=365), NOW, now=NOW), "1d")
+        # A short range past raw retention is served from 1-minute rollups
+        old = NOW - timedelta(days=5)
+        self.assertEqual(telemetry_store.select_tier(old - timedelta(hours=1), old, now=NOW), "1m")
+
+
+class TelemetryStoreTests(TestCase):
+    """Tests for batched storage and rollups."""
+
+    def setUp(self):
+        """Set up agent."""
+        self.agent = Agent.objects.create(
+            hostname="telemetry-agent",
+            platform="linux",
+            platform_version="22.04",
+            agent_version="1.0.0",
+            registration_key="reg-key-telemetry-store",
+            ip_address="10.0.1.1",
+            mac_address="00:00:00:00:00:01",
+        )
+
+    def test_software_inventory_stored_only_on_change(self):
+        """Test repeated inventories are stored once and samples keep only the hash."""
+        inventory = [{"name": "firefox", "version": "2.0"}]
+        upgraded = [{"name": "firefox", "version": "2.1"}]
+        samples = [
+            _sample(10, NOW - timedelta(minutes=3), inventory),
+            _sample(20, NOW - timedelta(minutes=2), list(inventory)),
+            _sample(30, NOW - timedelta(minutes=1), upgraded),
+        ]
+
+        rows = telemetry_store.store_samples(self.agent, samples)
+        telemetry_store.store_samples(self.agent, [_sample(40, NOW, upgraded)])
+
+        self.assertEqual(AgentTelemetry.objects.filter(agent=self.agent).count(), 4)
+        self.assertEqual(
+            list(AgentSoftwareInventory.objects.order_by("collected_at").values_list("installed_software", flat=True)),
+            [inventory, upgraded],
+        )
+        self.assertEqual(rows[0].software_hash, rows[1].software_hash)
+        self.assertEqual(rows[0].installed_software, [])
+
+    def test_rollups_aggregate_across_tiers(self):
+        """Test raw samples roll up into minute, hour and day buckets."""
+        minute = NOW.replace(second=0)
+        samples = [_sample(10, minute), _sample(30, minute + timedelta(seconds=30))]
+        samples.append(_sample(50, minute + timedelta(minutes=1)))
+        telemetry_store.store_samples(self.agent, samples)
+
+        self.assertEqual(telemetry_store.rollup("1m", minute, minute + timedelta(minutes=2)), 2)
+        telemetry_store.rollup("1h", minute, minute + timedelta(hours=1))
+        telemetry_store.rollup("1d", minute, minute + timedelta(days=1))
+
+        first_minute = AgentTelemetryRollup.objects.get(resolution="1m", bucket_start=minute)
+        self.assertEqual(first_minute.sample_count, 2)
+        self.assertEqual(first_minute.cpu_avg, 20)
+        self.assertEqual(first_minute.cpu_max, 30)
+        day = AgentTelemetryRollup.objects.get(resolution="1d")
+        self.assertEqual(day.bucket_start, NOW.replace(hour=0, minute=0, second=0))
+        self.assertEqual(day.sample_count, 3)
+        self.assertEqual(day.cpu_avg, 30)
+        self.assertEqual(day.network_bytes_sent, 300)
+
+        # Recomputing a bucket replaces it rather than adding to it
+        telemetry_store.rollup("1m", minute, minute + timedelta(minutes=2))
+        self.assertEqual(AgentTelemetryRollup.objects.get(resolution="1m", bucket_start=minute).sample_count, 2)
+
+    def test_retention_per_tier(self):
+        """Test each tier is pruned after its own retention."""
+        telemetry_store.store_samples(self.agent, [_sample(10, NOW - timedelta(days=3)), _sample(20, NOW)])
+        for resolution, age in (("1m", 8), ("1m", 1), ("1h", 91), ("1d", 700)):
+            AgentTelemetryRollup.objects.create(
+                agent=self.agent,
+                resolution=resolution,
+                bucket_start=telemetry_store.bucket_floor(NOW - timedelta(days=age), resolution),
+            )
+
+        deleted = telemetry_store.apply_retention(now=NOW)
+
+        self.assertEqual(deleted, {"raw": 1, "1m": 1, "1h": 1, "1d": 0})
+        self.assertEqual(AgentTelemetry.objects.count(), 1)
+        self.assertEqual(AgentTelemetryRollup.objects.count(), 2)
+
+
+class AgentTelemetryRangeAPITests(TestCase):
+    """Tests for telemetry range queries and batch submission."""
+
+    def setUp(self):
+        """Set up client and agent."""
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="telemetry-api", password="testpass123")
+        self.client.force_authenticate(user=self.user)
+        self.agent = Agent.objects.create(
+            hostname="telemetry-api-agent",
+            platform="windows",
+            platform_version="11",
+            agent_version="1.0.0",
+            registration_key="reg-key-telemetry-api",
+            ip_address="10.0.1.2",
+            mac_address="00:00:00:00:00:02",
+        )
+
+    def test_batch_submission(self):
+        """Test POST /api/v1/agent-management/telemetry/batch/ stores all samples."""
+        now = timezone.now()
+        samples = [
+            {"cpu_usage_percent": 10.0 + i, "memory_usage_percent": 50.0, "disk_usage_percent": 60.0} for i in range(3)
+        ]
+        for i, sample in enumerate(samples):
+            sample["collected_at"] = (now - timedelta(seconds=10 * i)).isoformat()
+
+        response = self.client.post(
+            "/api/v1/agent-management/telemetry/batch/",
+            {"agent_id": str(self.agent.id), "samples": samples},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["stored"], 3)
+        self.assertEqual(AgentTelemetry.objects.filter(agent=self.agent).count(), 3)
+
+    def test_raw_samples_include_deduplicated_inventory(self):
+        """Test raw samples serve installed_software from the shared inventory, in one query for the page."""
+        inventory = [{"name": "firefox", "version": "2.0"}]
+        upgraded = [{"name": "firefox", "version": "2.1"}]
+        telemetry_store.store_samples(
+            self.agent,
+            [
+                _sample(10, NOW - timedelta(minutes=2), inventory),
+                _sample(20, NOW - timedelta(minutes=1), inventory),
+                _sample(30, NOW, upgraded),
+            ],
+        )
+        AgentTelemetry.objects.create(
+            agent=self.agent,
+            cpu_usage_percent=5,
+            memory_usage_percent=50,
+            disk_usage_percent=60,
+            installed_software=["legacy"],
+            collected_at=NOW - timedelta(minutes=3),
+        )
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(f"/api/v1/agent-management/agents/{self.agent.id}/telemetry/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [sample["installed_software"] for sample in response.data],
+            [upgraded, inventory, inventory, ["legacy"]],
+        )
+        inventory_table = AgentSoftwareInventory._meta.db_table
+        self.assertEqual(sum(1 for query in ctx.captured_queries if inventory_table in query["sql"]), 1)
+
+    def test_long_range_served_from_rollups(self):
+        """Test a 30-day range is answered from hourly rollups."""
+        end = timezone.now()
+        bucket = telemetry_store.bucket_floor(end - timedelta(days=2), "1h")
+        AgentTelemetryRollup.objects.create(
+            agent=self.agent, resolution="1h", bucket_start=bucket, sample_count=4, cpu_sum=100, cpu_max=40
+        )
+
+        response = self.client.get(
+            f"/api/v1/agent-management/agents/{self.agent.id}/telemetry/",
+            {"start": (end - timedelta(days=30)).isoformat(), "end": end.isoformat()},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["resolution"], "1h")
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["cpu_avg"], 25)
+
+    def test_invalid_range_rejected(self):
+        """Test malformed ranges and unknown resolutions return 400."""
+        url = f"/api/v1/agent-management/agents/{self.agent.id}/telemetry/"
+
+        self.assertEqual(self.client.get(url, {"start": "yesterday"}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(url, {"resolution": "5m"}).status_code, status.HTTP_400_BAD_REQUEST)
@@ -4,7 +4,13 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import AgentDeploymentStatusViewSet, AgentTaskViewSet, AgentTelemetryViewSet, AgentViewSet
+from .views import (
+    AgentDeploymentStatusViewSet,
+    AgentTaskViewSet,
+    AgentTelemetryViewSet,
+    AgentViewSet,
+    agent_task_poll,
+)
 
 router = DefaultRouter()
 router.register(r"agents", AgentViewSet, basename="agent")
@@ -13,5 +19,6 @@ router.register(r"telemetry", AgentTelemetryViewSet, basename="agent-telemetry")
 router.register(r"deployments", AgentDeploymentStatusViewSet, basename="agent-deployment")
 
 urlpatterns = [
+    path("agents/<uuid:agent_id>/tasks/poll/", agent_task_poll, name="agent-task-poll"),
     path("", include(router.urls)),
 ]
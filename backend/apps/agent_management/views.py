@@ -3,7 +3,17 @@
 """
 REST API views for agent management.
 """
+from datetime import timedelta
+from datetime import timezone as dt_timezone
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.http import JsonResponse
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.http import require_GET
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
@@ -12,17 +22,34 @@ from rest_framework.response import Response
 from apps.core.pagination import TelemetryCursorPagination
 
 from .models import Agent, AgentDeploymentStatus, AgentTask, AgentTelemetry
+from .parsers import CompressedJSONParser
+from .push import get_wakeup_listener
 from .serializers import (
     AgentDeploymentStatusSerializer,
+    AgentIngestSerializer,
     AgentRegistrationSerializer,
     AgentSerializer,
     AgentTaskCreateSerializer,
+    AgentTaskFanOutSerializer,
     AgentTaskSerializer,
     AgentTaskStatusUpdateSerializer,
+    AgentTelemetryBatchSubmitSerializer,
+    AgentTelemetryRollupSerializer,
     AgentTelemetrySerializer,
     AgentTelemetrySubmitSerializer,
 )
 from .services import AgentManagementService
+from .telemetry_store import RAW, TELEMETRY_MAX_POINTS, TELEMETRY_TIERS, query_telemetry
+
+
+def _parse_range_param(value):
+    """Parse an optional ISO 8601 datetime query parameter (naive values are UTC)."""
+    if not value:
+        return None
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise ValueError(f"Invalid datetime: {value}")
+    return parsed if timezone.is_aware(parsed) else timezone.make_aware(parsed, dt_timezone.utc)
 
 
 class AgentViewSet(viewsets.ModelViewSet):
@@ -90,6 +117,28 @@ class AgentViewSet(viewsets.ModelViewSet):
         except Agent.DoesNotExist:
             return Response({"error": "Agent not found"}, status=status.HTTP_404_NOT_FOUND)
 
+    @action(detail=True, methods=["post"], parser_classes=[CompressedJSONParser])
+    def ingest(self, request, pk=None):
+        """
+        Batched upload of telemetry and task-status records.
+
+        The JSON body may be gzip- or zstd-compressed (Content-Encoding).
+        """
+        serializer = AgentIngestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        service = AgentManagementService()
+        correlation_id = request.headers.get("X-Correlation-ID", "")
+
+        try:
+            result = service.ingest_records(
+                agent_id=str(pk), records=serializer.validated_data["records"], correlation_id=correlation_id
+            )
+        except Agent.DoesNotExist:
+            return Response({"error": "Agent not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        return Response(result)
+
     @action(detail=True, methods=["get"])
     def tasks(self, request, pk=None):
         """Get agent's tasks."""
@@ -100,11 +149,42 @@ class AgentViewSet(viewsets.ModelViewSet):
 
     @action(detail=True, methods=["get"])
     def telemetry(self, request, pk=None):
-        """Get agent's telemetry data."""
+        """
+        Get agent's telemetry data.
+
+        Without query parameters, returns the latest 100 raw samples. With
+        start/end (ISO 8601; default the last hour) and optionally resolution
+        (raw, 1m, 1h or 1d), returns the range from the appropriate rollup tier.
+        """
         agent = self.get_object()
-        telemetry = agent.telemetry.all()[:100]
-        serializer = AgentTelemetrySerializer(telemetry, many=True)
-        return Response(serializer.data)
+        params = request.query_params
+        if not any(name in params for name in ("start", "end", "resolution")):
+            telemetry = agent.telemetry.all()[:100]
+            serializer = AgentTelemetrySerializer(telemetry, many=True)
+            return Response(serializer.data)
+
+        try:
+            end = _parse_range_param(params.get("end")) or timezone.now()
+            start = _parse_range_param(params.get("start")) or end - timedelta(hours=1)
+        except ValueError:
+            return Response({"error": "start and end must be ISO 8601 datetimes"}, status=status.HTTP_400_BAD_REQUEST)
+        resolution = params.get("resolution")
+        if resolution and resolution not in TELEMETRY_TIERS:
+            return Response(
+                {"error": f"resolution must be one of: {', '.join(TELEMETRY_TIERS)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if start >= end:
+            return Response({"error": "start must be before end"}, status=status.HTTP_400_BAD_REQUEST)
+
+        tier, queryset = query_telemetry(agent, start, end, resolution)
+        if tier == RAW:
+            serializer = AgentTelemetrySerializer(queryset.select_related("agent")[:TELEMETRY_MAX_POINTS], many=True)
+        else:
+            serializer = AgentTelemetryRollupSerializer(queryset[:TELEMETRY_MAX_POINTS], many=True)
+        return Response(
+            {"resolution": tier, "start": start.isoformat(), "end": end.isoformat(), "results": serializer.data}
+        )
 
 
 class AgentTaskViewSet(viewsets.ModelViewSet):
@@ -114,6 +194,14 @@ class AgentTaskViewSet(viewsets.ModelViewSet):
     serializer_class = AgentTaskSerializer
     permission_classes = [IsAuthenticated]
 
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        """Exclude the fan-out route from ATOMIC_REQUESTS, as fan_out_task() commits per chunk."""
+        view = super().as_view(actions, **initkwargs)
+        if actions and "fan_out" in actions.values():
+            view = transaction.non_atomic_requests(view)
+        return view
+
     def get_queryset(self):
         """Filter queryset by query parameters."""
         queryset = super().get_queryset()
@@ -159,6 +247,23 @@ class AgentTaskViewSet(viewsets.ModelViewSet):
 
         return Response(AgentTaskSerializer(task).data, status=status.HTTP_201_CREATED)
 
+    @action(detail=False, methods=["post"], url_path="fan-out")
+    def fan_out(self, request):
+        """Create a task on every agent matching a platform/ring/tags selector."""
+        serializer = AgentTaskFanOutSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        service = AgentManagementService()
+        correlation_id = request.headers.get("X-Correlation-ID", "")
+
+        result = service.fan_out_task(
+            **serializer.validated_data,
+            created_by=request.user,
+            correlation_id=correlation_id,
+        )
+
+        return Response(result, status=status.HTTP_201_CREATED)
+
     @action(detail=True, methods=["post"])
     def start(self, request, pk=None):
         """Mark task as started."""
@@ -238,6 +343,26 @@ class AgentTelemetryViewSet(viewsets.ModelViewSet):
 
         return Response(AgentTelemetrySerializer(telemetry).data, status=status.HTTP_201_CREATED)
 
+    @action(detail=False, methods=["post"])
+    def batch(self, request):
+        """Submit a batch of telemetry samples from one agent."""
+        serializer = AgentTelemetryBatchSubmitSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        service = AgentManagementService()
+        correlation_id = request.headers.get("X-Correlation-ID", "")
+
+        try:
+            rows = service.store_telemetry_batch(
+                agent_id=str(serializer.validated_data["agent_id"]),
+                samples=serializer.validated_data["samples"],
+                correlation_id=correlation_id,
+            )
+        except Agent.DoesNotExist:
+            return Response({"error": "Agent not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        return Response({"stored": len(rows)}, status=status.HTTP_201_CREATED)
+
 
 class AgentDeploymentStatusViewSet(viewsets.ModelViewSet):
     """ViewSet for deployment status tracking."""
@@ -263,3 +388,50 @@ class AgentDeploymentStatusViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(status=status_filter)
 
         return queryset.select_related("agent")
+
+
+@transaction.non_atomic_requests
+@require_GET
+async def agent_task_poll(request, agent_id):
+    """
+    Long-poll for an agent's new tasks.
+
+    Excluded from ATOMIC_REQUESTS: Django cannot wrap async views in a
+    request transaction, and a poll must not hold one open while it waits.
+    claim_tasks() commits its own short transaction.
+
+    Pending tasks are returned at once. Otherwise the request waits up to
+    ?timeout= seconds (capped at AGENT_TASK_POLL_TIMEOUT_SECONDS) for a
+    wake-up published when tasks are created, and returns the tasks claimed
+    then (an empty list on timeout). Without Redis push the request returns
+    immediately and tasks are picked up on heartbeats.
+    """
+    user = await request.auser()
+    if not user.is_authenticated:
+        return JsonResponse({"detail": "Authentication credentials were not provided."}, status=403)
+
+    max_timeout = settings.AGENT_TASK_POLL_TIMEOUT_SECONDS
+    try:
+        timeout = min(max(float(request.GET.get("timeout", max_timeout)), 0), max_timeout)
+    except ValueError:
+        return JsonResponse({"error": "timeout must be a number of seconds"}, status=400)
+
+    service = AgentManagementService()
+    correlation_id = request.headers.get("X-Correlation-ID", "")
+    result = {}
+
+    async def claim():
+        result.update(await sync_to_async(service.claim_tasks)(agent_id=str(agent_id), correlation_id=correlation_id))
+        return result["tasks"]
+
+    try:
+        listener = get_wakeup_listener()
+        if listener is None or not timeout:
+            await claim()
+        elif await listener.wait(str(agent_id), timeout, ready=claim) and not result["tasks"]:
+            # Woken by a publish: claim the new tasks
+            await claim()
+    except Agent.DoesNotExist:
+        return JsonResponse({"error": "Agent not found"}, status=404)
+
+    return JsonResponse(result)
@@ -13,4 +13,4 @@ class ApplicationPortfolioConfig(AppConfig):
 
     def ready(self) -> None:
         """Import signals when app is ready."""
-        pass  # Add signal imports here when needed
+        from . import signals  # noqa: F401
@@ -0,0 +1,116 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Management command to benchmark the dashboard summary endpoints at scale.
+
+Seeds synthetic applications and assets inside a transaction that is
+rolled back afterwards, then times the snapshot rebuild and the cached
+endpoint reads for each size.
+"""
+import time
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.application_portfolio.models import Application, ApplicationStatus, Publisher
+from apps.application_portfolio.services import SUMMARY_CACHE_KEY, refresh_portfolio_summary
+from apps.application_portfolio.views import PortfolioSummaryViewSet
+from apps.connectors.models import Asset
+from apps.telemetry.services import DEMO_VARIANTS, PLATFORM_METRICS_CACHE_KEY, refresh_platform_metrics
+from apps.telemetry.views import metrics_view
+
+SEED_BATCH_SIZE = 5000
+CATEGORIES = ["Productivity", "Security", "Development", "Communication", ""]
+STATUSES = [choice for choice, _ in ApplicationStatus.choices]
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Benchmark portfolio summary and telemetry metrics latency at 1k/100k/1M rows (rolled back)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=[1_000, 100_000, 1_000_000],
+            help="Number of applications and assets to seed per run",
+        )
+        parser.add_argument("--reads", type=int, default=200, help="Cached endpoint reads to average per size")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'rows':>10} {'rebuild':>10} {'summary p50':>12} {'metrics p50':>12}")
+        for size in options["sizes"]:
+            try:
+                with transaction.atomic():
+                    self.stdout.write(self._run(size, options["reads"]))
+                    raise _Rollback
+            except _Rollback:
+                pass
+            finally:
+                cache.delete_many(
+                    [SUMMARY_CACHE_KEY]
+                    + [PLATFORM_METRICS_CACHE_KEY.format(variant=variant) for variant in DEMO_VARIANTS.values()]
+                )
+
+    def _run(self, size: int, reads: int) -> str:
+        self._seed(size)
+
+        start = time.perf_counter()
+        refresh_portfolio_summary()
+        for is_demo in DEMO_VARIANTS:
+            refresh_platform_metrics(is_demo)
+        rebuild = time.perf_counter() - start
+
+        user = get_user_model().objects.create_user(username=f"bench-{uuid.uuid4().hex[:8]}", password=None)
+        factory = APIRequestFactory()
+        summary_view = PortfolioSummaryViewSet.as_view({"get": "list"})
+
+        def timed(view, path):
+            samples = []
+            for _ in range(reads):
+                request = factory.get(path)
+                force_authenticate(request, user=user)
+                start = time.perf_counter()
+                view(request)
+                samples.append(time.perf_counter() - start)
+            return sorted(samples)[len(samples) // 2]
+
+        summary_p50 = timed(summary_view, "/api/v1/portfolio/summary/")
+        metrics_p50 = timed(metrics_view, "/api/v1/telemetry/metrics/?include_demo=all")
+        return f"{size:>10} {rebuild * 1000:>8.1f}ms {summary_p50 * 1000:>10.2f}ms {metrics_p50 * 1000:>10.2f}ms"
+
+    def _seed(self, size: int) -> None:
+        run = uuid.uuid4().hex[:8]
+        publisher = Publisher.objects.create(name=f"Benchmark {run}", identifier=f"bench.{run}")
+        for offset in range(0, size, SEED_BATCH_SIZE):
+            count = min(SEED_BATCH_SIZE, size - offset)
+            Application.objects.bulk_create(
+                Application(
+                    name=f"App {offset + i}",
+                    identifier=f"bench.{run}.app{offset + i}",
+                    publisher=publisher,
+                    category=CATEGORIES[(offset + i) % len(CATEGORIES)],
+                    status=STATUSES[(offset + i) % len(STATUSES)],
+                )
+                for i in range(count)
+            )
+            Asset.objects.bulk_create(
+                Asset(
+                    name=f"host-{offset + i}",
+                    asset_id=f"bench-{run}-{offset + i}",
+                    type=Asset.AssetType.LAPTOP,
+                    os="Windows 11",
+                    status="Active" if (offset + i) % 10 else "Inactive",
+                    location="Benchmark",
+                    owner="benchmark",
+                )
+                for i in range(count)
+            )
@@ -0,0 +1,160 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Application Portfolio services: materialized dashboard summary.
+
+The portfolio summary (application status/category counts, platform
+coverage, health summary and deployment counts) is computed as one
+snapshot and kept in the shared cache, so the summary endpoint is a single
+cache read.
+
+Refresh:
+- post_save/post_delete on the counted models mark the snapshot dirty.
+- A dirty snapshot is still served for up to
+  PORTFOLIO_SUMMARY_MAX_STALENESS_SECONDS, then rebuilt by the next read.
+- The refresh_portfolio_summary_snapshot beat task rebuilds dirty snapshots ahead of
+  readers, and any snapshot older than PORTFOLIO_SUMMARY_MAX_AGE_SECONDS
+  (covers bulk writes, which send no signals).
+"""
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from .models import (
+    Application,
+    ApplicationHealth,
+    ApplicationVersion,
+    DeploymentIntent,
+    DeploymentStatus,
+    PackageArtifact,
+    Publisher,
+)
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_CACHE_KEY = "application_portfolio:summary"
+SUMMARY_DIRTY_CACHE_KEY = "application_portfolio:summary:dirty"
+
+
+def build_portfolio_summary() -> dict[str, Any]:
+    """
+    Compute the portfolio summary from the database.
+
+    Six aggregate queries; totals are derived from the grouped counts.
+    """
+    apps_by_status: dict[str, int] = {}
+    apps_by_category: dict[str, int] = {}
+    total_apps = active_apps = 0
+    for row in Application.objects.values("status", "category", "is_active").annotate(count=Count("id")).order_by():
+        total_apps += row["count"]
+        active_apps += row["count"] if row["is_active"] else 0
+        apps_by_status[row["status"]] = apps_by_status.get(row["status"], 0) + row["count"]
+        if row["category"]:
+            apps_by_category[row["category"]] = apps_by_category.get(row["category"], 0) + row["count"]
+
+    platforms_coverage = dict(
+        PackageArtifact.objects.values("platform")
+        .annotate(count=Count("id"))
+        .order_by()
+        .values_list("platform", "count")
+    )
+
+    deployments = DeploymentIntent.objects.aggregate(
+        pending=Count("id", filter=Q(status=DeploymentStatus.PENDING_APPROVAL)),
+        active=Count("id", filter=Q(status=DeploymentStatus.IN_PROGRESS)),
+    )
+
+    health_counts = dict(
+        ApplicationHealth.objects.values("health_status")
+        .annotate(count=Count("application", distinct=True))
+        .order_by()
+        .values_list("health_status", "count")
+    )
+
+    return {
+        "total_applications": total_apps,
+        "active_applications": active_apps,
+        "total_versions": ApplicationVersion.objects.count(),
+        "total_artifacts": sum(platforms_coverage.values()),
+        "applications_by_status": apps_by_status,
+        "applications_by_category": apps_by_category,
+        "platforms_coverage": platforms_coverage,
+        "publishers_count": Publisher.objects.filter(is_active=True).count(),
+        "pending_deployments": deployments["pending"],
+        "active_deployments": deployments["active"],
+        "health_summary": health_counts,
+    }
+
+
+def refresh_portfolio_summary() -> dict[str, Any]:
+    """
+    Rebuild and store the summary snapshot.
+
+    The dirty flag is cleared before counting, so writes that land while
+    the snapshot is being built mark it dirty again.
+    """
+    try:
+        cache.delete(SUMMARY_DIRTY_CACHE_KEY)
+    except Exception as e:
+        logger.warning(f"Failed to clear portfolio summary dirty flag: {e}")
+
+    summary = build_portfolio_summary()
+    try:
+        cache.set(SUMMARY_CACHE_KEY, {"computed_at": time.time(), "summary": summary}, timeout=None)
+    except Exception as e:
+        logger.warning(f"Failed to cache portfolio summary: {e}")
+    return summary
+
+
+def get_portfolio_summary() -> dict[str, Any]:
+    """
+    Return the portfolio summary, served from the snapshot when usable.
+    """
+    try:
+        cached = cache.get_many([SUMMARY_CACHE_KEY, SUMMARY_DIRTY_CACHE_KEY])
+    except Exception:
+        cached = {}
+
+    snapshot = cached.get(SUMMARY_CACHE_KEY)
+    if snapshot is not None:
+        age = time.time() - snapshot["computed_at"]
+        dirty = SUMMARY_DIRTY_CACHE_KEY in cached
+        if age < settings.PORTFOLIO_SUMMARY_MAX_AGE_SECONDS and (
+            not dirty or age < settings.PORTFOLIO_SUMMARY_MAX_STALENESS_SECONDS
+        ):
+            return snapshot["summary"]
+    return refresh_portfolio_summary()
+
+
+def mark_portfolio_summary_dirty() -> None:
+    """Flag the summary snapshot as out of date."""
+    try:
+        cache.set(SUMMARY_DIRTY_CACHE_KEY, True, timeout=None)
+    except Exception as e:
+        # Shared cache down: the snapshot's max age still bounds staleness
+        logger.warning(f"Failed to mark portfolio summary dirty: {e}")
+
+
+def refresh_portfolio_summary_if_needed() -> bool:
+    """
+    Rebuild the snapshot if it is dirty, missing or past its max age.
+
+    Returns:
+        True if the snapshot was rebuilt
+    """
+    cached = cache.get_many([SUMMARY_CACHE_KEY, SUMMARY_DIRTY_CACHE_KEY])
+    snapshot = cached.get(SUMMARY_CACHE_KEY)
+    if (
+        snapshot is not None
+        and SUMMARY_DIRTY_CACHE_KEY not in cached
+        and time.time() - snapshot["computed_at"] < settings.PORTFOLIO_SUMMARY_MAX_AGE_SECONDS
+    ):
+        return False
+    refresh_portfolio_summary()
+    return True
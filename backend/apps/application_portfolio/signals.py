@@ -0,0 +1,23 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Application Portfolio signal handlers.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from .models import Application, ApplicationHealth, ApplicationVersion, DeploymentIntent, PackageArtifact, Publisher
+from .services import mark_portfolio_summary_dirty
+
+# Models counted by the portfolio summary snapshot
+SUMMARY_MODELS = (Application, ApplicationVersion, PackageArtifact, Publisher, DeploymentIntent, ApplicationHealth)
+
+
+def mark_summary_dirty(sender, **kwargs):
+    """Mark the portfolio summary snapshot dirty once a change to a counted model is committed."""
+    transaction.on_commit(mark_portfolio_summary_dirty)
+
+
+for model in SUMMARY_MODELS:
+    post_save.connect(mark_summary_dirty, sender=model, dispatch_uid=f"portfolio_summary_{model.__name__}_save")
+    post_delete.connect(mark_summary_dirty, sender=model, dispatch_uid=f"portfolio_summary_{model.__name__}_delete")
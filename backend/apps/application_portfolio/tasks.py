@@ -0,0 +1,24 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Celery tasks for the application portfolio summary snapshot.
+"""
+import logging
+
+from celery import shared_task
+
+from .services import refresh_portfolio_summary_if_needed
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="apps.application_portfolio.tasks.refresh_portfolio_summary_snapshot")
+def refresh_portfolio_summary_snapshot():
+    """
+    Rebuild the portfolio summary snapshot if it is dirty or expired.
+    """
+    try:
+        return {"refreshed": refresh_portfolio_summary_if_needed()}
+    except Exception as e:
+        logger.error(f"Portfolio summary refresh failed: {e}", exc_info=True)
+        return {"refreshed": False, "error": str(e)}
@@ -0,0 +1,133 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Tests for the Application Portfolio summary snapshot.
+"""
+import time
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.application_portfolio.models import (
+    Application,
+    ApplicationHealth,
+    ApplicationStatus,
+    HealthStatus,
+    PackageArtifact,
+    Publisher,
+)
+from apps.application_portfolio.services import (
+    SUMMARY_CACHE_KEY,
+    SUMMARY_DIRTY_CACHE_KEY,
+    build_portfolio_summary,
+    get_portfolio_summary,
+    refresh_portfolio_summary_if_needed,
+)
+
+
+@pytest.fixture
+def publisher(db):
+    """Create a test publisher."""
+    return Publisher.objects.create(name="Summary Publisher", identifier="com.summarypublisher")
+
+
+def _app(publisher, index, status=ApplicationStatus.PUBLISHED, category="Productivity", is_active=True):
+    return Application.objects.create(
+        name=f"App {index}",
+        identifier=f"com.summarypublisher.app{index}",
+        publisher=publisher,
+        status=status,
+        category=category,
+        is_active=is_active,
+    )
+
+
+@pytest.mark.django_db
+class TestPortfolioSummary:
+    """Test summary computation and snapshot refresh."""
+
+    def test_build_summary_counts(self, publisher):
+        """Test grouped counts and derived totals."""
+        app = _app(publisher, 1)
+        _app(publisher, 2, status=ApplicationStatus.DRAFT, category="")
+        _app(publisher, 3, category="Security", is_active=False)
+        ApplicationHealth.objects.create(application=app, health_status=HealthStatus.HEALTHY)
+        ApplicationHealth.objects.create(application=app, health_status=HealthStatus.HEALTHY)
+
+        summary = build_portfolio_summary()
+
+        assert summary["total_applications"] == 3
+        assert summary["active_applications"] == 2
+        assert summary["applications_by_status"] == {ApplicationStatus.PUBLISHED: 2, ApplicationStatus.DRAFT: 1}
+        assert summary["applications_by_category"] == {"Productivity": 1, "Security": 1}
+        assert summary["health_summary"] == {HealthStatus.HEALTHY: 1}
+        assert summary["publishers_count"] == 1
+        assert summary["total_artifacts"] == PackageArtifact.objects.count() == 0
+
+    def test_cached_read_is_single_cache_lookup(self, publisher):
+        """Test a warm read issues no database queries."""
+        _app(publisher, 1)
+        get_portfolio_summary()
+
+        with CaptureQueriesContext(connection) as ctx:
+            assert get_portfolio_summary()["total_applications"] == 1
+        assert len(ctx.captured_queries) == 0
+
+    def test_save_marks_snapshot_dirty(self, publisher, settings, django_capture_on_commit_callbacks):
+        """Test counted-model saves mark the snapshot dirty and reads rebuild once past the staleness bound."""
+        settings.PORTFOLIO_SUMMARY_MAX_STALENESS_SECONDS = 60
+        get_portfolio_summary()
+        with django_capture_on_commit_callbacks(execute=True):
+            _app(publisher, 1)
+
+        assert cache.get(SUMMARY_DIRTY_CACHE_KEY) is True
+        assert get_portfolio_summary()["total_applications"] == 0
+
+        settings.PORTFOLIO_SUMMARY_MAX_STALENESS_SECONDS = 0
+        assert get_portfolio_summary()["total_applications"] == 1
+        assert cache.get(SUMMARY_DIRTY_CACHE_KEY) is None
+
+    def test_dirty_flag_set_only_on_commit(self, publisher, django_capture_on_commit_callbacks):
+        """Test a refresh racing an uncommitted write cannot clear the flag before the write lands."""
+        get_portfolio_summary()
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            _app(publisher, 1)
+            assert cache.get(SUMMARY_DIRTY_CACHE_KEY) is None
+
+        for callback in callbacks:
+            callback()
+        assert cache.get(SUMMARY_DIRTY_CACHE_KEY) is True
+
+    def test_refresh_if_needed(self, publisher, settings, django_capture_on_commit_callbacks):
+        """Test the beat refresh only rebuilds dirty or expired snapshots."""
+        settings.PORTFOLIO_SUMMARY_MAX_AGE_SECONDS = 900
+        assert refresh_portfolio_summary_if_needed() is True
+        assert refresh_portfolio_summary_if_needed() is False
+
+        with django_capture_on_commit_callbacks(execute=True):
+            _app(publisher, 1)
+        assert refresh_portfolio_summary_if_needed() is True
+
+        snapshot = cache.get(SUMMARY_CACHE_KEY)
+        snapshot["computed_at"] = time.time() - 1000
+        cache.set(SUMMARY_CACHE_KEY, snapshot)
+        assert refresh_portfolio_summary_if_needed() is True
+
+    def test_summary_endpoint(self, authenticated_client, publisher):
+        """Test summary endpoint serves the snapshot."""
+        _app(publisher, 1)
+
+        response = authenticated_client.get("/api/v1/portfolio/summary/")
+
+        assert response.status_code == 200
+        assert response.data["total_applications"] == 1
+        assert response.data["applications_by_status"] == {ApplicationStatus.PUBLISHED: 1}
+
+    @pytest.mark.slow
+    def test_benchmark_command(self):
+        """Benchmark the summary endpoints at 1k rows."""
+        call_command("benchmark_dashboard_summary", sizes=[1000], reads=20)
@@ -8,7 +8,7 @@ and deployment management.
 """
 from __future__ import annotations
 
-from django.db.models import Count, Q
+from django.db.models import Q
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
@@ -45,6 +45,7 @@ from .serializers import (
     PublisherListSerializer,
     PublisherSerializer,
 )
+from .services import get_portfolio_summary
 
 
 class PublisherViewSet(viewsets.ModelViewSet):
@@ -646,60 +647,8 @@ class PortfolioSummaryViewSet(viewsets.ViewSet):
     permission_classes = [IsAuthenticated]
 
     def list(self, request: Request) -> Response:
-        """Get portfolio summary statistics."""
-        # Application counts
-        total_apps = Application.objects.count()
-        active_apps = Application.objects.filter(is_active=True).count()
-
-        # Version and artifact counts
-        total_versions = ApplicationVersion.objects.count()
-        total_artifacts = PackageArtifact.objects.count()
-
-        # Applications by status
-        apps_by_status = dict(
-            Application.objects.values("status").annotate(count=Count("id")).values_list("status", "count")
-        )
-
-        # Applications by category
-        apps_by_category = dict(
-            Application.objects.exclude(category="")
-            .values("category")
-            .annotate(count=Count("id"))
-            .values_list("category", "count")
-        )
-
-        # Platform coverage
-        platforms_coverage = dict(
-            PackageArtifact.objects.values("platform").annotate(count=Count("id")).values_list("platform", "count")
-        )
-
-        # Publisher count
-        publishers_count = Publisher.objects.filter(is_active=True).count()
-
-        # Deployment counts
-        pending_deployments = DeploymentIntent.objects.filter(status=DeploymentStatus.PENDING_APPROVAL).count()
-        active_deployments = DeploymentIntent.objects.filter(status=DeploymentStatus.IN_PROGRESS).count()
-
-        # Health summary
-        health_counts = dict(
-            ApplicationHealth.objects.values("health_status")
-            .annotate(count=Count("application", distinct=True))
-            .values_list("health_status", "count")
-        )
-
-        summary = {
-            "total_applications": total_apps,
-            "active_applications": active_apps,
-            "total_versions": total_versions,
-            "total_artifacts": total_artifacts,
-            "applications_by_status": apps_by_status,
-            "applications_by_category": apps_by_category,
-            "platforms_coverage": platforms_coverage,
-            "publishers_count": publishers_count,
-            "pending_deployments": pending_deployments,
-            "active_deployments": active_deployments,
-            "health_summary": health_counts,
-        }
+        """Get portfolio summary statistics (served from the materialized snapshot)."""
+        summary = get_portfolio_summary()
 
         serializer = ApplicationPortfolioSummarySerializer(summary)
         return Response(serializer.data)
@@ -12,9 +12,12 @@ import logging
 import time
 from typing import Optional
 
+import httpx
 import requests
 from decouple import config
 
+from apps.connectors.http_pool import get_async_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -213,6 +216,35 @@ class AnsibleAuth:
 
         return self._session
 
+    def get_async_client(self) -> httpx.AsyncClient:
+        """
+        Get the pooled async client for this server (shared per event loop).
+
+        Returns:
+            Configured httpx.AsyncClient; OAuth tokens are still added by sign_request
+        """
+        headers = {
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+            "User-Agent": "EUCORA-ControlPlane/1.0",
+        }
+        auth = None
+        credential = None
+
+        if self.auth_method == "token":
+            headers["Authorization"] = f"Bearer {self.token}"
+            credential = self.token
+        elif self.auth_method == "basic":
+            auth = httpx.BasicAuth(self.username, self.password)
+            credential = (self.username, self.password)
+
+        return get_async_client(
+            ("awx", self.server_url, self.auth_method, credential, self.verify_ssl),
+            headers=headers,
+            auth=auth,
+            verify=self.verify_ssl,
+        )
+
     def sign_request(
         self,
         method: str,
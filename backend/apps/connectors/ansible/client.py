@@ -12,16 +12,24 @@ Provides integration with AWX/Tower for:
 
 API Reference: https://docs.ansible.com/ansible-tower/latest/html/towerapi/
 """
+import asyncio
+import contextlib
 import hashlib
+import itertools
 import json
 import logging
+import math
 import time
+from collections import deque
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
 from uuid import uuid4
 
-import requests
+import httpx
+from django.conf import settings
 
+from apps.connectors.idempotency import get_idempotency_store
+from apps.connectors.job_tracker import TRACKER_BATCH_SIZE, get_job_tracker
 from apps.core.structured_logging import StructuredLogger
 
 from .auth import AnsibleAuth
@@ -72,10 +80,13 @@ class AnsibleConnector:
     JOB_STATUS_CANCELED = "canceled"
 
     TERMINAL_STATUSES = {JOB_STATUS_SUCCESSFUL, JOB_STATUS_FAILED, JOB_STATUS_ERROR, JOB_STATUS_CANCELED}
+    SUCCESS_STATUSES = {JOB_STATUS_SUCCESSFUL}
 
-    # Cache for idempotent operations (TTL: 1 hour)
-    _idempotency_cache: dict[str, tuple[dict, float]] = {}
-    CACHE_TTL_SECONDS = 3600
+    # Plane name used by the shared job tracker
+    TRACKER_PLANE = "ansible"
+
+    # AWX rejects larger page_size values
+    MAX_PAGE_SIZE = 200
 
     def __init__(self, auth: Optional[AnsibleAuth] = None):
         """
@@ -88,8 +99,10 @@ class AnsibleConnector:
         self.server_url = self.auth.server_url
         self.api_base = f"{self.server_url}/api/v2"
         self.logger = StructuredLogger(__name__)
+        # Results of idempotent operations, shared across workers
+        self._idempotency_cache = get_idempotency_store("ansible")
 
-    def _make_request(
+    async def _make_request(
         self,
         method: str,
         endpoint: str,
@@ -98,7 +111,7 @@ class AnsibleConnector:
         correlation_id: Optional[str] = None,
     ) -> dict[str, Any]:
         """
-        Make authenticated request to AWX API.
+        Make authenticated request to AWX API over the pooled async client.
 
         Args:
             method: HTTP method
@@ -116,7 +129,7 @@ class AnsibleConnector:
         url = f"{self.api_base}{endpoint}"
         correlation_id = correlation_id or str(uuid4())
 
-        session = self.auth.get_session()
+        client = self.auth.get_async_client()
         headers = {"X-Correlation-ID": correlation_id}
         headers = self.auth.sign_request(method, url, headers)
 
@@ -128,7 +141,7 @@ class AnsibleConnector:
         )
 
         try:
-            response = session.request(
+            response = await client.request(
                 method=method,
                 url=url,
                 params=params,
@@ -172,30 +185,141 @@ class AnsibleConnector:
 
             return response.json()
 
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             raise AnsibleConnectorError(
                 "Request timeout",
                 is_transient=True,
             )
 
-        except requests.exceptions.ConnectionError as e:
+        except httpx.TransportError as e:
             raise AnsibleConnectorError(
                 f"Connection error: {e}",
                 is_transient=True,
             )
 
-        except requests.exceptions.HTTPError as e:
-            status_code = e.response.status_code if e.response else None
+        except httpx.HTTPStatusError as e:
+            status_code = e.response.status_code if e.response is not None else None
             is_transient = status_code in (408, 429, 502, 503, 504) if status_code else False
 
             raise AnsibleConnectorError(
                 f"HTTP error: {e}",
                 is_transient=is_transient,
                 status_code=status_code,
-                response_body=e.response.text if e.response else None,
+                response_body=e.response.text if e.response is not None else None,
             )
 
-    def _paginate(
+    async def _iter_paginated(
+        self,
+        endpoint: str,
+        params: Optional[dict] = None,
+        max_results: int = 10000,
+        correlation_id: Optional[str] = None,
+    ) -> AsyncIterator[dict]:
+        """
+        Stream the items of a list endpoint, prefetching pages concurrently.
+
+        The first page gives the total count. The remaining pages are
+        requested by number, at most CONNECTOR_AWX_PAGE_PREFETCH_WINDOW at a
+        time, and their items are yielded in page order. Results are ordered
+        by id unless params set order_by, so page boundaries stay stable
+        while pages arrive out of order. Outstanding requests are cancelled
+        if the consumer stops early.
+
+        Args:
+            endpoint: API endpoint
+            params: Query parameters
+            max_results: Maximum results to yield
+            correlation_id: Correlation ID
+
+        Yields:
+            Result items
+        """
+        page_size = min(self.MAX_PAGE_SIZE, max_results)
+        params = {**(params or {}), "page_size": page_size}
+        params.setdefault("order_by", "id")
+
+        async def fetch(page: int) -> dict[str, Any]:
+            return await self._make_request(
+                "GET",
+                endpoint,
+                params={**params, "page": page},
+                correlation_id=correlation_id,
+            )
+
+        remaining = max_results
+        # Closing the page iterator cancels its outstanding requests if we stop early
+        async with contextlib.aclosing(self._iter_pages(fetch, page_size, max_results)) as pages:
+            async for response in pages:
+                for item in response.get("results", [])[:remaining]:
+                    remaining -= 1
+                    yield item
+                if remaining <= 0:
+                    return
+
+    async def _iter_pages(
+        self,
+        fetch: Callable[[int], Awaitable[dict[str, Any]]],
+        page_size: int,
+        max_results: int,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield list responses in page order, prefetching when the total count is known."""
+        response = await fetch(1)
+        yield response
+        if not response.get("next"):
+            return
+
+        count = response.get("count")
+        if count is None:
+            # No total to plan against: follow the next links one page at a time
+            pages = self._follow_next_links(fetch, response)
+        else:
+            pages = self._prefetch_pages(fetch, math.ceil(min(count, max_results) / page_size))
+        async with contextlib.aclosing(pages):
+            async for response in pages:
+                yield response
+
+    @staticmethod
+    async def _follow_next_links(
+        fetch: Callable[[int], Awaitable[dict[str, Any]]], response: dict[str, Any]
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield the pages after response for as long as each one links to a next page."""
+        page = 1
+        while response.get("next"):
+            page += 1
+            response = await fetch(page)
+            yield response
+
+    @staticmethod
+    async def _prefetch_pages(
+        fetch: Callable[[int], Awaitable[dict[str, Any]]], last_page: int
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield pages 2..last_page, keeping CONNECTOR_AWX_PAGE_PREFETCH_WINDOW requests in flight."""
+        window = max(1, settings.CONNECTOR_AWX_PAGE_PREFETCH_WINDOW)
+        pages = iter(range(2, last_page + 1))
+        in_flight: deque[asyncio.Task] = deque(
+            asyncio.create_task(fetch(page)) for page in itertools.islice(pages, window)
+        )
+        try:
+            while in_flight:
+                try:
+                    response = await in_flight.popleft()
+                except AnsibleConnectorError as e:
+                    if e.status_code == 404:
+                        # The listing shrank since the count was read
+                        return
+                    raise
+
+                # Keep the window full while the consumer works through this page
+                next_page = next(pages, None)
+                if next_page is not None:
+                    in_flight.append(asyncio.create_task(fetch(next_page)))
+                yield response
+        finally:
+            for task in in_flight:
+                task.cancel()
+            await asyncio.gather(*in_flight, return_exceptions=True)
+
+    async def _paginate(
         self,
         endpoint: str,
         params: Optional[dict] = None,
@@ -214,58 +338,24 @@ class AnsibleConnector:
         Returns:
             List of all results
         """
-        results: list[Any] = []
-        params = params or {}
-        params["page_size"] = min(200, max_results)  # AWX max page size
-
-        while len(results) < max_results:
-            response = self._make_request(
-                "GET",
+        return [
+            item
+            async for item in self._iter_paginated(
                 endpoint,
                 params=params,
+                max_results=max_results,
                 correlation_id=correlation_id,
             )
-
-            results.extend(response.get("results", []))
-
-            # Check for next page
-            next_url = response.get("next")
-            if not next_url:
-                break
-
-            # Extract page number from next URL
-            from urllib.parse import parse_qs, urlparse
-
-            parsed = urlparse(next_url)
-            query_params = parse_qs(parsed.query)
-            if "page" in query_params:
-                params["page"] = query_params["page"][0]
-            else:
-                break
-
-        return results[:max_results]
+        ]
 
     def get_idempotency_key(self, operation: str, params: dict) -> str:
         """Generate idempotency key for an operation."""
         key_data = json.dumps({"operation": operation, "params": params}, sort_keys=True)
         return hashlib.sha256(key_data.encode()).hexdigest()
 
-    def _get_cached_result(self, idempotency_key: str) -> Optional[dict]:
-        """Get cached result if exists and not expired."""
-        if idempotency_key in self._idempotency_cache:
-            result, timestamp = self._idempotency_cache[idempotency_key]
-            if datetime.now().timestamp() - timestamp < self.CACHE_TTL_SECONDS:
-                return result
-            del self._idempotency_cache[idempotency_key]
-        return None
-
-    def _cache_result(self, idempotency_key: str, result: dict) -> None:
-        """Cache operation result."""
-        self._idempotency_cache[idempotency_key] = (result, datetime.now().timestamp())
-
     async def test_connection(self) -> tuple[bool, str]:
         """Test connection to AWX server."""
-        return self.auth.test_connection()
+        return await asyncio.to_thread(self.auth.test_connection)
 
     # =========================================================================
     # Inventory Management
@@ -288,17 +378,14 @@ class AnsibleConnector:
         Returns:
             List of inventories
         """
-        params: dict[str, Any] = {}
-        if search:
-            params["search"] = search
-        if organization_id:
-            params["organization"] = organization_id
-
-        results = self._paginate(
-            "/inventories/",
-            params=params,
-            correlation_id=correlation_id,
-        )
+        results = [
+            inventory
+            async for inventory in self.iter_inventories(
+                search=search,
+                organization_id=organization_id,
+                correlation_id=correlation_id,
+            )
+        ]
 
         return {
             "success": True,
@@ -306,6 +393,32 @@ class AnsibleConnector:
             "count": len(results),
         }
 
+    async def iter_inventories(
+        self,
+        search: Optional[str] = None,
+        organization_id: Optional[int] = None,
+        correlation_id: Optional[str] = None,
+    ) -> AsyncIterator[dict]:
+        """
+        Stream inventories, prefetching pages concurrently.
+
+        Args:
+            search: Search query
+            organization_id: Filter by organization
+            correlation_id: Correlation ID
+
+        Yields:
+            Inventories
+        """
+        params: dict[str, Any] = {}
+        if search:
+            params["search"] = search
+        if organization_id:
+            params["organization"] = organization_id
+
+        async for inventory in self._iter_paginated("/inventories/", params=params, correlation_id=correlation_id):
+            yield inventory
+
     async def get_inventory(
         self,
         inventory_id: int,
@@ -321,7 +434,7 @@ class AnsibleConnector:
         Returns:
             Inventory details
         """
-        response = self._make_request(
+        response = await self._make_request(
             "GET",
             f"/inventories/{inventory_id}/",
             correlation_id=correlation_id,
@@ -349,15 +462,14 @@ class AnsibleConnector:
         Returns:
             List of hosts
         """
-        params: dict[str, Any] = {}
-        if enabled_only:
-            params["enabled"] = "true"
-
-        results = self._paginate(
-            f"/inventories/{inventory_id}/hosts/",
-            params=params,
-            correlation_id=correlation_id,
-        )
+        results = [
+            host
+            async for host in self.iter_inventory_hosts(
+                inventory_id,
+                enabled_only=enabled_only,
+                correlation_id=correlation_id,
+            )
+        ]
 
         return {
             "success": True,
@@ -366,6 +478,37 @@ class AnsibleConnector:
             "inventory_id": inventory_id,
         }
 
+    async def iter_inventory_hosts(
+        self,
+        inventory_id: int,
+        enabled_only: bool = False,
+        max_results: int = 10000,
+        correlation_id: Optional[str] = None,
+    ) -> AsyncIterator[dict]:
+        """
+        Stream the hosts of an inventory, prefetching pages concurrently.
+
+        Args:
+            inventory_id: Inventory ID
+            enabled_only: Only yield enabled hosts
+            max_results: Maximum hosts to yield
+            correlation_id: Correlation ID
+
+        Yields:
+            Hosts
+        """
+        params: dict[str, Any] = {}
+        if enabled_only:
+            params["enabled"] = "true"
+
+        async for host in self._iter_paginated(
+            f"/inventories/{inventory_id}/hosts/",
+            params=params,
+            max_results=max_results,
+            correlation_id=correlation_id,
+        ):
+            yield host
+
     async def sync_inventory_source(
         self,
         inventory_source_id: int,
@@ -381,7 +524,7 @@ class AnsibleConnector:
         Returns:
             Sync job details
         """
-        response = self._make_request(
+        response = await self._make_request(
             "POST",
             f"/inventory_sources/{inventory_source_id}/update/",
             correlation_id=correlation_id,
@@ -426,15 +569,6 @@ class AnsibleConnector:
         """
         correlation_id = correlation_id or str(uuid4())
 
-        # Idempotency check
-        idempotency_key = self.get_idempotency_key(
-            "create_host",
-            {"inventory_id": inventory_id, "name": name},
-        )
-        cached = self._get_cached_result(idempotency_key)
-        if cached:
-            return cached
-
         json_data = {
             "name": name,
             "description": description,
@@ -444,35 +578,36 @@ class AnsibleConnector:
         if variables:
             json_data["variables"] = json.dumps(variables)
 
-        try:
-            response = self._make_request(
-                "POST",
-                "/hosts/",
-                json_data=json_data,
-                correlation_id=correlation_id,
-            )
-
-            result = {
-                "success": True,
-                "created": True,
-                "host": response,
-                "correlation_id": correlation_id,
-            }
-
-        except AnsibleConnectorError as e:
-            if e.status_code == 400 and "already exists" in str(e.response_body or ""):
-                # Host already exists - idempotent success
-                result = {
+        async def create() -> dict[str, Any]:
+            try:
+                response = await self._make_request(
+                    "POST",
+                    "/hosts/",
+                    json_data=json_data,
+                    correlation_id=correlation_id,
+                )
+                return {
                     "success": True,
-                    "created": False,
-                    "message": "Host already exists",
+                    "created": True,
+                    "host": response,
                     "correlation_id": correlation_id,
                 }
-            else:
+            except AnsibleConnectorError as e:
+                if e.status_code == 400 and "already exists" in str(e.response_body or ""):
+                    # Host already exists - idempotent success
+                    return {
+                        "success": True,
+                        "created": False,
+                        "message": "Host already exists",
+                        "correlation_id": correlation_id,
+                    }
                 raise
 
-        self._cache_result(idempotency_key, result)
-        return result
+        idempotency_key = self.get_idempotency_key(
+            "create_host",
+            {"inventory_id": inventory_id, "name": name},
+        )
+        return await self._idempotency_cache.run_once(idempotency_key, create)
 
     # =========================================================================
     # Job Template Management
@@ -505,7 +640,7 @@ class AnsibleConnector:
         if inventory_id:
             params["inventory"] = inventory_id
 
-        results = self._paginate(
+        results = await self._paginate(
             "/job_templates/",
             params=params,
             correlation_id=correlation_id,
@@ -532,7 +667,7 @@ class AnsibleConnector:
         Returns:
             Job template details
         """
-        response = self._make_request(
+        response = await self._make_request(
             "GET",
             f"/job_templates/{template_id}/",
             correlation_id=correlation_id,
@@ -586,7 +721,7 @@ class AnsibleConnector:
         if credential_id:
             json_data["credentials"] = [credential_id]
 
-        response = self._make_request(
+        response = await self._make_request(
             "POST",
             f"/job_templates/{template_id}/launch/",
             json_data=json_data if json_data else None,
@@ -630,7 +765,7 @@ class AnsibleConnector:
         Returns:
             Job details
         """
-        response = self._make_request(
+        response = await self._make_request(
             "GET",
             f"/jobs/{job_id}/",
             correlation_id=correlation_id,
@@ -656,7 +791,7 @@ class AnsibleConnector:
         Returns:
             Job stdout
         """
-        response = self._make_request(
+        response = await self._make_request(
             "GET",
             f"/jobs/{job_id}/stdout/",
             params={"format": "txt"},
@@ -692,7 +827,7 @@ class AnsibleConnector:
         Returns:
             Cancellation result
         """
-        self._make_request(
+        await self._make_request(
             "POST",
             f"/jobs/{job_id}/cancel/",
             correlation_id=correlation_id,
@@ -720,10 +855,14 @@ class AnsibleConnector:
         """
         Wait for a job to complete.
 
+        The job is registered with the shared job tracker, which checks all
+        outstanding jobs on this event loop with batched status queries and
+        publishes the completion to the event store.
+
         Args:
             job_id: Job ID to wait for
             timeout: Maximum wait time in seconds
-            poll_interval: Poll interval in seconds
+            poll_interval: Unused; the tracker polls every CONNECTOR_JOB_TRACKER_POLL_SECONDS
             correlation_id: Correlation ID
 
         Returns:
@@ -731,27 +870,40 @@ class AnsibleConnector:
         """
         start_time = time.time()
 
-        while time.time() - start_time < timeout:
-            result = await self.get_job(job_id, correlation_id=correlation_id)
-            job = result.get("job", {})
-            status = job.get("status")
+        try:
+            result = await get_job_tracker().wait(self, job_id, timeout=timeout, correlation_id=correlation_id)
+        except asyncio.TimeoutError:
+            return {
+                "success": False,
+                "status": "timeout",
+                "job_id": job_id,
+                "message": f"Job did not complete within {timeout} seconds",
+            }
 
-            if status in self.TERMINAL_STATUSES:
-                return {
-                    "success": status == self.JOB_STATUS_SUCCESSFUL,
-                    "job": job,
-                    "status": status,
-                    "elapsed": time.time() - start_time,
-                }
+        return {**result, "elapsed": time.time() - start_time}
 
-            time.sleep(poll_interval)
+    async def get_job_statuses(
+        self,
+        job_ids: list[str],
+        correlation_id: Optional[str] = None,
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Get many jobs in one request using an id__in filter.
 
-        return {
-            "success": False,
-            "status": "timeout",
-            "job_id": job_id,
-            "message": f"Job did not complete within {timeout} seconds",
-        }
+        Args:
+            job_ids: Job IDs (at most TRACKER_BATCH_SIZE)
+            correlation_id: Correlation ID
+
+        Returns:
+            Jobs keyed by job ID (as str); unknown IDs are absent
+        """
+        response = await self._make_request(
+            "GET",
+            "/jobs/",
+            params={"id__in": ",".join(str(job_id) for job_id in job_ids), "page_size": TRACKER_BATCH_SIZE},
+            correlation_id=correlation_id,
+        )
+        return {str(job["id"]): job for job in response.get("results", [])}
 
     async def list_jobs(
         self,
@@ -778,7 +930,7 @@ class AnsibleConnector:
         if job_template_id:
             params["job_template"] = job_template_id
 
-        response = self._make_request(
+        response = await self._make_request(
             "GET",
             "/jobs/",
             params=params,
@@ -814,7 +966,7 @@ class AnsibleConnector:
         if search:
             params["search"] = search
 
-        results = self._paginate(
+        results = await self._paginate(
             "/workflow_job_templates/",
             params=params,
             correlation_id=correlation_id,
@@ -853,7 +1005,7 @@ class AnsibleConnector:
         if inventory_id:
             json_data["inventory"] = inventory_id
 
-        response = self._make_request(
+        response = await self._make_request(
             "POST",
             f"/workflow_job_templates/{workflow_id}/launch/",
             json_data=json_data if json_data else None,
@@ -898,7 +1050,7 @@ class AnsibleConnector:
         if search:
             params["search"] = search
 
-        results = self._paginate(
+        results = await self._paginate(
             "/projects/",
             params=params,
             correlation_id=correlation_id,
@@ -925,7 +1077,7 @@ class AnsibleConnector:
         Returns:
             Sync job details
         """
-        response = self._make_request(
+        response = await self._make_request(
             "POST",
             f"/projects/{project_id}/update/",
             correlation_id=correlation_id,
@@ -975,39 +1127,32 @@ class AnsibleConnector:
         """
         correlation_id = correlation_id or str(uuid4())
 
-        # Check idempotency for install/remove
-        if action in ("install", "remove"):
-            idempotency_key = self.get_idempotency_key(
-                f"deploy_packages_{action}",
-                {"template_id": template_id, "hosts": sorted(hosts), "packages": sorted(packages)},
-            )
-            cached = self._get_cached_result(idempotency_key)
-            if cached:
-                self.logger.info(
-                    "awx_deploy_packages_cached",
-                    action=action,
-                    correlation_id=correlation_id,
-                )
-                return cached
-
         extra_vars = {
             "packages": packages,
             "package_action": action,
         }
 
-        result = await self.launch_job_template(
-            template_id=template_id,
-            extra_vars=extra_vars,
-            limit=",".join(hosts) if isinstance(hosts, list) else hosts,
-            correlation_id=correlation_id,
-        )
-
-        result["action"] = action
-        result["packages"] = packages
-        result["hosts"] = hosts
+        async def deploy() -> dict[str, Any]:
+            result = await self.launch_job_template(
+                template_id=template_id,
+                extra_vars=extra_vars,
+                limit=",".join(hosts) if isinstance(hosts, list) else hosts,
+                correlation_id=correlation_id,
+            )
+            result["action"] = action
+            result["packages"] = packages
+            result["hosts"] = hosts
+            return result
 
+        # Install/remove are idempotent; upgrades always run
         if action in ("install", "remove"):
-            self._cache_result(idempotency_key, result)
+            idempotency_key = self.get_idempotency_key(
+                f"deploy_packages_{action}",
+                {"template_id": template_id, "hosts": sorted(hosts), "packages": sorted(packages)},
+            )
+            result = await self._idempotency_cache.run_once(idempotency_key, deploy)
+        else:
+            result = await deploy()
 
         self.logger.info(
             "awx_deploy_packages",
@@ -1086,7 +1231,7 @@ class AnsibleConnector:
         Returns:
             Host facts
         """
-        response = self._make_request(
+        response = await self._make_request(
             "GET",
             f"/hosts/{host_id}/ansible_facts/",
             correlation_id=correlation_id,
@@ -1113,7 +1258,7 @@ class AnsibleConnector:
         Returns:
             Host summaries with success/failure counts
         """
-        results = self._paginate(
+        results = await self._paginate(
             f"/jobs/{job_id}/job_host_summaries/",
             correlation_id=correlation_id,
         )
@@ -1133,6 +1278,41 @@ class AnsibleConnector:
             "success_rate": (successful / total_hosts * 100) if total_hosts > 0 else 0,
         }
 
+    async def iter_job_events(
+        self,
+        job_id: int,
+        event: Optional[str] = None,
+        failed_only: bool = False,
+        max_results: int = 100000,
+        correlation_id: Optional[str] = None,
+    ) -> AsyncIterator[dict]:
+        """
+        Stream the events of a job in event order, prefetching pages concurrently.
+
+        Args:
+            job_id: Job ID
+            event: Only yield events of this type (e.g. 'runner_on_failed')
+            failed_only: Only yield failed events
+            max_results: Maximum events to yield
+            correlation_id: Correlation ID
+
+        Yields:
+            Job events
+        """
+        params: dict[str, Any] = {"order_by": "counter"}
+        if event:
+            params["event"] = event
+        if failed_only:
+            params["failed"] = "true"
+
+        async for job_event in self._iter_paginated(
+            f"/jobs/{job_id}/job_events/",
+            params=params,
+            max_results=max_results,
+            correlation_id=correlation_id,
+        ):
+            yield job_event
+
     # =========================================================================
     # Inventory Sync for Control Plane
     # =========================================================================
@@ -1,10 +1,11 @@
 # SPDX-License-Identifier: Apache-2.0
 # Copyright (c) 2026 BuildWorks.AI
 """Tests for Ansible/AWX connector client."""
-from unittest.mock import Mock
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
-import requests
+import httpx
 
 from apps.connectors.ansible.client import AnsibleConnector, AnsibleConnectorError
 
@@ -15,7 +16,7 @@ def mock_auth():
     auth = Mock()
     auth.server_url = "https://awx.example.com"
     auth.test_connection.return_value = (True, "Connected to AWX v21.0.0")
-    auth.get_session.return_value = Mock(spec=requests.Session)
+    auth.get_async_client.return_value = AsyncMock(spec=httpx.AsyncClient)
     auth.sign_request.return_value = {"Authorization": "Bearer test"}
     return auth
 
@@ -60,9 +61,9 @@ class TestAnsibleConnectorInventory:
         mock_response.raise_for_status = Mock()
         mock_response.text = "{}"
 
-        mock_session = Mock()
-        mock_session.request.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.list_inventories()
 
@@ -82,9 +83,9 @@ class TestAnsibleConnectorInventory:
         mock_response.raise_for_status = Mock()
         mock_response.text = "{}"
 
-        mock_session = Mock()
-        mock_session.request.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.get_inventory(inventory_id=1)
 
@@ -107,9 +108,9 @@ class TestAnsibleConnectorInventory:
         mock_response.raise_for_status = Mock()
         mock_response.text = "{}"
 
-        mock_session = Mock()
-        mock_session.request.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.get_inventory_hosts(inventory_id=1)
 
@@ -128,9 +129,9 @@ class TestAnsibleConnectorInventory:
         mock_response.raise_for_status = Mock()
         mock_response.text = "{}"
 
-        mock_session = Mock()
-        mock_session.request.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.create_host(
             inventory_id=1,
@@ -160,9 +161,9 @@ class TestAnsibleConnectorJobTemplates:
         mock_response.raise_for_status = Mock()
         mock_response.text = "{}"
 
-        mock_session = Mock()
-        mock_session.request.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.list_job_templates()
 
@@ -182,9 +183,9 @@ class TestAnsibleConnectorJobTemplates:
         mock_response.raise_for_status = Mock()
         mock_response.text = "{}"
 
-        mock_session = Mock()
-        mock_session.request.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.get_job_template(template_id=1)
 
@@ -204,9 +205,9 @@ class TestAnsibleConnectorJobTemplates:
         mock_response.raise_for_status = Mock()
         mock_response.text = "{}"
 
-        mock_session = Mock()
-        mock_session.request.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.launch_job_template(
             template_id=1,
@@ -226,9 +227,9 @@ class TestAnsibleConnectorJobTemplates:
         mock_response.raise_for_status = Mock()
         mock_response.text = "{}"
 
-        mock_session = Mock()
-        mock_session.request.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.launch_job_template(
             template_id=1,
@@ -255,9 +256,9 @@ class TestAnsibleConnectorJobs:
         mock_response.raise_for_status = Mock()
         mock_response.text = "{}"
 
-        mock_session = Mock()
-        mock_session.request.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.get_job(job_id=100)
 
@@ -273,9 +274,9 @@ class TestAnsibleConnectorJobs:
         mock_response.raise_for_status = Mock()
         mock_response.text = ""
 
-        mock_session = Mock()
-        mock_session.request.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.cancel_job(job_id=100)
 
@@ -297,9 +298,9 @@ class TestAnsibleConnectorJobs:
         mock_response.raise_for_status = Mock()
         mock_response.text = "{}"
 
-        mock_session = Mock()
-        mock_session.request.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.list_jobs()
 
@@ -322,9 +323,9 @@ class TestAnsibleConnectorJobs:
         mock_response.raise_for_status = Mock()
         mock_response.text = "{}"
 
-        mock_session = Mock()
-        mock_session.request.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.get_job_host_summaries(job_id=100)
 
@@ -352,9 +353,9 @@ class TestAnsibleConnectorWorkflows:
         mock_response.raise_for_status = Mock()
         mock_response.text = "{}"
 
-        mock_session = Mock()
-        mock_session.request.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.list_workflow_templates()
 
@@ -373,9 +374,9 @@ class TestAnsibleConnectorWorkflows:
         mock_response.raise_for_status = Mock()
         mock_response.text = "{}"
 
-        mock_session = Mock()
-        mock_session.request.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.launch_workflow(
             workflow_id=1,
@@ -404,9 +405,9 @@ class TestAnsibleConnectorProjects:
         mock_response.raise_for_status = Mock()
         mock_response.text = "{}"
 
-        mock_session = Mock()
-        mock_session.request.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.list_projects()
 
@@ -422,9 +423,9 @@ class TestAnsibleConnectorProjects:
         mock_response.raise_for_status = Mock()
         mock_response.text = "{}"
 
-        mock_session = Mock()
-        mock_session.request.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.sync_project(project_id=1)
 
@@ -444,9 +445,9 @@ class TestAnsibleConnectorPackageDeployment:
         mock_response.raise_for_status = Mock()
         mock_response.text = "{}"
 
-        mock_session = Mock()
-        mock_session.request.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.deploy_packages(
             template_id=1,
@@ -468,9 +469,9 @@ class TestAnsibleConnectorPackageDeployment:
         mock_response.raise_for_status = Mock()
         mock_response.text = "{}"
 
-        mock_session = Mock()
-        mock_session.request.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         # Clear cache
         connector._idempotency_cache.clear()
@@ -492,7 +493,7 @@ class TestAnsibleConnectorPackageDeployment:
         )
 
         # Should only make one API call
-        assert mock_session.request.call_count == 1
+        assert mock_client.request.call_count == 1
         assert result1 == result2
 
     @pytest.mark.asyncio
@@ -504,9 +505,9 @@ class TestAnsibleConnectorPackageDeployment:
         mock_response.raise_for_status = Mock()
         mock_response.text = "{}"
 
-        mock_session = Mock()
-        mock_session.request.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.run_remediation(
             template_id=2,
@@ -549,9 +550,9 @@ class TestAnsibleConnectorInventorySync:
         hosts_response.raise_for_status = Mock()
         hosts_response.text = "{}"
 
-        mock_session = Mock()
-        mock_session.request.side_effect = [inventory_response, hosts_response]
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.side_effect = [inventory_response, hosts_response]
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.sync_inventory(inventory_id=1)
 
@@ -569,9 +570,9 @@ class TestAnsibleConnectorErrorHandling:
         mock_response = Mock()
         mock_response.status_code = 429
 
-        mock_session = Mock()
-        mock_session.request.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         with pytest.raises(AnsibleConnectorError) as exc_info:
             await connector.list_inventories()
@@ -586,9 +587,9 @@ class TestAnsibleConnectorErrorHandling:
         mock_response.status_code = 500
         mock_response.text = "Internal Server Error"
 
-        mock_session = Mock()
-        mock_session.request.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         with pytest.raises(AnsibleConnectorError) as exc_info:
             await connector.list_inventories()
@@ -599,9 +600,9 @@ class TestAnsibleConnectorErrorHandling:
     @pytest.mark.asyncio
     async def test_timeout_error(self, connector, mock_auth):
         """Test timeout error handling."""
-        mock_session = Mock()
-        mock_session.request.side_effect = requests.exceptions.Timeout()
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.side_effect = httpx.ReadTimeout("timed out")
+        mock_auth.get_async_client.return_value = mock_client
 
         with pytest.raises(AnsibleConnectorError) as exc_info:
             await connector.list_inventories()
@@ -611,9 +612,9 @@ class TestAnsibleConnectorErrorHandling:
     @pytest.mark.asyncio
     async def test_connection_error(self, connector, mock_auth):
         """Test connection error handling."""
-        mock_session = Mock()
-        mock_session.request.side_effect = requests.exceptions.ConnectionError()
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.side_effect = httpx.ConnectError("connection refused")
+        mock_auth.get_async_client.return_value = mock_client
 
         with pytest.raises(AnsibleConnectorError) as exc_info:
             await connector.list_inventories()
@@ -621,6 +622,141 @@ class TestAnsibleConnectorErrorHandling:
         assert exc_info.value.is_transient is True
 
 
+class FakeAWXListing:
+    """Serves numbered AWX list pages and records request concurrency."""
+
+    def __init__(self, count):
+        self.count = count
+        self.pages = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, method, endpoint, params=None, correlation_id=None):
+        page, page_size = params["page"], params["page_size"]
+        self.pages.append(page)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            # Later pages answer first, so ordering is not an accident of timing
+            await asyncio.sleep(0.01 / page)
+        finally:
+            self.in_flight -= 1
+        start = (page - 1) * page_size
+        if start >= self.count:
+            raise AnsibleConnectorError("Invalid page.", status_code=404)
+        return {
+            "count": self.count,
+            "next": f"/api/v2/hosts/?page={page + 1}" if start + page_size < self.count else None,
+            "results": [{"id": i} for i in range(start, min(start + page_size, self.count))],
+        }
+
+
+class TestAnsibleConnectorPagination:
+    """Tests for the concurrent paginator."""
+
+    @pytest.mark.asyncio
+    async def test_pages_prefetched_in_window_and_yielded_in_order(self, connector, settings):
+        """Test remaining pages are fetched concurrently but items arrive in page order."""
+        settings.CONNECTOR_AWX_PAGE_PREFETCH_WINDOW = 3
+        listing = FakeAWXListing(count=1150)
+
+        with patch.object(connector, "_make_request", listing):
+            hosts = [host async for host in connector.iter_inventory_hosts(1)]
+
+        assert [host["id"] for host in hosts] == list(range(1150))
+        assert sorted(listing.pages) == [1, 2, 3, 4, 5, 6]
+        assert listing.max_in_flight == 3
+
+    @pytest.mark.asyncio
+    async def test_max_results_limits_pages_requested(self, connector):
+        """Test only the pages needed for max_results are requested."""
+        listing = FakeAWXListing(count=5000)
+
+        with patch.object(connector, "_make_request", listing):
+            results = await connector._paginate("/hosts/", max_results=450)
+
+        assert len(results) == 450
+        assert sorted(listing.pages) == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_listing_without_count_follows_next_links(self, connector):
+        """Test pages are requested one at a time when the listing reports no total."""
+        listing = FakeAWXListing(count=450)
+
+        async def without_count(*args, **kwargs):
+            response = await listing(*args, **kwargs)
+            return {**response, "count": None}
+
+        with patch.object(connector, "_make_request", without_count):
+            results = await connector._paginate("/hosts/")
+
+        assert [result["id"] for result in results] == list(range(450))
+        assert listing.pages == [1, 2, 3]
+        assert listing.max_in_flight == 1
+
+    @pytest.mark.asyncio
+    async def test_early_stop_cancels_prefetched_pages(self, connector):
+        """Test a consumer that stops early leaves no requests running."""
+        listing = FakeAWXListing(count=2000)
+
+        with patch.object(connector, "_make_request", listing):
+            stream = connector.iter_job_events(42)
+            async for _ in stream:
+                break
+            await stream.aclose()
+
+        assert listing.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_job_events_ordered_by_counter(self, connector):
+        """Test job events are requested in event order with filters applied."""
+        make_request = AsyncMock(return_value={"count": 1, "next": None, "results": [{"id": 1, "counter": 1}]})
+
+        with patch.object(connector, "_make_request", make_request):
+            events = [event async for event in connector.iter_job_events(42, failed_only=True)]
+
+        assert events == [{"id": 1, "counter": 1}]
+        params = make_request.call_args.kwargs["params"]
+        assert make_request.call_args.args[1] == "/jobs/42/job_events/"
+        assert params["order_by"] == "counter"
+        assert params["failed"] == "true"
+
+
+class TestAnsibleConnectorJobTracking:
+    """Tests for job completion tracking."""
+
+    @pytest.mark.asyncio
+    async def test_get_job_statuses_uses_id_in_filter(self, connector):
+        """Test outstanding jobs are fetched in one id__in query."""
+        make_request = AsyncMock(
+            return_value={"results": [{"id": 1, "status": "running"}, {"id": 2, "status": "failed"}]}
+        )
+
+        with patch.object(connector, "_make_request", make_request):
+            statuses = await connector.get_job_statuses(["1", "2", "3"])
+
+        assert make_request.call_args.kwargs["params"]["id__in"] == "1,2,3"
+        assert statuses == {"1": {"id": 1, "status": "running"}, "2": {"id": 2, "status": "failed"}}
+
+    @pytest.mark.asyncio
+    async def test_wait_for_job_awaits_tracker(self, connector, settings):
+        """Test concurrent waits are answered by shared batched queries."""
+        settings.CONNECTOR_JOB_TRACKER_POLL_SECONDS = 0.01
+        make_request = AsyncMock(
+            return_value={"results": [{"id": 1, "status": "successful"}, {"id": 2, "status": "successful"}]}
+        )
+
+        with patch.object(connector, "_make_request", make_request), patch("apps.connectors.job_tracker.append_events"):
+            results = await asyncio.gather(
+                connector.wait_for_job(1, timeout=1),
+                connector.wait_for_job(2, timeout=1),
+            )
+
+        assert [result["status"] for result in results] == ["successful", "successful"]
+        assert all(result["success"] for result in results)
+        assert make_request.await_count == 1
+
+
 class TestAnsibleConnectorIdempotency:
     """Tests for idempotency."""
 
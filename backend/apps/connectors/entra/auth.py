@@ -19,6 +19,8 @@ from typing import Any, Optional
 
 import httpx
 
+from apps.connectors.token_broker import get_token_broker
+
 logger = logging.getLogger(__name__)
 
 
@@ -86,9 +88,10 @@ class EntraAuth:
         self._scope = scope
         self._timeout = timeout
 
-        # Token cache
+        # Token cache (shared with other workers through the token broker)
         self._token_info: Optional[EntraTokenInfo] = None
         self._token_lock_time: float = 0
+        self._token_refresh_at: Optional[float] = None
 
         # Validate configuration
         self._validate_config()
@@ -140,10 +143,34 @@ class EntraAuth:
             httpx.HTTPStatusError: If authentication fails
             ValueError: If configuration is invalid
         """
-        if self.is_token_valid and self._token_info:
+        refresh_due = self._token_refresh_at is not None and time.time() >= self._token_refresh_at
+        if self.is_token_valid and self._token_info and not refresh_due:
             logger.debug("Using cached Entra ID token")
             return self._token_info
 
+        return await self._authenticate_via_broker(force_refresh=False)
+
+    def _broker_cache_key(self) -> str:
+        return f"entra_token:{self._tenant_id}:{self._client_id}:{self._auth_method}:{self._scope}"
+
+    async def _authenticate_via_broker(self, force_refresh: bool) -> EntraTokenInfo:
+        """Get the shared token for this credential, fetching it only if the broker has none to hand out."""
+        token = await get_token_broker().aget_token(
+            "entra", self._broker_cache_key(), self._fetch_token_data, force_refresh=force_refresh
+        )
+        data = token.data
+        self._token_info = EntraTokenInfo(
+            access_token=token.access_token,
+            expires_at=datetime.fromtimestamp(token.issued_at + data["expires_in"], tz=timezone.utc),
+            token_type=data.get("token_type", "Bearer"),
+            scope=data.get("scope", self._scope),
+            resource=data.get("resource", "https://graph.microsoft.com"),
+        )
+        self._token_refresh_at = token.refresh_at
+        return self._token_info
+
+    async def _fetch_token_data(self) -> dict[str, Any]:
+        """Authenticate with the configured method and return the token as a broker token response."""
         logger.info(f"Authenticating to Entra ID using {self._auth_method}")
 
         if self._auth_method == "client_credentials":
@@ -155,9 +182,14 @@ class EntraAuth:
         else:
             raise ValueError(f"Unknown auth method: {self._auth_method}")
 
-        self._token_info = token_info
         logger.info(f"Entra ID authentication successful, expires at {token_info.expires_at.isoformat()}")
-        return token_info
+        return {
+            "access_token": token_info.access_token,
+            "expires_in": max(0, int((token_info.expires_at - datetime.now(timezone.utc)).total_seconds())),
+            "token_type": token_info.token_type,
+            "scope": token_info.scope,
+            "resource": token_info.resource,
+        }
 
     async def _authenticate_client_credentials(self) -> EntraTokenInfo:
         """Authenticate using client credentials (secret)."""
@@ -282,7 +314,7 @@ class EntraAuth:
         For client credentials flow, this re-authenticates.
         """
         self._token_info = None
-        return await self.authenticate()
+        return await self._authenticate_via_broker(force_refresh=True)
 
     def get_token_hash(self) -> str:
         """Get hash of current token for audit logging (never log the actual token)."""
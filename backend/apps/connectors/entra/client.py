@@ -6,8 +6,7 @@ Entra ID connector for EUCORA Control Plane.
 Provides user and group synchronization via Microsoft Graph API:
 - List/get users with attributes
 - List/get groups with membership
-- Sync users to local user database
-- Sync groups for RBAC mapping
+- Incremental user/group sync to local storage via Graph delta queries
 
 All operations are idempotent with correlation ID tracking.
 """
@@ -16,14 +15,22 @@ import logging
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 import httpx
+from asgiref.sync import sync_to_async
 
+from apps.connectors.graph import GRAPH_API_URL, GraphBatchError, GraphBatchResponse, GraphClient
+from apps.connectors.models import ConnectorInstance
+
+from . import directory
 from .auth import EntraAuth
 
 logger = logging.getLogger(__name__)
 
+# Graph error codes meaning a delta token can no longer be used
+DELTA_RESYNC_ERROR_CODES = {"resyncRequired", "syncStateNotFound", "syncStateInvalid"}
+
 
 @dataclass
 class EntraUser:
@@ -77,6 +84,7 @@ class SyncResult:
     started_at: datetime
     completed_at: Optional[datetime] = None
     duration_seconds: Optional[float] = None
+    full_resync: bool = False
 
 
 class EntraConnector:
@@ -86,15 +94,14 @@ class EntraConnector:
     Implements:
     - User listing with pagination and filtering
     - Group listing with membership expansion
-    - User sync to local database
-    - Group sync for RBAC mapping
+    - Delta-query user/group sync to local storage
     - Manager hierarchy resolution
 
     All operations are idempotent and tracked with correlation IDs.
     """
 
-    GRAPH_API_URL = "https://graph.microsoft.com/v1.0"
-    BATCH_API_URL = "https://graph.microsoft.com/v1.0/$batch"
+    GRAPH_API_URL = GRAPH_API_URL
+    BATCH_API_URL = f"{GRAPH_API_URL}/$batch"
 
     # Default fields to fetch for users
     DEFAULT_USER_FIELDS = [
@@ -132,6 +139,7 @@ class EntraConnector:
         timeout: float = 30.0,
         max_retries: int = 3,
         page_size: int = 100,
+        instance: Optional[ConnectorInstance] = None,
     ) -> None:
         """
         Initialize Entra ID connector.
@@ -141,20 +149,34 @@ class EntraConnector:
             timeout: Request timeout in seconds
             max_retries: Maximum retry attempts for transient failures
             page_size: Number of records per page for pagination
+            instance: Connector instance that owns synced users/groups and their delta links
+                (without one, sync only counts changes and keeps delta links in memory)
         """
         self._auth = auth
         self._timeout = timeout
         self._max_retries = max_retries
         self._page_size = min(page_size, 999)  # Graph API max is 999
+        self._graph = GraphClient(
+            token_provider=self._auth_header,
+            on_unauthorized=auth.refresh_token,
+            timeout=timeout,
+            max_retries=max_retries,
+            base_url=self.GRAPH_API_URL,
+        )
 
-        # Idempotency cache (correlation_id -> result)
-        self._idempotency_cache: dict[str, Any] = {}
-        self._cache_max_size = 1000
+        self._instance = instance
+        # Graph delta links keyed by resource (users, groups)
+        self._delta_links: dict[str, str] = dict(instance.delta_links) if instance else {}
 
     async def _ensure_authenticated(self) -> None:
         """Ensure we have a valid token."""
         await self._auth.authenticate()
 
+    async def _auth_header(self) -> dict[str, str]:
+        """Authorization header for the shared Graph client."""
+        await self._ensure_authenticated()
+        return self._auth.get_auth_header()
+
     async def _make_request(
         self,
         method: str,
@@ -164,7 +186,7 @@ class EntraConnector:
         correlation_id: Optional[str] = None,
     ) -> dict[str, Any]:
         """
-        Make authenticated request to Graph API.
+        Make authenticated request to Graph API over the shared pooled client.
 
         Args:
             method: HTTP method
@@ -179,63 +201,26 @@ class EntraConnector:
         Raises:
             httpx.HTTPStatusError: If request fails after retries
         """
-        await self._ensure_authenticated()
-
-        url = f"{self.GRAPH_API_URL}/{endpoint.lstrip('/')}"
-        headers = {
-            **self._auth.get_auth_header(),
-            "Content-Type": "application/json",
-            "ConsistencyLevel": "eventual",  # Required for some queries
-        }
-
-        if correlation_id:
-            headers["client-request-id"] = correlation_id
-
-        last_error: Optional[Exception] = None
-
-        for attempt in range(self._max_retries):
-            try:
-                async with httpx.AsyncClient(timeout=self._timeout) as client:
-                    response = await client.request(
-                        method=method,
-                        url=url,
-                        params=params,
-                        json=json_data,
-                        headers=headers,
-                    )
-
-                    # Handle throttling
-                    if response.status_code == 429:
-                        retry_after = int(response.headers.get("Retry-After", 30))
-                        logger.warning(f"Graph API throttled, retrying after {retry_after}s")
-                        import asyncio
-
-                        await asyncio.sleep(retry_after)
-                        continue
+        return await self._graph.request(
+            method, endpoint, params=params, json_data=json_data, correlation_id=correlation_id
+        )
 
-                    response.raise_for_status()
-                    return response.json() if response.content else {}
+    async def _batch(
+        self,
+        requests: list[dict[str, Any]],
+        correlation_id: Optional[str] = None,
+    ) -> list[GraphBatchResponse]:
+        """
+        Execute sub-requests through Graph $batch (split, retried and ordered by GraphClient).
 
-            except httpx.HTTPStatusError as e:
-                if e.response.status_code in (401, 403):
-                    # Token might be expired, refresh and retry
-                    await self._auth.refresh_token()
-                    continue
-                if e.response.status_code >= 500:
-                    last_error = e
-                    logger.warning(
-                        f"Graph API error {e.response.status_code}, attempt {attempt + 1}/{self._max_retries}"
-                    )
-                    continue
-                raise
-            except httpx.RequestError as e:
-                last_error = e
-                logger.warning(f"Request error: {e}, attempt {attempt + 1}/{self._max_retries}")
-                continue
+        Args:
+            requests: Sub-requests with 'method' and 'url'
+            correlation_id: Correlation ID for tracking
 
-        if last_error:
-            raise last_error
-        raise RuntimeError("Request failed after retries")
+        Returns:
+            Sub-responses in request order
+        """
+        return await self._graph.batch(requests, correlation_id=correlation_id)
 
     def _get_idempotency_key(self, operation: str, params: dict[str, Any]) -> str:
         """Generate idempotency key for an operation."""
@@ -420,14 +405,9 @@ class EntraConnector:
             "$top": self._page_size,
             "$count": "true",
         }
-
-        if security_only:
-            if filter_query:
-                params["$filter"] = f"({filter_query}) and securityEnabled eq true"
-            else:
-                params["$filter"] = "securityEnabled eq true"
-        elif filter_query:
-            params["$filter"] = filter_query
+        group_filter = self._group_filter(filter_query, security_only)
+        if group_filter:
+            params["$filter"] = group_filter
 
         groups: list[EntraGroup] = []
         endpoint = "groups"
@@ -435,24 +415,10 @@ class EntraConnector:
         while True:
             response = await self._make_request("GET", endpoint, params=params, correlation_id=correlation_id)
 
-            for group_data in response.get("value", []):
-                group = self._parse_group(group_data)
-
-                if include_member_count:
-                    # Get member count
-                    try:
-                        count_response = await self._make_request(
-                            "GET",
-                            f"groups/{group.id}/members/$count",
-                            correlation_id=correlation_id,
-                        )
-                        # Response is just a number
-                        group.member_count = int(count_response) if isinstance(count_response, (int, str)) else 0
-                    except Exception:
-                        # Count endpoint may fail, continue without it
-                        pass
-
-                groups.append(group)
+            page = [self._parse_group(group_data) for group_data in response.get("value", [])]
+            if include_member_count and page:
+                await self._fill_member_counts(page, correlation_id)
+            groups.extend(page)
 
             # Handle pagination
             next_link = response.get("@odata.nextLink")
@@ -465,6 +431,38 @@ class EntraConnector:
         logger.info(f"[{correlation_id}] Retrieved {len(groups)} groups from Entra ID")
         return groups
 
+    @staticmethod
+    def _group_filter(filter_query: Optional[str], security_only: bool) -> Optional[str]:
+        """Combine the caller's OData filter with the security-group restriction."""
+        if not security_only:
+            return filter_query
+        if filter_query:
+            return f"({filter_query}) and securityEnabled eq true"
+        return "securityEnabled eq true"
+
+    async def _fill_member_counts(self, page: list[EntraGroup], correlation_id: str) -> None:
+        """Set member_count on a page of groups with batched calls."""
+        try:
+            counts = await self._batch(
+                [
+                    {
+                        "method": "GET",
+                        "url": f"/groups/{group.id}/members/$count",
+                        "headers": {"ConsistencyLevel": "eventual"},
+                    }
+                    for group in page
+                ],
+                correlation_id=correlation_id,
+            )
+        except Exception as e:
+            # Count endpoint may fail, continue without it
+            logger.warning(f"[{correlation_id}] Failed to fetch group member counts: {e}")
+            return
+        for group, count in zip(page, counts):
+            # Body is just a number
+            if count.ok and isinstance(count.body, (int, str)):
+                group.member_count = int(count.body)
+
     async def get_group(
         self,
         group_id: str,
@@ -533,6 +531,68 @@ class EntraConnector:
 
         return member_ids
 
+    async def get_members_for_groups(
+        self,
+        group_ids: list[str],
+        transitive: bool = False,
+        correlation_id: Optional[str] = None,
+    ) -> dict[str, list[str]]:
+        """
+        Get user members of many groups through batched calls.
+
+        First pages for all groups are fetched together, then every group's
+        next page, until no group has more pages.
+
+        Args:
+            group_ids: Group IDs
+            transitive: Include nested group members
+            correlation_id: Correlation ID for tracking
+
+        Returns:
+            Dict of group ID to member user IDs (groups that no longer exist are omitted)
+
+        Raises:
+            GraphBatchError: If a group's members cannot be fetched
+        """
+        correlation_id = correlation_id or str(uuid.uuid4())
+        relation = "transitiveMembers" if transitive else "members"
+
+        members: dict[str, list[str]] = {}
+        pending = {
+            group_id: f"/groups/{group_id}/{relation}?$select=id&$top={self._page_size}" for group_id in group_ids
+        }
+
+        while pending:
+            batch_ids = list(pending)
+            responses = await self._batch(
+                [{"method": "GET", "url": pending[group_id]} for group_id in batch_ids],
+                correlation_id=correlation_id,
+            )
+            pending = {}
+
+            for group_id, response in zip(batch_ids, responses):
+                if response.status == 404:
+                    logger.warning(f"[{correlation_id}] Group {group_id} not found while expanding members")
+                    continue
+                if not response.ok:
+                    raise GraphBatchError(
+                        f"Failed to get members of group {group_id}: HTTP {response.status}", response
+                    )
+
+                body = response.body or {}
+                members.setdefault(group_id, []).extend(
+                    member["id"]
+                    for member in body.get("value", [])
+                    if member.get("@odata.type") == "#microsoft.graph.user"
+                )
+
+                next_link = body.get("@odata.nextLink")
+                if next_link:
+                    pending[group_id] = next_link
+
+        logger.info(f"[{correlation_id}] Expanded members for {len(members)} groups")
+        return members
+
     def _parse_group(self, data: dict[str, Any]) -> EntraGroup:
         """Parse group data from Graph API response."""
         created_dt = None
@@ -557,119 +617,72 @@ class EntraConnector:
 
     async def sync_users(
         self,
-        filter_query: Optional[str] = None,
         include_disabled: bool = False,
         correlation_id: Optional[str] = None,
     ) -> SyncResult:
         """
-        Sync users from Entra ID to local database.
+        Sync users from Entra ID to local storage with a Graph delta query.
 
-        This is an idempotent operation - running it multiple times
-        with the same parameters produces the same result.
+        The first run (or a run after the delta token expired) walks all users;
+        later runs only fetch users changed or removed since the stored
+        deltaLink. Failed runs keep the previous deltaLink, so re-running is
+        safe.
 
         Args:
-            filter_query: Optional filter for users to sync
-            include_disabled: Include disabled accounts
+            include_disabled: Keep disabled accounts (otherwise they are removed locally)
             correlation_id: Correlation ID for tracking
 
         Returns:
             SyncResult with operation details
         """
-        correlation_id = correlation_id or str(uuid.uuid4())
-        started_at = datetime.now(timezone.utc)
-
-        # Check idempotency cache
-        idempotency_key = self._get_idempotency_key(
-            "sync_users", {"filter": filter_query, "include_disabled": include_disabled}
+        fields = [name for name in self.DEFAULT_USER_FIELDS if name != "signInActivity"]
+        return await self._delta_sync(
+            "users",
+            fields,
+            keep=lambda item: include_disabled or item.get("accountEnabled") is not False,
+            operation="sync_users",
+            correlation_id=correlation_id,
         )
-        if idempotency_key in self._idempotency_cache:
-            logger.info(f"[{correlation_id}] Returning cached sync result")
-            return self._idempotency_cache[idempotency_key]
-
-        logger.info(f"[{correlation_id}] Starting user sync from Entra ID")
-
-        # Build filter
-        if not include_disabled:
-            base_filter = "accountEnabled eq true"
-            if filter_query:
-                filter_query = f"({filter_query}) and {base_filter}"
-            else:
-                filter_query = base_filter
 
-        errors: list[dict[str, Any]] = []
-        created = 0
-        updated = 0
-
-        try:
-            users = await self.list_users(
-                filter_query=filter_query,
-                include_sign_in_activity=True,
-                correlation_id=correlation_id,
-            )
-
-            # In a real implementation, this would sync to the local database
-            # For now, we just count the users
-            for user in users:
-                # Placeholder for actual database sync logic
-                # This would call UserProfile.objects.update_or_create(...)
-                updated += 1
-
-            result = SyncResult(
-                success=True,
-                correlation_id=correlation_id,
-                operation="sync_users",
-                records_processed=len(users),
-                records_created=created,
-                records_updated=updated,
-                records_deleted=0,
-                errors=errors,
-                started_at=started_at,
-                completed_at=datetime.now(timezone.utc),
-            )
+    async def sync_groups(
+        self,
+        security_only: bool = True,
+        correlation_id: Optional[str] = None,
+    ) -> SyncResult:
+        """
+        Sync groups from Entra ID to local storage with a Graph delta query.
 
-        except Exception as e:
-            logger.exception(f"[{correlation_id}] User sync failed: {e}")
-            result = SyncResult(
-                success=False,
-                correlation_id=correlation_id,
-                operation="sync_users",
-                records_processed=0,
-                records_created=0,
-                records_updated=0,
-                records_deleted=0,
-                errors=[{"message": str(e), "type": type(e).__name__}],
-                started_at=started_at,
-                completed_at=datetime.now(timezone.utc),
-            )
+        Args:
+            security_only: Only keep security groups (others are removed locally)
+            correlation_id: Correlation ID for tracking
 
-        result.duration_seconds = (
-            (result.completed_at - result.started_at).total_seconds() if result.completed_at else None
+        Returns:
+            SyncResult with operation details
+        """
+        return await self._delta_sync(
+            "groups",
+            self.DEFAULT_GROUP_FIELDS,
+            keep=lambda item: not security_only or item.get("securityEnabled") is not False,
+            operation="sync_groups",
+            correlation_id=correlation_id,
         )
 
-        # Cache result
-        if len(self._idempotency_cache) >= self._cache_max_size:
-            # Remove oldest entries
-            keys_to_remove = list(self._idempotency_cache.keys())[: self._cache_max_size // 2]
-            for key in keys_to_remove:
-                del self._idempotency_cache[key]
-        self._idempotency_cache[idempotency_key] = result
-
-        return result
-
-    async def sync_groups(
+    async def _delta_sync(
         self,
-        filter_query: Optional[str] = None,
-        security_only: bool = True,
+        resource: str,
+        select_fields: list[str],
+        keep: Callable[[dict[str, Any]], bool],
+        operation: str,
         correlation_id: Optional[str] = None,
     ) -> SyncResult:
         """
-        Sync groups from Entra ID to local database.
-
-        This is an idempotent operation.
+        Run one delta sync for a resource, falling back to a full resync if the delta token expired.
 
         Args:
-            filter_query: Optional filter for groups to sync
-            security_only: Only sync security groups
+            resource: 'users' or 'groups'
+            select_fields: Properties to request on the initial delta query
+            keep: Predicate for changed objects; objects failing it are removed locally
+            operation: Operation name for the result
             correlation_id: Correlation ID for tracking
 
         Returns:
@@ -677,51 +690,52 @@ class EntraConnector:
         """
         correlation_id = correlation_id or str(uuid.uuid4())
         started_at = datetime.now(timezone.utc)
+        delta_link = self._delta_links.get(resource)
 
-        idempotency_key = self._get_idempotency_key(
-            "sync_groups", {"filter": filter_query, "security_only": security_only}
-        )
-        if idempotency_key in self._idempotency_cache:
-            logger.info(f"[{correlation_id}] Returning cached group sync result")
-            return self._idempotency_cache[idempotency_key]
-
-        logger.info(f"[{correlation_id}] Starting group sync from Entra ID")
-
-        errors: list[dict[str, Any]] = []
-        created = 0
-        updated = 0
+        logger.info(f"[{correlation_id}] Starting {'incremental' if delta_link else 'full'} {resource} sync")
 
         try:
-            groups = await self.list_groups(
-                filter_query=filter_query,
-                security_only=security_only,
-                include_member_count=True,
-                correlation_id=correlation_id,
-            )
+            try:
+                counts, new_link = await self._walk_delta(
+                    resource, select_fields, keep, delta_link, started_at, correlation_id
+                )
+            except httpx.HTTPStatusError as e:
+                if not delta_link or not self._is_delta_expired(e):
+                    raise
+                logger.warning(f"[{correlation_id}] {resource} delta token expired, running full resync")
+                delta_link = None
+                await self._store_delta_link(resource, None)
+                counts, new_link = await self._walk_delta(
+                    resource, select_fields, keep, None, started_at, correlation_id
+                )
+
+            if delta_link is None and self._instance is not None:
+                # A full walk rewrote every live object; whatever it did not touch is gone
+                counts["deleted"] += await sync_to_async(directory.prune_unseen)(self._instance, resource, started_at)
 
-            for group in groups:
-                # Placeholder for actual database sync logic
-                updated += 1
+            if new_link:
+                await self._store_delta_link(resource, new_link)
 
             result = SyncResult(
                 success=True,
                 correlation_id=correlation_id,
-                operation="sync_groups",
-                records_processed=len(groups),
-                records_created=created,
-                records_updated=updated,
-                records_deleted=0,
-                errors=errors,
+                operation=operation,
+                records_processed=counts["processed"],
+                records_created=counts["created"],
+                records_updated=counts["updated"],
+                records_deleted=counts["deleted"],
+                errors=[],
                 started_at=started_at,
                 completed_at=datetime.now(timezone.utc),
+                full_resync=delta_link is None,
             )
 
         except Exception as e:
-            logger.exception(f"[{correlation_id}] Group sync failed: {e}")
+            logger.exception(f"[{correlation_id}] {resource} sync failed: {e}")
             result = SyncResult(
                 success=False,
                 correlation_id=correlation_id,
-                operation="sync_groups",
+                operation=operation,
                 records_processed=0,
                 records_created=0,
                 records_updated=0,
@@ -729,15 +743,92 @@ class EntraConnector:
                 errors=[{"message": str(e), "type": type(e).__name__}],
                 started_at=started_at,
                 completed_at=datetime.now(timezone.utc),
+                full_resync=delta_link is None,
             )
 
         result.duration_seconds = (
             (result.completed_at - result.started_at).total_seconds() if result.completed_at else None
         )
-        self._idempotency_cache[idempotency_key] = result
-
         return result
 
+    async def _walk_delta(
+        self,
+        resource: str,
+        select_fields: list[str],
+        keep: Callable[[dict[str, Any]], bool],
+        delta_link: Optional[str],
+        synced_at: datetime,
+        correlation_id: str,
+    ) -> tuple[dict[str, int], Optional[str]]:
+        """
+        Follow a delta query page by page, applying each page as it arrives.
+
+        Returns:
+            Tuple of (counts, new deltaLink)
+        """
+        counts = {"processed": 0, "created": 0, "updated": 0, "deleted": 0}
+
+        if delta_link:
+            endpoint = delta_link.replace(self.GRAPH_API_URL + "/", "")
+            params: Optional[dict[str, Any]] = None
+        else:
+            endpoint = f"{resource}/delta"
+            params = {"$select": ",".join(select_fields)}
+
+        while True:
+            response = await self._make_request("GET", endpoint, params=params, correlation_id=correlation_id)
+
+            changed: list[dict[str, Any]] = []
+            removed: list[str] = []
+            for item in response.get("value", []):
+                if "@removed" in item or not keep(item):
+                    removed.append(item["id"])
+                else:
+                    changed.append(item)
+
+            for key, value in (await self._apply_delta_page(resource, changed, removed, synced_at)).items():
+                counts[key] += value
+            counts["processed"] += len(changed) + len(removed)
+
+            next_link = response.get("@odata.nextLink")
+            if not next_link:
+                return counts, response.get("@odata.deltaLink")
+
+            endpoint = next_link.replace(self.GRAPH_API_URL + "/", "")
+            params = None
+
+    async def _apply_delta_page(
+        self,
+        resource: str,
+        changed: list[dict[str, Any]],
+        removed: list[str],
+        synced_at: datetime,
+    ) -> dict[str, int]:
+        """Write one delta page to local storage (counts only when no connector instance is bound)."""
+        if self._instance is None:
+            return {"created": 0, "updated": len(changed), "deleted": len(removed)}
+        return await sync_to_async(directory.apply_changes)(self._instance, resource, changed, removed, synced_at)
+
+    async def _store_delta_link(self, resource: str, delta_link: Optional[str]) -> None:
+        """Remember the delta link, persisting it on the connector instance if bound."""
+        if delta_link:
+            self._delta_links[resource] = delta_link
+        else:
+            self._delta_links.pop(resource, None)
+        if self._instance is not None:
+            await sync_to_async(directory.save_delta_link)(self._instance, resource, delta_link)
+
+    @staticmethod
+    def _is_delta_expired(error: httpx.HTTPStatusError) -> bool:
+        """Whether Graph rejected a delta token as expired or unknown."""
+        if error.response.status_code == 410:
+            return True
+        try:
+            code = error.response.json().get("error", {}).get("code", "")
+        except ValueError:
+            return False
+        return code in DELTA_RESYNC_ERROR_CODES
+
     # ========================================================================
     # HEALTH CHECK
     # ========================================================================
@@ -0,0 +1,152 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Local storage for Entra ID users and groups synced through Graph delta queries.
+
+A delta page carries changed objects and '@removed' tombstones. Changed
+objects may hold only the properties that changed, so apply_changes()
+groups them by property set and writes each group with one bulk
+INSERT ... ON CONFLICT (connector, object_id) DO UPDATE that touches only
+those columns; tombstones are deleted in one statement. Every written row
+is stamped with the run's synced_at so a full resync can drop objects it
+no longer saw with prune_unseen().
+"""
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Optional
+
+from django.db import transaction
+
+from apps.connectors.models import ConnectorInstance, DirectoryGroup, DirectoryUser
+
+logger = logging.getLogger(__name__)
+
+# Graph property -> model field
+USER_FIELD_MAP = {
+    "userPrincipalName": "user_principal_name",
+    "displayName": "display_name",
+    "givenName": "given_name",
+    "surname": "surname",
+    "mail": "mail",
+    "jobTitle": "job_title",
+    "department": "department",
+    "officeLocation": "office_location",
+    "accountEnabled": "account_enabled",
+}
+
+GROUP_FIELD_MAP = {
+    "displayName": "display_name",
+    "description": "description",
+    "mail": "mail",
+    "mailEnabled": "mail_enabled",
+    "securityEnabled": "security_enabled",
+    "groupTypes": "group_types",
+    "membershipRule": "membership_rule",
+}
+
+RESOURCES = {
+    "users": (DirectoryUser, USER_FIELD_MAP),
+    "groups": (DirectoryGroup, GROUP_FIELD_MAP),
+}
+
+
+def _row(model, field_map: dict[str, str], item: dict[str, Any], keys: tuple[str, ...]) -> dict[str, Any]:
+    """Model field values for the Graph properties present on an item (nulls become field defaults)."""
+    values = {}
+    for key in keys:
+        name = field_map[key]
+        value = item[key]
+        values[name] = model._meta.get_field(name).get_default() if value is None else value
+    return values
+
+
+def apply_changes(
+    instance: ConnectorInstance,
+    resource: str,
+    changed: list[dict[str, Any]],
+    removed_ids: list[str],
+    synced_at: datetime,
+) -> dict[str, int]:
+    """
+    Apply one delta page to local storage.
+
+    Args:
+        instance: Connector instance owning the rows
+        resource: 'users' or 'groups'
+        changed: Changed Graph objects (each with at least 'id')
+        removed_ids: Object IDs to delete
+        synced_at: Start of the current sync run
+
+    Returns:
+        Dict with 'created', 'updated' and 'deleted' counts
+    """
+    model, field_map = RESOURCES[resource]
+
+    # Later duplicates within a page win
+    items = {item["id"]: item for item in changed}
+    existing = set(
+        model.objects.filter(connector=instance, object_id__in=list(items)).values_list("object_id", flat=True)
+    )
+
+    by_keys: dict[tuple[str, ...], list[dict[str, Any]]] = defaultdict(list)
+    for item in items.values():
+        by_keys[tuple(key for key in field_map if key in item)].append(item)
+
+    deleted = 0
+    with transaction.atomic():
+        for keys, group in by_keys.items():
+            model.objects.bulk_create(
+                [
+                    model(
+                        connector=instance,
+                        object_id=item["id"],
+                        synced_at=synced_at,
+                        **_row(model, field_map, item, keys),
+                    )
+                    for item in group
+                ],
+                update_conflicts=True,
+                unique_fields=["connector", "object_id"],
+                update_fields=[field_map[key] for key in keys] + ["synced_at", "updated_at"],
+            )
+        if removed_ids:
+            deleted, _ = model.objects.filter(connector=instance, object_id__in=removed_ids).delete()
+
+    created = len(set(items) - existing)
+    return {"created": created, "updated": len(items) - created, "deleted": deleted}
+
+
+def prune_unseen(instance: ConnectorInstance, resource: str, synced_at: datetime) -> int:
+    """
+    Delete rows not written since synced_at (objects a full resync no longer saw).
+
+    Returns:
+        Number of rows deleted
+    """
+    model, _ = RESOURCES[resource]
+    deleted, _ = model.objects.filter(connector=instance, synced_at__lt=synced_at).delete()
+    return deleted
+
+
+def save_delta_link(instance: ConnectorInstance, resource: str, delta_link: Optional[str]) -> None:
+    """
+    Persist (or clear, when None) the delta link for a resource.
+
+    The row is locked and re-read so concurrent user and group syncs on the
+    same instance do not overwrite each other's links.
+    """
+    with transaction.atomic():
+        links = (
+            ConnectorInstance.objects.select_for_update()
+            .filter(pk=instance.pk)
+            .values_list("delta_links", flat=True)
+            .first()
+        )
+        links = dict(links or {})
+        if delta_link:
+            links[resource] = delta_link
+        else:
+            links.pop(resource, None)
+        ConnectorInstance.objects.filter(pk=instance.pk).update(delta_links=links)
+    instance.delta_links = links
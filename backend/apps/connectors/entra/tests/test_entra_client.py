@@ -3,10 +3,12 @@
 """Tests for Entra ID connector client."""
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
 
 from apps.connectors.entra.auth import EntraAuth
-from apps.connectors.entra.client import EntraConnector, EntraGroup, EntraUser
+from apps.connectors.entra.client import EntraConnector
+from apps.connectors.graph import GraphBatchError, GraphBatchResponse
 
 
 @pytest.fixture
@@ -226,6 +228,30 @@ class TestEntraConnectorListGroups:
             call_args = mock_request.call_args
             assert "securityEnabled eq true" in call_args.kwargs["params"]["$filter"]
 
+    @pytest.mark.asyncio
+    async def test_list_groups_batches_member_counts(self, connector):
+        """Test member counts for a page come from one batched call."""
+        mock_response = {
+            "value": [{"id": f"group-{i}", "displayName": f"G{i}"} for i in range(3)],
+        }
+        counts = [GraphBatchResponse(id=str(i), status=200, body=i * 10) for i in range(3)]
+
+        with (
+            patch.object(connector, "_make_request", new_callable=AsyncMock) as mock_request,
+            patch.object(connector, "_batch", new_callable=AsyncMock) as mock_batch,
+        ):
+            mock_request.return_value = mock_response
+            mock_batch.return_value = counts
+
+            groups = await connector.list_groups()
+
+            assert mock_request.call_count == 1
+            mock_batch.assert_awaited_once()
+            assert [r["url"] for r in mock_batch.call_args.args[0]] == [
+                f"/groups/group-{i}/members/$count" for i in range(3)
+            ]
+            assert [g.member_count for g in groups] == [0, 10, 20]
+
 
 class TestEntraConnectorGetGroup:
     """Tests for get_group method."""
@@ -304,93 +330,214 @@ class TestEntraConnectorGetGroupMembers:
             assert "transitiveMembers" in call_args.args[1]
 
 
+class TestEntraConnectorGetMembersForGroups:
+    """Tests for batched group membership expansion."""
+
+    @pytest.mark.asyncio
+    async def test_expands_all_groups_and_follows_next_links(self, connector):
+        """Test first pages are batched together and next pages follow in later batches."""
+        user = "#microsoft.graph.user"
+        first = [
+            GraphBatchResponse(
+                id="0",
+                status=200,
+                body={
+                    "value": [{"@odata.type": user, "id": "u1"}],
+                    "@odata.nextLink": "https://graph.microsoft.com/v1.0/groups/g1/members?$skiptoken=x",
+                },
+            ),
+            GraphBatchResponse(
+                id="1",
+                status=200,
+                body={"value": [{"@odata.type": user, "id": "u2"}, {"@odata.type": "#microsoft.graph.group"}]},
+            ),
+            GraphBatchResponse(id="2", status=404),
+        ]
+        second = [GraphBatchResponse(id="0", status=200, body={"value": [{"@odata.type": user, "id": "u3"}]})]
+
+        with patch.object(connector, "_batch", new_callable=AsyncMock) as mock_batch:
+            mock_batch.side_effect = [first, second]
+
+            members = await connector.get_members_for_groups(["g1", "g2", "gone"])
+
+            assert members == {"g1": ["u1", "u3"], "g2": ["u2"]}
+            assert mock_batch.call_count == 2
+            assert len(mock_batch.call_args_list[0].args[0]) == 3
+            assert mock_batch.call_args_list[1].args[0] == [
+                {"method": "GET", "url": "https://graph.microsoft.com/v1.0/groups/g1/members?$skiptoken=x"}
+            ]
+
+    @pytest.mark.asyncio
+    async def test_transitive_uses_transitive_members(self, connector):
+        """Test transitive expansion requests transitiveMembers."""
+        with patch.object(connector, "_batch", new_callable=AsyncMock) as mock_batch:
+            mock_batch.return_value = [GraphBatchResponse(id="0", status=200, body={"value": []})]
+
+            await connector.get_members_for_groups(["g1"], transitive=True)
+
+            assert "/groups/g1/transitiveMembers" in mock_batch.call_args.args[0][0]["url"]
+
+    @pytest.mark.asyncio
+    async def test_failed_group_raises(self, connector):
+        """Test a permanently failed sub-request raises GraphBatchError."""
+        with patch.object(connector, "_batch", new_callable=AsyncMock) as mock_batch:
+            mock_batch.return_value = [GraphBatchResponse(id="0", status=403)]
+
+            with pytest.raises(GraphBatchError) as exc_info:
+                await connector.get_members_for_groups(["g1"])
+
+            assert exc_info.value.status_code == 403
+
+
+def _http_error(status, body=None):
+    """Build an httpx.HTTPStatusError for a Graph response."""
+    request = httpx.Request("GET", "https://graph.microsoft.com/v1.0/users/delta")
+    response = httpx.Response(status, json=body or {}, request=request)
+    return httpx.HTTPStatusError(f"HTTP {status}", request=request, response=response)
+
+
+DELTA_LINK = "https://graph.microsoft.com/v1.0/users/delta?$deltatoken=tok-1"
+
+
 class TestEntraConnectorSyncUsers:
-    """Tests for sync_users method."""
+    """Tests for delta-query sync_users."""
 
     @pytest.mark.asyncio
     async def test_sync_users_success(self, connector):
-        """Test successful user sync."""
-        mock_users = [
-            EntraUser(
-                id="user-1",
-                user_principal_name="u1@ex.com",
-                display_name="U1",
-                given_name="User",
-                surname="One",
-                mail="u1@ex.com",
-                job_title=None,
-                department=None,
-                office_location=None,
-                mobile_phone=None,
-                account_enabled=True,
-                created_datetime=None,
-            )
+        """Test the first sync walks users/delta and stores the deltaLink."""
+        pages = [
+            {
+                "value": [{"id": "user-1", "userPrincipalName": "u1@ex.com", "accountEnabled": True}],
+                "@odata.nextLink": "https://graph.microsoft.com/v1.0/users/delta?$skiptoken=s1",
+            },
+            {"value": [{"id": "user-2", "accountEnabled": True}], "@odata.deltaLink": DELTA_LINK},
         ]
 
-        with patch.object(connector, "list_users", new_callable=AsyncMock) as mock_list:
-            mock_list.return_value = mock_users
+        with patch.object(connector, "_make_request", new_callable=AsyncMock) as mock_request:
+            mock_request.side_effect = pages
 
             result = await connector.sync_users()
 
             assert result.success is True
-            assert result.records_processed == 1
+            assert result.records_processed == 2
             assert result.operation == "sync_users"
+            assert result.full_resync is True
+            first_call = mock_request.call_args_list[0]
+            assert first_call.args[1] == "users/delta"
+            assert "signInActivity" not in first_call.kwargs["params"]["$select"]
+            assert mock_request.call_args_list[1].args[1] == "users/delta?$skiptoken=s1"
+            assert connector._delta_links["users"] == DELTA_LINK
 
     @pytest.mark.asyncio
-    async def test_sync_users_idempotent(self, connector):
-        """Test that sync_users is idempotent."""
-        mock_users = []
+    async def test_sync_users_incremental(self, connector):
+        """Test a second sync resumes from the deltaLink and applies removals."""
+        with patch.object(connector, "_make_request", new_callable=AsyncMock) as mock_request:
+            mock_request.side_effect = [
+                {"value": [], "@odata.deltaLink": DELTA_LINK},
+                {
+                    "value": [
+                        {"id": "user-1", "displayName": "Renamed"},
+                        {"id": "user-2", "@removed": {"reason": "deleted"}},
+                        {"id": "user-3", "accountEnabled": False},
+                    ],
+                    "@odata.deltaLink": "https://graph.microsoft.com/v1.0/users/delta?$deltatoken=tok-2",
+                },
+            ]
 
-        with patch.object(connector, "list_users", new_callable=AsyncMock) as mock_list:
-            mock_list.return_value = mock_users
+            await connector.sync_users()
+            result = await connector.sync_users()
+
+            assert mock_request.call_args_list[1].args[1] == "users/delta?$deltatoken=tok-1"
+            assert mock_request.call_args_list[1].kwargs["params"] is None
+            assert result.full_resync is False
+            assert result.records_updated == 1
+            # Tombstones and accounts that were disabled are both removed locally
+            assert result.records_deleted == 2
+            assert connector._delta_links["users"].endswith("tok-2")
+
+    @pytest.mark.asyncio
+    async def test_sync_users_expired_token_falls_back_to_full_resync(self, connector):
+        """Test a 410 on the stored deltaLink restarts from a full delta walk."""
+        connector._delta_links["users"] = DELTA_LINK
+
+        with patch.object(connector, "_make_request", new_callable=AsyncMock) as mock_request:
+            mock_request.side_effect = [
+                _http_error(410, {"error": {"code": "resyncRequired"}}),
+                {"value": [{"id": "user-1"}], "@odata.deltaLink": DELTA_LINK},
+            ]
 
-            result1 = await connector.sync_users(filter_query="test")
-            result2 = await connector.sync_users(filter_query="test")
+            result = await connector.sync_users()
 
-            # Second call should return cached result
-            assert mock_list.call_count == 1
-            assert result1.correlation_id == result2.correlation_id
+            assert result.success is True
+            assert result.full_resync is True
+            assert mock_request.call_args_list[1].args[1] == "users/delta"
+            assert connector._delta_links["users"] == DELTA_LINK
 
     @pytest.mark.asyncio
-    async def test_sync_users_error(self, connector):
-        """Test sync_users handles errors."""
-        with patch.object(connector, "list_users", new_callable=AsyncMock) as mock_list:
-            mock_list.side_effect = Exception("API Error")
+    async def test_sync_users_keeps_delta_link_on_failure(self, connector):
+        """Test a failed walk reports the error and keeps the previous deltaLink."""
+        connector._delta_links["users"] = DELTA_LINK
+
+        with patch.object(connector, "_make_request", new_callable=AsyncMock) as mock_request:
+            mock_request.side_effect = Exception("API Error")
 
             result = await connector.sync_users()
 
             assert result.success is False
             assert len(result.errors) == 1
             assert "API Error" in result.errors[0]["message"]
+            assert connector._delta_links["users"] == DELTA_LINK
+
+    @pytest.mark.asyncio
+    async def test_sync_users_writes_to_connector_instance(self, mock_auth):
+        """Test pages are applied and the deltaLink persisted when an instance is bound."""
+        instance = MagicMock(delta_links={})
+        connector = EntraConnector(auth=mock_auth, instance=instance)
+
+        with (
+            patch.object(connector, "_make_request", new_callable=AsyncMock) as mock_request,
+            patch("apps.connectors.entra.client.directory") as store,
+        ):
+            mock_request.return_value = {
+                "value": [{"id": "user-1"}, {"id": "user-2", "@removed": {"reason": "changed"}}],
+                "@odata.deltaLink": DELTA_LINK,
+            }
+            store.apply_changes.return_value = {"created": 1, "updated": 0, "deleted": 1}
+            store.prune_unseen.return_value = 3
+
+            result = await connector.sync_users()
+
+            args = store.apply_changes.call_args.args
+            assert args[:4] == (instance, "users", [{"id": "user-1"}], ["user-2"])
+            store.prune_unseen.assert_called_once_with(instance, "users", result.started_at)
+            store.save_delta_link.assert_called_once_with(instance, "users", DELTA_LINK)
+            assert result.records_created == 1
+            assert result.records_deleted == 4
 
 
 class TestEntraConnectorSyncGroups:
-    """Tests for sync_groups method."""
+    """Tests for delta-query sync_groups."""
 
     @pytest.mark.asyncio
     async def test_sync_groups_success(self, connector):
-        """Test successful group sync."""
-        mock_groups = [
-            EntraGroup(
-                id="group-1",
-                display_name="Engineering",
-                description=None,
-                mail=None,
-                mail_enabled=False,
-                security_enabled=True,
-                group_types=[],
-                created_datetime=None,
-            )
-        ]
-
-        with patch.object(connector, "list_groups", new_callable=AsyncMock) as mock_list:
-            mock_list.return_value = mock_groups
+        """Test groups/delta is walked and non-security groups are removed locally."""
+        with patch.object(connector, "_make_request", new_callable=AsyncMock) as mock_request:
+            mock_request.return_value = {
+                "value": [
+                    {"id": "group-1", "displayName": "Engineering", "securityEnabled": True},
+                    {"id": "group-2", "displayName": "Newsletter", "securityEnabled": False},
+                ],
+                "@odata.deltaLink": "https://graph.microsoft.com/v1.0/groups/delta?$deltatoken=g1",
+            }
 
             result = await connector.sync_groups()
 
             assert result.success is True
-            assert result.records_processed == 1
+            assert result.records_processed == 2
+            assert result.records_updated == 1
+            assert result.records_deleted == 1
             assert result.operation == "sync_groups"
+            assert mock_request.call_args.args[1] == "groups/delta"
 
 
 class TestEntraConnectorTestConnection:
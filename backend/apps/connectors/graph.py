@@ -0,0 +1,262 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Shared Microsoft Graph API client for the Entra ID and Intune connectors.
+
+Requests go through the pooled async HTTP client (see http_pool), so every
+connector talking to Graph on the same event loop reuses one set of
+keep-alive connections instead of opening a client (and TLS session) per
+call.
+
+batch() packs independent GET/POST calls into Graph JSON $batch requests:
+sub-requests are split into calls of at most MAX_BATCH_SIZE, sub-requests
+that come back throttled (429) or with a transient server error are retried
+on their own after the longest Retry-After among them, and responses are
+returned in request order.
+"""
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional
+
+import httpx
+
+from apps.connectors.http_pool import get_async_client
+
+logger = logging.getLogger(__name__)
+
+GRAPH_API_URL = "https://graph.microsoft.com/v1.0"
+
+# Graph rejects $batch payloads with more than 20 sub-requests
+MAX_BATCH_SIZE = 20
+# $batch calls in flight at once for one batch() call
+MAX_CONCURRENT_BATCHES = 4
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+@dataclass
+class GraphBatchResponse:
+    """One sub-response of a $batch call."""
+
+    id: str
+    status: int
+    headers: dict[str, str] = field(default_factory=dict)
+    body: Any = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the sub-request succeeded."""
+        return 200 <= self.status < 300
+
+
+class GraphBatchError(Exception):
+    """Raised by callers when a batched sub-request fails permanently."""
+
+    def __init__(self, message: str, response: GraphBatchResponse):
+        super().__init__(message)
+        self.response = response
+        self.status_code = response.status
+
+
+def _retry_after(headers: dict[str, str], attempt: int) -> float:
+    """Seconds to wait before retrying, from Retry-After or exponential backoff."""
+    for name, value in headers.items():
+        if name.lower() == "retry-after":
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                break
+    return float(2**attempt)
+
+
+class GraphClient:
+    """
+    Async Microsoft Graph client with retries and $batch support.
+
+    Authentication is supplied by the owning connector: token_provider
+    returns the Authorization header for each attempt, and on_unauthorized
+    (if given) is awaited before retrying a 401/403.
+    """
+
+    def __init__(
+        self,
+        token_provider: Callable[[], Awaitable[dict[str, str]]],
+        on_unauthorized: Optional[Callable[[], Awaitable[Any]]] = None,
+        timeout: float = 30.0,
+        max_retries: int = 3,
+        base_url: str = GRAPH_API_URL,
+    ) -> None:
+        """
+        Initialize Graph client.
+
+        Args:
+            token_provider: Coroutine function returning auth headers
+            on_unauthorized: Coroutine function refreshing credentials after a 401/403
+            timeout: Request timeout in seconds
+            max_retries: Maximum attempts per request (and retries per batched sub-request)
+            base_url: Graph API root
+        """
+        self._token_provider = token_provider
+        self._on_unauthorized = on_unauthorized
+        self._timeout = timeout
+        self._max_retries = max_retries
+        self.base_url = base_url.rstrip("/")
+
+    def _client(self) -> httpx.AsyncClient:
+        return get_async_client(("graph", self.base_url), timeout=self._timeout)
+
+    def relative_url(self, url: str) -> str:
+        """Strip the API root from an absolute Graph URL (e.g. an @odata.nextLink)."""
+        if url.startswith(self.base_url):
+            url = url[len(self.base_url) :]
+        return "/" + url.lstrip("/")
+
+    async def _headers(self, correlation_id: Optional[str]) -> dict[str, str]:
+        headers = {
+            **(await self._token_provider()),
+            "Content-Type": "application/json",
+            "ConsistencyLevel": "eventual",  # Required for some queries
+        }
+        if correlation_id:
+            headers["client-request-id"] = correlation_id
+        return headers
+
+    async def request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[dict[str, Any]] = None,
+        json_data: Optional[dict[str, Any]] = None,
+        correlation_id: Optional[str] = None,
+    ) -> Any:
+        """
+        Make authenticated request to Graph API.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint (relative to base_url)
+            params: Query parameters
+            json_data: JSON body
+            correlation_id: Correlation ID for tracking
+
+        Returns:
+            Decoded JSON response ({} for empty bodies)
+
+        Raises:
+            httpx.HTTPStatusError: If request fails after retries
+        """
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        last_error: Optional[Exception] = None
+
+        for attempt in range(self._max_retries):
+            try:
+                response = await self._client().request(
+                    method=method,
+                    url=url,
+                    params=params,
+                    json=json_data,
+                    headers=await self._headers(correlation_id),
+                )
+
+                # Handle throttling
+                if response.status_code == 429:
+                    retry_after = _retry_after(dict(response.headers), attempt)
+                    logger.warning(f"Graph API throttled, retrying after {retry_after}s")
+                    await asyncio.sleep(retry_after)
+                    continue
+
+                response.raise_for_status()
+                return response.json() if response.content else {}
+
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code in (401, 403) and self._on_unauthorized:
+                    # Token might be expired, refresh and retry
+                    await self._on_unauthorized()
+                    continue
+                if e.response.status_code >= 500:
+                    last_error = e
+                    logger.warning(
+                        f"Graph API error {e.response.status_code}, attempt {attempt + 1}/{self._max_retries}"
+                    )
+                    continue
+                raise
+            except httpx.RequestError as e:
+                last_error = e
+                logger.warning(f"Request error: {e}, attempt {attempt + 1}/{self._max_retries}")
+                continue
+
+        if last_error:
+            raise last_error
+        raise RuntimeError("Request failed after retries")
+
+    async def batch(
+        self,
+        requests: list[dict[str, Any]],
+        correlation_id: Optional[str] = None,
+    ) -> list[GraphBatchResponse]:
+        """
+        Execute sub-requests through Graph JSON $batch.
+
+        Args:
+            requests: Sub-requests with 'method' and 'url' (relative to base_url),
+                plus optional 'body' and 'headers'
+            correlation_id: Correlation ID for tracking
+
+        Returns:
+            One GraphBatchResponse per sub-request, in request order
+        """
+        sub_requests = {
+            str(index): {"id": str(index), **request, "url": self.relative_url(request["url"])}
+            for index, request in enumerate(requests)
+        }
+        results: dict[str, GraphBatchResponse] = {}
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_BATCHES)
+
+        async def send(chunk: list[str]) -> list[GraphBatchResponse]:
+            async with semaphore:
+                response = await self.request(
+                    "POST",
+                    "$batch",
+                    json_data={"requests": [sub_requests[request_id] for request_id in chunk]},
+                    correlation_id=correlation_id,
+                )
+            return [
+                GraphBatchResponse(
+                    id=str(sub["id"]),
+                    status=int(sub.get("status", 0)),
+                    headers=sub.get("headers") or {},
+                    body=sub.get("body"),
+                )
+                for sub in response.get("responses", [])
+            ]
+
+        pending = list(sub_requests)
+        attempt = 0
+        while pending:
+            chunks = [pending[i : i + MAX_BATCH_SIZE] for i in range(0, len(pending), MAX_BATCH_SIZE)]
+            for responses in await asyncio.gather(*(send(chunk) for chunk in chunks)):
+                for response in responses:
+                    results[response.id] = response
+
+            retryable = [
+                request_id
+                for request_id in pending
+                if request_id not in results or results[request_id].status in RETRYABLE_STATUSES
+            ]
+            if not retryable or attempt >= self._max_retries:
+                break
+
+            delay = max(_retry_after(results[r].headers, attempt) if r in results else 2**attempt for r in retryable)
+            logger.warning(
+                f"Graph $batch: retrying {len(retryable)} of {len(sub_requests)} sub-requests after {delay}s",
+                extra={"correlation_id": correlation_id, "attempt": attempt + 1},
+            )
+            await asyncio.sleep(delay)
+            pending = retryable
+            attempt += 1
+
+        return [
+            results.get(request_id, GraphBatchResponse(id=request_id, status=503, body={"error": "no response"}))
+            for request_id in sub_requests
+        ]
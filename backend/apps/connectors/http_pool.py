@@ -0,0 +1,99 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Shared pooled async HTTP clients for execution-plane connectors.
+
+Connector operations are coroutines, so their HTTP calls must be awaited
+rather than made with a blocking requests.Session. Auth modules ask this
+module for an httpx.AsyncClient keyed by their server and credentials;
+every connector instance with the same key shares one client (and its
+connection pool) per event loop. Each client talks to a single host, so
+its connection limit is the per-host limit. Idle connections are kept
+alive between calls, and HTTP/2 is negotiated when the h2 package is
+installed and the caller allows it.
+
+httpx connections are bound to the event loop that opened them, so clients
+are cached per running loop and dropped with it.
+"""
+import asyncio
+import logging
+import weakref
+from typing import Any, Hashable, Optional
+
+import httpx
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on installed extras
+    HTTP2_AVAILABLE = False
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[Hashable, httpx.AsyncClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def connection_limits() -> httpx.Limits:
+    """Per-host connection limits from settings."""
+    max_connections = settings.CONNECTOR_HTTP_MAX_CONNECTIONS_PER_HOST
+    return httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        keepalive_expiry=settings.CONNECTOR_HTTP_KEEPALIVE_EXPIRY_SECONDS,
+    )
+
+
+def get_async_client(
+    key: Hashable,
+    *,
+    headers: Optional[dict[str, str]] = None,
+    auth: Optional[httpx.Auth] = None,
+    verify: Any = True,
+    cert: Any = None,
+    http2: bool = True,
+    timeout: float = 60.0,
+) -> httpx.AsyncClient:
+    """
+    Get the shared client for `key` on the running event loop, creating it on first use.
+
+    Args:
+        key: Identifies the host and credentials the client is configured for
+        headers: Default headers sent with every request
+        auth: httpx auth flow (basic, NTLM, ...)
+        verify: TLS verification flag or CA bundle path
+        cert: Client certificate (path or tuple)
+        http2: Allow HTTP/2 (disable for connection-bound auth such as NTLM)
+        timeout: Default request timeout in seconds
+
+    Returns:
+        Pooled httpx.AsyncClient (must be used from the current event loop)
+    """
+    loop = asyncio.get_running_loop()
+    loop_clients = _clients.setdefault(loop, {})
+
+    client = loop_clients.get(key)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            headers=headers,
+            auth=auth,
+            verify=verify,
+            cert=cert,
+            http2=http2 and HTTP2_AVAILABLE and settings.CONNECTOR_HTTP2_ENABLED,
+            limits=connection_limits(),
+            timeout=timeout,
+        )
+        loop_clients[key] = client
+        logger.debug("Opened pooled connector HTTP client", extra={"pool_size": len(loop_clients)})
+
+    return client
+
+
+async def aclose_clients() -> None:
+    """Close every pooled client opened on the running event loop."""
+    loop_clients = _clients.pop(asyncio.get_running_loop(), {})
+    for client in loop_clients.values():
+        await client.aclose()
@@ -0,0 +1,404 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Shared idempotency store for execution-plane connector operations.
+
+Results of idempotent plane operations (create host, install packages,
+deploy to collection, ...) are kept in two tiers:
+
+- A process-local LRU with TTL, split into shards that each have their own
+  lock, so concurrent threads in one worker rarely contend. It is bounded
+  by CONNECTOR_IDEMPOTENCY_LOCAL_MAX_ENTRIES; the least recently used entry
+  of a full shard is evicted.
+- The shared Django cache (Redis in deployed environments), so a result
+  recorded by one Celery worker is seen by every other worker.
+
+Before running an operation, run_once() claims its key with an atomic
+set-if-absent (cache.add) on the shared cache. A worker that loses the
+claim waits for the winner's result instead of repeating the plane call.
+A claim holds a random owner token and is only released by its owner (see
+apps.core.cache_locks), so a worker whose claim lapsed cannot release the
+claim another worker took since. run_once() and wait() reach the shared
+cache through Django's async cache API. If the shared cache is unreachable,
+the store degrades to the local tier and local claims.
+
+Lookups, evictions and claims are exported as Prometheus counters (see
+apps.core.metrics).
+"""
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.core.cache_locks import arelease_lock, new_lock_token, release_lock
+from apps.core.metrics import (
+    record_idempotency_claim,
+    record_idempotency_eviction,
+    record_idempotency_lookup,
+)
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = "connector-idempotency"
+
+# Lookup result for "no recorded result" (None is a valid operation result)
+_MISSING = object()
+# Seconds between checks while waiting for another worker's result
+WAIT_INTERVAL_SECONDS = 0.25
+
+
+class IdempotencyInFlightError(Exception):
+    """Raised when another worker holds the claim on an operation for too long."""
+
+    def __init__(self, namespace: str, key: str):
+        super().__init__(f"Operation {key} on {namespace} is still in flight in another worker")
+        self.namespace = namespace
+        self.key = key
+
+
+class _Shard:
+    """One lock-protected slice of the local LRU."""
+
+    def __init__(self, max_entries: int):
+        self.lock = threading.Lock()
+        self.entries: "OrderedDict[str, tuple[Any, float]]" = OrderedDict()
+        self.max_entries = max_entries
+
+
+class IdempotencyStore:
+    """
+    Two-tier (local LRU + shared cache) store of idempotent operation results.
+
+    One store exists per namespace (connector type); use
+    get_idempotency_store() rather than instantiating it directly.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        ttl: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        shards: Optional[int] = None,
+        claim_ttl: Optional[int] = None,
+    ):
+        """
+        Initialize idempotency store.
+
+        Args:
+            namespace: Key namespace (connector type)
+            ttl: Seconds a result is kept (defaults to CONNECTOR_IDEMPOTENCY_TTL_SECONDS)
+            max_entries: Local entries across all shards (defaults to CONNECTOR_IDEMPOTENCY_LOCAL_MAX_ENTRIES)
+            shards: Local shard count (defaults to CONNECTOR_IDEMPOTENCY_SHARDS)
+            claim_ttl: Seconds an in-flight claim is held before it lapses
+                (defaults to CONNECTOR_IDEMPOTENCY_CLAIM_TTL_SECONDS)
+        """
+        self.namespace = namespace
+        self.ttl = ttl or settings.CONNECTOR_IDEMPOTENCY_TTL_SECONDS
+        self.claim_ttl = claim_ttl or settings.CONNECTOR_IDEMPOTENCY_CLAIM_TTL_SECONDS
+        shard_count = max(1, shards or settings.CONNECTOR_IDEMPOTENCY_SHARDS)
+        max_entries = max_entries or settings.CONNECTOR_IDEMPOTENCY_LOCAL_MAX_ENTRIES
+        self._shards = [_Shard(max(1, max_entries // shard_count)) for _ in range(shard_count)]
+        # Claims held by this process (key -> shared claim token, None for a local-only
+        # claim); used on their own when the shared cache is unreachable
+        self._local_claims: dict[str, Optional[int]] = {}
+        self._claims_lock = threading.Lock()
+
+    def _shard(self, key: str) -> _Shard:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def _cache_key(self, key: str) -> str:
+        return f"{CACHE_KEY_PREFIX}:{self.namespace}:{key}"
+
+    def _claim_key(self, key: str) -> str:
+        return f"{CACHE_KEY_PREFIX}:{self.namespace}:claim:{key}"
+
+    def _get_local(self, key: str, default: Any = None) -> Any:
+        shard = self._shard(key)
+        with shard.lock:
+            entry = shard.entries.get(key)
+            if entry is None:
+                return default
+            result, expires_at = entry
+            if expires_at <= time.time():
+                del shard.entries[key]
+                record_idempotency_eviction(self.namespace, "expired")
+                return default
+            shard.entries.move_to_end(key)
+            return result
+
+    def _set_local(self, key: str, result: Any, expires_at: float) -> None:
+        shard = self._shard(key)
+        with shard.lock:
+            shard.entries[key] = (result, expires_at)
+            shard.entries.move_to_end(key)
+            while len(shard.entries) > shard.max_entries:
+                shard.entries.popitem(last=False)
+                record_idempotency_eviction(self.namespace, "capacity")
+
+    def _shared_result(self, key: str, entry: Optional[dict]) -> Any:
+        """Result of a shared-tier entry, copied to the local tier, or _MISSING."""
+        if entry is None or entry["expires_at"] <= time.time():
+            record_idempotency_lookup(self.namespace, "miss")
+            return _MISSING
+
+        # Keep the shared expiry so the local copy does not outlive it
+        self._set_local(key, entry["result"], entry["expires_at"])
+        record_idempotency_lookup(self.namespace, "shared_hit")
+        return entry["result"]
+
+    def _lookup_local(self, key: str) -> Any:
+        result = self._get_local(key, _MISSING)
+        if result is not _MISSING:
+            record_idempotency_lookup(self.namespace, "local_hit")
+        return result
+
+    def _lookup(self, key: str) -> Any:
+        """Recorded result, or _MISSING."""
+        result = self._lookup_local(key)
+        if result is not _MISSING:
+            return result
+        try:
+            entry = cache.get(self._cache_key(key))
+        except Exception as e:
+            logger.warning(f"Idempotency store {self.namespace}: shared cache unavailable ({e})")
+            entry = None
+        return self._shared_result(key, entry)
+
+    async def _alookup(self, key: str) -> Any:
+        """Async variant of _lookup()."""
+        result = self._lookup_local(key)
+        if result is not _MISSING:
+            return result
+        try:
+            entry = await cache.aget(self._cache_key(key))
+        except Exception as e:
+            logger.warning(f"Idempotency store {self.namespace}: shared cache unavailable ({e})")
+            entry = None
+        return self._shared_result(key, entry)
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a recorded result.
+
+        Args:
+            key: Idempotency key
+
+        Returns:
+            The recorded result, or None if the operation has not completed
+            (or completed with None)
+        """
+        result = self._lookup(key)
+        return None if result is _MISSING else result
+
+    def _record_local(self, key: str, result: Any) -> dict:
+        """Record a result in the local tier; returns the entry to share."""
+        expires_at = time.time() + self.ttl
+        self._set_local(key, result, expires_at)
+        return {"result": result, "expires_at": expires_at}
+
+    def set(self, key: str, result: Any) -> None:
+        """
+        Record an operation result in both tiers.
+
+        Args:
+            key: Idempotency key
+            result: Operation result (must be picklable)
+        """
+        entry = self._record_local(key, result)
+        try:
+            cache.set(self._cache_key(key), entry, timeout=self.ttl)
+        except Exception as e:
+            logger.warning(f"Idempotency store {self.namespace}: could not share result ({e})")
+
+    async def aset(self, key: str, result: Any) -> None:
+        """Async variant of set()."""
+        entry = self._record_local(key, result)
+        try:
+            await cache.aset(self._cache_key(key), entry, timeout=self.ttl)
+        except Exception as e:
+            logger.warning(f"Idempotency store {self.namespace}: could not share result ({e})")
+
+    def _claim_local(self, key: str) -> bool:
+        with self._claims_lock:
+            if key in self._local_claims:
+                record_idempotency_claim(self.namespace, "contended")
+                return False
+            self._local_claims[key] = None
+        return True
+
+    def _claim_settled(self, key: str, token: Optional[int], acquired: bool) -> bool:
+        with self._claims_lock:
+            if acquired:
+                self._local_claims[key] = token
+            else:
+                self._local_claims.pop(key, None)
+        record_idempotency_claim(self.namespace, "acquired" if acquired else "contended")
+        return acquired
+
+    def claim(self, key: str) -> bool:
+        """
+        Atomically claim an operation before running it.
+
+        Args:
+            key: Idempotency key
+
+        Returns:
+            True if this caller now owns the operation, False if another caller does
+        """
+        if not self._claim_local(key):
+            return False
+        token = new_lock_token()
+        try:
+            acquired = cache.add(self._claim_key(key), token, timeout=self.claim_ttl)
+        except Exception as e:
+            logger.warning(f"Idempotency store {self.namespace}: shared claim unavailable, using local claim ({e})")
+            acquired, token = True, None
+        return self._claim_settled(key, token, acquired)
+
+    async def aclaim(self, key: str) -> bool:
+        """Async variant of claim()."""
+        if not self._claim_local(key):
+            return False
+        token = new_lock_token()
+        try:
+            acquired = await cache.aadd(self._claim_key(key), token, timeout=self.claim_ttl)
+        except Exception as e:
+            logger.warning(f"Idempotency store {self.namespace}: shared claim unavailable, using local claim ({e})")
+            acquired, token = True, None
+        return self._claim_settled(key, token, acquired)
+
+    def _drop_local_claim(self, key: str) -> Optional[int]:
+        with self._claims_lock:
+            return self._local_claims.pop(key, None)
+
+    def release(self, key: str) -> None:
+        """Release a claim taken with claim(), unless it lapsed and another worker holds it now."""
+        token = self._drop_local_claim(key)
+        if token is None:
+            return
+        try:
+            release_lock(self._claim_key(key), token)
+        except Exception as e:
+            logger.warning(f"Idempotency store {self.namespace}: could not release claim ({e})")
+
+    async def arelease(self, key: str) -> None:
+        """Async variant of release()."""
+        token = self._drop_local_claim(key)
+        if token is None:
+            return
+        try:
+            await arelease_lock(self._claim_key(key), token)
+        except Exception as e:
+            logger.warning(f"Idempotency store {self.namespace}: could not release claim ({e})")
+
+    async def _is_claimed(self, key: str) -> bool:
+        with self._claims_lock:
+            if key in self._local_claims:
+                return True
+        try:
+            return await cache.aget(self._claim_key(key)) is not None
+        except Exception:
+            return False
+
+    async def _await_result(self, key: str, timeout: Optional[float], interval: float) -> Any:
+        """Poll for a claimed operation's result; _MISSING if the claim was released without one."""
+        deadline = time.monotonic() + (timeout if timeout is not None else self.claim_ttl)
+        while True:
+            result = await self._alookup(key)
+            if result is not _MISSING:
+                return result
+            if not await self._is_claimed(key):
+                return _MISSING
+            if time.monotonic() >= deadline:
+                raise IdempotencyInFlightError(self.namespace, key)
+            await asyncio.sleep(interval)
+
+    async def wait(
+        self, key: str, timeout: Optional[float] = None, interval: float = WAIT_INTERVAL_SECONDS
+    ) -> Optional[Any]:
+        """
+        Wait for a claimed operation to finish.
+
+        Args:
+            key: Idempotency key
+            timeout: Max seconds to wait (defaults to the claim TTL)
+            interval: Seconds between checks
+
+        Returns:
+            The recorded result, or None if the claim was released without one
+
+        Raises:
+            IdempotencyInFlightError: If the operation is still claimed after timeout
+        """
+        result = await self._await_result(key, timeout, interval)
+        return None if result is _MISSING else result
+
+    async def run_once(self, key: str, operation: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run an operation at most once per key within the TTL.
+
+        A recorded result (None included) is returned without calling the
+        operation. Otherwise the key is claimed, the operation awaited and its
+        result recorded. If another worker holds the claim, its result is
+        awaited instead; if it gives up without a result, the claim is
+        retried. An operation that raises records nothing, so a later call
+        runs it again.
+
+        Args:
+            key: Idempotency key
+            operation: Coroutine function performing the plane call
+
+        Returns:
+            The operation result
+        """
+        while True:
+            result = await self._alookup(key)
+            if result is not _MISSING:
+                return result
+            if await self.aclaim(key):
+                break
+            result = await self._await_result(key, None, WAIT_INTERVAL_SECONDS)
+            if result is not _MISSING:
+                return result
+
+        try:
+            result = await operation()
+            await self.aset(key, result)
+            return result
+        finally:
+            await self.arelease(key)
+
+    def clear(self) -> None:
+        """Drop every local entry (shared entries expire on their own)."""
+        for shard in self._shards:
+            with shard.lock:
+                shard.entries.clear()
+
+    def __len__(self) -> int:
+        return sum(len(shard.entries) for shard in self._shards)
+
+
+_stores: dict[str, IdempotencyStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_idempotency_store(namespace: str) -> IdempotencyStore:
+    """
+    Get the process-wide idempotency store for a namespace, creating it on first use.
+
+    Args:
+        namespace: Key namespace (connector type)
+
+    Returns:
+        Shared IdempotencyStore
+    """
+    store = _stores.get(namespace)
+    if store is None:
+        with _stores_lock:
+            store = _stores.setdefault(namespace, IdempotencyStore(namespace))
+    return store
@@ -10,7 +10,7 @@ Authentication Flow:
 2. Grant API permissions: DeviceManagementApps.ReadWrite.All, DeviceManagementConfiguration.ReadWrite.All
 3. Create client secret
 4. Use tenant ID, client ID, and client secret to obtain access token
-5. Access token valid for 1 hour (cached and refreshed automatically)
+5. Access token valid for 1 hour (cached and refreshed ahead of expiry by the shared token broker)
 
 Configuration (environment variables):
 - INTUNE_TENANT_ID: Azure AD tenant ID
@@ -18,13 +18,12 @@ Configuration (environment variables):
 - INTUNE_CLIENT_SECRET: Client secret value
 """
 import logging
-from datetime import datetime, timedelta
 from typing import Dict, Optional
 
 from decouple import config
 from django.conf import settings
-from django.core.cache import cache
 
+from apps.connectors.token_broker import get_token_broker
 from apps.core.resilient_http import ResilientAPIError, ResilientHTTPClient
 from apps.core.structured_logging import StructuredLogger
 
@@ -56,9 +55,6 @@ class IntuneAuth:
     # Token cache key prefix
     CACHE_KEY_PREFIX = "intune_access_token"
 
-    # Token expiry buffer (refresh 5 minutes before expiry)
-    EXPIRY_BUFFER_SECONDS = 300
-
     def __init__(self):
         """Initialize Intune authentication."""
         # Load configuration
@@ -98,53 +94,14 @@ class IntuneAuth:
         if correlation_id:
             self.structured_logger.correlation_id = correlation_id
 
-        # Check cache unless force refresh
-        if not force_refresh:
-            cached_token = self._get_cached_token()
-            if cached_token:
-                self.structured_logger.debug("Using cached Intune access token")
-                return cached_token
-
-        # Acquire new token
-        self.structured_logger.info("Acquiring new Intune access token")
-        token_data = self._acquire_token(correlation_id)
-
-        # Cache token
-        self._cache_token(token_data)
-
-        return token_data["access_token"]
-
-    def _get_cached_token(self) -> Optional[str]:
-        """Get cached access token if valid."""
-        cache_key = f"{self.CACHE_KEY_PREFIX}:{self.tenant_id}"
-        cached_data = cache.get(cache_key)
-
-        if cached_data:
-            expiry = cached_data.get("expiry")
-            if expiry and datetime.now() < expiry:
-                return cached_data.get("access_token")
-
-        return None
-
-    def _cache_token(self, token_data: Dict) -> None:
-        """Cache access token with expiry."""
-        expires_in = token_data.get("expires_in", 3600)  # Default 1 hour
-
-        # Calculate expiry with buffer
-        expiry = datetime.now() + timedelta(seconds=expires_in - self.EXPIRY_BUFFER_SECONDS)
-
-        cache_key = f"{self.CACHE_KEY_PREFIX}:{self.tenant_id}"
-        cache_data = {
-            "access_token": token_data["access_token"],
-            "expiry": expiry,
-        }
-
-        # Cache for token lifetime
-        cache.set(cache_key, cache_data, timeout=expires_in)
-
-        self.structured_logger.info(
-            "Cached Intune access token", extra={"expires_in": expires_in, "expiry": expiry.isoformat()}
+        token = get_token_broker().get_token(
+            "intune", self._get_cache_key(), lambda: self._acquire_token(correlation_id), force_refresh=force_refresh
         )
+        return token.access_token
+
+    def _get_cache_key(self) -> str:
+        """Shared cache key for this tenant's token."""
+        return f"{self.CACHE_KEY_PREFIX}:{self.tenant_id}"
 
     def _acquire_token(self, correlation_id: Optional[str] = None) -> Dict:
         """
@@ -207,8 +164,7 @@ class IntuneAuth:
 
     def clear_cached_token(self) -> None:
         """Clear cached access token (force re-authentication on next request)."""
-        cache_key = f"{self.CACHE_KEY_PREFIX}:{self.tenant_id}"
-        cache.delete(cache_key)
+        get_token_broker().invalidate(self._get_cache_key())
         self.structured_logger.info("Cleared cached Intune access token")
 
     def validate_token(self, token: str, correlation_id: Optional[str] = None) -> bool:
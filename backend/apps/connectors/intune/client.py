@@ -4,7 +4,7 @@
 Microsoft Intune connector client using Microsoft Graph API.
 
 Implements core operations for Windows application deployment:
-- List managed devices
+- List managed devices (and stream them for resumable inventory sync)
 - Create Win32 application
 - Assign application to groups
 - Query application assignment status
@@ -12,10 +12,17 @@ Implements core operations for Windows application deployment:
 
 API Reference: https://learn.microsoft.com/en-us/graph/api/resources/intune-graph-overview
 """
+import asyncio
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 from uuid import UUID
 
+import httpx
+
+from apps.connectors import http_pool
+from apps.connectors.graph import GRAPH_API_URL, GraphClient
+from apps.connectors.inventory import InventoryPage, asset_type_for_os
+from apps.connectors.models import Asset
 from apps.core.resilient_http import CircuitBreakerOpen, ResilientAPIClient, ResilientAPIError
 from apps.core.structured_logging import StructuredLogger
 
@@ -42,7 +49,7 @@ class IntuneConnector:
     """
 
     # Microsoft Graph API base URL
-    GRAPH_API_BASE = "https://graph.microsoft.com/v1.0"
+    GRAPH_API_BASE = GRAPH_API_URL
 
     def __init__(self):
         """Initialize Intune connector."""
@@ -59,6 +66,14 @@ class IntuneConnector:
             timeout=30,
         )
 
+        # Shared pooled Graph client for batched lookups
+        self.graph = GraphClient(
+            token_provider=self._graph_auth_header,
+            on_unauthorized=self._refresh_graph_token,
+            timeout=30,
+            base_url=self.GRAPH_API_BASE,
+        )
+
         self.structured_logger = StructuredLogger(__name__, user="system")
 
     def _get_auth_headers(self, correlation_id: Optional[str] = None) -> Dict[str, str]:
@@ -74,14 +89,115 @@ class IntuneConnector:
                 f"Failed to get access token: {e.message}", correlation_id=correlation_id, details=e.details
             )
 
+    async def _graph_auth_header(self) -> Dict[str, str]:
+        """Authorization header for the Graph client (token cache lookups run off the event loop)."""
+        return await asyncio.to_thread(self._get_auth_headers)
+
+    async def _refresh_graph_token(self) -> None:
+        """Force a token refresh after Graph rejects the current one."""
+        await asyncio.to_thread(self.auth.get_access_token, True)
+
+    def get_managed_devices(
+        self, device_ids: List[str], correlation_id: Optional[str] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Look up many managed devices by ID from synchronous code.
+
+        Runs aget_managed_devices() on a private event loop, so connections are
+        not pooled across calls: the loop's clients are closed before returning.
+        Callers already on an event loop should await aget_managed_devices().
+
+        Args:
+            device_ids: Intune managed device IDs
+            correlation_id: Correlation ID for tracing
+
+        Returns:
+            Dict of device ID to managed device object (unknown devices are omitted)
+
+        Raises:
+            IntuneConnectorError: If a lookup fails
+        """
+
+        async def lookup() -> Dict[str, Dict[str, Any]]:
+            try:
+                return await self.aget_managed_devices(device_ids, correlation_id=correlation_id)
+            finally:
+                await http_pool.aclose_clients()
+
+        return asyncio.run(lookup())
+
+    async def aget_managed_devices(
+        self, device_ids: List[str], correlation_id: Optional[str] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Look up many managed devices by ID through batched Graph calls.
+
+        Uses the pooled Graph client of the running event loop.
+
+        Args:
+            device_ids: Intune managed device IDs
+            correlation_id: Correlation ID for tracing
+
+        Returns:
+            Dict of device ID to managed device object (unknown devices are omitted)
+
+        Raises:
+            IntuneConnectorError: If a lookup fails
+        """
+        self.structured_logger.connector_event(
+            connector_type="intune",
+            operation="GET_MANAGED_DEVICES",
+            correlation_id=correlation_id or "UNKNOWN",
+            outcome="STARTED",
+            details={"device_count": len(device_ids)},
+        )
+
+        try:
+            responses = await self.graph.batch(
+                [{"method": "GET", "url": f"/deviceManagement/managedDevices/{device_id}"} for device_id in device_ids],
+                correlation_id=correlation_id,
+            )
+        except (httpx.HTTPError, IntuneConnectorError) as e:
+            self.structured_logger.connector_event(
+                connector_type="intune",
+                operation="GET_MANAGED_DEVICES",
+                correlation_id=correlation_id or "UNKNOWN",
+                outcome="FAILURE",
+                details={"error": str(e)},
+            )
+            raise IntuneConnectorError(f"Failed to get managed devices: {e}", correlation_id=correlation_id)
+
+        devices: Dict[str, Dict[str, Any]] = {}
+        for device_id, response in zip(device_ids, responses):
+            if response.ok:
+                devices[device_id] = response.body
+            elif response.status != 404:
+                raise IntuneConnectorError(
+                    f"Failed to get managed device {device_id}",
+                    correlation_id=correlation_id,
+                    details={"status_code": response.status, "device_id": device_id},
+                )
+
+        self.structured_logger.connector_event(
+            connector_type="intune",
+            operation="GET_MANAGED_DEVICES",
+            correlation_id=correlation_id or "UNKNOWN",
+            outcome="SUCCESS",
+            details={"device_count": len(devices)},
+        )
+
+        return devices
+
     def list_managed_devices(
         self, top: int = 100, filter_query: Optional[str] = None, correlation_id: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
-        List managed devices in Intune.
+        List managed devices in Intune, following @odata.nextLink until top devices are collected.
+
+        Use iter_inventory_pages() to stream a whole tenant.
 
         Args:
-            top: Maximum number of devices to return (default: 100, max: 999)
+            top: Maximum number of devices to return (default: 100; pages hold at most 999)
             filter_query: OData filter query (e.g., "operatingSystem eq 'Windows'")
             correlation_id: Correlation ID for tracing
 
@@ -101,19 +217,28 @@ class IntuneConnector:
 
         try:
             headers = self._get_auth_headers(correlation_id)
-            params = {"$top": str(min(top, 999))}
+            params: Optional[Dict[str, str]] = {"$top": str(min(top, 999))}
 
             if filter_query:
                 params["$filter"] = filter_query
 
-            response = self.client.get(
-                endpoint="/deviceManagement/managedDevices",
-                headers=headers,
-                params=params,
-                correlation_id=correlation_id,
-            )
+            devices: List[Dict[str, Any]] = []
+            endpoint: Optional[str] = "/deviceManagement/managedDevices"
 
-            devices = response.get("value", [])
+            while endpoint and len(devices) < top:
+                response = self.client.get(
+                    endpoint=endpoint,
+                    headers=headers,
+                    params=params,
+                    correlation_id=correlation_id,
+                )
+                devices.extend(response.get("value", []))
+
+                next_link = response.get("@odata.nextLink")
+                endpoint = self.graph.relative_url(next_link) if next_link else None
+                params = None
+
+            devices = devices[:top]
 
             self.structured_logger.connector_event(
                 connector_type="intune",
@@ -148,6 +273,67 @@ class IntuneConnector:
                 details={"status_code": e.status_code},
             )
 
+    async def iter_inventory_pages(
+        self,
+        cursor: Optional[str] = None,
+        correlation_id: Optional[str] = None,
+        filter_query: Optional[str] = None,
+        page_size: int = 999,
+    ) -> AsyncIterator[InventoryPage]:
+        """
+        Stream every managed device one Graph page at a time.
+
+        Args:
+            cursor: @odata.nextLink to resume from (None starts at the first page)
+            correlation_id: Correlation ID for tracing
+            filter_query: OData filter query (ignored when resuming; it is part of the nextLink)
+            page_size: Devices per page (max 999)
+
+        Yields:
+            InventoryPage whose next_cursor is the following nextLink (None on the last page)
+
+        Raises:
+            IntuneConnectorError: If a page cannot be fetched
+        """
+        if cursor:
+            endpoint: Optional[str] = self.graph.relative_url(cursor)
+            params: Optional[Dict[str, str]] = None
+        else:
+            endpoint = "/deviceManagement/managedDevices"
+            params = {"$top": str(min(page_size, 999)), "$count": "true"}
+            if filter_query:
+                params["$filter"] = filter_query
+
+        while endpoint:
+            try:
+                response = await self.graph.request("GET", endpoint, params=params, correlation_id=correlation_id)
+            except httpx.HTTPError as e:
+                raise IntuneConnectorError(f"Failed to list managed devices: {e}", correlation_id=correlation_id)
+
+            next_link = response.get("@odata.nextLink")
+            yield InventoryPage(
+                records=response.get("value", []), next_cursor=next_link, total=response.get("@odata.count")
+            )
+            endpoint = self.graph.relative_url(next_link) if next_link else None
+            params = None
+
+    def map_asset(self, device: Dict[str, Any]) -> Dict[str, Any]:
+        """Map an Intune managed device to Asset fields."""
+        os_name = device.get("operatingSystem") or ""
+        return {
+            "asset_id": f"intune-{device.get('id')}" if device.get("id") else None,
+            "name": device.get("deviceName") or "Unknown",
+            "serial_number": device.get("serialNumber") or "",
+            "type": asset_type_for_os(os_name),
+            "os": " ".join(part for part in (os_name, device.get("osVersion")) if part)[:100],
+            "status": Asset.Status.ACTIVE,
+            "location": "",
+            "owner": device.get("userPrincipalName") or "",
+            "is_demo": False,
+            "connector_type": "intune",
+            "connector_object_id": device.get("id") or "",
+        }
+
     def create_win32_app(
         self,
         display_name: str,
@@ -4,12 +4,15 @@
 Comprehensive tests for Intune connector client.
 Tests device management, app deployment, and assignment operations.
 """
-from unittest.mock import MagicMock, Mock, patch
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
+import httpx
 import pytest
+from asgiref.sync import async_to_sync
 from django.core.cache import cache
 from django.test import TestCase
 
+from apps.connectors.graph import GraphBatchResponse
 from apps.connectors.intune.client import IntuneConnector, IntuneConnectorError
 from apps.core.circuit_breaker import CircuitBreakerOpen
 from apps.core.resilient_http import ResilientAPIError
@@ -135,6 +138,181 @@ class TestIntuneDeviceManagement(TestCase):
         call_kwargs = mock_client.get.call_args[1]
         self.assertEqual(call_kwargs["params"]["$top"], "999")
 
+    @patch("apps.connectors.intune.client.ResilientAPIClient")
+    def test_list_managed_devices_follows_next_link(self, mock_api_client_class):
+        """Should follow @odata.nextLink until top devices are collected."""
+        mock_client = Mock()
+        mock_client.get.side_effect = [
+            {
+                "value": [{"id": f"device-{i}"} for i in range(3)],
+                "@odata.nextLink": "https://graph.microsoft.com/v1.0/deviceManagement/managedDevices?$skiptoken=p2",
+            },
+            {
+                "value": [{"id": f"device-{i}"} for i in range(3, 6)],
+                "@odata.nextLink": "https://graph.microsoft.com/v1.0/deviceManagement/managedDevices?$skiptoken=p3",
+            },
+        ]
+        self.connector.client = mock_client
+
+        devices = self.connector.list_managed_devices(top=5, correlation_id="TEST-PAGES")
+
+        self.assertEqual([d["id"] for d in devices], [f"device-{i}" for i in range(5)])
+        self.assertEqual(mock_client.get.call_count, 2)
+        second_call = mock_client.get.call_args_list[1][1]
+        self.assertEqual(second_call["endpoint"], "/deviceManagement/managedDevices?$skiptoken=p2")
+        self.assertIsNone(second_call["params"])
+
+
+class TestIntuneInventoryStream(TestCase):
+    """Test streaming managed devices for inventory sync."""
+
+    def setUp(self):
+        """Setup for each test."""
+        cache.clear()
+        self.connector = IntuneConnector()
+
+    def tearDown(self):
+        """Cleanup after each test."""
+        cache.clear()
+
+    def _collect(self, **kwargs):
+        async def collect():
+            return [page async for page in self.connector.iter_inventory_pages(**kwargs)]
+
+        return async_to_sync(collect)()
+
+    def test_streams_every_page(self):
+        """Should yield each Graph page with the nextLink as its resume cursor."""
+        next_link = "https://graph.microsoft.com/v1.0/deviceManagement/managedDevices?$skiptoken=p2"
+
+        with patch.object(self.connector.graph, "request", new_callable=AsyncMock) as mock_request:
+            mock_request.side_effect = [
+                {"value": [{"id": "device-1"}], "@odata.count": 2, "@odata.nextLink": next_link},
+                {"value": [{"id": "device-2"}]},
+            ]
+
+            pages = self._collect(correlation_id="TEST-STREAM")
+
+        self.assertEqual([page.records for page in pages], [[{"id": "device-1"}], [{"id": "device-2"}]])
+        self.assertEqual(pages[0].next_cursor, next_link)
+        self.assertEqual(pages[0].total, 2)
+        self.assertIsNone(pages[1].next_cursor)
+        self.assertEqual(mock_request.call_args_list[0].kwargs["params"]["$top"], "999")
+        self.assertEqual(mock_request.call_args_list[1].args[1], "/deviceManagement/managedDevices?$skiptoken=p2")
+
+    def test_resumes_from_cursor(self):
+        """Should start from the checkpointed nextLink instead of the first page."""
+        with patch.object(self.connector.graph, "request", new_callable=AsyncMock) as mock_request:
+            mock_request.return_value = {"value": []}
+
+            self._collect(cursor="https://graph.microsoft.com/v1.0/deviceManagement/managedDevices?$skiptoken=p7")
+
+        mock_request.assert_awaited_once()
+        self.assertEqual(mock_request.call_args.args[1], "/deviceManagement/managedDevices?$skiptoken=p7")
+        self.assertIsNone(mock_request.call_args.kwargs["params"])
+
+    def test_page_failure_raises_connector_error(self):
+        """Should wrap Graph failures in IntuneConnectorError."""
+        with patch.object(self.connector.graph, "request", new_callable=AsyncMock) as mock_request:
+            mock_request.side_effect = httpx.ConnectError("boom")
+
+            with self.assertRaises(IntuneConnectorError):
+                self._collect()
+
+    def test_map_asset(self):
+        """Should map a managed device to Asset fields."""
+        fields = self.connector.map_asset(
+            {
+                "id": "device-1",
+                "deviceName": "WIN-001",
+                "serialNumber": "SN1",
+                "operatingSystem": "Windows",
+                "osVersion": "10.0.22631",
+                "userPrincipalName": "user@example.com",
+            }
+        )
+
+        self.assertEqual(fields["asset_id"], "intune-device-1")
+        self.assertEqual(fields["os"], "Windows 10.0.22631")
+        self.assertEqual(fields["type"], "Desktop")
+        self.assertEqual(fields["owner"], "user@example.com")
+        self.assertEqual(fields["connector_type"], "intune")
+
+
+class TestIntuneBatchedDeviceLookup(TestCase):
+    """Test batched managed device lookups over the shared Graph client."""
+
+    def setUp(self):
+        """Setup for each test."""
+        cache.clear()
+        self.connector = IntuneConnector()
+
+    def tearDown(self):
+        """Cleanup after each test."""
+        cache.clear()
+
+    def test_get_managed_devices_batches_lookups(self):
+        """Should look up all devices in one batch call and omit unknown ones."""
+        responses = [
+            GraphBatchResponse(id="0", status=200, body={"id": "device-1", "deviceName": "WIN-001"}),
+            GraphBatchResponse(id="1", status=404),
+            GraphBatchResponse(id="2", status=200, body={"id": "device-3", "deviceName": "WIN-003"}),
+        ]
+
+        with patch.object(self.connector.graph, "batch", new_callable=AsyncMock) as mock_batch:
+            mock_batch.return_value = responses
+
+            devices = self.connector.get_managed_devices(
+                ["device-1", "device-2", "device-3"], correlation_id="TEST-BATCH"
+            )
+
+        self.assertEqual(set(devices), {"device-1", "device-3"})
+        self.assertEqual(devices["device-3"]["deviceName"], "WIN-003")
+        mock_batch.assert_awaited_once()
+        sub_requests = mock_batch.call_args.args[0]
+        self.assertEqual(
+            [r["url"] for r in sub_requests],
+            [f"/deviceManagement/managedDevices/device-{i}" for i in (1, 2, 3)],
+        )
+        self.assertEqual(mock_batch.call_args.kwargs["correlation_id"], "TEST-BATCH")
+
+    def test_get_managed_devices_failed_lookup(self):
+        """Should raise IntuneConnectorError when a lookup fails permanently."""
+        with patch.object(self.connector.graph, "batch", new_callable=AsyncMock) as mock_batch:
+            mock_batch.return_value = [GraphBatchResponse(id="0", status=403)]
+
+            with self.assertRaises(IntuneConnectorError) as context:
+                self.connector.get_managed_devices(["device-1"])
+
+        self.assertEqual(context.exception.details["status_code"], 403)
+
+    def test_get_managed_devices_closes_private_loop_clients(self):
+        """Sync lookups should close the clients opened on their private event loop, even on failure."""
+        with (
+            patch.object(self.connector.graph, "batch", new_callable=AsyncMock) as mock_batch,
+            patch("apps.connectors.intune.client.http_pool.aclose_clients", new_callable=AsyncMock) as mock_close,
+        ):
+            mock_batch.return_value = [GraphBatchResponse(id="0", status=200, body={"id": "device-1"})]
+            self.connector.get_managed_devices(["device-1"])
+
+            mock_batch.side_effect = httpx.ConnectError("unreachable")
+            with self.assertRaises(IntuneConnectorError):
+                self.connector.get_managed_devices(["device-1"])
+
+        self.assertEqual(mock_close.await_count, 2)
+
+    def test_aget_managed_devices_keeps_loop_clients(self):
+        """Async lookups should run on the caller's loop and leave its pooled clients open."""
+        with (
+            patch.object(self.connector.graph, "batch", new_callable=AsyncMock) as mock_batch,
+            patch("apps.connectors.intune.client.http_pool.aclose_clients", new_callable=AsyncMock) as mock_close,
+        ):
+            mock_batch.return_value = [GraphBatchResponse(id="0", status=200, body={"id": "device-1"})]
+            devices = async_to_sync(self.connector.aget_managed_devices)(["device-1"])
+
+        self.assertEqual(devices, {"device-1": {"id": "device-1"}})
+        mock_close.assert_not_awaited()
+
 
 class TestIntuneAppDeployment(TestCase):
     """Test Win32 application deployment operations."""
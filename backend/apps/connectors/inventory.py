@@ -0,0 +1,220 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Resumable device inventory sync from execution-plane connectors into Asset.
+
+Connectors implementing InventorySource stream their inventory as an async
+iterator of InventoryPage. run_inventory_sync() writes each page to Asset
+with the chunked bulk upsert from asset_ingest, then checkpoints the page's
+resume cursor and running counters on the SyncJob. A job that FAILED
+part-way keeps its checkpoint, and a RUNNING job whose worker stopped
+checkpointing for CONNECTOR_INVENTORY_JOB_LEASE_SECONDS is taken to have
+crashed; the next run for the same connector instance continues either job
+from its checkpoint instead of starting over. A RUNNING job still within its
+lease is left to its worker (InventorySyncInProgressError). A page re-applied
+after a crash between upsert and checkpoint is skipped by the Asset content
+hash.
+"""
+import logging
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional, Protocol
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.connectors.models import Asset, ConnectorInstance, SyncJob, SyncJobStatus, SyncJobType
+from apps.integrations.services.asset_ingest import upsert_assets
+
+logger = logging.getLogger(__name__)
+
+JOB_PROGRESS_FIELDS = [
+    "total_records",
+    "records_processed",
+    "records_created",
+    "records_updated",
+    "records_failed",
+    "checkpoint",
+    "updated_at",
+]
+
+
+class InventorySyncInProgressError(Exception):
+    """Raised when another worker is still running the instance's inventory sync."""
+
+    def __init__(self, job: SyncJob):
+        super().__init__(f"Inventory sync job {job.id} is still running (last checkpoint at {job.updated_at})")
+        self.job = job
+
+
+@dataclass
+class InventoryPage:
+    """One page of device records from a connector."""
+
+    records: List[Dict[str, Any]]
+    # Cursor that resumes after this page (None on the last page)
+    next_cursor: Any = None
+    # Total devices reported by the source, if known
+    total: Optional[int] = None
+
+
+class InventorySource(Protocol):
+    """Connector capable of streaming its device inventory."""
+
+    def iter_inventory_pages(
+        self, cursor: Any = None, correlation_id: Optional[str] = None
+    ) -> AsyncIterator[InventoryPage]:
+        """Yield inventory pages starting at cursor (None for the first page)."""
+
+    def map_asset(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Map a device record to Asset fields (asset_id plus ASSET_SYNC_FIELDS)."""
+
+
+def asset_type_for_os(os_name: str) -> str:
+    """Best-effort Asset type from an operating system name."""
+    os_lower = (os_name or "").lower()
+    if any(mobile in os_lower for mobile in ("ios", "ipados", "android")):
+        return Asset.AssetType.MOBILE
+    if "server" in os_lower:
+        return Asset.AssetType.SERVER
+    if "mac" in os_lower:
+        return Asset.AssetType.LAPTOP
+    return Asset.AssetType.DESKTOP
+
+
+def _is_resumable(job: Optional[SyncJob]) -> bool:
+    """Whether job is an abandoned RUNNING job or a FAILED job with a checkpoint to resume from."""
+    if job is None:
+        return False
+    if job.status == SyncJobStatus.RUNNING:
+        lease = timedelta(seconds=settings.CONNECTOR_INVENTORY_JOB_LEASE_SECONDS)
+        if job.updated_at > timezone.now() - lease:
+            raise InventorySyncInProgressError(job)
+        return True
+    return job.status == SyncJobStatus.FAILED and bool(job.checkpoint)
+
+
+def _claim_job(instance: ConnectorInstance, trigger_type: str, triggered_by) -> SyncJob:
+    """Resume the instance's unfinished inventory job, or start a new one."""
+    with transaction.atomic():
+        job = (
+            SyncJob.objects.select_for_update()
+            .filter(connector=instance, job_type=SyncJobType.FULL_SYNC)
+            .order_by("-created_at")
+            .first()
+        )
+        if _is_resumable(job):
+            logger.info(
+                f"Resuming inventory sync job {job.id} for {instance}",
+                extra={"correlation_id": str(job.correlation_id), "checkpoint": job.checkpoint},
+            )
+            job.status = SyncJobStatus.RUNNING
+            job.save(update_fields=["status", "updated_at"])
+            return job
+
+        return SyncJob.objects.create(
+            connector=instance,
+            job_type=SyncJobType.FULL_SYNC,
+            status=SyncJobStatus.RUNNING,
+            started_at=timezone.now(),
+            trigger_type=trigger_type,
+            triggered_by=triggered_by,
+        )
+
+
+def _checkpoint(job: SyncJob, page: InventoryPage, totals: Dict[str, int]) -> None:
+    """Record a written page: running counters plus the cursor after it."""
+    job.records_processed += totals["fetched"]
+    job.records_created += totals["created"]
+    job.records_updated += totals["updated"]
+    job.records_failed += totals["failed"]
+    if page.total is not None:
+        job.total_records = page.total
+    job.checkpoint = {"cursor": page.next_cursor, "pages": job.checkpoint.get("pages", 0) + 1}
+    job.save(update_fields=JOB_PROGRESS_FIELDS)
+
+
+def _finish(job: SyncJob, instance: ConnectorInstance, error: Optional[Exception] = None) -> None:
+    """Close out the job; a failed job keeps its checkpoint for the next run."""
+    now = timezone.now()
+    if error is None:
+        job.status = SyncJobStatus.COMPLETED
+        job.completed_at = now
+        job.checkpoint = {}
+        instance.last_sync_at = now
+    else:
+        job.status = SyncJobStatus.FAILED
+        job.errors = [
+            *job.errors,
+            {"message": str(error), "type": type(error).__name__, "checkpoint": job.checkpoint, "at": now.isoformat()},
+        ]
+    job.save(update_fields=["status", "completed_at", "checkpoint", "errors", "updated_at"])
+
+    instance.last_sync_status = job.status
+    instance.save(update_fields=["last_sync_at", "last_sync_status", "updated_at"])
+
+
+async def run_inventory_sync(
+    instance: ConnectorInstance,
+    source: InventorySource,
+    chunk_size: Optional[int] = None,
+    trigger_type: str = "scheduled",
+    triggered_by=None,
+) -> SyncJob:
+    """
+    Stream a connector's device inventory into Asset, resuming unfinished jobs.
+
+    A RUNNING job that has not checkpointed within
+    CONNECTOR_INVENTORY_JOB_LEASE_SECONDS is treated as abandoned and picked
+    up; one still within its lease belongs to another worker.
+
+    Args:
+        instance: Connector instance being synced
+        source: Connector streaming the inventory
+        chunk_size: Rows per bulk upsert (defaults to INTEGRATION_ASSET_SYNC_CHUNK_SIZE)
+        trigger_type: How the job was triggered (manual, scheduled, webhook)
+        triggered_by: User who triggered the job
+
+    Returns:
+        The SyncJob (COMPLETED, or FAILED with its checkpoint kept)
+
+    Raises:
+        InventorySyncInProgressError: Another worker is running the instance's sync
+    """
+    job = await sync_to_async(_claim_job)(instance, trigger_type, triggered_by)
+    correlation_id = str(job.correlation_id)
+    cursor = job.checkpoint.get("cursor")
+    pages = 0
+
+    try:
+        while True:
+            try:
+                async for page in source.iter_inventory_pages(cursor=cursor, correlation_id=correlation_id):
+                    totals = await sync_to_async(upsert_assets)(page.records, source.map_asset, chunk_size=chunk_size)
+                    await sync_to_async(_checkpoint)(job, page, totals)
+                    pages += 1
+                break
+            except Exception as e:
+                if pages or cursor is None:
+                    raise
+                # The stored cursor may have expired on the source; the checkpoint is
+                # only overwritten once a page from the fresh walk has been written
+                logger.warning(
+                    f"Could not resume inventory sync job {job.id} from its checkpoint ({e}); restarting",
+                    extra={"correlation_id": correlation_id},
+                )
+                cursor = None
+
+        await sync_to_async(_finish)(job, instance)
+        logger.info(
+            f"Inventory sync job {job.id} completed: {job.records_processed} devices",
+            extra={"correlation_id": correlation_id, "pages": pages},
+        )
+
+    except Exception as e:
+        logger.exception(f"Inventory sync job {job.id} failed: {e}", extra={"correlation_id": correlation_id})
+        await sync_to_async(_finish)(job, instance, e)
+
+    return job
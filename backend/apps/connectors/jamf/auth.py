@@ -6,7 +6,7 @@ Jamf Pro authentication manager with OAuth 2.0 support.
 Handles authentication with Jamf Pro API using:
 - OAuth 2.0 client credentials flow (preferred for API integrations)
 - Basic authentication (fallback for legacy configurations)
-- Token caching with automatic refresh
+- Token caching with proactive refresh through the shared token broker
 
 Configuration (environment variables):
 - JAMF_SERVER_URL: Jamf Pro server URL (e.g., https://yourorg.jamfcloud.com)
@@ -21,12 +21,11 @@ Example:
 """
 import base64
 import logging
-from datetime import datetime, timedelta
 from typing import Dict, Optional
 
 from decouple import config
-from django.core.cache import cache
 
+from apps.connectors.token_broker import get_token_broker
 from apps.core.resilient_http import ResilientHTTPClient
 from apps.core.structured_logging import StructuredLogger
 
@@ -47,17 +46,14 @@ class JamfAuth:
     Jamf Pro authentication manager.
 
     Supports both OAuth 2.0 (preferred) and Basic authentication (fallback).
-    Implements token caching with automatic refresh.
+    Tokens are cached and refreshed by the shared token broker.
     """
 
     # OAuth 2.0 endpoints
     TOKEN_ENDPOINT = "/api/oauth/token"
     TOKEN_VALIDATION_ENDPOINT = "/api/v1/auth"
 
-    # Token expiry buffer (refresh 5 minutes before expiry)
-    EXPIRY_BUFFER_SECONDS = 300
-
-    # Cache TTL for tokens
+    # Token lifetime assumed when Jamf does not return one
     CACHE_TTL_SECONDS = 1800  # 30 minutes (Jamf tokens typically expire after 30 minutes)
 
     def __init__(self):
@@ -118,23 +114,11 @@ class JamfAuth:
         Raises:
             JamfAuthError: If token acquisition fails
         """
-        # Check cache for valid token (unless force refresh)
-        if not force_refresh:
-            cached_token = self._get_cached_token()
-            if cached_token:
-                self.structured_logger.debug("Using cached Jamf access token", extra={"auth_method": self.auth_method})
-                return cached_token
-
-        # Acquire new token based on auth method
-        if self.auth_method == "oauth":
-            token_data = self._acquire_oauth_token(correlation_id)
-        else:
-            token_data = self._acquire_basic_token(correlation_id)
-
-        # Cache token
-        self._cache_token(token_data)
-
-        return token_data["access_token"]
+        acquire = self._acquire_oauth_token if self.auth_method == "oauth" else self._acquire_basic_token
+        token = get_token_broker().get_token(
+            "jamf", self._get_cache_key(), lambda: acquire(correlation_id), force_refresh=force_refresh
+        )
+        return token.access_token
 
     def _acquire_oauth_token(self, correlation_id: Optional[str] = None) -> Dict:
         """
@@ -181,7 +165,7 @@ class JamfAuth:
             # Jamf returns expires_in in seconds
             if "expires_in" not in token_data:
                 # Default to 30 minutes if not provided
-                token_data["expires_in"] = 1800
+                token_data["expires_in"] = self.CACHE_TTL_SECONDS
 
             self.structured_logger.security_event(
                 event_type="JAMF_AUTH_SUCCESS",
@@ -246,7 +230,7 @@ class JamfAuth:
             # Normalize response format (Basic auth returns 'token', OAuth returns 'access_token')
             normalized_token_data = {
                 "access_token": token_data["token"],
-                "expires_in": token_data.get("expires", 1800),  # Default to 30 minutes
+                "expires_in": token_data.get("expires", self.CACHE_TTL_SECONDS),
             }
 
             self.structured_logger.security_event(
@@ -269,51 +253,6 @@ class JamfAuth:
                 f"Failed to acquire Jamf Basic auth token: {str(e)}", correlation_id=correlation_id
             ) from e
 
-    def _get_cached_token(self) -> Optional[str]:
-        """
-        Get cached access token if available and not expired.
-
-        Returns:
-            Cached token string or None if not available/expired
-        """
-        cache_key = self._get_cache_key()
-        cached_data = cache.get(cache_key)
-
-        if cached_data:
-            token = cached_data.get("token")
-            expiry = cached_data.get("expiry")
-
-            # Check if token is still valid (with buffer)
-            if expiry and datetime.utcnow() < expiry:
-                return token
-
-        return None
-
-    def _cache_token(self, token_data: Dict) -> None:
-        """
-        Cache access token with expiry time.
-
-        Args:
-            token_data: Token data dict with 'access_token' and 'expires_in'
-        """
-        cache_key = self._get_cache_key()
-
-        # Calculate expiry time with buffer
-        expires_in_seconds = token_data.get("expires_in", self.CACHE_TTL_SECONDS)
-        expiry_time = datetime.utcnow() + timedelta(seconds=expires_in_seconds - self.EXPIRY_BUFFER_SECONDS)
-
-        cached_data = {
-            "token": token_data["access_token"],
-            "expiry": expiry_time,
-        }
-
-        # Cache with TTL
-        cache.set(cache_key, cached_data, timeout=expires_in_seconds)
-
-        self.structured_logger.debug(
-            "Cached Jamf access token", extra={"expiry": expiry_time.isoformat(), "expires_in": expires_in_seconds}
-        )
-
     def _get_cache_key(self) -> str:
         """
         Get cache key for token storage.
@@ -331,8 +270,7 @@ class JamfAuth:
 
         Useful for testing or forcing token refresh.
         """
-        cache_key = self._get_cache_key()
-        cache.delete(cache_key)
+        get_token_broker().invalidate(self._get_cache_key())
 
         self.structured_logger.debug("Cleared cached Jamf access token")
 
@@ -4,7 +4,7 @@
 Jamf Pro connector for macOS device and application management.
 
 Provides integration with Jamf Pro API for:
-- Device inventory management
+- Device inventory management (paged listing and resumable streaming)
 - macOS application deployment (PKG packages)
 - Policy-based deployments
 - Application installation status tracking
@@ -21,16 +21,22 @@ Example:
     computers = connector.list_computers(correlation_id='DEPLOY-123')
     package_id = connector.create_package('MyApp.pkg', 'MyApp', correlation_id='DEPLOY-456')
 """
+import asyncio
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
+from apps.connectors.inventory import InventoryPage, asset_type_for_os
 from apps.connectors.jamf.auth import JamfAuth, JamfAuthError
+from apps.connectors.models import Asset
 from apps.core.circuit_breaker import CircuitBreakerOpen
 from apps.core.resilient_http import ResilientAPIClient, ResilientAPIError
 from apps.core.structured_logging import StructuredLogger
 
 logger = logging.getLogger(__name__)
 
+# Inventory sections needed to map a computer to an Asset
+INVENTORY_SECTIONS = ["GENERAL", "HARDWARE", "OPERATING_SYSTEM", "USER_AND_LOCATION"]
+
 
 class JamfConnectorError(Exception):
     """Exception raised for Jamf connector errors."""
@@ -91,11 +97,13 @@ class JamfConnector:
         sort: Optional[str] = None,
         filter_query: Optional[str] = None,
         correlation_id: Optional[str] = None,
+        sections: Optional[List[str]] = None,
     ) -> Dict[str, Any]:
         """
-        List managed computers (macOS devices) in Jamf Pro.
+        List one page of managed computers (macOS devices) in Jamf Pro.
 
-        Uses Jamf Pro API v1 for computer inventory.
+        Uses Jamf Pro API v1 for computer inventory. Use iter_inventory_pages()
+        to stream the whole inventory.
 
         Args:
             page: Page number (0-indexed)
@@ -103,6 +111,7 @@ class JamfConnector:
             sort: Sort expression (e.g., 'general.name:asc')
             filter_query: RSQL filter query (e.g., 'general.platform=="Mac"')
             correlation_id: Correlation ID for tracing
+            sections: Inventory sections to include (e.g., ['GENERAL', 'HARDWARE']; Jamf defaults to GENERAL)
 
         Returns:
             Dict with 'totalCount' and 'results' list of computer objects
@@ -115,7 +124,7 @@ class JamfConnector:
 
         try:
             headers = self._get_auth_headers(correlation_id)
-            params: Dict[str, str] = {
+            params: Dict[str, Any] = {
                 "page": str(page),
                 "page-size": str(min(page_size, 2000)),
             }
@@ -126,6 +135,9 @@ class JamfConnector:
             if filter_query:
                 params["filter"] = filter_query
 
+            if sections:
+                params["section"] = sections
+
             response = self.client.get(
                 "/api/v1/computers-inventory", headers=headers, params=params, correlation_id=correlation_id
             )
@@ -155,6 +167,82 @@ class JamfConnector:
                 f"Failed to list computers: {e.message}", correlation_id=correlation_id, status_code=e.status_code
             ) from e
 
+    async def iter_inventory_pages(
+        self,
+        cursor: Optional[int] = None,
+        correlation_id: Optional[str] = None,
+        filter_query: Optional[str] = None,
+        page_size: int = 500,
+    ) -> AsyncIterator[InventoryPage]:
+        """
+        Stream every computer one inventory page at a time.
+
+        Pages are sorted by ID so a page number stays a stable resume point.
+        Requests run on a worker thread (the API client is synchronous).
+
+        Args:
+            cursor: Page number to resume from (None starts at page 0)
+            correlation_id: Correlation ID for tracing
+            filter_query: RSQL filter query
+            page_size: Computers per page (max 2000)
+
+        Yields:
+            InventoryPage whose next_cursor is the following page number (None on the last page)
+
+        Raises:
+            JamfConnectorError: If a page cannot be fetched
+        """
+        page = int(cursor or 0)
+        page_size = min(page_size, 2000)
+
+        while True:
+            response = await asyncio.to_thread(
+                self.list_computers,
+                page=page,
+                page_size=page_size,
+                sort="id:asc",
+                filter_query=filter_query,
+                correlation_id=correlation_id,
+                sections=INVENTORY_SECTIONS,
+            )
+            computers = response.get("results", [])
+            total = response.get("totalCount")
+
+            if not computers:
+                more = False
+            elif total is not None:
+                more = (page + 1) * page_size < total
+            else:
+                more = len(computers) == page_size
+
+            yield InventoryPage(records=computers, next_cursor=page + 1 if more else None, total=total)
+            if not more:
+                return
+            page += 1
+
+    def map_asset(self, computer: Dict[str, Any]) -> Dict[str, Any]:
+        """Map a Jamf computer inventory record to Asset fields."""
+        general = computer.get("general") or {}
+        hardware = computer.get("hardware") or {}
+        operating_system = computer.get("operatingSystem") or {}
+        user = computer.get("userAndLocation") or {}
+
+        os_name = operating_system.get("name") or general.get("platform") or "macOS"
+        model = hardware.get("model") or ""
+        return {
+            "asset_id": f"jamf-{computer.get('id')}" if computer.get("id") else None,
+            "name": general.get("name") or "Unknown",
+            "serial_number": hardware.get("serialNumber") or "",
+            "type": Asset.AssetType.LAPTOP if "book" in model.lower() else asset_type_for_os(os_name),
+            "os": " ".join(part for part in (os_name, operating_system.get("version")) if part)[:100],
+            "status": Asset.Status.ACTIVE,
+            "location": user.get("room") or "",
+            "owner": user.get("email") or user.get("username") or "",
+            "is_demo": False,
+            "connector_type": "jamf",
+            "connector_object_id": str(computer.get("id") or ""),
+        }
+
     def get_computer_by_id(self, computer_id: str, correlation_id: Optional[str] = None) -> Dict:
         """
         Get detailed information for a specific computer.
@@ -7,6 +7,7 @@ Tests device management, package deployment, and policy operations.
 from unittest.mock import MagicMock, Mock, patch
 
 import pytest
+from asgiref.sync import async_to_sync
 from django.core.cache import cache
 from django.test import TestCase
 
@@ -196,6 +197,70 @@ class TestJamfComputerManagement(TestCase):
         self.assertEqual(context.exception.status_code, 404)
 
 
+class TestJamfInventoryStream(TestCase):
+    """Test streaming computers for inventory sync."""
+
+    def setUp(self):
+        """Setup for each test."""
+        cache.clear()
+        self.connector = JamfConnector()
+
+    def tearDown(self):
+        """Cleanup after each test."""
+        cache.clear()
+
+    def _collect(self, **kwargs):
+        async def collect():
+            return [page async for page in self.connector.iter_inventory_pages(**kwargs)]
+
+        return async_to_sync(collect)()
+
+    def test_streams_every_page(self):
+        """Should page through the inventory sorted by ID with page numbers as cursors."""
+        with patch.object(self.connector, "list_computers") as mock_list:
+            mock_list.side_effect = [
+                {"totalCount": 3, "results": [{"id": "1"}, {"id": "2"}]},
+                {"totalCount": 3, "results": [{"id": "3"}]},
+            ]
+
+            pages = self._collect(page_size=2, correlation_id="TEST-STREAM")
+
+        self.assertEqual([page.next_cursor for page in pages], [1, None])
+        self.assertEqual([call.kwargs["page"] for call in mock_list.call_args_list], [0, 1])
+        first_call = mock_list.call_args_list[0].kwargs
+        self.assertEqual(first_call["sort"], "id:asc")
+        self.assertIn("HARDWARE", first_call["sections"])
+
+    def test_resumes_from_cursor(self):
+        """Should start at the checkpointed page number."""
+        with patch.object(self.connector, "list_computers") as mock_list:
+            mock_list.return_value = {"totalCount": 10, "results": [{"id": "9"}, {"id": "10"}]}
+
+            pages = self._collect(cursor=4, page_size=2)
+
+        mock_list.assert_called_once()
+        self.assertEqual(mock_list.call_args.kwargs["page"], 4)
+        self.assertIsNone(pages[0].next_cursor)
+
+    def test_map_asset(self):
+        """Should map a computer inventory record to Asset fields."""
+        fields = self.connector.map_asset(
+            {
+                "id": "42",
+                "general": {"name": "MacBook-042", "platform": "Mac"},
+                "hardware": {"model": "MacBook Pro (14-inch)", "serialNumber": "C02XYZ"},
+                "operatingSystem": {"name": "macOS", "version": "14.4"},
+                "userAndLocation": {"username": "jdoe", "email": "jdoe@example.com"},
+            }
+        )
+
+        self.assertEqual(fields["asset_id"], "jamf-42")
+        self.assertEqual(fields["serial_number"], "C02XYZ")
+        self.assertEqual(fields["os"], "macOS 14.4")
+        self.assertEqual(fields["type"], "Laptop")
+        self.assertEqual(fields["owner"], "jdoe@example.com")
+
+
 class TestJamfPackageManagement(TestCase):
     """Test package deployment operations."""
 
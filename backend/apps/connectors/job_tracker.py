@@ -0,0 +1,264 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Shared completion tracking for AWX jobs and Landscape activities.
+
+Callers used to poll each job's status on its own until it reached a
+terminal state. With many concurrent rollouts, that polling made up most
+of the connector traffic. The tracker instead keeps every outstanding job
+on the running event loop in one registry, grouped by execution plane
+(connector type and server). One poll loop checks them all on a fixed
+interval:
+
+- Each plane is asked for the status of all its outstanding jobs in one
+  batched request per TRACKER_BATCH_SIZE jobs. Connectors implement
+  get_job_statuses() with AWX `id__in` filters or a Landscape bulk
+  activity query.
+- Jobs that reached a terminal status resolve the futures returned by
+  track(). Callers await a future instead of polling.
+- Each completion with a deployment correlation ID is appended to the event
+  store as DEPLOYMENT_COMPLETED or DEPLOYMENT_FAILED, in one bulk insert
+  per poll.
+
+Like the pooled HTTP clients, a tracker belongs to one event loop. Jobs are
+tracked for as long as that loop runs.
+"""
+import asyncio
+import logging
+import time
+import uuid
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Optional, Protocol
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from apps.event_store.models import DeploymentEvent
+from apps.event_store.services import append_events
+
+logger = logging.getLogger(__name__)
+
+# Jobs per batched status request
+TRACKER_BATCH_SIZE = 100
+
+EVENT_ACTOR = "job-tracker"
+
+
+class TrackableConnector(Protocol):
+    """Connector whose jobs can be tracked (AnsibleConnector, LandscapeConnector)."""
+
+    TRACKER_PLANE: str
+    TERMINAL_STATUSES: set[str]
+    SUCCESS_STATUSES: set[str]
+    server_url: str
+
+    async def get_job_statuses(
+        self, job_ids: list[str], correlation_id: Optional[str] = None
+    ) -> dict[str, dict[str, Any]]:
+        """Fetch many jobs in one request, keyed by job ID (as str)."""
+
+
+@dataclass
+class _TrackedJob:
+    job_id: str
+    correlation_id: Optional[str]
+    event_data: dict[str, Any]
+    futures: list[asyncio.Future] = field(default_factory=list)
+    tracked_at: float = field(default_factory=time.monotonic)
+
+    def is_abandoned(self) -> bool:
+        """Whether every waiter gave up (timed out or was cancelled)."""
+        return bool(self.futures) and all(future.done() for future in self.futures)
+
+
+@dataclass
+class _Plane:
+    connector: TrackableConnector
+    jobs: dict[str, _TrackedJob] = field(default_factory=dict)
+
+
+def _deployment_correlation_id(value: Optional[str]) -> Optional[uuid.UUID]:
+    """Correlation ID as a UUID, or None if the job is not tied to a deployment."""
+    try:
+        return uuid.UUID(str(value))
+    except (TypeError, ValueError):
+        return None
+
+
+class JobTracker:
+    """Multiplexes completion polling for every outstanding plane job on one event loop."""
+
+    def __init__(self, poll_interval: Optional[float] = None):
+        """
+        Initialize job tracker.
+
+        Args:
+            poll_interval: Seconds between status polls (defaults to CONNECTOR_JOB_TRACKER_POLL_SECONDS)
+        """
+        self.poll_interval = poll_interval or settings.CONNECTOR_JOB_TRACKER_POLL_SECONDS
+        self._planes: dict[tuple[str, str], _Plane] = {}
+        self._poller: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> int:
+        """Number of jobs awaiting a terminal status."""
+        return sum(len(plane.jobs) for plane in self._planes.values())
+
+    def track(
+        self,
+        connector: TrackableConnector,
+        job_id: Any,
+        correlation_id: Optional[str] = None,
+        event_data: Optional[dict[str, Any]] = None,
+    ) -> asyncio.Future:
+        """
+        Start tracking a job.
+
+        Args:
+            connector: Connector that launched the job
+            job_id: AWX job ID or Landscape activity ID
+            correlation_id: Deployment correlation ID (completion events are published for UUIDs)
+            event_data: Extra payload for the completion event (e.g. app_name, ring)
+
+        Returns:
+            Future resolving to {"success", "status", "job"} once the job is terminal
+        """
+        key = (connector.TRACKER_PLANE, connector.server_url)
+        plane = self._planes.setdefault(key, _Plane(connector=connector))
+        job_id = str(job_id)
+
+        job = plane.jobs.get(job_id)
+        if job is None:
+            job = _TrackedJob(job_id=job_id, correlation_id=correlation_id, event_data=dict(event_data or {}))
+            plane.jobs[job_id] = job
+        elif event_data:
+            job.event_data.update(event_data)
+
+        future = asyncio.get_running_loop().create_future()
+        job.futures.append(future)
+
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.create_task(self._run())
+        return future
+
+    async def wait(
+        self,
+        connector: TrackableConnector,
+        job_id: Any,
+        timeout: Optional[float] = None,
+        correlation_id: Optional[str] = None,
+        event_data: Optional[dict[str, Any]] = None,
+    ) -> dict[str, Any]:
+        """
+        Track a job and wait for its terminal status.
+
+        Raises:
+            asyncio.TimeoutError: If the job is not terminal within timeout
+        """
+        future = self.track(connector, job_id, correlation_id=correlation_id, event_data=event_data)
+        return await asyncio.wait_for(future, timeout)
+
+    async def _run(self) -> None:
+        while self.pending:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self.poll_once()
+            except Exception:
+                logger.exception("Job tracker poll failed")
+
+    async def poll_once(self) -> int:
+        """
+        Query every plane once and settle jobs that reached a terminal status.
+
+        Returns:
+            Number of jobs that completed
+        """
+        for plane in self._planes.values():
+            for job_id in [job_id for job_id, job in plane.jobs.items() if job.is_abandoned()]:
+                del plane.jobs[job_id]
+
+        planes = [plane for plane in self._planes.values() if plane.jobs]
+        completed_per_plane = await asyncio.gather(*(self._poll_plane(plane) for plane in planes))
+        completed = [item for items in completed_per_plane for item in items]
+
+        events = [event for event in (self._completion_event(*item) for item in completed) if event is not None]
+        if events:
+            try:
+                await sync_to_async(append_events)(events)
+            except Exception:
+                logger.exception(f"Job tracker could not publish {len(events)} completion events")
+
+        self._planes = {key: plane for key, plane in self._planes.items() if plane.jobs}
+        return len(completed)
+
+    async def _poll_plane(self, plane: _Plane) -> list[tuple[_Plane, _TrackedJob, dict[str, Any]]]:
+        connector = plane.connector
+        job_ids = list(plane.jobs)
+        batches = [job_ids[i : i + TRACKER_BATCH_SIZE] for i in range(0, len(job_ids), TRACKER_BATCH_SIZE)]
+
+        responses = await asyncio.gather(
+            *(connector.get_job_statuses(batch) for batch in batches), return_exceptions=True
+        )
+
+        completed = []
+        for batch, response in zip(batches, responses):
+            if isinstance(response, BaseException):
+                # Jobs stay tracked and are retried on the next poll
+                logger.warning(
+                    f"Job tracker: status query to {connector.TRACKER_PLANE} failed for {len(batch)} jobs: {response}",
+                    extra={"plane": connector.TRACKER_PLANE, "server_url": connector.server_url},
+                )
+                continue
+
+            for job_id in batch:
+                record = response.get(job_id)
+                status = (record or {}).get("status")
+                if status not in connector.TERMINAL_STATUSES:
+                    continue
+
+                job = plane.jobs.pop(job_id, None)
+                if job is None:
+                    # Settled by an overlapping poll
+                    continue
+                result = {"success": status in connector.SUCCESS_STATUSES, "status": status, "job": record}
+                for future in job.futures:
+                    if not future.done():
+                        future.set_result(result)
+                completed.append((plane, job, result))
+
+        return completed
+
+    @staticmethod
+    def _completion_event(plane: _Plane, job: _TrackedJob, result: dict[str, Any]) -> Optional[DeploymentEvent]:
+        correlation_id = _deployment_correlation_id(job.correlation_id)
+        if correlation_id is None:
+            return None
+        return DeploymentEvent(
+            correlation_id=correlation_id,
+            event_type=(
+                DeploymentEvent.EventType.DEPLOYMENT_COMPLETED
+                if result["success"]
+                else DeploymentEvent.EventType.DEPLOYMENT_FAILED
+            ),
+            event_data={
+                **job.event_data,
+                "connector_type": plane.connector.TRACKER_PLANE,
+                "job_id": job.job_id,
+                "status": result["status"],
+                "tracked_seconds": round(time.monotonic() - job.tracked_at, 3),
+            },
+            actor=EVENT_ACTOR,
+        )
+
+
+_trackers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, JobTracker]" = weakref.WeakKeyDictionary()
+
+
+def get_job_tracker() -> JobTracker:
+    """Get the job tracker for the running event loop, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    tracker = _trackers.get(loop)
+    if tracker is None:
+        tracker = _trackers[loop] = JobTracker()
+    return tracker
@@ -14,9 +14,13 @@ import logging
 import time
 from typing import Optional
 
+import httpx
 import requests
 from decouple import config
 
+from apps.connectors.http_pool import get_async_client
+from apps.connectors.token_broker import get_token_broker
+
 logger = logging.getLogger(__name__)
 
 
@@ -149,7 +153,10 @@ class LandscapeAuth:
 
     def _get_oauth_token(self) -> str:
         """
-        Get OAuth 2.0 access token, refreshing if expired.
+        Get OAuth 2.0 access token, refreshing it ahead of expiry.
+
+        The token is shared with other workers through the token broker; this
+        instance keeps it until the broker's refresh point.
 
         Returns:
             Valid access token
@@ -157,38 +164,89 @@ class LandscapeAuth:
         Raises:
             LandscapeAuthError: If token acquisition fails
         """
-        # Check if we have a valid token
-        if self._access_token and time.time() < self._token_expires_at - 60:
+        # Check if we have a token that is not yet due for refresh
+        if self._access_token and time.time() < self._token_expires_at:
             return self._access_token
 
         try:
-            response = requests.post(
-                self.token_url,
-                data={
-                    "grant_type": "client_credentials",
-                    "client_id": self.client_id,
-                    "client_secret": self.client_secret,
-                },
-                verify=self.verify_ssl,
-                timeout=30,
+            token = get_token_broker().get_token(
+                "landscape", f"landscape_token:{self.server_url}:{self.client_id}", self._request_oauth_token
             )
-            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Failed to acquire OAuth token: {e}")
+            raise LandscapeAuthError(
+                f"OAuth token acquisition failed: {e}",
+                is_transient=True,
+            )
+
+        self._access_token = token.access_token
+        self._token_expires_at = token.refresh_at
+        return self._access_token
 
-            token_data = response.json()
-            self._access_token = token_data["access_token"]
-            expires_in = token_data.get("expires_in", 3600)
-            self._token_expires_at = time.time() + expires_in
+    async def _aget_oauth_token(self) -> str:
+        """
+        Async variant of _get_oauth_token() for use inside coroutines.
+
+        Returns:
+            Valid access token
 
-            logger.info("Successfully acquired OAuth token for Landscape")
+        Raises:
+            LandscapeAuthError: If token acquisition fails
+        """
+        if self._access_token and time.time() < self._token_expires_at:
             return self._access_token
 
-        except requests.exceptions.RequestException as e:
+        try:
+            token = await get_token_broker().aget_token(
+                "landscape", f"landscape_token:{self.server_url}:{self.client_id}", self._arequest_oauth_token
+            )
+        except httpx.HTTPError as e:
             logger.error(f"Failed to acquire OAuth token: {e}")
             raise LandscapeAuthError(
                 f"OAuth token acquisition failed: {e}",
                 is_transient=True,
             )
 
+        self._access_token = token.access_token
+        self._token_expires_at = token.refresh_at
+        return self._access_token
+
+    async def _arequest_oauth_token(self) -> dict:
+        """Request a new token with the client credentials grant without blocking the event loop."""
+        # Not the pooled client: its JSON Content-Type default would override the form encoding
+        async with httpx.AsyncClient(verify=self.verify_ssl, timeout=30) as client:
+            response = await client.post(
+                self.token_url,
+                data={
+                    "grant_type": "client_credentials",
+                    "client_id": self.client_id,
+                    "client_secret": self.client_secret,
+                },
+            )
+        response.raise_for_status()
+
+        token_data = response.json()
+        logger.info("Successfully acquired OAuth token for Landscape")
+        return {"access_token": token_data["access_token"], "expires_in": token_data.get("expires_in", 3600)}
+
+    def _request_oauth_token(self) -> dict:
+        """Request a new token with the client credentials grant."""
+        response = requests.post(
+            self.token_url,
+            data={
+                "grant_type": "client_credentials",
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
+            },
+            verify=self.verify_ssl,
+            timeout=30,
+        )
+        response.raise_for_status()
+
+        token_data = response.json()
+        logger.info("Successfully acquired OAuth token for Landscape")
+        return {"access_token": token_data["access_token"], "expires_in": token_data.get("expires_in", 3600)}
+
     def get_session(self) -> requests.Session:
         """
         Get or create authenticated session.
@@ -218,6 +276,28 @@ class LandscapeAuth:
 
         return self._session
 
+    def get_async_client(self) -> httpx.AsyncClient:
+        """
+        Get the pooled async client for this server (shared per event loop).
+
+        Returns:
+            Configured httpx.AsyncClient; per-request signing still goes through asign_request
+        """
+        cert = None
+        if self.auth_method == "certificate":
+            cert = (self.cert_path, self.key_path) if self.key_path else self.cert_path
+
+        return get_async_client(
+            ("landscape", self.server_url, self.auth_method, cert, self.verify_ssl),
+            headers={
+                "Accept": "application/json",
+                "Content-Type": "application/json",
+                "User-Agent": "EUCORA-ControlPlane/1.0",
+            },
+            verify=self.verify_ssl,
+            cert=cert,
+        )
+
     def sign_request(
         self,
         method: str,
@@ -263,6 +343,35 @@ class LandscapeAuth:
 
         return headers
 
+    async def asign_request(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str],
+        body: str = "",
+    ) -> dict[str, str]:
+        """
+        Async variant of sign_request() for the pooled async client.
+
+        OAuth tokens are fetched through the broker's async path, so a token
+        refresh does not block the event loop.
+
+        Args:
+            method: HTTP method
+            url: Full request URL
+            headers: Existing headers
+            body: Request body exactly as it will be sent
+
+        Returns:
+            Updated headers with authentication
+        """
+        if self.auth_method == "oauth":
+            token = await self._aget_oauth_token()
+            headers["Authorization"] = f"Bearer {token}"
+            return headers
+
+        return self.sign_request(method, url, headers, body)
+
     def clear_session(self) -> None:
         """Clear the current session, forcing re-authentication."""
         if self._session:
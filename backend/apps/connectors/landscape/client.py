@@ -12,6 +12,7 @@ Provides integration with Canonical Landscape for:
 
 API Reference: https://landscape.canonical.com/api
 """
+import asyncio
 import hashlib
 import json
 import logging
@@ -19,8 +20,10 @@ from datetime import datetime
 from typing import Any, Optional
 from uuid import uuid4
 
-import requests
+import httpx
 
+from apps.connectors.idempotency import get_idempotency_store
+from apps.connectors.job_tracker import TRACKER_BATCH_SIZE, get_job_tracker
 from apps.core.structured_logging import StructuredLogger
 
 from .auth import LandscapeAuth
@@ -61,9 +64,12 @@ class LandscapeConnector:
     for audit trail and reconciliation support.
     """
 
-    # Cache for idempotent operations (TTL: 1 hour)
-    _idempotency_cache: dict[str, tuple[dict, float]] = {}
-    CACHE_TTL_SECONDS = 3600
+    # Activity statuses after which an activity no longer changes
+    TERMINAL_STATUSES = {"succeeded", "completed", "failed", "canceled", "undeliverable"}
+    SUCCESS_STATUSES = {"succeeded", "completed"}
+
+    # Plane name used by the shared job tracker
+    TRACKER_PLANE = "landscape"
 
     def __init__(self, auth: Optional[LandscapeAuth] = None):
         """
@@ -75,8 +81,10 @@ class LandscapeConnector:
         self.auth = auth or LandscapeAuth()
         self.server_url = self.auth.server_url
         self.logger = StructuredLogger(__name__)
+        # Results of idempotent operations, shared across workers
+        self._idempotency_cache = get_idempotency_store("landscape")
 
-    def _make_request(
+    async def _make_request(
         self,
         method: str,
         endpoint: str,
@@ -85,7 +93,7 @@ class LandscapeConnector:
         correlation_id: Optional[str] = None,
     ) -> dict[str, Any]:
         """
-        Make authenticated request to Landscape API.
+        Make authenticated request to Landscape API over the pooled async client.
 
         Args:
             method: HTTP method
@@ -103,26 +111,24 @@ class LandscapeConnector:
         url = f"{self.server_url}{endpoint}"
         correlation_id = correlation_id or str(uuid4())
 
-        session = self.auth.get_session()
-        headers = {"X-Correlation-ID": correlation_id}
+        client = self.auth.get_async_client()
+        headers = {"X-Correlation-ID": correlation_id, "Content-Type": "application/json"}
 
-        # Prepare body for signing
-        body = json.dumps(json_data) if json_data else ""
-        headers = self.auth.sign_request(method, url, headers, body)
+        # Sign exactly the bytes that are sent
+        body = json.dumps(json_data) if json_data is not None else ""
+        headers = await self.auth.asign_request(method, url, headers, body)
 
         self.logger.info(
             "landscape_api_request",
-            method=method,
-            endpoint=endpoint,
-            correlation_id=correlation_id,
+            extra={"extra": {"method": method, "endpoint": endpoint, "correlation_id": correlation_id}},
         )
 
         try:
-            response = session.request(
+            response = await client.request(
                 method=method,
                 url=url,
                 params=params,
-                json=json_data,
+                content=body.encode("utf-8") if body else None,
                 headers=headers,
                 timeout=60,
             )
@@ -130,8 +136,7 @@ class LandscapeConnector:
             # Log response
             self.logger.info(
                 "landscape_api_response",
-                status_code=response.status_code,
-                correlation_id=correlation_id,
+                extra={"extra": {"status_code": response.status_code, "correlation_id": correlation_id}},
             )
 
             # Handle specific status codes
@@ -158,27 +163,27 @@ class LandscapeConnector:
 
             return response.json()
 
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             raise LandscapeConnectorError(
                 "Request timeout",
                 is_transient=True,
             )
 
-        except requests.exceptions.ConnectionError as e:
+        except httpx.TransportError as e:
             raise LandscapeConnectorError(
                 f"Connection error: {e}",
                 is_transient=True,
             )
 
-        except requests.exceptions.HTTPError as e:
-            status_code = e.response.status_code if e.response else None
+        except httpx.HTTPStatusError as e:
+            status_code = e.response.status_code if e.response is not None else None
             is_transient = status_code in (408, 429, 502, 503, 504) if status_code else False
 
             raise LandscapeConnectorError(
                 f"HTTP error: {e}",
                 is_transient=is_transient,
                 status_code=status_code,
-                response_body=e.response.text if e.response else None,
+                response_body=e.response.text if e.response is not None else None,
             )
 
     def get_idempotency_key(self, operation: str, params: dict) -> str:
@@ -195,20 +200,6 @@ class LandscapeConnector:
         key_data = json.dumps({"operation": operation, "params": params}, sort_keys=True)
         return hashlib.sha256(key_data.encode()).hexdigest()
 
-    def _get_cached_result(self, idempotency_key: str) -> Optional[dict]:
-        """Get cached result if exists and not expired."""
-        if idempotency_key in self._idempotency_cache:
-            result, timestamp = self._idempotency_cache[idempotency_key]
-            if datetime.now().timestamp() - timestamp < self.CACHE_TTL_SECONDS:
-                return result
-            # Expired, remove from cache
-            del self._idempotency_cache[idempotency_key]
-        return None
-
-    def _cache_result(self, idempotency_key: str, result: dict) -> None:
-        """Cache operation result."""
-        self._idempotency_cache[idempotency_key] = (result, datetime.now().timestamp())
-
     async def test_connection(self) -> tuple[bool, str]:
         """
         Test connection to Landscape server.
@@ -216,7 +207,7 @@ class LandscapeConnector:
         Returns:
             Tuple of (success, message)
         """
-        return self.auth.test_connection()
+        return await asyncio.to_thread(self.auth.test_connection)
 
     # =========================================================================
     # Computer Management
@@ -252,7 +243,7 @@ class LandscapeConnector:
         if tags:
             params["tags"] = ",".join(tags)
 
-        response = self._make_request(
+        response = await self._make_request(
             "GET",
             "/api/v2/computers",
             params=params,
@@ -263,10 +254,7 @@ class LandscapeConnector:
 
         self.logger.info(
             "landscape_list_computers",
-            count=len(computers),
-            query=query,
-            tags=tags,
-            correlation_id=correlation_id,
+            extra={"count": len(computers), "query": query, "tags": tags, "correlation_id": correlation_id},
         )
 
         return {
@@ -292,7 +280,7 @@ class LandscapeConnector:
         Returns:
             Computer details
         """
-        response = self._make_request(
+        response = await self._make_request(
             "GET",
             f"/api/v2/computers/{computer_id}",
             correlation_id=correlation_id,
@@ -324,7 +312,7 @@ class LandscapeConnector:
         if installed_only:
             params["installed"] = "true"
 
-        response = self._make_request(
+        response = await self._make_request(
             "GET",
             f"/api/v2/computers/{computer_id}/packages",
             params=params,
@@ -354,7 +342,7 @@ class LandscapeConnector:
         Returns:
             Operation result
         """
-        self._make_request(
+        await self._make_request(
             "POST",
             f"/api/v2/computers/{computer_id}/tags",
             json_data={"tags": tags},
@@ -363,9 +351,7 @@ class LandscapeConnector:
 
         self.logger.info(
             "landscape_add_tags",
-            computer_id=computer_id,
-            tags=tags,
-            correlation_id=correlation_id,
+            extra={"computer_id": computer_id, "tags": tags, "correlation_id": correlation_id},
         )
 
         return {
@@ -391,7 +377,7 @@ class LandscapeConnector:
         Returns:
             Operation result
         """
-        self._make_request(
+        await self._make_request(
             "DELETE",
             f"/api/v2/computers/{computer_id}/tags",
             json_data={"tags": tags},
@@ -400,9 +386,7 @@ class LandscapeConnector:
 
         self.logger.info(
             "landscape_remove_tags",
-            computer_id=computer_id,
-            tags=tags,
-            correlation_id=correlation_id,
+            extra={"computer_id": computer_id, "tags": tags, "correlation_id": correlation_id},
         )
 
         return {
@@ -438,7 +422,7 @@ class LandscapeConnector:
         if search:
             params["search"] = search
 
-        response = self._make_request(
+        response = await self._make_request(
             "GET",
             "/api/v2/packages",
             params=params,
@@ -475,19 +459,6 @@ class LandscapeConnector:
         """
         correlation_id = correlation_id or str(uuid4())
 
-        # Check idempotency cache
-        idempotency_key = self.get_idempotency_key(
-            "install_packages",
-            {"computer_ids": sorted(computer_ids), "packages": sorted(packages)},
-        )
-        cached = self._get_cached_result(idempotency_key)
-        if cached:
-            self.logger.info(
-                "landscape_install_packages_cached",
-                correlation_id=correlation_id,
-            )
-            return cached
-
         json_data: dict[str, Any] = {
             "computer_ids": computer_ids,
             "packages": packages,
@@ -495,29 +466,35 @@ class LandscapeConnector:
         if deliver_after:
             json_data["deliver_after"] = deliver_after.isoformat()
 
-        response = self._make_request(
-            "POST",
-            "/api/v2/activities/install-packages",
-            json_data=json_data,
-            correlation_id=correlation_id,
-        )
-
-        result = {
-            "success": True,
-            "activity_id": response.get("activity_id"),
-            "computer_ids": computer_ids,
-            "packages": packages,
-            "correlation_id": correlation_id,
-        }
+        async def install() -> dict[str, Any]:
+            response = await self._make_request(
+                "POST",
+                "/api/v2/activities/install-packages",
+                json_data=json_data,
+                correlation_id=correlation_id,
+            )
+            return {
+                "success": True,
+                "activity_id": response.get("activity_id"),
+                "computer_ids": computer_ids,
+                "packages": packages,
+                "correlation_id": correlation_id,
+            }
 
-        self._cache_result(idempotency_key, result)
+        idempotency_key = self.get_idempotency_key(
+            "install_packages",
+            {"computer_ids": sorted(computer_ids), "packages": sorted(packages)},
+        )
+        result = await self._idempotency_cache.run_once(idempotency_key, install)
 
         self.logger.info(
             "landscape_install_packages",
-            activity_id=response.get("activity_id"),
-            computer_count=len(computer_ids),
-            package_count=len(packages),
-            correlation_id=correlation_id,
+            extra={
+                "activity_id": result.get("activity_id"),
+                "computer_count": len(computer_ids),
+                "package_count": len(packages),
+                "correlation_id": correlation_id,
+            },
         )
 
         return result
@@ -541,41 +518,38 @@ class LandscapeConnector:
         """
         correlation_id = correlation_id or str(uuid4())
 
-        # Check idempotency cache
+        async def remove() -> dict[str, Any]:
+            response = await self._make_request(
+                "POST",
+                "/api/v2/activities/remove-packages",
+                json_data={
+                    "computer_ids": computer_ids,
+                    "packages": packages,
+                },
+                correlation_id=correlation_id,
+            )
+            return {
+                "success": True,
+                "activity_id": response.get("activity_id"),
+                "computer_ids": computer_ids,
+                "packages": packages,
+                "correlation_id": correlation_id,
+            }
+
         idempotency_key = self.get_idempotency_key(
             "remove_packages",
             {"computer_ids": sorted(computer_ids), "packages": sorted(packages)},
         )
-        cached = self._get_cached_result(idempotency_key)
-        if cached:
-            return cached
-
-        response = self._make_request(
-            "POST",
-            "/api/v2/activities/remove-packages",
-            json_data={
-                "computer_ids": computer_ids,
-                "packages": packages,
-            },
-            correlation_id=correlation_id,
-        )
-
-        result = {
-            "success": True,
-            "activity_id": response.get("activity_id"),
-            "computer_ids": computer_ids,
-            "packages": packages,
-            "correlation_id": correlation_id,
-        }
-
-        self._cache_result(idempotency_key, result)
+        result = await self._idempotency_cache.run_once(idempotency_key, remove)
 
         self.logger.info(
             "landscape_remove_packages",
-            activity_id=response.get("activity_id"),
-            computer_count=len(computer_ids),
-            package_count=len(packages),
-            correlation_id=correlation_id,
+            extra={
+                "activity_id": result.get("activity_id"),
+                "computer_count": len(computer_ids),
+                "package_count": len(packages),
+                "correlation_id": correlation_id,
+            },
         )
 
         return result
@@ -608,7 +582,7 @@ class LandscapeConnector:
         if packages:
             json_data["packages"] = packages
 
-        response = self._make_request(
+        response = await self._make_request(
             "POST",
             "/api/v2/activities/upgrade-packages",
             json_data=json_data,
@@ -617,10 +591,12 @@ class LandscapeConnector:
 
         self.logger.info(
             "landscape_upgrade_packages",
-            activity_id=response.get("activity_id"),
-            computer_count=len(computer_ids),
-            security_only=security_only,
-            correlation_id=correlation_id,
+            extra={
+                "activity_id": response.get("activity_id"),
+                "computer_count": len(computer_ids),
+                "security_only": security_only,
+                "correlation_id": correlation_id,
+            },
         )
 
         return {
@@ -646,7 +622,7 @@ class LandscapeConnector:
         Returns:
             List of repositories
         """
-        response = self._make_request(
+        response = await self._make_request(
             "GET",
             "/api/v2/repositories",
             correlation_id=correlation_id,
@@ -684,15 +660,6 @@ class LandscapeConnector:
         """
         correlation_id = correlation_id or str(uuid4())
 
-        # Idempotency check
-        idempotency_key = self.get_idempotency_key(
-            "create_repository",
-            {"name": name, "uri": uri, "distribution": distribution},
-        )
-        cached = self._get_cached_result(idempotency_key)
-        if cached:
-            return cached
-
         json_data = {
             "name": name,
             "uri": uri,
@@ -703,41 +670,45 @@ class LandscapeConnector:
         if gpg_key:
             json_data["gpg_key"] = gpg_key
 
-        try:
-            response = self._make_request(
-                "POST",
-                "/api/v2/repositories",
-                json_data=json_data,
-                correlation_id=correlation_id,
-            )
-
-            result = {
-                "success": True,
-                "created": True,
-                "repository": response,
-                "correlation_id": correlation_id,
-            }
-
-        except LandscapeConnectorError as e:
-            if e.status_code == 409:
-                # Already exists - idempotent success
-                result = {
+        async def create() -> dict[str, Any]:
+            try:
+                response = await self._make_request(
+                    "POST",
+                    "/api/v2/repositories",
+                    json_data=json_data,
+                    correlation_id=correlation_id,
+                )
+                return {
                     "success": True,
-                    "created": False,
-                    "message": "Repository already exists",
+                    "created": True,
+                    "repository": response,
                     "correlation_id": correlation_id,
                 }
-            else:
+            except LandscapeConnectorError as e:
+                if e.status_code == 409:
+                    # Already exists - idempotent success
+                    return {
+                        "success": True,
+                        "created": False,
+                        "message": "Repository already exists",
+                        "correlation_id": correlation_id,
+                    }
                 raise
 
-        self._cache_result(idempotency_key, result)
+        idempotency_key = self.get_idempotency_key(
+            "create_repository",
+            {"name": name, "uri": uri, "distribution": distribution},
+        )
+        result = await self._idempotency_cache.run_once(idempotency_key, create)
 
         self.logger.info(
             "landscape_create_repository",
-            name=name,
-            uri=uri,
-            created=result.get("created", False),
-            correlation_id=correlation_id,
+            extra={
+                "repository_name": name,
+                "uri": uri,
+                "repository_created": result.get("created", False),
+                "correlation_id": correlation_id,
+            },
         )
 
         return result
@@ -757,7 +728,7 @@ class LandscapeConnector:
         Returns:
             Sync activity details
         """
-        response = self._make_request(
+        response = await self._make_request(
             "POST",
             f"/api/v2/repositories/{repository_id}/sync",
             correlation_id=correlation_id,
@@ -765,9 +736,11 @@ class LandscapeConnector:
 
         self.logger.info(
             "landscape_sync_repository",
-            repository_id=repository_id,
-            activity_id=response.get("activity_id"),
-            correlation_id=correlation_id,
+            extra={
+                "repository_id": repository_id,
+                "activity_id": response.get("activity_id"),
+                "correlation_id": correlation_id,
+            },
         )
 
         return {
@@ -805,7 +778,7 @@ class LandscapeConnector:
         """
         correlation_id = correlation_id or str(uuid4())
 
-        response = self._make_request(
+        response = await self._make_request(
             "POST",
             "/api/v2/activities/run-script",
             json_data={
@@ -820,10 +793,12 @@ class LandscapeConnector:
 
         self.logger.info(
             "landscape_run_script",
-            activity_id=response.get("activity_id"),
-            computer_count=len(computer_ids),
-            interpreter=interpreter,
-            correlation_id=correlation_id,
+            extra={
+                "activity_id": response.get("activity_id"),
+                "computer_count": len(computer_ids),
+                "interpreter": interpreter,
+                "correlation_id": correlation_id,
+            },
         )
 
         return {
@@ -852,7 +827,7 @@ class LandscapeConnector:
         Returns:
             Activity details including status and results
         """
-        response = self._make_request(
+        response = await self._make_request(
             "GET",
             f"/api/v2/activities/{activity_id}",
             correlation_id=correlation_id,
@@ -888,7 +863,7 @@ class LandscapeConnector:
         if activity_type:
             params["type"] = activity_type
 
-        response = self._make_request(
+        response = await self._make_request(
             "GET",
             "/api/v2/activities",
             params=params,
@@ -901,6 +876,69 @@ class LandscapeConnector:
             "total": response.get("total", 0),
         }
 
+    async def get_job_statuses(
+        self,
+        job_ids: list[str],
+        correlation_id: Optional[str] = None,
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Get many activities in one bulk activity query.
+
+        Args:
+            job_ids: Activity IDs (at most TRACKER_BATCH_SIZE)
+            correlation_id: Correlation ID for audit
+
+        Returns:
+            Activities keyed by activity ID (as str); unknown IDs are absent
+        """
+        response = await self._make_request(
+            "GET",
+            "/api/v2/activities",
+            params={
+                "query": " OR ".join(f"id:{activity_id}" for activity_id in job_ids),
+                "limit": TRACKER_BATCH_SIZE,
+            },
+            correlation_id=correlation_id,
+        )
+        return {str(activity["id"]): activity for activity in response.get("activities", [])}
+
+    async def wait_for_activity(
+        self,
+        activity_id: str,
+        timeout: int = 600,
+        correlation_id: Optional[str] = None,
+    ) -> dict[str, Any]:
+        """
+        Wait for an activity to reach a terminal status.
+
+        The activity is registered with the shared job tracker, which checks
+        all outstanding activities on this event loop with bulk queries and
+        publishes the completion to the event store.
+
+        Args:
+            activity_id: Activity ID to wait for
+            timeout: Maximum wait time in seconds
+            correlation_id: Correlation ID for audit
+
+        Returns:
+            Final activity status
+        """
+        try:
+            result = await get_job_tracker().wait(self, activity_id, timeout=timeout, correlation_id=correlation_id)
+        except asyncio.TimeoutError:
+            return {
+                "success": False,
+                "status": "timeout",
+                "activity_id": activity_id,
+                "message": f"Activity did not complete within {timeout} seconds",
+            }
+
+        return {
+            "success": result["success"],
+            "status": result["status"],
+            "activity": result["job"],
+        }
+
     async def cancel_activity(
         self,
         activity_id: str,
@@ -916,7 +954,7 @@ class LandscapeConnector:
         Returns:
             Cancellation result
         """
-        self._make_request(
+        await self._make_request(
             "POST",
             f"/api/v2/activities/{activity_id}/cancel",
             correlation_id=correlation_id,
@@ -924,8 +962,7 @@ class LandscapeConnector:
 
         self.logger.info(
             "landscape_cancel_activity",
-            activity_id=activity_id,
-            correlation_id=correlation_id,
+            extra={"activity_id": activity_id, "correlation_id": correlation_id},
         )
 
         return {
@@ -961,7 +998,7 @@ class LandscapeConnector:
         if tags:
             params["tags"] = ",".join(tags)
 
-        response = self._make_request(
+        response = await self._make_request(
             "GET",
             "/api/v2/compliance/packages",
             params=params,
@@ -1007,7 +1044,7 @@ class LandscapeConnector:
         if severity:
             params["severity"] = severity
 
-        response = self._make_request(
+        response = await self._make_request(
             "GET",
             "/api/v2/security/updates",
             params=params,
@@ -1044,7 +1081,7 @@ class LandscapeConnector:
         """
         correlation_id = correlation_id or str(uuid4())
 
-        response = self._make_request(
+        response = await self._make_request(
             "POST",
             "/api/v2/activities/install-packages",
             json_data={
@@ -1057,10 +1094,12 @@ class LandscapeConnector:
 
         self.logger.info(
             "landscape_rollback_packages",
-            activity_id=response.get("activity_id"),
-            computer_count=len(computer_ids),
-            package_count=len(packages),
-            correlation_id=correlation_id,
+            extra={
+                "activity_id": response.get("activity_id"),
+                "computer_count": len(computer_ids),
+                "package_count": len(packages),
+                "correlation_id": correlation_id,
+            },
         )
 
         return {
@@ -1102,8 +1141,7 @@ class LandscapeConnector:
 
         self.logger.info(
             "landscape_sync_inventory",
-            computer_count=len(computers),
-            correlation_id=correlation_id,
+            extra={"computer_count": len(computers), "correlation_id": correlation_id},
         )
 
         return {
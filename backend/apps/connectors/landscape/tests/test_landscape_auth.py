@@ -1,7 +1,7 @@
 # SPDX-License-Identifier: Apache-2.0
 # Copyright (c) 2026 BuildWorks.AI
 """Tests for Landscape authentication."""
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 import requests
@@ -362,3 +362,15 @@ class TestLandscapeAuthOAuth:
 
             assert "Authorization" in signed
             assert signed["Authorization"] == "Bearer oauth_token"
+
+    @pytest.mark.asyncio
+    async def test_asign_request_oauth_uses_async_token(self, oauth_auth):
+        """Test that async signing fetches the OAuth token without the blocking path."""
+        with (
+            patch.object(oauth_auth, "_get_oauth_token") as sync_token,
+            patch.object(oauth_auth, "_aget_oauth_token", AsyncMock(return_value="oauth_token")),
+        ):
+            signed = await oauth_auth.asign_request("GET", "https://landscape.example.com/api/v2/computers", {})
+
+        assert signed["Authorization"] == "Bearer oauth_token"
+        sync_token.assert_not_called()
@@ -1,10 +1,10 @@
 # SPDX-License-Identifier: Apache-2.0
 # Copyright (c) 2026 BuildWorks.AI
 """Tests for Landscape connector client."""
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
-import requests
+import httpx
 
 from apps.connectors.landscape.client import LandscapeConnector, LandscapeConnectorError
 
@@ -15,8 +15,8 @@ def mock_auth():
     auth = Mock()
     auth.server_url = "https://landscape.example.com"
     auth.test_connection.return_value = (True, "Connected to Landscape v23.10")
-    auth.get_session.return_value = Mock(spec=requests.Session)
-    auth.sign_request.return_value = {"X-LDS-Access-Key": "test"}
+    auth.get_async_client.return_value = AsyncMock(spec=httpx.AsyncClient)
+    auth.asign_request = AsyncMock(return_value={"X-LDS-Access-Key": "test"})
     return auth
 
 
@@ -96,9 +96,9 @@ class TestLandscapeConnectorListComputers:
         }
         mock_response.raise_for_status = Mock()
 
-        mock_session = Mock()
-        mock_session.request.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.list_computers(correlation_id="test-123")
 
@@ -114,15 +114,15 @@ class TestLandscapeConnectorListComputers:
         mock_response.json.return_value = {"computers": [], "total": 0}
         mock_response.raise_for_status = Mock()
 
-        mock_session = Mock()
-        mock_session.request.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.list_computers(query="web-server")
 
         assert result["success"] is True
         # Verify query param was passed
-        call_args = mock_session.request.call_args
+        call_args = mock_client.request.call_args
         assert call_args[1]["params"]["query"] == "web-server"
 
     @pytest.mark.asyncio
@@ -133,9 +133,9 @@ class TestLandscapeConnectorListComputers:
         mock_response.json.return_value = {"computers": [], "total": 0}
         mock_response.raise_for_status = Mock()
 
-        mock_session = Mock()
-        mock_session.request.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.list_computers(tags=["production", "web"])
 
@@ -153,9 +153,9 @@ class TestLandscapeConnectorInstallPackages:
         mock_response.json.return_value = {"activity_id": "act-123"}
         mock_response.raise_for_status = Mock()
 
-        mock_session = Mock()
-        mock_session.request.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.install_packages(
             computer_ids=["1", "2"],
@@ -175,9 +175,9 @@ class TestLandscapeConnectorInstallPackages:
         mock_response.json.return_value = {"activity_id": "act-123"}
         mock_response.raise_for_status = Mock()
 
-        mock_session = Mock()
-        mock_session.request.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         # First call
         result1 = await connector.install_packages(
@@ -192,7 +192,7 @@ class TestLandscapeConnectorInstallPackages:
         )
 
         # Session.request should only be called once
-        assert mock_session.request.call_count == 1
+        assert mock_client.request.call_count == 1
         assert result1 == result2
 
 
@@ -207,9 +207,9 @@ class TestLandscapeConnectorRemovePackages:
         mock_response.json.return_value = {"activity_id": "act-456"}
         mock_response.raise_for_status = Mock()
 
-        mock_session = Mock()
-        mock_session.request.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.remove_packages(
             computer_ids=["1"],
@@ -231,9 +231,9 @@ class TestLandscapeConnectorUpgradePackages:
         mock_response.json.return_value = {"activity_id": "act-789"}
         mock_response.raise_for_status = Mock()
 
-        mock_session = Mock()
-        mock_session.request.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.upgrade_packages(computer_ids=["1", "2"])
 
@@ -247,9 +247,9 @@ class TestLandscapeConnectorUpgradePackages:
         mock_response.json.return_value = {"activity_id": "act-sec"}
         mock_response.raise_for_status = Mock()
 
-        mock_session = Mock()
-        mock_session.request.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.upgrade_packages(
             computer_ids=["1"],
@@ -276,9 +276,9 @@ class TestLandscapeConnectorRepositories:
         }
         mock_response.raise_for_status = Mock()
 
-        mock_session = Mock()
-        mock_session.request.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.list_repositories()
 
@@ -293,9 +293,9 @@ class TestLandscapeConnectorRepositories:
         mock_response.json.return_value = {"id": "repo-new", "name": "Custom Repo"}
         mock_response.raise_for_status = Mock()
 
-        mock_session = Mock()
-        mock_session.request.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.create_repository(
             name="Custom Repo",
@@ -314,9 +314,9 @@ class TestLandscapeConnectorRepositories:
         mock_response = Mock()
         mock_response.status_code = 409
 
-        mock_session = Mock()
-        mock_session.request.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         # Clear cache to ensure fresh call
         connector._idempotency_cache.clear()
@@ -343,9 +343,9 @@ class TestLandscapeConnectorRepositories:
         mock_response.json.return_value = {"activity_id": "sync-123"}
         mock_response.raise_for_status = Mock()
 
-        mock_session = Mock()
-        mock_session.request.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.sync_repository(repository_id="repo-1")
 
@@ -364,9 +364,9 @@ class TestLandscapeConnectorScriptExecution:
         mock_response.json.return_value = {"activity_id": "script-123"}
         mock_response.raise_for_status = Mock()
 
-        mock_session = Mock()
-        mock_session.request.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.run_script(
             computer_ids=["1", "2"],
@@ -392,9 +392,9 @@ class TestLandscapeConnectorActivities:
         }
         mock_response.raise_for_status = Mock()
 
-        mock_session = Mock()
-        mock_session.request.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.get_activity(activity_id="act-123")
 
@@ -415,9 +415,9 @@ class TestLandscapeConnectorActivities:
         }
         mock_response.raise_for_status = Mock()
 
-        mock_session = Mock()
-        mock_session.request.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.list_activities()
 
@@ -432,15 +432,39 @@ class TestLandscapeConnectorActivities:
         mock_response.json.return_value = {}
         mock_response.raise_for_status = Mock()
 
-        mock_session = Mock()
-        mock_session.request.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.cancel_activity(activity_id="act-123")
 
         assert result["success"] is True
         assert result["cancelled"] is True
 
+    @pytest.mark.asyncio
+    async def test_get_job_statuses_bulk_query(self, connector):
+        """Test outstanding activities are fetched in one bulk query."""
+        make_request = AsyncMock(return_value={"activities": [{"id": "a1", "status": "succeeded"}]})
+
+        with patch.object(connector, "_make_request", make_request):
+            statuses = await connector.get_job_statuses(["a1", "a2"])
+
+        assert make_request.call_args.kwargs["params"]["query"] == "id:a1 OR id:a2"
+        assert statuses == {"a1": {"id": "a1", "status": "succeeded"}}
+
+    @pytest.mark.asyncio
+    async def test_wait_for_activity_times_out(self, connector, settings):
+        """Test an activity still running at the timeout reports a timeout."""
+        settings.CONNECTOR_JOB_TRACKER_POLL_SECONDS = 0.01
+        make_request = AsyncMock(return_value={"activities": [{"id": "a1", "status": "delivered"}]})
+
+        with patch.object(connector, "_make_request", make_request):
+            result = await connector.wait_for_activity("a1", timeout=0.05)
+
+        assert result["success"] is False
+        assert result["status"] == "timeout"
+        assert make_request.await_count >= 1
+
 
 class TestLandscapeConnectorCompliance:
     """Tests for compliance reporting."""
@@ -458,9 +482,9 @@ class TestLandscapeConnectorCompliance:
         }
         mock_response.raise_for_status = Mock()
 
-        mock_session = Mock()
-        mock_session.request.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.get_compliance_status()
 
@@ -483,9 +507,9 @@ class TestLandscapeConnectorCompliance:
         }
         mock_response.raise_for_status = Mock()
 
-        mock_session = Mock()
-        mock_session.request.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.get_security_updates()
 
@@ -504,9 +528,9 @@ class TestLandscapeConnectorRollback:
         mock_response.json.return_value = {"activity_id": "rollback-123"}
         mock_response.raise_for_status = Mock()
 
-        mock_session = Mock()
-        mock_session.request.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.rollback_packages(
             computer_ids=["1"],
@@ -537,9 +561,9 @@ class TestLandscapeConnectorInventorySync:
         }
         mock_response.raise_for_status = Mock()
 
-        mock_session = Mock()
-        mock_session.request.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.sync_inventory(correlation_id="sync-123")
 
@@ -557,9 +581,9 @@ class TestLandscapeConnectorErrorHandling:
         mock_response = Mock()
         mock_response.status_code = 429
 
-        mock_session = Mock()
-        mock_session.request.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         with pytest.raises(LandscapeConnectorError) as exc_info:
             await connector.list_computers()
@@ -574,9 +598,9 @@ class TestLandscapeConnectorErrorHandling:
         mock_response.status_code = 500
         mock_response.text = "Internal Server Error"
 
-        mock_session = Mock()
-        mock_session.request.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         with pytest.raises(LandscapeConnectorError) as exc_info:
             await connector.list_computers()
@@ -587,9 +611,9 @@ class TestLandscapeConnectorErrorHandling:
     @pytest.mark.asyncio
     async def test_timeout_error(self, connector, mock_auth):
         """Test timeout error handling."""
-        mock_session = Mock()
-        mock_session.request.side_effect = requests.exceptions.Timeout()
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.side_effect = httpx.ReadTimeout("timed out")
+        mock_auth.get_async_client.return_value = mock_client
 
         with pytest.raises(LandscapeConnectorError) as exc_info:
             await connector.list_computers()
@@ -599,9 +623,9 @@ class TestLandscapeConnectorErrorHandling:
     @pytest.mark.asyncio
     async def test_connection_error(self, connector, mock_auth):
         """Test connection error handling."""
-        mock_session = Mock()
-        mock_session.request.side_effect = requests.exceptions.ConnectionError()
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.request.side_effect = httpx.ConnectError("connection refused")
+        mock_auth.get_async_client.return_value = mock_client
 
         with pytest.raises(LandscapeConnectorError) as exc_info:
             await connector.list_computers()
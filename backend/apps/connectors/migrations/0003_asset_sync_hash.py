@@ -0,0 +1,23 @@
+# Generated by Django 5.0.14 on 2026-10-16 00:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("connectors", "0002_add_is_demo"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="asset",
+            name="sync_hash",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text="SHA-256 of the fields last written by an integration sync",
+                max_length=64,
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.14 on 2026-10-17 00:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("connectors", "0004_connector_instances_and_directory"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="syncjob",
+            name="checkpoint",
+            field=models.JSONField(
+                blank=True, default=dict, help_text="Resume point of an unfinished sync (page cursor and pages done)"
+            ),
+        ),
+    ]
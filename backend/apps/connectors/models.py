@@ -8,6 +8,7 @@ Includes:
 - ConnectorInstance for connector configurations
 - SyncJob for tracking sync operations
 - DriftEvent for drift detection and remediation
+- DirectoryUser/DirectoryGroup for Entra ID objects mirrored by delta sync
 """
 import uuid
 
@@ -80,6 +81,9 @@ class Asset(TimeStampedModel):
         max_length=20, blank=True, help_text="Source connector (intune, jamf, sccm, landscape)"
     )
     connector_object_id = models.CharField(max_length=255, blank=True, help_text="Platform-specific object ID")
+    sync_hash = models.CharField(
+        max_length=64, blank=True, default="", help_text="SHA-256 of the fields last written by an integration sync"
+    )
     is_demo = models.BooleanField(default=False, db_index=True, help_text="Whether this is demo data")
 
     objects = DemoQuerySet.as_manager()
@@ -284,6 +288,11 @@ class ConnectorInstance(TimeStampedModel):
     # Scope restrictions
     scope_filter = models.JSONField(default=dict, blank=True, help_text="Scope filter for this connector")
 
+    # Incremental sync state
+    delta_links = models.JSONField(
+        default=dict, blank=True, help_text="Graph delta links keyed by resource (users, groups)"
+    )
+
     # Audit
     created_by = models.ForeignKey(
         User,
@@ -351,6 +360,9 @@ class SyncJob(TimeStampedModel, CorrelationIdModel):
     errors = models.JSONField(default=list, blank=True, help_text="List of errors")
     warnings = models.JSONField(default=list, blank=True, help_text="List of warnings")
     summary = models.JSONField(default=dict, blank=True, help_text="Job summary")
+    checkpoint = models.JSONField(
+        default=dict, blank=True, help_text="Resume point of an unfinished sync (page cursor and pages done)"
+    )
 
     # Drift detection results
     drift_events_created = models.IntegerField(default=0, help_text="New drift events detected")
@@ -500,3 +512,81 @@ class DriftEvent(TimeStampedModel):
         from django.utils import timezone
 
         return (timezone.now() - self.detected_at).total_seconds()
+
+
+class DirectoryUser(TimeStampedModel):
+    """
+    Entra ID user mirrored by delta sync.
+
+    Rows are keyed by (connector, object_id) and written in bulk by
+    apps.connectors.entra.directory.
+    """
+
+    connector = models.ForeignKey(
+        ConnectorInstance,
+        on_delete=models.CASCADE,
+        related_name="directory_users",
+        help_text="Connector instance",
+    )
+    object_id = models.CharField(max_length=64, help_text="Entra ID object ID")
+    user_principal_name = models.CharField(max_length=255, blank=True, db_index=True)
+    display_name = models.CharField(max_length=255, blank=True)
+    given_name = models.CharField(max_length=255, blank=True)
+    surname = models.CharField(max_length=255, blank=True)
+    mail = models.CharField(max_length=255, blank=True, db_index=True)
+    job_title = models.CharField(max_length=255, blank=True)
+    department = models.CharField(max_length=255, blank=True)
+    office_location = models.CharField(max_length=255, blank=True)
+    account_enabled = models.BooleanField(default=True)
+    synced_at = models.DateTimeField(help_text="Start of the sync run that last wrote this row")
+
+    class Meta:
+        db_table = "connector_directory_user"
+        ordering = ["user_principal_name"]
+        constraints = [
+            models.UniqueConstraint(fields=["connector", "object_id"], name="directory_user_connector_object_unique"),
+        ]
+        indexes = [
+            models.Index(fields=["connector", "synced_at"]),
+        ]
+
+    def __str__(self) -> str:
+        return self.user_principal_name or self.object_id
+
+
+class DirectoryGroup(TimeStampedModel):
+    """
+    Entra ID group mirrored by delta sync.
+
+    Rows are keyed by (connector, object_id) and written in bulk by
+    apps.connectors.entra.directory.
+    """
+
+    connector = models.ForeignKey(
+        ConnectorInstance,
+        on_delete=models.CASCADE,
+        related_name="directory_groups",
+        help_text="Connector instance",
+    )
+    object_id = models.CharField(max_length=64, help_text="Entra ID object ID")
+    display_name = models.CharField(max_length=255, blank=True, db_index=True)
+    description = models.TextField(blank=True)
+    mail = models.CharField(max_length=255, blank=True)
+    mail_enabled = models.BooleanField(default=False)
+    security_enabled = models.BooleanField(default=False)
+    group_types = models.JSONField(default=list, blank=True)
+    membership_rule = models.TextField(blank=True)
+    synced_at = models.DateTimeField(help_text="Start of the sync run that last wrote this row")
+
+    class Meta:
+        db_table = "connector_directory_group"
+        ordering = ["display_name"]
+        constraints = [
+            models.UniqueConstraint(fields=["connector", "object_id"], name="directory_group_connector_object_unique"),
+        ]
+        indexes = [
+            models.Index(fields=["connector", "synced_at"]),
+        ]
+
+    def __str__(self) -> str:
+        return self.display_name or self.object_id
@@ -0,0 +1,319 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Pool of long-lived pwsh worker processes for connector invocations.
+
+Each worker runs scripts/connectors/ConnectorWorker.ps1 bound to one
+connector, so the connector script (and its module, when present) is
+loaded once and stays warm across requests. Requests and responses are
+single-line JSON frames over the worker's stdin/stdout.
+
+Workers are checked out per connector type (up to workers_per_connector
+concurrently), pinged when they have been idle for a while, and recycled
+after max_requests_per_worker requests, on timeout, or when the process
+exits. Results are returned as subprocess.CompletedProcess so callers can
+treat a pooled call exactly like a one-shot `pwsh -File` call.
+"""
+import atexit
+import itertools
+import json
+import logging
+import queue
+import subprocess
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+WORKER_SCRIPT = "scripts/connectors/ConnectorWorker.ps1"
+STARTUP_TIMEOUT_SECONDS = 30
+PING_TIMEOUT_SECONDS = 5
+SHUTDOWN_TIMEOUT_SECONDS = 5
+
+
+class PowerShellWorkerError(RuntimeError):
+    """Raised when a worker process dies or breaks the framing protocol."""
+
+
+class PowerShellWorker:
+    """One pwsh process serving JSON-framed requests for a single connector."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, connector_type: str, command: List[str]):
+        self.connector_type = connector_type
+        self.command = command
+        self.requests_served = 0
+        self.last_used = time.monotonic()
+        self._frames: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            bufsize=1,
+        )
+        threading.Thread(target=self._read_stdout, name=f"pwsh-{connector_type}-out", daemon=True).start()
+        threading.Thread(target=self._drain_stderr, name=f"pwsh-{connector_type}-err", daemon=True).start()
+        try:
+            self.ready = self._next_frame(STARTUP_TIMEOUT_SECONDS, lambda frame: frame.get("ready"))
+        except Exception:
+            self._process.kill()
+            self._process.wait()
+            raise
+        for warning in self.ready.get("warnings") or []:
+            logger.warning(
+                f"PowerShell worker for {connector_type}: {warning}", extra={"connector_type": connector_type}
+            )
+
+    @property
+    def pid(self) -> int:
+        return self._process.pid
+
+    @property
+    def alive(self) -> bool:
+        return self._process.poll() is None
+
+    def _read_stdout(self) -> None:
+        for line in self._process.stdout:
+            self._frames.put(line)
+        self._frames.put(None)
+
+    def _drain_stderr(self) -> None:
+        for line in self._process.stderr:
+            logger.debug(f"pwsh[{self.connector_type}] {line.rstrip()}", extra={"connector_type": self.connector_type})
+
+    def _next_frame(self, timeout: float, match) -> Dict[str, Any]:
+        """Return the next JSON frame satisfying match, skipping stray output."""
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise subprocess.TimeoutExpired(self.command, timeout)
+            try:
+                line = self._frames.get(timeout=remaining)
+            except queue.Empty:
+                raise subprocess.TimeoutExpired(self.command, timeout)
+            if line is None:
+                raise PowerShellWorkerError(
+                    f"PowerShell worker for {self.connector_type} exited (code {self._process.wait()})"
+                )
+            try:
+                frame = json.loads(line)
+            except json.JSONDecodeError:
+                logger.debug(f"Skipping non-JSON worker output: {line.rstrip()}")
+                continue
+            if isinstance(frame, dict) and match(frame):
+                return frame
+
+    def request(self, payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """Send one request frame and wait for its response frame."""
+        request_id = str(next(self._ids))
+        try:
+            self._process.stdin.write(json.dumps({"id": request_id, **payload}) + "\n")
+            self._process.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise PowerShellWorkerError(f"PowerShell worker for {self.connector_type} is gone: {e}")
+        frame = self._next_frame(timeout, lambda f: f.get("id") == request_id)
+        self.requests_served += 1
+        self.last_used = time.monotonic()
+        return frame
+
+    def ping(self) -> bool:
+        """Round-trip a ping frame; False if the worker is unresponsive."""
+        try:
+            return bool(self.request({"action": "ping"}, PING_TIMEOUT_SECONDS).get("pong"))
+        except (subprocess.TimeoutExpired, PowerShellWorkerError):
+            return False
+
+    def stop(self, graceful: bool = True) -> None:
+        """Close stdin (the worker exits on EOF), killing the process if it lingers or graceful is False."""
+        if not graceful:
+            self._process.kill()
+        try:
+            self._process.stdin.close()
+        except OSError:
+            pass
+        try:
+            self._process.wait(timeout=SHUTDOWN_TIMEOUT_SECONDS)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+            self._process.wait()
+
+
+class PowerShellWorkerPool:
+    """Per-connector pools of warm pwsh workers with sync and async submission."""
+
+    def __init__(
+        self,
+        base_path: str,
+        connector_scripts: Dict[str, str],
+        connector_modules: Optional[Dict[str, str]] = None,
+        workers_per_connector: int = 2,
+        max_requests_per_worker: int = 500,
+        health_check_idle_seconds: float = 60.0,
+        executable: str = "pwsh",
+    ):
+        self.base_path = Path(base_path)
+        self.connector_scripts = connector_scripts
+        self.connector_modules = connector_modules or {}
+        self.workers_per_connector = workers_per_connector
+        self.max_requests_per_worker = max_requests_per_worker
+        self.health_check_idle_seconds = health_check_idle_seconds
+        self.executable = executable
+        self._lock = threading.Lock()
+        self._idle: Dict[str, List[PowerShellWorker]] = {}
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._closed = False
+
+    def _worker_command(self, connector_type: str) -> List[str]:
+        command = [
+            self.executable,
+            "-NoLogo",
+            "-NoProfile",
+            "-NonInteractive",
+            "-File",
+            str(self.base_path / WORKER_SCRIPT),
+            "-ScriptPath",
+            str(self.base_path / self.connector_scripts[connector_type]),
+        ]
+        module = self.connector_modules.get(connector_type)
+        if module and (self.base_path / module).exists():
+            command += ["-ModulePath", str(self.base_path / module)]
+        return command
+
+    def _slot(self, connector_type: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if connector_type not in self._slots:
+                self._slots[connector_type] = threading.BoundedSemaphore(self.workers_per_connector)
+                self._idle[connector_type] = []
+            return self._slots[connector_type]
+
+    def _checkout(self, connector_type: str) -> PowerShellWorker:
+        """Return a healthy idle worker, or start a new one (caller holds a slot)."""
+        while True:
+            with self._lock:
+                worker = self._idle[connector_type].pop() if self._idle[connector_type] else None
+            if worker is None:
+                worker = PowerShellWorker(connector_type, self._worker_command(connector_type))
+                logger.info(
+                    f"Started PowerShell worker for {connector_type} (pid {worker.pid})",
+                    extra={"connector_type": connector_type, "pid": worker.pid},
+                )
+                return worker
+            idle_for = time.monotonic() - worker.last_used
+            if worker.alive and (idle_for < self.health_check_idle_seconds or worker.ping()):
+                return worker
+            logger.warning(
+                f"Recycling unhealthy PowerShell worker for {connector_type} (pid {worker.pid})",
+                extra={"connector_type": connector_type, "pid": worker.pid},
+            )
+            worker.stop(graceful=False)
+
+    def _checkin(self, worker: PowerShellWorker, healthy: bool) -> None:
+        """Return a worker to its pool, or retire it when unhealthy, exhausted or the pool is closed."""
+        retire = not healthy or not worker.alive or worker.requests_served >= self.max_requests_per_worker
+        with self._lock:
+            if not retire and not self._closed:
+                self._idle[worker.connector_type].append(worker)
+                return
+        worker.stop(graceful=healthy)
+
+    def run(self, connector_type: str, params: Dict[str, Any], timeout: float) -> subprocess.CompletedProcess:
+        """
+        Invoke a connector script on a pooled worker.
+
+        Args:
+            connector_type: Connector type (key of connector_scripts)
+            params: Script parameters by PowerShell name (e.g. {'Action': 'Deploy', 'AppName': ...})
+            timeout: Seconds to wait for a free worker plus the invocation itself
+
+        Returns:
+            CompletedProcess with the script's exit code, output and error stream
+
+        Raises:
+            subprocess.TimeoutExpired: No worker freed up or the invocation overran
+            PowerShellWorkerError: The worker died mid-request
+        """
+        if self._closed:
+            raise PowerShellWorkerError("PowerShell worker pool is shut down")
+        if connector_type not in self.connector_scripts:
+            raise ValueError(f"Unknown connector type: {connector_type}")
+
+        deadline = time.monotonic() + timeout
+        slot = self._slot(connector_type)
+        if not slot.acquire(timeout=timeout):
+            raise subprocess.TimeoutExpired(self._worker_command(connector_type), timeout)
+        try:
+            worker = self._checkout(connector_type)
+            healthy = False
+            try:
+                frame = worker.request(
+                    {"action": "invoke", "params": params}, max(deadline - time.monotonic(), PING_TIMEOUT_SECONDS)
+                )
+                healthy = True
+            finally:
+                self._checkin(worker, healthy)
+        finally:
+            slot.release()
+
+        return subprocess.CompletedProcess(
+            args=worker.command,
+            returncode=int(frame.get("exit_code", 1)),
+            stdout=frame.get("stdout") or "",
+            stderr=frame.get("stderr") or "",
+        )
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """
+        Run fn (typically run(), or a caller wrapping it) on the pool's dispatch threads.
+
+        The dispatch executor is sized to every connector's worker count, so
+        concurrent submissions only queue behind their own connector's slots.
+        """
+        with self._lock:
+            if self._closed:
+                raise PowerShellWorkerError("PowerShell worker pool is shut down")
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers_per_connector * max(len(self.connector_scripts), 1),
+                    thread_name_prefix="pwsh-submit",
+                )
+            executor = self._executor
+        return executor.submit(fn, *args, **kwargs)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Idle worker counts and served requests per connector."""
+        with self._lock:
+            return {
+                connector_type: {
+                    "idle_workers": len(workers),
+                    "requests_served": sum(w.requests_served for w in workers),
+                }
+                for connector_type, workers in self._idle.items()
+            }
+
+    def shutdown(self) -> None:
+        """Stop all idle workers; in-flight workers are retired when checked in."""
+        with self._lock:
+            self._closed = True
+            workers = [w for pool in self._idle.values() for w in pool]
+            for pool in self._idle.values():
+                pool.clear()
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+        for worker in workers:
+            worker.stop()
+
+
+def register_shutdown(pool: PowerShellWorkerPool) -> PowerShellWorkerPool:
+    """Stop the pool's workers at interpreter exit."""
+    atexit.register(pool.shutdown)
+    return pool
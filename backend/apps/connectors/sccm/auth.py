@@ -23,10 +23,13 @@ import logging
 from datetime import datetime, timedelta
 from typing import Any, Dict, Optional, Tuple
 
+import httpx
 import requests
 from decouple import config
+from httpx_ntlm import HttpNtlmAuth as AsyncHttpNtlmAuth
 from requests_ntlm import HttpNtlmAuth
 
+from apps.connectors.http_pool import get_async_client
 from apps.core.structured_logging import StructuredLogger
 
 logger = logging.getLogger(__name__)
@@ -161,6 +164,45 @@ class SCCMAuth:
 
         return session
 
+    def get_async_client(self, correlation_id: Optional[str] = None) -> httpx.AsyncClient:
+        """
+        Get the pooled async client for AdminService (shared per event loop).
+
+        NTLM authenticates the TCP connection rather than each request, so
+        NTLM clients stay on HTTP/1.1 keep-alive connections.
+
+        Args:
+            correlation_id: Correlation ID for logging
+
+        Returns:
+            Authenticated httpx.AsyncClient
+        """
+        if correlation_id:
+            self.structured_logger.correlation_id = correlation_id
+
+        auth = None
+        cert = None
+        if self.auth_method == "wia":
+            auth = AsyncHttpNtlmAuth("", "")  # Empty = use current user
+        elif self.auth_method == "basic":
+            auth = AsyncHttpNtlmAuth(self.username, self.password)
+        elif self.auth_method == "certificate":
+            cert = (self.cert_path, self.cert_password)
+
+        verify = config("SCCM_VERIFY_SSL", default=True, cast=bool)
+        return get_async_client(
+            ("sccm", self.server_url, self.auth_method, self.username, self.password, cert, verify),
+            headers={
+                "Content-Type": "application/json",
+                "Accept": "application/json",
+            },
+            auth=auth,
+            verify=verify,
+            cert=cert,
+            http2=auth is None,
+            timeout=self.DEFAULT_TIMEOUT,
+        )
+
     def test_connection(self, correlation_id: Optional[str] = None) -> Tuple[bool, str]:
         """
         Test connection to SCCM AdminService.
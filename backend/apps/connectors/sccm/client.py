@@ -13,16 +13,18 @@ Implements SCCM AdminService REST API operations for:
 AdminService API Documentation:
 https://learn.microsoft.com/en-us/mem/configmgr/develop/adminservice/overview
 """
+import asyncio
 import hashlib
 import json
 import logging
 import uuid
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
-import requests
+import httpx
 from decouple import config
 
+from apps.connectors.idempotency import get_idempotency_store
 from apps.core.structured_logging import StructuredLogger
 
 from .auth import SCCMAuth, SCCMAuthError
@@ -63,9 +65,6 @@ class SCCMConnector:
     API_DEPLOYMENTS = "/wmi/SMS_ApplicationAssignment"
     API_COMPLIANCE = "/wmi/SMS_AppDeploymentAssetDetails"
 
-    # Idempotency key cache (in production, use Redis)
-    _idempotency_cache: Dict[str, Dict[str, Any]] = {}
-
     def __init__(self, auth: Optional[SCCMAuth] = None):
         """
         Initialize SCCM connector.
@@ -78,6 +77,8 @@ class SCCMConnector:
         self.site_code = self.auth.site_code
         self.structured_logger = StructuredLogger(__name__, user="system")
         self._default_timeout = 60
+        # Results of idempotent operations, shared across workers
+        self._idempotency_cache = get_idempotency_store("sccm")
 
     def get_idempotency_key(self, operation: str, params: Dict[str, Any]) -> str:
         """
@@ -93,23 +94,18 @@ class SCCMConnector:
         key_data = json.dumps({"operation": operation, "params": params}, sort_keys=True)
         return hashlib.sha256(key_data.encode()).hexdigest()[:16]
 
-    def _check_idempotency(self, key: str, correlation_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
-        """Check if operation was already performed."""
-        cached = self._idempotency_cache.get(key)
-        if cached:
-            self.structured_logger.log_info(
-                "Idempotent operation - returning cached result",
-                extra={"idempotency_key": key, "correlation_id": correlation_id},
-            )
-        return cached
-
-    def _store_idempotency(self, key: str, result: Dict[str, Any], correlation_id: Optional[str] = None) -> None:
-        """Store operation result for idempotency."""
-        self._idempotency_cache[key] = result
+    async def _run_idempotent(
+        self,
+        key: str,
+        operation: Callable[[], Awaitable[Dict[str, Any]]],
+        correlation_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Run an operation once per idempotency key, replaying its recorded result afterwards."""
         self.structured_logger.log_debug(
-            "Stored idempotency result",
+            "Running idempotent operation",
             extra={"idempotency_key": key, "correlation_id": correlation_id},
         )
+        return await self._idempotency_cache.run_once(key, operation)
 
     async def test_connection(self, correlation_id: Optional[str] = None) -> Tuple[bool, str]:
         """
@@ -121,7 +117,7 @@ class SCCMConnector:
         Returns:
             Tuple of (success: bool, message: str)
         """
-        return self.auth.test_connection(correlation_id)
+        return await asyncio.to_thread(self.auth.test_connection, correlation_id)
 
     async def sync_inventory(self, correlation_id: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -137,11 +133,11 @@ class SCCMConnector:
             self.structured_logger.correlation_id = correlation_id
 
         try:
-            session = self.auth.get_session(correlation_id)
+            client = self.auth.get_async_client(correlation_id)
 
             # Get all applications
             url = f"{self.server_url}{self.API_APPLICATIONS}"
-            response = session.get(url, timeout=self._default_timeout)
+            response = await client.get(url, timeout=self._default_timeout)
             response.raise_for_status()
 
             data = response.json()
@@ -162,7 +158,7 @@ class SCCMConnector:
                 "synced_at": datetime.utcnow().isoformat(),
             }
 
-        except requests.exceptions.HTTPError as e:
+        except httpx.HTTPStatusError as e:
             raise SCCMConnectorError(
                 f"Failed to sync inventory: {e}",
                 error_type="transient" if e.response.status_code >= 500 else "permanent",
@@ -206,17 +202,26 @@ class SCCMConnector:
         if correlation_id:
             self.structured_logger.correlation_id = correlation_id
 
-        # Check idempotency
         idem_key = self.get_idempotency_key("create_application", {"name": name, "version": version})
-        cached = self._check_idempotency(idem_key, correlation_id)
-        if cached:
-            return cached
+        return await self._run_idempotent(
+            idem_key,
+            lambda: self._create_application(name, version, publisher, correlation_id),
+            correlation_id,
+        )
 
+    async def _create_application(
+        self,
+        name: str,
+        version: str,
+        publisher: str,
+        correlation_id: Optional[str],
+    ) -> Dict[str, Any]:
+        """Create the application unless it already exists (see create_application)."""
         try:
-            session = self.auth.get_session(correlation_id)
+            client = self.auth.get_async_client(correlation_id)
 
             # Check if application already exists
-            existing = await self._find_application_by_name(name, version, session)
+            existing = await self._find_application_by_name(name, version, client)
             if existing:
                 self.structured_logger.log_info(
                     "Application already exists",
@@ -232,7 +237,6 @@ class SCCMConnector:
                     "application": existing,
                     "message": "Application already exists",
                 }
-                self._store_idempotency(idem_key, result, correlation_id)
                 return result
 
             # Create application via AdminService
@@ -246,18 +250,17 @@ class SCCMConnector:
             }
 
             url = f"{self.server_url}{self.API_APPLICATIONS}"
-            response = session.post(url, json=app_data, timeout=self._default_timeout)
+            response = await client.post(url, json=app_data, timeout=self._default_timeout)
 
             if response.status_code == 409:
                 # Application already exists - find and return it
-                existing = await self._find_application_by_name(name, version, session)
+                existing = await self._find_application_by_name(name, version, client)
                 result = {
                     "success": True,
                     "created": False,
                     "application": existing,
                     "message": "Application already exists (conflict)",
                 }
-                self._store_idempotency(idem_key, result, correlation_id)
                 return result
 
             response.raise_for_status()
@@ -278,12 +281,11 @@ class SCCMConnector:
                 "application": created_app,
                 "message": "Application created successfully",
             }
-            self._store_idempotency(idem_key, result, correlation_id)
             return result
 
         except SCCMConnectorError:
             raise
-        except requests.exceptions.HTTPError as e:
+        except httpx.HTTPStatusError as e:
             raise SCCMConnectorError(
                 f"Failed to create application: {e}",
                 error_type="transient" if e.response.status_code >= 500 else "permanent",
@@ -301,7 +303,7 @@ class SCCMConnector:
         self,
         name: str,
         version: Optional[str],
-        session: requests.Session,
+        client: httpx.AsyncClient,
     ) -> Optional[Dict[str, Any]]:
         """Find application by name and optionally version."""
         try:
@@ -310,7 +312,7 @@ class SCCMConnector:
                 filter_query += f" and SoftwareVersion eq '{version}'"
 
             url = f"{self.server_url}{self.API_APPLICATIONS}?$filter={filter_query}"
-            response = session.get(url, timeout=self._default_timeout)
+            response = await client.get(url, timeout=self._default_timeout)
             response.raise_for_status()
 
             data = response.json()
@@ -340,31 +342,39 @@ class SCCMConnector:
         if correlation_id:
             self.structured_logger.correlation_id = correlation_id
 
-        # Check idempotency
         idem_key = self.get_idempotency_key(
             "distribute_content",
             {"application_id": application_id, "dp_groups": distribution_point_groups},
         )
-        cached = self._check_idempotency(idem_key, correlation_id)
-        if cached:
-            return cached
+        return await self._run_idempotent(
+            idem_key,
+            lambda: self._distribute_content(application_id, distribution_point_groups, correlation_id),
+            correlation_id,
+        )
 
+    async def _distribute_content(
+        self,
+        application_id: str,
+        distribution_point_groups: List[str],
+        correlation_id: Optional[str],
+    ) -> Dict[str, Any]:
+        """Start content distribution to every DP group (see distribute_content)."""
         try:
-            session = self.auth.get_session(correlation_id)
+            client = self.auth.get_async_client(correlation_id)
 
-            # Distribute to each DP group
-            results = []
-            for dp_group in distribution_point_groups:
+            async def distribute(dp_group: str) -> Dict[str, Any]:
                 # AdminService distribute content call
                 url = f"{self.server_url}/wmi/SMS_DistributionPointGroup('{dp_group}')/AdminService.DistributeContent"
                 payload = {"PackageIDs": [application_id]}
 
-                response = session.post(url, json=payload, timeout=self._default_timeout)
+                response = await client.post(url, json=payload, timeout=self._default_timeout)
 
                 if response.status_code in [200, 201, 204]:
-                    results.append({"dp_group": dp_group, "status": "initiated"})
-                else:
-                    results.append({"dp_group": dp_group, "status": "failed", "code": response.status_code})
+                    return {"dp_group": dp_group, "status": "initiated"}
+                return {"dp_group": dp_group, "status": "failed", "code": response.status_code}
+
+            # Distribute to all DP groups concurrently over the pooled client
+            results = list(await asyncio.gather(*(distribute(dp_group) for dp_group in distribution_point_groups)))
 
             self.structured_logger.log_info(
                 "Content distribution initiated",
@@ -380,7 +390,6 @@ class SCCMConnector:
                 "distribution_results": results,
                 "message": "Content distribution initiated",
             }
-            self._store_idempotency(idem_key, result, correlation_id)
             return result
 
         except Exception as e:
@@ -416,7 +425,6 @@ class SCCMConnector:
         if correlation_id:
             self.structured_logger.correlation_id = correlation_id
 
-        # Check idempotency
         idem_key = self.get_idempotency_key(
             "deploy_to_collection",
             {
@@ -425,12 +433,26 @@ class SCCMConnector:
                 "action": deployment_action,
             },
         )
-        cached = self._check_idempotency(idem_key, correlation_id)
-        if cached:
-            return cached
+        return await self._run_idempotent(
+            idem_key,
+            lambda: self._deploy_to_collection(
+                application_id, collection_id, deployment_action, deployment_purpose, schedule, correlation_id
+            ),
+            correlation_id,
+        )
 
+    async def _deploy_to_collection(
+        self,
+        application_id: str,
+        collection_id: str,
+        deployment_action: str,
+        deployment_purpose: str,
+        schedule: Optional[Dict[str, Any]],
+        correlation_id: Optional[str],
+    ) -> Dict[str, Any]:
+        """Create the ApplicationAssignment unless it already exists (see deploy_to_collection)."""
         try:
-            session = self.auth.get_session(correlation_id)
+            client = self.auth.get_async_client(correlation_id)
 
             # Create deployment (ApplicationAssignment)
             deployment_data = {
@@ -448,7 +470,7 @@ class SCCMConnector:
                 deployment_data["AssignedCIs"] = schedule
 
             url = f"{self.server_url}{self.API_DEPLOYMENTS}"
-            response = session.post(url, json=deployment_data, timeout=self._default_timeout)
+            response = await client.post(url, json=deployment_data, timeout=self._default_timeout)
 
             if response.status_code == 409:
                 # Deployment already exists
@@ -457,7 +479,6 @@ class SCCMConnector:
                     "created": False,
                     "message": "Deployment already exists",
                 }
-                self._store_idempotency(idem_key, result, correlation_id)
                 return result
 
             response.raise_for_status()
@@ -478,12 +499,11 @@ class SCCMConnector:
                 "deployment": deployment,
                 "message": "Deployment created successfully",
             }
-            self._store_idempotency(idem_key, result, correlation_id)
             return result
 
         except SCCMConnectorError:
             raise
-        except requests.exceptions.HTTPError as e:
+        except httpx.HTTPStatusError as e:
             raise SCCMConnectorError(
                 f"Failed to create deployment: {e}",
                 error_type="transient" if e.response.status_code >= 500 else "permanent",
@@ -518,7 +538,7 @@ class SCCMConnector:
             self.structured_logger.correlation_id = correlation_id
 
         try:
-            session = self.auth.get_session(correlation_id)
+            client = self.auth.get_async_client(correlation_id)
 
             # Query compliance status
             filter_query = f"AppCI eq '{application_id}'"
@@ -526,7 +546,7 @@ class SCCMConnector:
                 filter_query += f" and CollectionID eq '{collection_id}'"
 
             url = f"{self.server_url}{self.API_COMPLIANCE}?$filter={filter_query}"
-            response = session.get(url, timeout=self._default_timeout)
+            response = await client.get(url, timeout=self._default_timeout)
             response.raise_for_status()
 
             data = response.json()
@@ -574,7 +594,7 @@ class SCCMConnector:
                 "queried_at": datetime.utcnow().isoformat(),
             }
 
-        except requests.exceptions.HTTPError as e:
+        except httpx.HTTPStatusError as e:
             raise SCCMConnectorError(
                 f"Failed to get compliance status: {e}",
                 error_type="transient" if e.response.status_code >= 500 else "permanent",
@@ -606,11 +626,11 @@ class SCCMConnector:
             self.structured_logger.correlation_id = correlation_id
 
         try:
-            session = self.auth.get_session(correlation_id)
+            client = self.auth.get_async_client(correlation_id)
 
             # Delete deployment assignment
             url = f"{self.server_url}{self.API_DEPLOYMENTS}('{deployment_id}')"
-            response = session.delete(url, timeout=self._default_timeout)
+            response = await client.delete(url, timeout=self._default_timeout)
 
             if response.status_code == 404:
                 self.structured_logger.log_warning(
@@ -635,7 +655,7 @@ class SCCMConnector:
                 "message": "Deployment rolled back successfully",
             }
 
-        except requests.exceptions.HTTPError as e:
+        except httpx.HTTPStatusError as e:
             raise SCCMConnectorError(
                 f"Failed to rollback deployment: {e}",
                 error_type="transient" if e.response.status_code >= 500 else "permanent",
@@ -667,13 +687,13 @@ class SCCMConnector:
             self.structured_logger.correlation_id = correlation_id
 
         try:
-            session = self.auth.get_session(correlation_id)
+            client = self.auth.get_async_client(correlation_id)
 
             # Collection type: 1 = User, 2 = Device
             type_filter = 2 if collection_type == "Device" else 1
             url = f"{self.server_url}{self.API_COLLECTIONS}?$filter=CollectionType eq {type_filter}"
 
-            response = session.get(url, timeout=self._default_timeout)
+            response = await client.get(url, timeout=self._default_timeout)
             response.raise_for_status()
 
             data = response.json()
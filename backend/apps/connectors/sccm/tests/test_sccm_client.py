@@ -4,7 +4,7 @@
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
-import requests
+import httpx
 
 from apps.connectors.sccm.client import SCCMConnector, SCCMConnectorError
 
@@ -16,7 +16,7 @@ def mock_auth():
     auth.server_url = "https://sccm.example.com/AdminService"
     auth.site_code = "PS1"
     auth.test_connection.return_value = (True, "Connected")
-    auth.get_session.return_value = Mock(spec=requests.Session)
+    auth.get_async_client.return_value = AsyncMock(spec=httpx.AsyncClient)
     return auth
 
 
@@ -95,9 +95,9 @@ class TestSCCMConnectorSyncInventory:
         }
         mock_response.raise_for_status = Mock()
 
-        mock_session = Mock()
-        mock_session.get.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.get.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.sync_inventory(correlation_id="test-123")
 
@@ -112,9 +112,9 @@ class TestSCCMConnectorSyncInventory:
         mock_response.json.return_value = {"value": []}
         mock_response.raise_for_status = Mock()
 
-        mock_session = Mock()
-        mock_session.get.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.get.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.sync_inventory()
 
@@ -126,11 +126,13 @@ class TestSCCMConnectorSyncInventory:
         """Test inventory sync with HTTP error."""
         mock_response = Mock()
         mock_response.status_code = 500
-        mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError(response=mock_response)
+        mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
+            "Server Error", request=Mock(), response=mock_response
+        )
 
-        mock_session = Mock()
-        mock_session.get.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.get.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         with pytest.raises(SCCMConnectorError) as exc_info:
             await connector.sync_inventory()
@@ -158,10 +160,10 @@ class TestSCCMConnectorCreateApplication:
         }
         mock_create_response.raise_for_status = Mock()
 
-        mock_session = Mock()
-        mock_session.get.return_value = mock_find_response
-        mock_session.post.return_value = mock_create_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.get.return_value = mock_find_response
+        mock_client.post.return_value = mock_create_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.create_application(
             name="TestApp",
@@ -184,9 +186,9 @@ class TestSCCMConnectorCreateApplication:
         }
         mock_find_response.raise_for_status = Mock()
 
-        mock_session = Mock()
-        mock_session.get.return_value = mock_find_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.get.return_value = mock_find_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.create_application(
             name="TestApp",
@@ -213,10 +215,10 @@ class TestSCCMConnectorCreateApplication:
         mock_create_response.json.return_value = {"CI_UniqueID": "new-app"}
         mock_create_response.raise_for_status = Mock()
 
-        mock_session = Mock()
-        mock_session.get.return_value = mock_find_response
-        mock_session.post.return_value = mock_create_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.get.return_value = mock_find_response
+        mock_client.post.return_value = mock_create_response
+        mock_auth.get_async_client.return_value = mock_client
 
         # First call
         result1 = await connector.create_application(
@@ -239,7 +241,7 @@ class TestSCCMConnectorCreateApplication:
         )
 
         # Session.post should only be called once
-        assert mock_session.post.call_count == 1
+        assert mock_client.post.call_count == 1
         assert result1 == result2
 
 
@@ -258,9 +260,9 @@ class TestSCCMConnectorDeployToCollection:
         }
         mock_response.raise_for_status = Mock()
 
-        mock_session = Mock()
-        mock_session.post.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.post.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.deploy_to_collection(
             application_id="app-id",
@@ -278,9 +280,9 @@ class TestSCCMConnectorDeployToCollection:
         mock_response = Mock()
         mock_response.status_code = 409
 
-        mock_session = Mock()
-        mock_session.post.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.post.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.deploy_to_collection(
             application_id="app-id",
@@ -308,9 +310,9 @@ class TestSCCMConnectorGetComplianceStatus:
         }
         mock_response.raise_for_status = Mock()
 
-        mock_session = Mock()
-        mock_session.get.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.get.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.get_compliance_status(
             application_id="app-id",
@@ -331,9 +333,9 @@ class TestSCCMConnectorGetComplianceStatus:
         mock_response.json.return_value = {"value": []}
         mock_response.raise_for_status = Mock()
 
-        mock_session = Mock()
-        mock_session.get.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.get.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.get_compliance_status(application_id="app-id")
 
@@ -352,9 +354,9 @@ class TestSCCMConnectorRollback:
         mock_response.status_code = 204
         mock_response.raise_for_status = Mock()
 
-        mock_session = Mock()
-        mock_session.delete.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.delete.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.rollback(deployment_id="deploy-123")
 
@@ -366,9 +368,9 @@ class TestSCCMConnectorRollback:
         mock_response = Mock()
         mock_response.status_code = 404
 
-        mock_session = Mock()
-        mock_session.delete.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.delete.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.rollback(deployment_id="deploy-123")
 
@@ -391,15 +393,15 @@ class TestSCCMConnectorListCollections:
         }
         mock_response.raise_for_status = Mock()
 
-        mock_session = Mock()
-        mock_session.get.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.get.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.list_collections(collection_type="Device")
 
         assert len(result) == 2
         # Verify filter includes CollectionType eq 2 (Device)
-        call_args = mock_session.get.call_args
+        call_args = mock_client.get.call_args
         assert "CollectionType eq 2" in call_args[0][0]
 
     @pytest.mark.asyncio
@@ -409,12 +411,12 @@ class TestSCCMConnectorListCollections:
         mock_response.json.return_value = {"value": []}
         mock_response.raise_for_status = Mock()
 
-        mock_session = Mock()
-        mock_session.get.return_value = mock_response
-        mock_auth.get_session.return_value = mock_session
+        mock_client = AsyncMock()
+        mock_client.get.return_value = mock_response
+        mock_auth.get_async_client.return_value = mock_client
 
         result = await connector.list_collections(collection_type="User")
 
         # Verify filter includes CollectionType eq 1 (User)
-        call_args = mock_session.get.call_args
+        call_args = mock_client.get.call_args
         assert "CollectionType eq 1" in call_args[0][0]
@@ -6,8 +6,11 @@ PowerShell connector service for execution plane integration.
 import json
 import logging
 import subprocess
+from concurrent.futures import Future
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional
+
+from .powershell_pool import PowerShellWorkerPool, register_shutdown
 
 logger = logging.getLogger(__name__)
 
@@ -24,14 +27,46 @@ class PowerShellConnectorService:
         "ansible": "scripts/connectors/Invoke-AnsibleConnector.ps1",
     }
 
-    def __init__(self, base_path: str = "/app"):
+    # Connector modules preloaded into pooled workers
+    CONNECTOR_MODULES = {
+        "intune": "scripts/connectors/intune/IntuneConnector.ps1",
+        "jamf": "scripts/connectors/jamf/JamfConnector.ps1",
+        "sccm": "scripts/connectors/sccm/SccmConnector.ps1",
+        "landscape": "scripts/connectors/landscape/LandscapeConnector.ps1",
+        "ansible": "scripts/connectors/ansible/AnsibleConnector.ps1",
+    }
+
+    def __init__(self, base_path: str = "/app", pool: Optional[PowerShellWorkerPool] = None):
         """
         Initialize PowerShell connector service.
 
         Args:
             base_path: Base path for PowerShell scripts (default: /app for Docker)
+            pool: Warm worker pool; without one every call starts its own pwsh process
         """
         self.base_path = Path(base_path)
+        self.pool = pool
+
+    def _invoke(self, connector_type: str, script_path: Path, params: Dict[str, str], timeout: int):
+        """Run a connector script on a pooled worker, or as a one-shot pwsh process."""
+        if self.pool is not None:
+            return self.pool.run(connector_type, params, timeout=timeout)
+
+        args = ["pwsh", "-File", str(script_path)]
+        for name, value in params.items():
+            args += [f"-{name}", value]
+        return subprocess.run(args, capture_output=True, text=True, timeout=timeout, check=False)
+
+    @staticmethod
+    def _deploy_script_params(deployment_params: Dict[str, Any]) -> Dict[str, str]:
+        return {
+            "Action": "Deploy",
+            "DeploymentIntentId": deployment_params["deployment_intent_id"],
+            "ArtifactPath": deployment_params["artifact_path"],
+            "TargetRing": deployment_params["target_ring"],
+            "AppName": deployment_params["app_name"],
+            "Version": deployment_params["version"],
+        }
 
     def health_check(self, connector_type: str) -> Dict[str, Any]:
         """
@@ -62,13 +97,7 @@ class PowerShellConnectorService:
 
         try:
             # Invoke PowerShell script with -Action HealthCheck
-            result = subprocess.run(
-                ["pwsh", "-File", str(script_path), "-Action", "HealthCheck"],
-                capture_output=True,
-                text=True,
-                timeout=30,
-                check=False,
-            )
+            result = self._invoke(connector_type, script_path, {"Action": "HealthCheck"}, timeout=30)
 
             if result.returncode == 0:
                 # Parse JSON output from PowerShell
@@ -146,32 +175,12 @@ class PowerShellConnectorService:
             }
 
         try:
-            # Build PowerShell command with parameters
-            ps_params = [
-                "pwsh",
-                "-File",
-                str(script_path),
-                "-Action",
-                "Deploy",
-                "-DeploymentIntentId",
-                deployment_params["deployment_intent_id"],
-                "-ArtifactPath",
-                deployment_params["artifact_path"],
-                "-TargetRing",
-                deployment_params["target_ring"],
-                "-AppName",
-                deployment_params["app_name"],
-                "-Version",
-                deployment_params["version"],
-            ]
-
             # Invoke PowerShell script
-            result = subprocess.run(
-                ps_params,
-                capture_output=True,
-                text=True,
+            result = self._invoke(
+                connector_type,
+                script_path,
+                self._deploy_script_params(deployment_params),
                 timeout=300,  # 5 minutes for deployment
-                check=False,
             )
 
             if result.returncode == 0:
@@ -227,14 +236,44 @@ class PowerShellConnectorService:
                 "details": {},
             }
 
+    def deploy_async(self, connector_type: str, deployment_params: Dict[str, Any]) -> "Future[Dict[str, Any]]":
+        """
+        Deploy without blocking the caller.
+
+        Deployments on the same plane run concurrently up to the pool's
+        workers per connector; without a pool the call runs inline.
+
+        Returns:
+            Future resolving to the deploy() result
+        """
+        if self.pool is None:
+            future: "Future[Dict[str, Any]]" = Future()
+            future.set_result(self.deploy(connector_type, deployment_params))
+            return future
+        return self.pool.submit(self.deploy, connector_type, deployment_params)
+
 
 # Singleton instance
 _connector_service = None
 
 
 def get_connector_service() -> PowerShellConnectorService:
-    """Get PowerShell connector service singleton instance."""
+    """Get PowerShell connector service singleton instance (backed by the worker pool when enabled)."""
     global _connector_service
     if _connector_service is None:
-        _connector_service = PowerShellConnectorService()
+        from django.conf import settings
+
+        pool = None
+        if settings.CONNECTOR_PWSH_POOL_ENABLED:
+            pool = register_shutdown(
+                PowerShellWorkerPool(
+                    base_path="/app",
+                    connector_scripts=PowerShellConnectorService.CONNECTOR_SCRIPTS,
+                    connector_modules=PowerShellConnectorService.CONNECTOR_MODULES,
+                    workers_per_connector=settings.CONNECTOR_PWSH_WORKERS_PER_CONNECTOR,
+                    max_requests_per_worker=settings.CONNECTOR_PWSH_MAX_REQUESTS_PER_WORKER,
+                    health_check_idle_seconds=settings.CONNECTOR_PWSH_HEALTH_CHECK_IDLE_SECONDS,
+                )
+            )
+        _connector_service = PowerShellConnectorService(pool=pool)
     return _connector_service
@@ -0,0 +1,156 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Tests for the shared Graph API client.
+
+Graph is replaced by an httpx.MockTransport so retries and $batch splitting
+run through the real request path.
+"""
+import json
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from apps.connectors.graph import MAX_BATCH_SIZE, GraphClient
+
+
+async def _token():
+    return {"Authorization": "Bearer test-token"}
+
+
+@pytest.fixture
+def graph_calls():
+    """Install a programmable Graph stand-in; yields (calls, set_handler)."""
+    calls = []
+    state = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return state["handler"](request)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    with (
+        patch("apps.connectors.graph.get_async_client", return_value=client),
+        patch("apps.connectors.graph.asyncio.sleep", new_callable=AsyncMock) as sleep,
+    ):
+        yield calls, lambda fn: state.__setitem__("handler", fn), sleep
+
+
+def _batch_ok(request):
+    payload = json.loads(request.content)
+    return httpx.Response(
+        200,
+        json={"responses": [{"id": r["id"], "status": 200, "body": {"url": r["url"]}} for r in payload["requests"]]},
+    )
+
+
+class TestGraphRequest:
+    """Tests for single requests."""
+
+    @pytest.mark.asyncio
+    async def test_throttled_request_honors_retry_after(self, graph_calls):
+        """Test a 429 is retried after the Retry-After delay."""
+        calls, set_handler, sleep = graph_calls
+        responses = iter([httpx.Response(429, headers={"Retry-After": "7"}), httpx.Response(200, json={"id": "u1"})])
+        set_handler(lambda request: next(responses))
+
+        result = await GraphClient(token_provider=_token).request("GET", "users/u1", correlation_id="corr-1")
+
+        assert result == {"id": "u1"}
+        assert len(calls) == 2
+        assert calls[0].headers["Authorization"] == "Bearer test-token"
+        assert calls[0].headers["client-request-id"] == "corr-1"
+        sleep.assert_awaited_once_with(7.0)
+
+    @pytest.mark.asyncio
+    async def test_unauthorized_refreshes_token(self, graph_calls):
+        """Test a 401 triggers on_unauthorized and a retry."""
+        calls, set_handler, _ = graph_calls
+        responses = iter([httpx.Response(401), httpx.Response(200, json={})])
+        set_handler(lambda request: next(responses))
+        refresh = AsyncMock()
+
+        await GraphClient(token_provider=_token, on_unauthorized=refresh).request("GET", "organization")
+
+        refresh.assert_awaited_once()
+        assert len(calls) == 2
+
+
+class TestGraphBatch:
+    """Tests for $batch splitting and per-sub-request retry."""
+
+    @pytest.mark.asyncio
+    async def test_splits_into_batches_of_twenty(self, graph_calls):
+        """Test sub-requests are split into $batch calls and returned in order."""
+        calls, set_handler, _ = graph_calls
+        set_handler(_batch_ok)
+
+        responses = await GraphClient(token_provider=_token).batch(
+            [{"method": "GET", "url": f"/devices/{i}"} for i in range(45)]
+        )
+
+        assert len(calls) == 3
+        assert all(call.url.path.endswith("/$batch") for call in calls)
+        batch_sizes = sorted(len(json.loads(call.content)["requests"]) for call in calls)
+        assert batch_sizes == [5, MAX_BATCH_SIZE, MAX_BATCH_SIZE]
+        assert [r.body["url"] for r in responses] == [f"/devices/{i}" for i in range(45)]
+        assert all(r.ok for r in responses)
+
+    @pytest.mark.asyncio
+    async def test_absolute_next_links_are_made_relative(self, graph_calls):
+        """Test @odata.nextLink URLs can be fed back as sub-requests."""
+        calls, set_handler, _ = graph_calls
+        set_handler(_batch_ok)
+
+        responses = await GraphClient(token_provider=_token).batch(
+            [{"method": "GET", "url": "https://graph.microsoft.com/v1.0/groups/g1/members?$skiptoken=abc"}]
+        )
+
+        assert responses[0].body["url"] == "/groups/g1/members?$skiptoken=abc"
+
+    @pytest.mark.asyncio
+    async def test_retries_only_throttled_sub_requests(self, graph_calls):
+        """Test throttled sub-requests are resent alone after the longest Retry-After."""
+        calls, set_handler, sleep = graph_calls
+        throttled = {"1": "3", "2": "5"}
+
+        def handler(request):
+            payload = json.loads(request.content)
+            responses = []
+            for sub in payload["requests"]:
+                if len(calls) == 1 and sub["id"] in throttled:
+                    responses.append({"id": sub["id"], "status": 429, "headers": {"Retry-After": throttled[sub["id"]]}})
+                else:
+                    responses.append({"id": sub["id"], "status": 200, "body": {"url": sub["url"]}})
+            return httpx.Response(200, json={"responses": responses})
+
+        set_handler(handler)
+
+        responses = await GraphClient(token_provider=_token).batch(
+            [{"method": "GET", "url": f"/devices/{i}"} for i in range(4)]
+        )
+
+        assert len(calls) == 2
+        assert [sub["id"] for sub in json.loads(calls[1].content)["requests"]] == ["1", "2"]
+        sleep.assert_awaited_once_with(5.0)
+        assert all(r.ok for r in responses)
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self, graph_calls):
+        """Test a sub-request that keeps failing is returned with its last status."""
+        calls, set_handler, _ = graph_calls
+
+        def handler(request):
+            payload = json.loads(request.content)
+            return httpx.Response(
+                200, json={"responses": [{"id": sub["id"], "status": 503} for sub in payload["requests"]]}
+            )
+
+        set_handler(handler)
+
+        responses = await GraphClient(token_provider=_token, max_retries=2).batch([{"method": "GET", "url": "/x"}])
+
+        assert len(calls) == 3
+        assert responses[0].status == 503
+        assert not responses[0].ok
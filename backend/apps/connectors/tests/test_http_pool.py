@@ -0,0 +1,141 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Tests for the pooled async connector HTTP client.
+
+Connectors are driven end to end against a local threaded HTTP stub that
+delays every response and records how many requests it served at once, so
+overlapping calls show up without relying on wall-clock timings.
+"""
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from apps.connectors.http_pool import aclose_clients, get_async_client
+from apps.connectors.landscape.auth import LandscapeAuth
+from apps.connectors.landscape.client import LandscapeConnector
+
+STUB_DELAY_SECONDS = 0.2
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.in_flight += 1
+            self.server.max_in_flight = max(self.server.max_in_flight, self.server.in_flight)
+        time.sleep(STUB_DELAY_SECONDS)
+        with self.server.lock:
+            self.server.in_flight -= 1
+        body = json.dumps({"id": self.path.rsplit("/", 1)[-1], "port": self.client_address[1]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    """Run a delaying HTTP stub on an ephemeral local port."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.in_flight = server.max_in_flight = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def connector(stub_server):
+    """Create a Landscape connector pointed at the stub."""
+    auth = LandscapeAuth(
+        server_url=stub_server.url,
+        access_key="key",
+        secret_key="secret",
+        auth_method="api_key",
+        verify_ssl=False,
+    )
+    return LandscapeConnector(auth=auth)
+
+
+class TestGetAsyncClient:
+    """Tests for client sharing across connector instances."""
+
+    @pytest.mark.asyncio
+    async def test_same_key_shares_client(self):
+        """Test one client is reused per key on a loop."""
+        first = get_async_client(("test", "https://a.example.com"))
+        second = get_async_client(("test", "https://a.example.com"))
+        other = get_async_client(("test", "https://b.example.com"))
+
+        assert first is second
+        assert other is not first
+        await aclose_clients()
+        assert first.is_closed
+
+    def test_clients_are_per_event_loop(self):
+        """Test each event loop gets its own client for the same key."""
+
+        async def open_client():
+            client = get_async_client(("test", "https://a.example.com"))
+            await aclose_clients()
+            return client
+
+        assert asyncio.run(open_client()) is not asyncio.run(open_client())
+
+    @pytest.mark.asyncio
+    async def test_closed_client_is_replaced(self):
+        """Test a client closed elsewhere is recreated on next use."""
+        client = get_async_client(("test", "https://a.example.com"))
+        await client.aclose()
+
+        assert get_async_client(("test", "https://a.example.com")) is not client
+        await aclose_clients()
+
+    @pytest.mark.asyncio
+    async def test_landscape_instances_share_pool(self, stub_server):
+        """Test connectors built from equivalent auth share one client."""
+        auths = [
+            LandscapeAuth(server_url=stub_server.url, access_key="k", secret_key="s", auth_method="api_key")
+            for _ in range(2)
+        ]
+
+        assert auths[0].get_async_client() is auths[1].get_async_client()
+        await aclose_clients()
+
+
+class TestConcurrentOperations:
+    """Tests that awaited connector calls overlap instead of blocking the loop."""
+
+    @pytest.mark.asyncio
+    async def test_sequential_calls_reuse_connection(self, connector):
+        """Test sequential calls ride a single keep-alive connection."""
+        first = await connector.get_computer("1")
+        second = await connector.get_computer("2")
+
+        assert first["computer"]["port"] == second["computer"]["port"]
+        await aclose_clients()
+
+    @pytest.mark.asyncio
+    async def test_parallel_calls_overlap(self, connector, stub_server):
+        """Test gathered calls are in flight together rather than serialized."""
+        count = 10
+
+        results = await asyncio.gather(*(connector.get_computer(str(i)) for i in range(count)))
+        await aclose_clients()
+
+        assert [r["computer"]["id"] for r in results] == [str(i) for i in range(count)]
+        assert stub_server.max_in_flight > 1
@@ -0,0 +1,156 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Tests for the shared connector idempotency store.
+
+The shared tier is Django's cache, so these tests run against whatever
+CACHES configures (an in-memory cache under test settings).
+"""
+import asyncio
+import uuid
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from django.core.cache import cache
+from prometheus_client import REGISTRY
+
+from apps.connectors.idempotency import IdempotencyInFlightError, IdempotencyStore
+
+
+@pytest.fixture
+def store():
+    """Store in a namespace no other test shares."""
+    return IdempotencyStore(f"test-{uuid.uuid4().hex[:8]}", ttl=60, max_entries=4, shards=2, claim_ttl=5)
+
+
+def _metric(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class TestIdempotencyStore:
+    """Tests for the two-tier store."""
+
+    def test_result_shared_between_stores(self, store):
+        """Test a result recorded by one worker is served to another from the shared cache."""
+        store.set("op", {"id": 1})
+        other_worker = IdempotencyStore(store.namespace, ttl=60)
+
+        assert other_worker.get("op") == {"id": 1}
+        assert _metric("connector_idempotency_lookups_total", namespace=store.namespace, result="shared_hit") == 1
+
+        # Now served from its local tier
+        assert other_worker.get("op") == {"id": 1}
+        assert _metric("connector_idempotency_lookups_total", namespace=store.namespace, result="local_hit") == 1
+
+    def test_local_tier_is_bounded_lru(self, store):
+        """Test a full shard evicts its least recently used entry."""
+        single_shard = IdempotencyStore(store.namespace, ttl=60, max_entries=2, shards=1)
+        single_shard.set("a", 1)
+        single_shard.set("b", 2)
+        single_shard._get_local("a")
+        single_shard.set("c", 3)
+
+        assert single_shard._get_local("a") == 1
+        assert single_shard._get_local("b") is None
+        assert len(single_shard) == 2
+        assert _metric("connector_idempotency_evictions_total", namespace=store.namespace, reason="capacity") == 1
+
+    def test_expired_results_are_not_served(self, store):
+        """Test entries past their TTL are dropped from both tiers."""
+        store.set("op", {"id": 1})
+
+        with patch("apps.connectors.idempotency.time.time", return_value=10**12):
+            assert store.get("op") is None
+
+        assert _metric("connector_idempotency_evictions_total", namespace=store.namespace, reason="expired") == 1
+
+    def test_claim_is_exclusive_until_released(self, store):
+        """Test only one worker can claim an operation at a time."""
+        other_worker = IdempotencyStore(store.namespace, ttl=60)
+
+        assert store.claim("op") is True
+        assert other_worker.claim("op") is False
+
+        store.release("op")
+        assert other_worker.claim("op") is True
+
+    def test_lapsed_claim_does_not_release_new_owner(self, store):
+        """Test a worker whose claim lapsed leaves the claim another worker took since."""
+        other_worker = IdempotencyStore(store.namespace, ttl=60)
+        assert store.claim("op") is True
+
+        # The claim TTL passes and another worker claims the operation
+        cache.delete(store._claim_key("op"))
+        assert other_worker.claim("op") is True
+
+        store.release("op")
+        assert IdempotencyStore(store.namespace, ttl=60).claim("op") is False
+
+    def test_shared_cache_outage_falls_back_to_local_tier(self, store):
+        """Test results and claims keep working in-process when the shared cache is down."""
+        with (
+            patch.object(cache, "get", side_effect=ConnectionError),
+            patch.object(cache, "set", side_effect=ConnectionError),
+            patch.object(cache, "add", side_effect=ConnectionError),
+        ):
+            store.set("op", {"id": 1})
+            assert store.get("op") == {"id": 1}
+            assert store.claim("other") is True
+            assert store.claim("other") is False
+
+
+class TestRunOnce:
+    """Tests for run_once."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_run_operation_once(self, store):
+        """Test callers racing on one key share the first caller's result."""
+        started = asyncio.Event()
+        finish = asyncio.Event()
+        calls = []
+
+        async def operation():
+            calls.append(1)
+            started.set()
+            await finish.wait()
+            return {"activity_id": "a-1"}
+
+        first = asyncio.create_task(store.run_once("op", operation))
+        await started.wait()
+        second = asyncio.create_task(store.run_once("op", operation))
+        await asyncio.sleep(0.05)
+        finish.set()
+
+        assert await first == {"activity_id": "a-1"}
+        assert await second == {"activity_id": "a-1"}
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_operation_is_not_recorded(self, store):
+        """Test an operation that raises releases its claim and runs again next time."""
+        operation = AsyncMock(side_effect=[RuntimeError("plane down"), {"id": 1}])
+
+        with pytest.raises(RuntimeError):
+            await store.run_once("op", operation)
+        assert await store.run_once("op", operation) == {"id": 1}
+
+        assert operation.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_none_result_is_recorded(self, store):
+        """Test an operation that returns None is replayed rather than run again."""
+        operation = AsyncMock(return_value=None)
+
+        assert await store.run_once("op", operation) is None
+        assert await IdempotencyStore(store.namespace, ttl=60).run_once("op", operation) is None
+
+        assert operation.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_wait_gives_up_on_stuck_claim(self, store):
+        """Test a claim held past the wait timeout raises IdempotencyInFlightError."""
+        other_worker = IdempotencyStore(store.namespace, ttl=60)
+        assert other_worker.claim("op") is True
+
+        with pytest.raises(IdempotencyInFlightError):
+            await store.wait("op", timeout=0.05, interval=0.01)
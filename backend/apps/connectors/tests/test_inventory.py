@@ -0,0 +1,181 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Tests for resumable inventory sync.
+
+Job bookkeeping and Asset writes are patched out so the tests exercise the
+paging, checkpoint and resume logic on its own.
+"""
+import uuid
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.utils import timezone
+
+from apps.connectors.inventory import InventoryPage, InventorySyncInProgressError, _claim_job, run_inventory_sync
+from apps.connectors.models import ConnectorInstance, ConnectorStatus, SyncJob, SyncJobStatus, SyncJobType
+
+
+class FakeSource:
+    """Inventory source serving integer-cursor pages, optionally failing at one page."""
+
+    def __init__(self, pages, fail_at=None, reject_cursor=False):
+        self.pages = pages
+        self.fail_at = fail_at
+        self.reject_cursor = reject_cursor
+        self.cursors = []
+
+    async def iter_inventory_pages(self, cursor=None, correlation_id=None):
+        self.cursors.append(cursor)
+        if cursor is not None and self.reject_cursor:
+            raise RuntimeError("cursor expired")
+        index = cursor or 0
+        while index < len(self.pages):
+            if index == self.fail_at:
+                raise RuntimeError("page failed")
+            next_cursor = index + 1 if index + 1 < len(self.pages) else None
+            yield InventoryPage(records=self.pages[index], next_cursor=next_cursor, total=4)
+            index += 1
+
+    def map_asset(self, record):
+        return record
+
+
+def _job(checkpoint=None):
+    return SimpleNamespace(
+        id=uuid.uuid4(), correlation_id=uuid.uuid4(), checkpoint=checkpoint or {}, records_processed=0
+    )
+
+
+@pytest.fixture
+def bookkeeping():
+    """Patch job persistence and Asset writes; yields (job holder, upserted pages, finish mock)."""
+    state = {"job": _job()}
+    upserted = []
+
+    def checkpoint(job, page, totals):
+        job.checkpoint = {"cursor": page.next_cursor, "pages": job.checkpoint.get("pages", 0) + 1}
+
+    def upsert(records, mapper, chunk_size=None):
+        upserted.append(list(records))
+        return {"fetched": len(records), "created": len(records), "updated": 0, "unchanged": 0, "failed": 0}
+
+    finish = MagicMock()
+    with (
+        patch("apps.connectors.inventory._claim_job", side_effect=lambda *args: state["job"]),
+        patch("apps.connectors.inventory._checkpoint", side_effect=checkpoint),
+        patch("apps.connectors.inventory.upsert_assets", side_effect=upsert),
+        patch("apps.connectors.inventory._finish", finish),
+    ):
+        yield state, upserted, finish
+
+
+PAGES = [[{"asset_id": "a1"}], [{"asset_id": "a2"}], [{"asset_id": "a3"}], [{"asset_id": "a4"}]]
+
+
+class TestRunInventorySync:
+    """Tests for run_inventory_sync."""
+
+    @pytest.mark.asyncio
+    async def test_streams_all_pages(self, bookkeeping):
+        """Test every page is written and the job completes."""
+        state, upserted, finish = bookkeeping
+        instance = MagicMock()
+
+        job = await run_inventory_sync(instance, FakeSource(PAGES))
+
+        assert upserted == PAGES
+        assert job.checkpoint == {"cursor": None, "pages": 4}
+        finish.assert_called_once_with(job, instance)
+
+    @pytest.mark.asyncio
+    async def test_failure_keeps_checkpoint_and_next_run_resumes(self, bookkeeping):
+        """Test a crash mid-walk resumes from the last written page instead of from zero."""
+        state, upserted, finish = bookkeeping
+        instance = MagicMock()
+
+        job = await run_inventory_sync(instance, FakeSource(PAGES, fail_at=2))
+
+        assert upserted == PAGES[:2]
+        assert job.checkpoint["cursor"] == 2
+        error = finish.call_args.args[2]
+        assert str(error) == "page failed"
+
+        # The next run claims the same job and continues at page 2
+        source = FakeSource(PAGES)
+        await run_inventory_sync(instance, source)
+
+        assert source.cursors == [2]
+        assert upserted == PAGES
+        assert finish.call_args.args == (job, instance)
+
+    @pytest.mark.asyncio
+    async def test_rejected_checkpoint_restarts_from_first_page(self, bookkeeping):
+        """Test a checkpoint the source no longer accepts falls back to a full walk."""
+        state, upserted, finish = bookkeeping
+        state["job"] = _job({"cursor": 3, "pages": 3})
+
+        source = FakeSource(PAGES, reject_cursor=True)
+        await run_inventory_sync(MagicMock(), source)
+
+        assert source.cursors == [3, None]
+        assert upserted == PAGES
+        assert len(finish.call_args.args) == 2
+
+
+@pytest.fixture
+def instance(db):
+    """Create the Intune connector instance."""
+    return ConnectorInstance.objects.create(connector_type="intune", name="intune prod", status=ConnectorStatus.ACTIVE)
+
+
+def _stored_job(instance, status, checkpoint=None, idle=timedelta(0)):
+    job = SyncJob.objects.create(
+        connector=instance, job_type=SyncJobType.FULL_SYNC, status=status, checkpoint=checkpoint or {}
+    )
+    SyncJob.objects.filter(id=job.id).update(updated_at=timezone.now() - idle)
+    return job
+
+
+class TestClaimJob:
+    """Tests for _claim_job."""
+
+    def test_running_job_within_lease_is_not_reclaimed(self, instance, settings):
+        """Test a job another worker is still checkpointing is left alone."""
+        settings.CONNECTOR_INVENTORY_JOB_LEASE_SECONDS = 900
+        _stored_job(instance, SyncJobStatus.RUNNING, {"cursor": 2, "pages": 2}, idle=timedelta(minutes=1))
+
+        with pytest.raises(InventorySyncInProgressError):
+            _claim_job(instance, "scheduled", None)
+
+        assert SyncJob.objects.count() == 1
+
+    def test_stale_running_job_is_resumed(self, instance, settings):
+        """Test a job that stopped checkpointing past its lease is taken over."""
+        settings.CONNECTOR_INVENTORY_JOB_LEASE_SECONDS = 900
+        stale = _stored_job(instance, SyncJobStatus.RUNNING, {"cursor": 2, "pages": 2}, idle=timedelta(hours=1))
+
+        job = _claim_job(instance, "scheduled", None)
+
+        assert job.id == stale.id
+        assert job.checkpoint["cursor"] == 2
+
+    def test_failed_job_with_checkpoint_is_resumed(self, instance):
+        """Test a job that failed part-way continues from its checkpoint."""
+        failed = _stored_job(instance, SyncJobStatus.FAILED, {"cursor": 2, "pages": 2})
+
+        job = _claim_job(instance, "scheduled", None)
+
+        assert job.id == failed.id
+        assert job.status == SyncJobStatus.RUNNING
+
+    def test_failed_job_without_checkpoint_starts_new_job(self, instance):
+        """Test a job that failed before its first page is not resumed."""
+        failed = _stored_job(instance, SyncJobStatus.FAILED)
+
+        job = _claim_job(instance, "scheduled", None)
+
+        assert job.id != failed.id
+        assert SyncJob.objects.count() == 2
@@ -0,0 +1,129 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Tests for the shared AWX/Landscape job tracker.
+
+Planes are fake connectors with scripted job statuses; event store writes
+are patched out.
+"""
+import asyncio
+import uuid
+from unittest.mock import patch
+
+import pytest
+
+from apps.connectors.job_tracker import TRACKER_BATCH_SIZE, JobTracker
+from apps.event_store.models import DeploymentEvent
+
+
+class FakePlane:
+    """Connector stand-in answering batched status queries from a dict."""
+
+    TRACKER_PLANE = "ansible"
+    TERMINAL_STATUSES = {"successful", "failed"}
+    SUCCESS_STATUSES = {"successful"}
+
+    def __init__(self, server_url="https://awx.example.com"):
+        self.server_url = server_url
+        self.statuses = {}
+        self.queries = []
+        self.fail_next = False
+
+    async def get_job_statuses(self, job_ids, correlation_id=None):
+        self.queries.append(list(job_ids))
+        if self.fail_next:
+            self.fail_next = False
+            raise ConnectionError("plane unreachable")
+        return {job_id: {"id": job_id, "status": self.statuses.get(job_id, "running")} for job_id in job_ids}
+
+
+@pytest.fixture
+def published():
+    """Capture events the tracker appends to the event store."""
+    events = []
+    with patch("apps.connectors.job_tracker.append_events", side_effect=lambda batch: events.extend(batch)):
+        yield events
+
+
+class TestJobTracker:
+    """Tests for JobTracker."""
+
+    @pytest.mark.asyncio
+    async def test_outstanding_jobs_share_batched_queries(self, published):
+        """Test many jobs on one plane are checked with one query per batch."""
+        tracker = JobTracker(poll_interval=3600)
+        plane = FakePlane()
+        futures = [tracker.track(plane, job_id) for job_id in range(TRACKER_BATCH_SIZE + 5)]
+
+        assert await tracker.poll_once() == 0
+        assert [len(query) for query in plane.queries] == [TRACKER_BATCH_SIZE, 5]
+
+        plane.statuses = {"3": "successful", "7": "failed"}
+        assert await tracker.poll_once() == 2
+        assert futures[3].result()["success"] is True
+        assert futures[7].result() == {"success": False, "status": "failed", "job": {"id": "7", "status": "failed"}}
+        assert tracker.pending == TRACKER_BATCH_SIZE + 3
+
+    @pytest.mark.asyncio
+    async def test_completion_published_for_deployment_jobs(self, published):
+        """Test completions with a deployment correlation ID are appended as events."""
+        tracker = JobTracker(poll_interval=3600)
+        plane = FakePlane()
+        correlation_id = str(uuid.uuid4())
+        tracker.track(plane, 1, correlation_id=correlation_id, event_data={"app_name": "firefox"})
+        tracker.track(plane, 2, correlation_id="not-a-deployment")
+        plane.statuses = {"1": "failed", "2": "successful"}
+
+        await tracker.poll_once()
+
+        assert len(published) == 1
+        event = published[0]
+        assert event.event_type == DeploymentEvent.EventType.DEPLOYMENT_FAILED
+        assert str(event.correlation_id) == correlation_id
+        assert event.event_data["app_name"] == "firefox"
+        assert event.event_data["job_id"] == "1"
+        assert event.event_data["connector_type"] == "ansible"
+
+    @pytest.mark.asyncio
+    async def test_failed_query_keeps_jobs_tracked(self, published):
+        """Test a plane that cannot be queried is retried on the next poll."""
+        tracker = JobTracker(poll_interval=3600)
+        plane, other_plane = FakePlane(), FakePlane("https://awx2.example.com")
+        future = tracker.track(plane, 1)
+        other_future = tracker.track(other_plane, 1)
+        plane.statuses = other_plane.statuses = {"1": "successful"}
+        plane.fail_next = True
+
+        await tracker.poll_once()
+        assert not future.done()
+        assert other_future.done()
+
+        await tracker.poll_once()
+        assert future.result()["status"] == "successful"
+        assert tracker.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_waiters_resolve_from_background_poll(self, published):
+        """Test wait() returns once the poll loop sees the terminal status."""
+        tracker = JobTracker(poll_interval=0.01)
+        plane = FakePlane()
+
+        waiter = asyncio.create_task(tracker.wait(plane, 9, timeout=1))
+        await asyncio.sleep(0.03)
+        plane.statuses = {"9": "successful"}
+
+        assert (await waiter)["success"] is True
+        assert tracker.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_abandoned_jobs_are_dropped(self, published):
+        """Test a job whose waiters all timed out stops being queried."""
+        tracker = JobTracker(poll_interval=3600)
+        plane = FakePlane()
+
+        with pytest.raises(asyncio.TimeoutError):
+            await tracker.wait(plane, 5, timeout=0.01)
+        await tracker.poll_once()
+
+        assert tracker.pending == 0
+        assert plane.queries == []
@@ -0,0 +1,263 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Tests for the pwsh worker pool.
+
+The pool is driven end to end over real pipes; a small Python script that
+speaks the ConnectorWorker.ps1 framing protocol stands in for pwsh.
+"""
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from apps.connectors.powershell_pool import WORKER_SCRIPT, PowerShellWorkerError, PowerShellWorkerPool
+from apps.connectors.services import PowerShellConnectorService
+
+FAKE_WORKER = r"""
+import json, os, sys, time
+
+print(json.dumps({"ready": True, "pid": os.getpid(), "preloaded": [], "warnings": []}), flush=True)
+for line in sys.stdin:
+    request = json.loads(line)
+    if request["action"] == "ping":
+        print(json.dumps({"id": request["id"], "pong": True}), flush=True)
+        continue
+    params = request["params"]
+    action = params.get("Action")
+    if action == "Crash":
+        sys.exit(3)
+    if action == "Sleep":
+        time.sleep(float(params["Seconds"]))
+    print("stray host output", flush=True)
+    if action == "Fail":
+        frame = {"exit_code": 1, "stdout": "", "stderr": "Missing required deployment parameters"}
+    else:
+        payload = {"status": "success", "pid": os.getpid(), "object_id": "obj-" + params.get("AppName", "")}
+        frame = {"exit_code": 0, "stdout": json.dumps(payload), "stderr": ""}
+    print(json.dumps({"id": request["id"], **frame}), flush=True)
+"""
+
+DEPLOY_PARAMS = {
+    "deployment_intent_id": "intent-1",
+    "artifact_path": "artifacts/app.msi",
+    "target_ring": "LAB",
+    "app_name": "PoolApp",
+    "version": "1.0.0",
+}
+
+
+class FakeWorkerPool(PowerShellWorkerPool):
+    """Pool whose workers run the fake worker script instead of pwsh."""
+
+    def __init__(self, script: Path, **kwargs):
+        kwargs.setdefault("connector_scripts", PowerShellConnectorService.CONNECTOR_SCRIPTS)
+        super().__init__(base_path="/app", **kwargs)
+        self.script = script
+
+    def _worker_command(self, connector_type):
+        return [sys.executable, str(self.script)]
+
+
+@pytest.fixture
+def make_pool(tmp_path):
+    """Build fake-worker pools and shut them down after the test."""
+    script = tmp_path / "fake_worker.py"
+    script.write_text(FAKE_WORKER)
+    pools = []
+
+    def factory(**kwargs):
+        pool = FakeWorkerPool(script, **kwargs)
+        pools.append(pool)
+        return pool
+
+    yield factory
+    for pool in pools:
+        pool.shutdown()
+
+
+def _pid(result):
+    return json.loads(result.stdout)["pid"]
+
+
+class TestPowerShellWorkerPool:
+    """Test worker reuse, recycling and concurrency."""
+
+    def test_worker_is_reused(self, make_pool):
+        """Test consecutive calls are served by the same warm worker."""
+        pool = make_pool()
+
+        first = pool.run("intune", {"Action": "HealthCheck"}, timeout=10)
+        second = pool.run("intune", {"Action": "HealthCheck"}, timeout=10)
+
+        assert first.returncode == 0
+        assert _pid(first) == _pid(second)
+        assert pool.stats()["intune"] == {"idle_workers": 1, "requests_served": 2}
+
+    def test_workers_are_per_connector(self, make_pool):
+        """Test each connector gets its own worker."""
+        pool = make_pool()
+
+        intune = pool.run("intune", {"Action": "HealthCheck"}, timeout=10)
+        jamf = pool.run("jamf", {"Action": "HealthCheck"}, timeout=10)
+
+        assert _pid(intune) != _pid(jamf)
+
+    def test_recycled_after_max_requests(self, make_pool):
+        """Test a worker is retired once it has served max_requests_per_worker."""
+        pool = make_pool(max_requests_per_worker=2)
+
+        pids = [_pid(pool.run("intune", {"Action": "HealthCheck"}, timeout=10)) for _ in range(3)]
+
+        assert pids[0] == pids[1] != pids[2]
+
+    def test_failed_script_keeps_worker(self, make_pool):
+        """Test a non-zero exit code is reported without discarding the worker."""
+        pool = make_pool()
+
+        result = pool.run("intune", {"Action": "Fail"}, timeout=10)
+
+        assert result.returncode == 1
+        assert "Missing required" in result.stderr
+        assert pool.stats()["intune"]["idle_workers"] == 1
+
+    def test_timeout_retires_worker(self, make_pool):
+        """Test an overrunning call raises TimeoutExpired and the worker is not reused."""
+        pool = make_pool()
+        before = _pid(pool.run("intune", {"Action": "HealthCheck"}, timeout=10))
+
+        with pytest.raises(subprocess.TimeoutExpired):
+            pool.run("intune", {"Action": "Sleep", "Seconds": "5"}, timeout=0.5)
+
+        assert _pid(pool.run("intune", {"Action": "HealthCheck"}, timeout=10)) != before
+
+    def test_crashed_worker_replaced(self, make_pool):
+        """Test a worker dying mid-request raises and a fresh worker serves the next call."""
+        pool = make_pool()
+
+        with pytest.raises(PowerShellWorkerError):
+            pool.run("intune", {"Action": "Crash"}, timeout=10)
+
+        assert pool.run("intune", {"Action": "HealthCheck"}, timeout=10).returncode == 0
+
+    def test_idle_worker_health_checked(self, make_pool):
+        """Test an idle worker that no longer answers is recycled on checkout."""
+        pool = make_pool(health_check_idle_seconds=0)
+        pid = _pid(pool.run("intune", {"Action": "HealthCheck"}, timeout=10))
+        os.kill(pid, 9)
+        time.sleep(0.1)
+
+        assert _pid(pool.run("intune", {"Action": "HealthCheck"}, timeout=10)) != pid
+
+    def test_concurrent_calls_per_connector(self, make_pool):
+        """Test async submissions on one connector run concurrently up to workers_per_connector."""
+        pool = make_pool(workers_per_connector=2)
+        params = {"Action": "Sleep", "Seconds": "0.5"}
+        # Warm both workers so the timing below excludes process startup
+        warm = [pool.submit(pool.run, "intune", params, 10) for _ in range(2)]
+        [future.result() for future in warm]
+
+        start = time.monotonic()
+        futures = [pool.submit(pool.run, "intune", params, 10) for _ in range(2)]
+        pids = {_pid(future.result()) for future in futures}
+
+        assert time.monotonic() - start < 0.9
+        assert len(pids) == 2
+
+    def test_shutdown_stops_workers(self, make_pool):
+        """Test shutdown stops idle workers and rejects new calls."""
+        pool = make_pool()
+        pool.run("intune", {"Action": "HealthCheck"}, timeout=10)
+
+        pool.shutdown()
+
+        assert pool.stats()["intune"]["idle_workers"] == 0
+        with pytest.raises(PowerShellWorkerError):
+            pool.run("intune", {"Action": "HealthCheck"}, timeout=10)
+
+
+class TestPooledConnectorService:
+    """Test PowerShellConnectorService on top of the pool."""
+
+    def test_health_check_and_deploy(self, make_pool, monkeypatch):
+        """Test pooled calls produce the same results as one-shot calls."""
+        monkeypatch.setattr(Path, "exists", lambda self: True)
+        service = PowerShellConnectorService(pool=make_pool())
+
+        assert service.health_check("intune")["status"] == "healthy"
+        result = service.deploy("intune", DEPLOY_PARAMS)
+
+        assert result["status"] == "success"
+        assert result["connector_object_id"] == "obj-PoolApp"
+
+    def test_deploy_async(self, make_pool, monkeypatch):
+        """Test deploy_async resolves to the deploy() result."""
+        monkeypatch.setattr(Path, "exists", lambda self: True)
+        service = PowerShellConnectorService(pool=make_pool())
+
+        futures = [service.deploy_async("jamf", DEPLOY_PARAMS) for _ in range(3)]
+
+        assert [f.result(timeout=10)["connector_object_id"] for f in futures] == ["obj-PoolApp"] * 3
+
+    def test_deploy_async_without_pool(self, monkeypatch):
+        """Test deploy_async falls back to an inline call without a pool."""
+        service = PowerShellConnectorService()
+        monkeypatch.setattr(service, "deploy", lambda connector_type, params: {"status": "success"})
+
+        assert service.deploy_async("intune", DEPLOY_PARAMS).result() == {"status": "success"}
+
+
+WORKER_PATH = Path(__file__).resolve().parents[4] / WORKER_SCRIPT
+
+
+class TestConnectorWorkerSyntax:
+    """Test ConnectorWorker.ps1 parses before anything runs it."""
+
+    def test_help_is_a_block_comment(self):
+        """Test only comments precede param(), so the help block cannot be parsed as code."""
+        header = WORKER_PATH.read_text()
+        header = header[: header.index("param(")]
+        header = re.sub(r"(?ms)^<#.*?^#>", "", header)
+
+        assert all(not line.strip() or line.lstrip().startswith("#") for line in header.splitlines())
+
+    @pytest.mark.skipif(shutil.which("pwsh") is None, reason="pwsh not installed")
+    def test_parses_without_errors(self):
+        """Test the PowerShell parser reports no errors for the worker script."""
+        command = (
+            "$errors = $null; "
+            "$null = [System.Management.Automation.Language.Parser]::ParseFile("
+            f"'{WORKER_PATH}', [ref]$null, [ref]$errors); "
+            "$errors | ForEach-Object { $_.ToString() }; exit $errors.Count"
+        )
+        result = subprocess.run(
+            ["pwsh", "-NoProfile", "-NonInteractive", "-Command", command], capture_output=True, text=True, timeout=60
+        )
+
+        assert result.returncode == 0, result.stdout
+
+
+@pytest.mark.skipif(shutil.which("pwsh") is None, reason="pwsh not installed")
+class TestConnectorWorkerScript:
+    """Test ConnectorWorker.ps1 against the real connector scripts."""
+
+    def test_real_worker(self):
+        """Test health check and deploy through a real pwsh worker."""
+        base_path = Path(__file__).resolve().parents[4]
+        service = PowerShellConnectorService(
+            base_path=str(base_path),
+            pool=PowerShellWorkerPool(
+                base_path=str(base_path), connector_scripts=PowerShellConnectorService.CONNECTOR_SCRIPTS
+            ),
+        )
+        try:
+            assert service.health_check("intune")["status"] == "healthy"
+            assert service.deploy("intune", DEPLOY_PARAMS)["connector_object_id"]
+        finally:
+            service.pool.shutdown()
@@ -0,0 +1,168 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Tests for the shared connector token broker.
+
+The shared tier is Django's cache, so these tests run against whatever
+CACHES configures (an in-memory cache under test settings).
+"""
+import asyncio
+import threading
+import time
+import uuid
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+from prometheus_client import REGISTRY
+
+from apps.connectors.token_broker import TokenBroker
+
+
+@pytest.fixture
+def cache_key():
+    """Credential key no other test shares."""
+    return f"test_token:{uuid.uuid4().hex[:8]}"
+
+
+@pytest.fixture
+def broker():
+    """Broker refreshing at half a token's lifetime, with short waits."""
+    return TokenBroker(refresh_fraction=0.5, lock_ttl=5, wait_timeout=2, wait_interval=0.01)
+
+
+class FakeIdP:
+    """Identity provider issuing numbered tokens, optionally slowly or failing."""
+
+    def __init__(self, expires_in=3600, delay=0.0):
+        self.expires_in = expires_in
+        self.delay = delay
+        self.calls = 0
+        self.fail = False
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+            number = self.calls
+        time.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("idp down")
+        return {"access_token": f"token-{number}", "expires_in": self.expires_in}
+
+
+def _metric(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class TestTokenBroker:
+    """Tests for TokenBroker.get_token."""
+
+    def test_token_shared_until_refresh_point(self, broker, cache_key):
+        """Test workers reuse one token and it is refreshed once its lifetime fraction has passed."""
+        idp = FakeIdP(expires_in=1000)
+        other_worker = TokenBroker(refresh_fraction=0.5)
+
+        assert broker.get_token("jamf", cache_key, idp).access_token == "token-1"
+        assert other_worker.get_token("jamf", cache_key, idp).access_token == "token-1"
+        assert cache.get(cache_key)["access_token"] == "token-1"
+
+        # Past half its lifetime the still-valid token is replaced
+        with patch("apps.connectors.token_broker.time.time", return_value=time.time() + 600):
+            assert broker.get_token("jamf", cache_key, idp).access_token == "token-2"
+        assert idp.calls == 2
+
+    def test_concurrent_misses_fetch_once(self, broker, cache_key):
+        """Test workers starting together make a single identity provider call."""
+        idp = FakeIdP(delay=0.1)
+        tokens = []
+
+        def worker():
+            tokens.append(broker.get_token("intune", cache_key, idp).access_token)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert idp.calls == 1
+        assert tokens == ["token-1"] * 8
+
+    def test_stale_token_served_while_another_worker_refreshes(self, broker, cache_key):
+        """Test a worker that loses the refresh lock keeps using the still-valid token."""
+        idp = FakeIdP(expires_in=1000)
+        broker.get_token("jamf", cache_key, idp)
+        # Another worker holds the refresh lock (without expiry, as the clock is moved below)
+        cache.add(f"{cache_key}:refresh-lock", True, timeout=None)
+
+        with patch("apps.connectors.token_broker.time.time", return_value=time.time() + 600):
+            assert broker.get_token("jamf", cache_key, idp).access_token == "token-1"
+
+        assert idp.calls == 1
+        assert _metric("connector_token_lookups_total", connector_type="jamf", result="stale") >= 1
+
+    def test_refresh_outliving_lock_leaves_new_holder_lock(self, broker, cache_key):
+        """Test a refresh that outlives its lock does not release the lock another worker took since."""
+        lock_key = f"{cache_key}:refresh-lock"
+
+        def slow_fetch():
+            # The lock TTL passes mid-fetch and another worker takes the lock
+            cache.delete(lock_key)
+            cache.add(lock_key, "other-worker", timeout=None)
+            return {"access_token": "token-1", "expires_in": 3600}
+
+        assert broker.get_token("jamf", cache_key, slow_fetch).access_token == "token-1"
+        assert cache.get(lock_key) == "other-worker"
+
+    def test_failed_proactive_refresh_keeps_current_token(self, broker, cache_key):
+        """Test an identity provider outage during proactive refresh does not fail callers."""
+        idp = FakeIdP(expires_in=1000)
+        broker.get_token("landscape", cache_key, idp)
+        idp.fail = True
+
+        with patch("apps.connectors.token_broker.time.time", return_value=time.time() + 600):
+            assert broker.get_token("landscape", cache_key, idp).access_token == "token-1"
+        with patch("apps.connectors.token_broker.time.time", return_value=time.time() + 990):
+            with pytest.raises(ConnectionError):
+                broker.get_token("landscape", cache_key, idp)
+
+    def test_force_refresh_replaces_token(self, broker, cache_key):
+        """Test force_refresh fetches a new token and records the reason."""
+        idp = FakeIdP()
+        broker.get_token("jamf", cache_key, idp)
+        before = _metric("connector_token_refreshes_total", connector_type="jamf", reason="forced")
+
+        assert broker.get_token("jamf", cache_key, idp, force_refresh=True).access_token == "token-2"
+        assert _metric("connector_token_refreshes_total", connector_type="jamf", reason="forced") == before + 1
+        assert _metric("connector_token_fetch_seconds_count", connector_type="jamf", status="success") >= 2
+
+    def test_shared_cache_outage_fetches_directly(self, broker, cache_key):
+        """Test tokens are still served when the shared cache is down."""
+        idp = FakeIdP()
+        with (
+            patch.object(cache, "get", side_effect=ConnectionError),
+            patch.object(cache, "set", side_effect=ConnectionError),
+            patch.object(cache, "add", side_effect=ConnectionError),
+            patch.object(cache, "delete", side_effect=ConnectionError),
+        ):
+            assert broker.get_token("entra", cache_key, idp).access_token == "token-1"
+
+
+class TestTokenBrokerAsync:
+    """Tests for TokenBroker.aget_token."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_fetch_once(self, broker, cache_key):
+        """Test coroutines racing on one credential share a single fetch."""
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {"access_token": "entra-token", "expires_in": 3600}
+
+        tokens = await asyncio.gather(*(broker.aget_token("entra", cache_key, fetch) for _ in range(5)))
+
+        assert len(calls) == 1
+        assert {token.access_token for token in tokens} == {"entra-token"}
@@ -0,0 +1,320 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Shared access-token broker for connector auth modules.
+
+Jamf, Intune, Landscape (OAuth) and Entra ID used to cache tokens on their
+own and refresh only once a token had (nearly) expired. When many workers
+started at once, or a token lapsed under load, every worker called the
+identity provider at the same moment. The broker replaces those per-module
+caches:
+
+- Tokens live in the shared Django cache (Redis in deployed environments)
+  under the auth module's existing cache key, so every worker reuses one
+  token per credential.
+- A token is refreshed once CONNECTOR_TOKEN_REFRESH_FRACTION of its lifetime
+  has passed, while it is still valid. Workers that find a token due for
+  refresh keep using it while one of them refreshes.
+- Refreshes are single-flight across the cluster. The worker that wins an
+  atomic set-if-absent (cache.add) on the credential's lock key calls the
+  identity provider. Workers without a usable token wait for its result
+  (up to CONNECTOR_TOKEN_WAIT_SECONDS) instead of fetching too. The lock
+  holds an owner token and is only released by its holder (see
+  apps.core.cache_locks), so a refresh that outlives the lock TTL cannot
+  release the lock another worker took since.
+- If the shared cache is unreachable, tokens are fetched directly.
+
+Fetch latency, refresh reasons and lookup results are exported as
+Prometheus metrics (see apps.core.metrics).
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Generator, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.core.cache_locks import new_lock_token, release_lock
+from apps.core.metrics import record_token_fetch, record_token_lookup
+
+logger = logging.getLogger(__name__)
+
+# Lifetime assumed when the identity provider does not return expires_in
+DEFAULT_LIFETIME_SECONDS = 3600
+# Tokens are treated as expired this long before the provider's expiry
+EXPIRY_SKEW_SECONDS = 60
+
+_FRESH, _STALE, _UNUSABLE = "fresh", "stale", "unusable"
+# Steps _lookup() asks its caller to perform
+_FETCH, _SLEEP = "fetch", "sleep"
+
+
+@dataclass(frozen=True)
+class BrokeredToken:
+    """Access token served by the broker."""
+
+    access_token: str
+    data: dict[str, Any]
+    issued_at: float
+    refresh_at: float
+    expires_at: float
+
+
+class TokenBroker:
+    """
+    Cluster-wide token cache with proactive, single-flight refresh.
+
+    Use get_token_broker() rather than instantiating it directly.
+    """
+
+    def __init__(
+        self,
+        refresh_fraction: Optional[float] = None,
+        lock_ttl: Optional[int] = None,
+        wait_timeout: Optional[float] = None,
+        wait_interval: float = 0.1,
+    ):
+        """
+        Initialize token broker.
+
+        Args:
+            refresh_fraction: Fraction of lifetime after which a token is refreshed
+                (defaults to CONNECTOR_TOKEN_REFRESH_FRACTION)
+            lock_ttl: Seconds a refresh lock is held at most (defaults to CONNECTOR_TOKEN_LOCK_SECONDS)
+            wait_timeout: Seconds to wait for another worker's refresh (defaults to CONNECTOR_TOKEN_WAIT_SECONDS)
+            wait_interval: Seconds between checks while waiting
+        """
+        self.refresh_fraction = refresh_fraction or settings.CONNECTOR_TOKEN_REFRESH_FRACTION
+        self.lock_ttl = lock_ttl or settings.CONNECTOR_TOKEN_LOCK_SECONDS
+        self.wait_timeout = wait_timeout if wait_timeout is not None else settings.CONNECTOR_TOKEN_WAIT_SECONDS
+        self.wait_interval = wait_interval
+
+    @staticmethod
+    def _lock_key(cache_key: str) -> str:
+        return f"{cache_key}:refresh-lock"
+
+    def _load(self, cache_key: str) -> Optional[dict[str, Any]]:
+        try:
+            return cache.get(cache_key)
+        except Exception as e:
+            logger.warning(f"Token broker: shared cache unavailable ({e})")
+            return None
+
+    def _store(self, cache_key: str, token_data: dict[str, Any]) -> dict[str, Any]:
+        expires_in = token_data.get("expires_in")
+        lifetime = int(expires_in) if expires_in is not None else DEFAULT_LIFETIME_SECONDS
+        issued_at = time.time()
+        entry = {
+            "access_token": token_data["access_token"],
+            "token_data": token_data,
+            "issued_at": issued_at,
+            "refresh_at": issued_at + lifetime * self.refresh_fraction,
+            "expires_at": issued_at + max(lifetime - EXPIRY_SKEW_SECONDS, lifetime * self.refresh_fraction),
+        }
+        try:
+            cache.set(cache_key, entry, timeout=lifetime)
+        except Exception as e:
+            logger.warning(f"Token broker: could not share token ({e})")
+        return entry
+
+    def _acquire_lock(self, cache_key: str) -> Optional[int]:
+        """Take the refresh lock; returns its owner token, or None if another worker holds it."""
+        token = new_lock_token()
+        try:
+            return token if cache.add(self._lock_key(cache_key), token, timeout=self.lock_ttl) else None
+        except Exception:
+            # Without the shared cache there is nothing to coordinate on
+            return token
+
+    def _release_lock(self, cache_key: str, token: int) -> None:
+        try:
+            release_lock(self._lock_key(cache_key), token)
+        except Exception as e:
+            logger.warning(f"Token broker: could not release refresh lock ({e})")
+
+    @staticmethod
+    def _state(entry: Optional[dict[str, Any]], not_before: float) -> str:
+        now = time.time()
+        if entry is None or entry["issued_at"] < not_before or now >= entry["expires_at"]:
+            return _UNUSABLE
+        return _STALE if now >= entry["refresh_at"] else _FRESH
+
+    @staticmethod
+    def _token(entry: dict[str, Any]) -> BrokeredToken:
+        return BrokeredToken(
+            access_token=entry["access_token"],
+            data=entry["token_data"],
+            issued_at=entry["issued_at"],
+            refresh_at=entry["refresh_at"],
+            expires_at=entry["expires_at"],
+        )
+
+    def _begin(self, cache_key: str, force_refresh: bool):
+        """Look up the cached entry; returns (entry, state, reason to fetch, not_before)."""
+        not_before = time.time() if force_refresh else 0.0
+        entry = self._load(cache_key)
+        state = self._state(entry, not_before)
+        if force_refresh:
+            reason = "forced"
+        elif state == _STALE:
+            reason = "proactive"
+        else:
+            reason = "initial"
+        return entry, state, reason, not_before
+
+    def _fetch_failed(self, connector_type: str, entry, state: str, error: Exception) -> BrokeredToken:
+        if state == _STALE:
+            # The current token is still valid; the next lookup retries the refresh
+            logger.warning(
+                f"Token broker: proactive refresh for {connector_type} failed, keeping current token ({error})",
+                extra={"connector_type": connector_type},
+            )
+            return self._token(entry)
+        raise error
+
+    def _refresh(
+        self, connector_type: str, cache_key: str, entry, state: str, reason: str, not_before: float
+    ) -> Generator[str, Any, BrokeredToken]:
+        """Refresh steps run while holding the lock (see _lookup())."""
+        # Another worker may have refreshed between our lookup and taking the lock
+        current = self._load(cache_key)
+        if self._state(current, not_before) == _FRESH:
+            record_token_lookup(connector_type, "waited")
+            return self._token(current)
+        started = time.monotonic()
+        try:
+            token_data = yield _FETCH
+        except Exception as e:
+            record_token_fetch(connector_type, reason, "failed", time.monotonic() - started)
+            return self._fetch_failed(connector_type, entry, state, e)
+        record_token_fetch(connector_type, reason, "success", time.monotonic() - started)
+        record_token_lookup(connector_type, "miss")
+        return self._token(self._store(cache_key, token_data))
+
+    def _lookup(self, connector_type: str, cache_key: str, force_refresh: bool) -> Generator[str, Any, BrokeredToken]:
+        """
+        Token lookup shared by get_token() and aget_token().
+
+        A generator that yields _FETCH when the identity provider must be
+        called (the caller sends back the token response, or throws the
+        fetch error in) and _SLEEP when the caller should wait
+        wait_interval before the next check. Returns the token.
+        """
+        entry, state, reason, not_before = self._begin(cache_key, force_refresh)
+        if state == _FRESH:
+            record_token_lookup(connector_type, "hit")
+            return self._token(entry)
+
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            lock_token = self._acquire_lock(cache_key)
+            if lock_token is not None:
+                try:
+                    return (yield from self._refresh(connector_type, cache_key, entry, state, reason, not_before))
+                finally:
+                    self._release_lock(cache_key, lock_token)
+
+            if state == _STALE:
+                # Another worker is refreshing; the current token is still valid
+                record_token_lookup(connector_type, "stale")
+                return self._token(entry)
+
+            if time.monotonic() >= deadline:
+                logger.warning(
+                    f"Token broker: gave up waiting for {connector_type} token refresh, fetching directly",
+                    extra={"connector_type": connector_type},
+                )
+                started = time.monotonic()
+                token_data = yield _FETCH
+                record_token_fetch(connector_type, "lock_timeout", "success", time.monotonic() - started)
+                return self._token(self._store(cache_key, token_data))
+
+            yield _SLEEP
+            entry = self._load(cache_key)
+            state = self._state(entry, not_before)
+            if state != _UNUSABLE:
+                record_token_lookup(connector_type, "waited")
+                return self._token(entry)
+
+    def get_token(
+        self,
+        connector_type: str,
+        cache_key: str,
+        fetch: Callable[[], dict[str, Any]],
+        force_refresh: bool = False,
+    ) -> BrokeredToken:
+        """
+        Get a token for a credential, fetching it at most once cluster-wide.
+
+        Args:
+            connector_type: Connector type (metric label)
+            cache_key: Shared cache key identifying the credential
+            fetch: Calls the identity provider; returns a token response with
+                access_token and (optionally) expires_in
+            force_refresh: Ignore the cached token (e.g. after a 401)
+
+        Returns:
+            BrokeredToken
+
+        Raises:
+            Whatever fetch raises when no valid token is available
+        """
+        lookup = self._lookup(connector_type, cache_key, force_refresh)
+        reply, error = None, None
+        while True:
+            try:
+                step = lookup.send(reply) if error is None else lookup.throw(error)
+            except StopIteration as done:
+                return done.value
+            reply, error = None, None
+            if step == _SLEEP:
+                time.sleep(self.wait_interval)
+                continue
+            try:
+                reply = fetch()
+            except Exception as e:
+                error = e
+
+    async def aget_token(
+        self,
+        connector_type: str,
+        cache_key: str,
+        fetch: Callable[[], Awaitable[dict[str, Any]]],
+        force_refresh: bool = False,
+    ) -> BrokeredToken:
+        """Async variant of get_token() for coroutine fetch functions."""
+        lookup = self._lookup(connector_type, cache_key, force_refresh)
+        reply, error = None, None
+        while True:
+            try:
+                step = lookup.send(reply) if error is None else lookup.throw(error)
+            except StopIteration as done:
+                return done.value
+            reply, error = None, None
+            if step == _SLEEP:
+                await asyncio.sleep(self.wait_interval)
+                continue
+            try:
+                reply = await fetch()
+            except Exception as e:
+                error = e
+
+    def invalidate(self, cache_key: str) -> None:
+        """Drop the cached token for a credential."""
+        try:
+            cache.delete(cache_key)
+        except Exception as e:
+            logger.warning(f"Token broker: could not drop cached token ({e})")
+
+
+_broker: Optional[TokenBroker] = None
+
+
+def get_token_broker() -> TokenBroker:
+    """Get the process-wide token broker, creating it on first use."""
+    global _broker
+    if _broker is None:
+        _broker = TokenBroker()
+    return _broker
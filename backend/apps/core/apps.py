@@ -12,3 +12,7 @@ class CoreConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.core"
     verbose_name = "EUCORA Core"
+
+    def ready(self):
+        """Import signal handlers when app is ready."""
+        from . import signals  # noqa: F401
@@ -0,0 +1,71 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Owner-checked release of locks taken with cache.add() on the default cache.
+
+A lock whose TTL lapsed while its holder was still working may already have
+been taken by another worker; deleting it unconditionally would release that
+worker's lock. Holders store a random token as the lock value and release
+only if the lock still holds it. On Redis the compare-and-delete is one Lua
+script; other backends (local memory in development and tests) compare and
+delete in two steps.
+
+Usage:
+    from apps.core.cache_locks import new_lock_token, release_lock
+
+    token = new_lock_token()
+    if cache.add(lock_key, token, timeout=30):
+        try:
+            ...
+        finally:
+            release_lock(lock_key, token)
+"""
+import secrets
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+# Delete KEYS[1] only while it holds ARGV[1]
+_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+def new_lock_token() -> int:
+    """
+    Random lock owner token.
+
+    An int, which django-redis stores as plain digits rather than pickled, so
+    the Lua script can compare it with the stored value.
+    """
+    return secrets.randbits(62)
+
+
+def release_lock(key: str, token: int) -> bool:
+    """
+    Delete a lock if it is still held under token.
+
+    Args:
+        key: Cache key of the lock
+        token: Token the lock was taken with
+
+    Returns:
+        True if the lock was released, False if it had lapsed or changed owner
+    """
+    if settings.CACHES["default"]["BACKEND"].startswith("django_redis."):
+        from django_redis import get_redis_connection
+
+        return bool(get_redis_connection("default").eval(_RELEASE_SCRIPT, 1, cache.make_key(key), str(token)))
+    if cache.get(key) != token:
+        return False
+    cache.delete(key)
+    return True
+
+
+async def arelease_lock(key: str, token: int) -> bool:
+    """Async variant of release_lock()."""
+    return await sync_to_async(release_lock)(key, token)
@@ -105,6 +105,62 @@ connector_operation_duration_seconds = Histogram(
     buckets=(0.1, 0.5, 1, 5, 10, 30, 60, 300),
 )
 
+# Connector Idempotency Store Metrics
+connector_idempotency_lookups_total = Counter(
+    "connector_idempotency_lookups_total",
+    "Idempotency store lookups by result (local_hit, shared_hit, miss)",
+    ["namespace", "result"],
+)
+
+connector_idempotency_evictions_total = Counter(
+    "connector_idempotency_evictions_total",
+    "Local idempotency entries evicted by reason (capacity, expired)",
+    ["namespace", "reason"],
+)
+
+connector_idempotency_claims_total = Counter(
+    "connector_idempotency_claims_total",
+    "In-flight claims on idempotent operations by outcome (acquired, contended)",
+    ["namespace", "outcome"],
+)
+
+connector_token_fetch_seconds = Histogram(
+    "connector_token_fetch_seconds",
+    "Latency of connector access token requests to the identity provider",
+    ["connector_type", "status"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+
+connector_token_refreshes_total = Counter(
+    "connector_token_refreshes_total",
+    "Connector access token fetches by reason (initial, proactive, forced, lock_timeout)",
+    ["connector_type", "reason"],
+)
+
+connector_token_lookups_total = Counter(
+    "connector_token_lookups_total",
+    "Connector token broker lookups by result (hit, stale, waited, miss)",
+    ["connector_type", "result"],
+)
+
+# Agent heartbeat metrics
+agent_heartbeats_total = Counter(
+    "agent_heartbeats_total",
+    "Agent heartbeats by path (coalesced in Redis, or database)",
+    ["path"],
+)
+
+agent_heartbeats_flushed_total = Counter(
+    "agent_heartbeats_flushed_total",
+    "Coalesced agent heartbeats written to the database",
+)
+
+agent_task_wakeups_total = Counter(
+    "agent_task_wakeups_total",
+    "Task wake-ups published to agents by outcome (delivered to a waiting long-poll, or missed)",
+    ["outcome"],
+)
+
 
 def record_deployment(status: str, ring: str, app_name: str, requires_cab: bool, duration: float):
     """
@@ -220,3 +276,45 @@ def record_connector_operation(connector_type: str, operation: str, status: str,
     connector_operation_duration_seconds.labels(
         connector_type=connector_type, operation=operation, status=status
     ).observe(duration)
+
+
+def record_idempotency_lookup(namespace: str, result: str):
+    """Record an idempotency store lookup ('local_hit', 'shared_hit' or 'miss')."""
+    connector_idempotency_lookups_total.labels(namespace=namespace, result=result).inc()
+
+
+def record_idempotency_eviction(namespace: str, reason: str):
+    """Record a local idempotency entry eviction ('capacity' or 'expired')."""
+    connector_idempotency_evictions_total.labels(namespace=namespace, reason=reason).inc()
+
+
+def record_idempotency_claim(namespace: str, outcome: str):
+    """Record an in-flight claim attempt ('acquired' or 'contended')."""
+    connector_idempotency_claims_total.labels(namespace=namespace, outcome=outcome).inc()
+
+
+def record_token_fetch(connector_type: str, reason: str, status: str, duration: float):
+    """Record an access token fetch from an identity provider ('success' or 'failed')."""
+    connector_token_fetch_seconds.labels(connector_type=connector_type, status=status).observe(duration)
+    connector_token_refreshes_total.labels(connector_type=connector_type, reason=reason).inc()
+
+
+def record_token_lookup(connector_type: str, result: str):
+    """Record a token broker lookup ('hit', 'stale', 'waited' or 'miss')."""
+    connector_token_lookups_total.labels(connector_type=connector_type, result=result).inc()
+
+
+def record_agent_heartbeat(path: str):
+    """Record an agent heartbeat ('coalesced' or 'database')."""
+    agent_heartbeats_total.labels(path=path).inc()
+
+
+def record_heartbeats_flushed(count: int):
+    """Record coalesced heartbeats flushed to the database."""
+    agent_heartbeats_flushed_total.inc(count)
+
+
+def record_agent_wakeups(published: int, delivered: int):
+    """Record task wake-ups published to agents and how many reached a waiting long-poll."""
+    agent_task_wakeups_total.labels(outcome="delivered").inc(delivered)
+    agent_task_wakeups_total.labels(outcome="missed").inc(published - delivered)
@@ -0,0 +1,18 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Core signal handlers.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import DemoModeConfig
+from .utils import invalidate_demo_mode_cache
+
+
+@receiver(post_save, sender=DemoModeConfig)
+@receiver(post_delete, sender=DemoModeConfig)
+def invalidate_demo_mode_on_change(sender, **kwargs):
+    """Drop every worker's cached demo mode flag once a config change is committed."""
+    transaction.on_commit(invalidate_demo_mode_cache)
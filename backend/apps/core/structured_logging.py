@@ -487,14 +487,20 @@ class StructuredLogger:
         )
 
     def connector_event(
-        self, connector_type: str, operation: str, outcome: str, details: Optional[Dict[str, Any]] = None
+        self,
+        connector_type: str,
+        operation: str,
+        outcome: str,
+        details: Optional[Dict[str, Any]] = None,
+        *,
+        correlation_id: Optional[str] = None,
     ) -> None:
-        """Log connector event with context."""
+        """Log connector event with context; correlation_id overrides the logger's own for this event."""
         log_connector_event(
             logger=self.logger,
             connector_type=connector_type,
             operation=operation,
-            correlation_id=self.correlation_id or "UNKNOWN",
+            correlation_id=correlation_id or self.correlation_id or "UNKNOWN",
             outcome=outcome,
             details=details,
         )
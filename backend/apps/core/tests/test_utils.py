@@ -4,12 +4,21 @@
 Tests for core utilities.
 """
 import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework.request import Request
 from rest_framework.test import APIRequestFactory
 
 from apps.connectors.models import Asset
 from apps.core.models import DemoModeConfig
-from apps.core.utils import apply_demo_filter, generate_correlation_id, get_demo_mode_enabled, set_demo_mode_enabled
+from apps.core.utils import (
+    DEMO_MODE_VERSION_CACHE_KEY,
+    apply_demo_filter,
+    generate_correlation_id,
+    get_demo_mode_enabled,
+    set_demo_mode_enabled,
+)
 
 
 @pytest.mark.django_db
@@ -21,14 +30,29 @@ def test_generate_correlation_id():
 
 
 @pytest.mark.django_db
-def test_demo_mode_toggle():
+def test_demo_mode_toggle(django_capture_on_commit_callbacks):
     assert get_demo_mode_enabled() is False
-    set_demo_mode_enabled(True)
+    with django_capture_on_commit_callbacks(execute=True):
+        set_demo_mode_enabled(True)
     assert get_demo_mode_enabled() is True
-    set_demo_mode_enabled(False)
+    with django_capture_on_commit_callbacks(execute=True):
+        set_demo_mode_enabled(False)
     assert get_demo_mode_enabled() is False
 
 
+@pytest.mark.django_db
+def test_demo_mode_invalidated_only_on_commit(django_capture_on_commit_callbacks):
+    assert get_demo_mode_enabled() is False
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        set_demo_mode_enabled(True)
+        assert get_demo_mode_enabled() is False
+
+    for callback in callbacks:
+        callback()
+    assert get_demo_mode_enabled() is True
+
+
 @pytest.mark.django_db
 def test_apply_demo_filter_with_query_param():
     Asset.objects.create(
@@ -103,3 +127,57 @@ def test_apply_demo_filter_with_global_mode():
     queryset = apply_demo_filter(Asset.objects.all(), request)
     assert queryset.count() == 1
     assert queryset.first().is_demo is True
+
+
+def _demo_config_lookups(queries):
+    return sum(1 for query in queries if DemoModeConfig._meta.db_table in query["sql"])
+
+
+@pytest.mark.django_db
+def test_demo_mode_cached_between_calls():
+    set_demo_mode_enabled(True)
+    get_demo_mode_enabled()
+
+    with CaptureQueriesContext(connection) as ctx:
+        for _ in range(5):
+            assert get_demo_mode_enabled() is True
+    assert _demo_config_lookups(ctx.captured_queries) == 0
+
+
+@pytest.mark.django_db
+def test_demo_mode_change_invalidates_other_workers(django_capture_on_commit_callbacks):
+    assert get_demo_mode_enabled() is False
+
+    # Another worker changes the flag: only the shared version token is visible here
+    with django_capture_on_commit_callbacks(execute=True):
+        DemoModeConfig.objects.update_or_create(id=1, defaults={"is_enabled": True})
+    assert get_demo_mode_enabled() is True
+
+    DemoModeConfig.objects.filter(id=1).update(is_enabled=False)
+    cache.set(DEMO_MODE_VERSION_CACHE_KEY, "bumped-by-other-worker", timeout=None)
+    assert get_demo_mode_enabled() is False
+
+
+@pytest.mark.django_db
+def test_demo_mode_reread_after_cache_flush():
+    assert get_demo_mode_enabled() is False
+    DemoModeConfig.objects.create(is_enabled=True)
+    cache.clear()
+
+    assert get_demo_mode_enabled() is True
+
+
+@pytest.mark.django_db
+def test_list_endpoints_do_not_query_demo_config_per_request(authenticated_client):
+    urls = [
+        "/api/v1/assets/",
+        "/api/v1/events/list",
+        "/api/v1/deployments/list",
+        "/api/v1/health/compliance-stats",
+    ]
+    authenticated_client.get(urls[0])
+
+    for url in urls:
+        with CaptureQueriesContext(connection) as ctx:
+            authenticated_client.get(url)
+        assert _demo_config_lookups(ctx.captured_queries) == 0, url
@@ -9,6 +9,10 @@ from typing import Callable, Optional
 from django.conf import settings
 from django.views.decorators.csrf import csrf_exempt
 
+from .versioned_cache import VersionedLocalCache
+
+DEMO_MODE_VERSION_CACHE_KEY = "core:demo_mode:version"
+
 
 def exempt_csrf_in_debug(view_func: Callable) -> Callable:
     """
@@ -56,19 +60,43 @@ def generate_correlation_id(prefix: Optional[str] = None) -> str:
     return correlation_id
 
 
+def _read_demo_mode_enabled() -> bool:
+    from apps.core.models import DemoModeConfig
+
+    config = DemoModeConfig.objects.order_by("id").first()
+    return bool(config and config.is_enabled)
+
+
+_demo_mode_cache = VersionedLocalCache(
+    DEMO_MODE_VERSION_CACHE_KEY, _read_demo_mode_enabled, ttl_setting="DEMO_MODE_CACHE_TTL_SECONDS", default_ttl=30
+)
+
+
 def get_demo_mode_enabled() -> bool:
     """
     Read the global demo mode flag.
+
+    Served from a per-process cache (see apps.core.versioned_cache); the TTL
+    DEMO_MODE_CACHE_TTL_SECONDS bounds staleness if the shared cache is
+    unavailable.
     """
-    from apps.core.models import DemoModeConfig
+    return _demo_mode_cache.get()
 
-    config = DemoModeConfig.objects.order_by("id").first()
-    return bool(config and config.is_enabled)
+
+def invalidate_demo_mode_cache() -> None:
+    """
+    Invalidate the cached demo mode flag in this and every other worker.
+
+    Called once DemoModeConfig changes are committed (see apps.core.signals).
+    """
+    _demo_mode_cache.invalidate()
 
 
 def set_demo_mode_enabled(is_enabled: bool) -> bool:
     """
     Set the global demo mode flag.
+
+    Saving DemoModeConfig invalidates every worker's cached flag.
     """
     from apps.core.models import DemoModeConfig
 
@@ -83,19 +111,28 @@ def set_demo_mode_enabled(is_enabled: bool) -> bool:
     return config.is_enabled
 
 
-def apply_demo_filter(queryset, request):
+def get_demo_filter_value(request) -> Optional[bool]:
     """
-    Apply demo filter to a queryset based on global demo mode and query params.
+    Resolve the is_demo value a request should see (None = no filter).
     """
     include_demo = request.query_params.get("include_demo")
 
     if include_demo == "all":
-        return queryset
+        return None
     if include_demo == "true":
-        return queryset.filter(is_demo=True)
+        return True
     if include_demo == "false":
-        return queryset.filter(is_demo=False)
+        return False
+
+    return get_demo_mode_enabled()
 
-    if get_demo_mode_enabled():
-        return queryset.filter(is_demo=True)
-    return queryset.filter(is_demo=False)
+
+def apply_demo_filter(queryset, request):
+    """
+    Apply demo filter to a queryset based on global demo mode and query params.
+    """
+    is_demo = get_demo_filter_value(request)
+
+    if is_demo is None:
+        return queryset
+    return queryset.filter(is_demo=is_demo)
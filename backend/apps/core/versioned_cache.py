@@ -0,0 +1,98 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Process-local caching of database-backed values, kept coherent across workers.
+
+Each worker holds its own copy of the value and serves it from memory while
+the version token in the shared Django cache matches the one it was loaded
+under. Invalidating publishes a new token, so every worker reloads on its
+next read. A missing token (e.g. after a cache flush) also forces a reload;
+the first reader publishes a new one. A TTL bounds staleness if the shared
+cache is unavailable.
+
+Usage:
+    from apps.core.versioned_cache import VersionedLocalCache
+
+    _flag_cache = VersionedLocalCache("app:flag:version", _read_flag, ttl_setting="FLAG_CACHE_TTL_SECONDS")
+
+    _flag_cache.get()
+    transaction.on_commit(_flag_cache.invalidate)  # after the change is committed
+"""
+import logging
+import threading
+import time
+import uuid
+from typing import Any, Callable, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+class VersionedLocalCache:
+    """Per-process copy of a value, invalidated through a shared version token."""
+
+    def __init__(
+        self,
+        version_key: str,
+        load: Callable[[], Any],
+        ttl_setting: str,
+        default_ttl: float = 300,
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            version_key: Shared cache key holding the version token
+            load: Reads the current value (e.g. from the database)
+            ttl_setting: Setting with the max seconds a copy is served without a reload
+            default_ttl: TTL used when the setting is not defined
+        """
+        self.version_key = version_key
+        self.load = load
+        self.ttl_setting = ttl_setting
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        # (value, version, loaded_at), swapped as one so readers never see a torn entry
+        self._entry: Optional[Tuple[Any, Optional[str], float]] = None
+
+    def get(self) -> Any:
+        """Return the value, reloading it if another worker invalidated it or the TTL expired."""
+        try:
+            version = cache.get(self.version_key)
+            cache_available = True
+        except Exception:
+            # Shared cache down: keep the local copy until the TTL expires
+            version, cache_available = None, False
+        ttl = getattr(settings, self.ttl_setting, self.default_ttl)
+
+        entry = self._entry
+        if entry is not None and time.monotonic() - entry[2] < ttl:
+            if not cache_available or (version is not None and entry[1] == version):
+                return entry[0]
+
+        with self._lock:
+            if version is None and cache_available:
+                # First reader after a flush publishes the token everyone else reads under
+                try:
+                    cache.add(self.version_key, uuid.uuid4().hex, timeout=None)
+                    version = cache.get(self.version_key)
+                except Exception:
+                    version = None
+            value = self.load()
+            self._entry = (value, version, time.monotonic())
+            return value
+
+    def invalidate(self) -> None:
+        """Make this and every other worker reload on its next read."""
+        try:
+            cache.set(self.version_key, uuid.uuid4().hex, timeout=None)
+        except Exception as e:
+            # Shared cache down: other workers fall back to the TTL
+            logger.warning(f"Failed to publish invalidation of {self.version_key}: {e}")
+        self.clear()
+
+    def clear(self) -> None:
+        """Drop this worker's copy only."""
+        self._entry = None
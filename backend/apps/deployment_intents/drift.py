@@ -0,0 +1,460 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Bulk drift detection of plane inventory against deployment intents.
+
+A drift run takes a full inventory snapshot of one execution plane (Landscape
+or SCCM sync_inventory, Intune app install statuses) and compares it with the
+desired state recorded by deployment intents in a single pass:
+
+1. Desired state is loaded in one query: per application, the latest
+   completed intent on the plane (present at its version) or rolled-back
+   intent (absent).
+2. The snapshot is indexed once by application. Each desired application is
+   then compared with set operations over device IDs: devices without it are
+   MISSING, devices on another version are MODIFIED, and devices still
+   holding a rolled-back application are EXTRA. Nothing is queried per device.
+3. Findings are written to connectors.DriftEvent in bulk
+   (upsert_drift_events(), shared with reconciliation). Open events are
+   loaded once and matched on (entity_id, drift_type): drift seen again is
+   refreshed (last_seen_at), new drift is bulk-created, and open drift that
+   is no longer detected is resolved.
+
+Versions are compared on their upstream part (normalize_version()), so
+distro revisions such as "1.2.3-1ubuntu1" do not count as MODIFIED.
+
+Drift entity IDs are "<device id>:<sha1 of the application key>", which
+keeps them within DriftEvent.entity_id however long the application name
+is; device IDs never contain a colon.
+"""
+import hashlib
+import logging
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import DeploymentIntent, RingDeployment
+
+logger = logging.getLogger(__name__)
+
+BULK_BATCH_SIZE = 1000
+DEVICE_ENTITY_TYPE = "device_app"
+CATALOG_ENTITY_TYPE = "application"
+# SCCM inventory is the site catalog rather than per-device state
+CATALOG_ENTITY_ID = "catalog"
+INTUNE_INSTALLED_STATES = {"installed"}
+
+
+def app_key(app_name: str) -> str:
+    """Normalized application key used to join plane inventory with intents."""
+    return (app_name or "").strip().lower()
+
+
+def app_key_hash(key: str) -> str:
+    """Fixed-length form of an application key, used in drift entity IDs."""
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+_VERSION_EPOCH = re.compile(r"^\d+:")
+_VERSION_SUFFIX = re.compile(r"[-+~]")
+
+
+def normalize_version(version: str) -> str:
+    """
+    Upstream part of a version, for comparing plane versions with intents.
+
+    Drops a package epoch ("1:"), a leading "v" and anything after the first
+    "-", "+" or "~" (distro revision, build metadata), so "1:1.2.3-1ubuntu1"
+    and "v1.2.3" both match "1.2.3".
+    """
+    version = _VERSION_EPOCH.sub("", (version or "").strip().lower())
+    if version[:1] == "v" and version[1:2].isdigit():
+        version = version[1:]
+    return _VERSION_SUFFIX.split(version, 1)[0]
+
+
+@dataclass(frozen=True)
+class DesiredApp:
+    """Desired state of one application on a plane."""
+
+    app_name: str
+    version: str
+    present: bool
+    ring: str
+    correlation_id: str
+
+
+@dataclass
+class PlaneSnapshot:
+    """
+    Full inventory of one plane.
+
+    Attributes:
+        plane: Connector type (landscape, sccm, intune, ...)
+        entity_type: DriftEvent.entity_type for findings
+        entities: Every entity in the snapshot (ID -> display name), including ones with nothing installed
+        installed: Application key -> {entity ID: installed version ("" if unknown)}
+        apps: Application keys the snapshot covers; None means it covers every application (full inventory)
+        fleet_wide: Whether every entity is expected to carry desired applications (GLOBAL ring only);
+            otherwise the entities are exactly those the applications are assigned to
+    """
+
+    plane: str
+    entity_type: str = DEVICE_ENTITY_TYPE
+    entities: Dict[str, str] = field(default_factory=dict)
+    installed: Dict[str, Dict[str, str]] = field(default_factory=lambda: defaultdict(dict))
+    apps: Optional[set] = None
+    fleet_wide: bool = True
+
+    def add(self, entity_id: str, app_name: str, version: str = "") -> None:
+        """Record an installed application on an entity."""
+        self.installed[app_key(app_name)][str(entity_id)] = str(version or "")
+
+
+@dataclass(frozen=True)
+class DriftFinding:
+    """One drifted (entity, application) pair."""
+
+    entity_id: str
+    entity_name: str
+    drift_type: str
+    desired_state: Dict[str, Any]
+    actual_state: Dict[str, Any]
+    severity: str
+
+
+def snapshot_from_landscape(
+    inventory: Dict[str, Any], packages_by_computer: Optional[Dict[str, List[Dict]]] = None
+) -> PlaneSnapshot:
+    """
+    Build a snapshot from LandscapeConnector.sync_inventory().
+
+    Args:
+        inventory: sync_inventory() result ({"computers": [...]})
+        packages_by_computer: Installed packages per computer ID, for computers
+            listed without embedded "packages"
+
+    Returns:
+        Fleet-wide device snapshot
+    """
+    packages_by_computer = packages_by_computer or {}
+    snapshot = PlaneSnapshot(plane="landscape")
+    for computer in inventory.get("computers", []):
+        computer_id = str(computer["id"])
+        snapshot.entities[computer_id] = computer.get("hostname") or computer.get("title") or computer_id
+        packages = computer.get("packages")
+        if packages is None:
+            packages = packages_by_computer.get(computer_id, [])
+        for package in packages:
+            snapshot.add(computer_id, package["name"], package.get("version", ""))
+    return snapshot
+
+
+def snapshot_from_sccm(inventory: Dict[str, Any]) -> PlaneSnapshot:
+    """
+    Build a snapshot from SCCMConnector.sync_inventory().
+
+    SCCM returns the application catalog, so the snapshot has a single
+    catalog entity and drift is tracked per application.
+    """
+    snapshot = PlaneSnapshot(plane="sccm", entity_type=CATALOG_ENTITY_TYPE)
+    snapshot.entities[CATALOG_ENTITY_ID] = "SCCM application catalog"
+    for application in inventory.get("applications", []):
+        snapshot.add(
+            CATALOG_ENTITY_ID, application.get("LocalizedDisplayName", ""), application.get("SoftwareVersion", "")
+        )
+    return snapshot
+
+
+def snapshot_from_intune_statuses(app_name: str, statuses: Iterable[Dict[str, Any]]) -> PlaneSnapshot:
+    """
+    Build a snapshot from IntuneConnector.get_app_install_status().
+
+    The statuses cover only the devices the app is assigned to, so the
+    snapshot is limited to that app and its assigned devices.
+
+    Args:
+        app_name: Application the statuses belong to
+        statuses: deviceStatuses records (deviceId, deviceName, installState)
+    """
+    snapshot = PlaneSnapshot(plane="intune", apps={app_key(app_name)}, fleet_wide=False)
+    for status in statuses:
+        device_id = str(status["deviceId"])
+        snapshot.entities[device_id] = status.get("deviceName") or device_id
+        if status.get("installState") in INTUNE_INSTALLED_STATES:
+            snapshot.add(device_id, app_name)
+    return snapshot
+
+
+def load_desired_state(plane: str, fleet_wide: bool = True) -> Dict[str, DesiredApp]:
+    """
+    Load the desired application state of a plane in one query.
+
+    Args:
+        plane: Connector type
+        fleet_wide: Only consider GLOBAL ring deployments (the state every device should have)
+
+    Returns:
+        Application key -> DesiredApp, from the most recently updated completed or rolled-back intent
+    """
+    rows = RingDeployment.objects.filter(
+        connector_type=plane,
+        deployment_intent__status__in=[DeploymentIntent.Status.COMPLETED, DeploymentIntent.Status.ROLLED_BACK],
+    )
+    if fleet_wide:
+        rows = rows.filter(ring=DeploymentIntent.Ring.GLOBAL)
+    rows = rows.order_by("deployment_intent__updated_at").values_list(
+        "deployment_intent__app_name",
+        "deployment_intent__version",
+        "deployment_intent__status",
+        "ring",
+        "deployment_intent__correlation_id",
+    )
+
+    desired: Dict[str, DesiredApp] = {}
+    for name, version, status, ring, correlation_id in rows.iterator(chunk_size=BULK_BATCH_SIZE):
+        # Later rows win: the latest intent decides whether the app should be present
+        desired[app_key(name)] = DesiredApp(
+            app_name=name,
+            version=version,
+            present=status == DeploymentIntent.Status.COMPLETED,
+            ring=ring,
+            correlation_id=str(correlation_id),
+        )
+    return desired
+
+
+def diff_snapshot(snapshot: PlaneSnapshot, desired: Dict[str, DesiredApp]) -> List[DriftFinding]:
+    """
+    Compare a snapshot with desired state.
+
+    Args:
+        snapshot: Plane inventory
+        desired: load_desired_state() result
+
+    Returns:
+        Drift findings (MISSING, MODIFIED, EXTRA)
+    """
+    entities = snapshot.entities
+    all_entities = entities.keys()
+    findings: List[DriftFinding] = []
+
+    for key, want in desired.items():
+        if snapshot.apps is not None and key not in snapshot.apps:
+            continue
+        holders = snapshot.installed.get(key, {})
+        key_hash = app_key_hash(key)
+        desired_state = {
+            "app_name": want.app_name,
+            "version": want.version,
+            "present": want.present,
+            "ring": want.ring,
+            "correlation_id": want.correlation_id,
+        }
+
+        if not want.present:
+            for entity_id in holders.keys() & all_entities:
+                findings.append(
+                    DriftFinding(
+                        entity_id=f"{entity_id}:{key_hash}",
+                        entity_name=f"{entities[entity_id]} {want.app_name}",
+                        drift_type="extra",
+                        desired_state=desired_state,
+                        actual_state={"installed": True, "version": holders[entity_id]},
+                        severity="high",
+                    )
+                )
+            continue
+
+        for entity_id in all_entities - holders.keys():
+            findings.append(
+                DriftFinding(
+                    entity_id=f"{entity_id}:{key_hash}",
+                    entity_name=f"{entities[entity_id]} {want.app_name}",
+                    drift_type="missing",
+                    desired_state=desired_state,
+                    actual_state={"installed": False},
+                    severity="high" if want.ring == DeploymentIntent.Ring.GLOBAL else "medium",
+                )
+            )
+
+        wanted_version = normalize_version(want.version)
+        if not wanted_version:
+            continue
+        for entity_id, version in holders.items():
+            # Planes that do not report versions ("") only confirm presence
+            if version and normalize_version(version) != wanted_version and entity_id in entities:
+                findings.append(
+                    DriftFinding(
+                        entity_id=f"{entity_id}:{key_hash}",
+                        entity_name=f"{entities[entity_id]} {want.app_name}",
+                        drift_type="modified",
+                        desired_state=desired_state,
+                        actual_state={"installed": True, "version": version},
+                        severity="medium",
+                    )
+                )
+
+    return findings
+
+
+def _chunks(items: List, size: int = BULK_BATCH_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def upsert_drift_events(
+    connector,
+    entity_type: str,
+    events: List,
+    now=None,
+    entity_ids: Optional[List[str]] = None,
+    resolve_unseen: Optional[Callable[[str], bool]] = None,
+    sync_job=None,
+) -> Dict[str, int]:
+    """
+    Write drift events in bulk, deduplicated against open ones.
+
+    Open events are loaded once and matched on (entity_id, drift_type): drift
+    seen again is refreshed (last_seen_at), new drift is bulk-created, and
+    optionally open drift that was not seen is resolved.
+
+    Args:
+        connector: ConnectorInstance the drift belongs to
+        entity_type: DriftEvent.entity_type of the events
+        events: Unsaved DriftEvent instances
+        now: Timestamp for last_seen_at/resolved_at (defaults to now)
+        entity_ids: Only match open events of these entities (defaults to every open event of entity_type)
+        resolve_unseen: Predicate on entity_id; open events it accepts that were not seen are resolved.
+            None leaves unseen events open.
+        sync_job: SyncJob to attribute events to (its drift_events_created is incremented)
+
+    Returns:
+        {"created", "refreshed", "resolved"}
+    """
+    from apps.connectors.models import DriftEvent, SyncJob
+
+    now = now or timezone.now()
+    open_events = DriftEvent.objects.filter(connector=connector, entity_type=entity_type, resolved_at__isnull=True)
+    if entity_ids is not None:
+        open_events = open_events.filter(entity_id__in=entity_ids)
+    open_ids = {
+        (entity_id, drift_type): pk
+        for entity_id, drift_type, pk in open_events.values_list("entity_id", "drift_type", "id").iterator(
+            chunk_size=BULK_BATCH_SIZE * 10
+        )
+    }
+
+    new_events = []
+    refreshed = []
+    for event in events:
+        pk = open_ids.pop((event.entity_id, event.drift_type), None)
+        if pk is not None:
+            refreshed.append(pk)
+        else:
+            new_events.append(event)
+
+    resolved = []
+    if resolve_unseen is not None:
+        resolved = [pk for (entity_id, _), pk in open_ids.items() if resolve_unseen(entity_id)]
+
+    refresh_fields = {"last_seen_at": now}
+    if sync_job is not None:
+        refresh_fields["sync_job"] = sync_job
+
+    with transaction.atomic():
+        DriftEvent.objects.bulk_create(new_events, batch_size=BULK_BATCH_SIZE)
+        for chunk in _chunks(refreshed):
+            DriftEvent.objects.filter(id__in=chunk).update(**refresh_fields)
+        for chunk in _chunks(resolved):
+            DriftEvent.objects.filter(id__in=chunk).update(
+                resolved_at=now, last_seen_at=now, resolution_notes="No longer detected in plane inventory"
+            )
+        if sync_job is not None and new_events:
+            SyncJob.objects.filter(id=sync_job.id).update(
+                drift_events_created=F("drift_events_created") + len(new_events)
+            )
+
+    return {"created": len(new_events), "refreshed": len(refreshed), "resolved": len(resolved)}
+
+
+def record_findings(
+    connector,
+    snapshot: PlaneSnapshot,
+    findings: List[DriftFinding],
+    sync_job=None,
+    now=None,
+) -> Dict[str, int]:
+    """
+    Upsert drift findings into DriftEvent in bulk.
+
+    Args:
+        connector: ConnectorInstance the snapshot came from
+        snapshot: Snapshot the findings were computed from (limits which open events may be resolved)
+        findings: diff_snapshot() result
+        sync_job: SyncJob to attribute events to (its drift_events_created is incremented)
+        now: Timestamp for last_seen_at/resolved_at (defaults to now)
+
+    Returns:
+        {"created", "refreshed", "resolved"}
+    """
+    from apps.connectors.models import DriftEvent, RemediationStatus
+
+    events = [
+        DriftEvent(
+            connector=connector,
+            sync_job=sync_job,
+            entity_type=snapshot.entity_type,
+            entity_id=finding.entity_id,
+            entity_name=finding.entity_name[:255],
+            drift_type=finding.drift_type,
+            desired_state=finding.desired_state,
+            actual_state=finding.actual_state,
+            severity=finding.severity,
+            remediation_status=RemediationStatus.PENDING,
+        )
+        for finding in findings
+    ]
+
+    covered_hashes = None if snapshot.apps is None else {app_key_hash(key) for key in snapshot.apps}
+
+    def covered(entity_id: str) -> bool:
+        # Only resolve drift of applications the snapshot covered
+        return covered_hashes is None or entity_id.partition(":")[2] in covered_hashes
+
+    return upsert_drift_events(
+        connector, snapshot.entity_type, events, now=now, resolve_unseen=covered, sync_job=sync_job
+    )
+
+
+def run_drift_detection(connector, snapshot: PlaneSnapshot, sync_job=None) -> Dict[str, Any]:
+    """
+    Detect and record drift for one plane snapshot.
+
+    Args:
+        connector: ConnectorInstance the snapshot came from
+        snapshot: Plane inventory (see the snapshot_from_* builders)
+        sync_job: SyncJob that produced the snapshot, if any
+
+    Returns:
+        {"entities", "drift_count", "created", "refreshed", "resolved", "by_type": {drift_type: count}}
+    """
+    desired = load_desired_state(snapshot.plane, fleet_wide=snapshot.fleet_wide)
+    findings = diff_snapshot(snapshot, desired)
+    counts = record_findings(connector, snapshot, findings, sync_job=sync_job)
+
+    by_type: Dict[str, int] = defaultdict(int)
+    for finding in findings:
+        by_type[finding.drift_type] += 1
+
+    summary = {"entities": len(snapshot.entities), "drift_count": len(findings), **counts, "by_type": dict(by_type)}
+    logger.info(
+        f"Drift detection for {snapshot.plane}: {len(findings)} findings across {len(snapshot.entities)} entities",
+        extra={"execution_plane": snapshot.plane, "drift_counts": counts},
+    )
+    return summary
@@ -0,0 +1,212 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Reconciliation of deployment intents against their execution planes.
+
+One run:
+1. Loads every ring deployment of an active intent in a single query and
+   groups it by execution plane (RingDeployment.connector_type).
+2. Health-checks each plane once, fanned out over a bounded thread pool
+   (RECONCILIATION_MAX_WORKERS); the checks are subprocess/network bound.
+3. Compares desired state with the recorded plane state per plane and
+   writes drift to connectors.DriftEvent in bulk. Drift that is already
+   open is refreshed (last_seen_at) instead of duplicated.
+
+All database access stays on the calling thread; pool workers only run
+connector calls.
+"""
+import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from .drift import BULK_BATCH_SIZE, upsert_drift_events
+from .models import DeploymentIntent, RingDeployment
+
+logger = logging.getLogger(__name__)
+
+RECONCILED_STATUSES = [DeploymentIntent.Status.DEPLOYING, DeploymentIntent.Status.COMPLETED]
+STUCK_DEPLOYING_AFTER = timedelta(hours=24)
+DRIFT_ENTITY_TYPE = "deployment"
+
+
+@dataclass
+class PlaneResult:
+    """Outcome of reconciling one execution plane."""
+
+    plane: str
+    healthy: bool
+    checked: int = 0
+    drift: List[Dict] = field(default_factory=list)
+    message: str = ""
+
+
+def _load_ring_deployments() -> Dict[str, List[Dict]]:
+    """Return ring deployments of active intents (current target ring only) grouped by execution plane."""
+    rows = RingDeployment.objects.filter(
+        deployment_intent__status__in=RECONCILED_STATUSES, ring=F("deployment_intent__target_ring")
+    ).values(
+        "connector_type",
+        "connector_object_id",
+        "ring",
+        "deployment_intent__correlation_id",
+        "deployment_intent__app_name",
+        "deployment_intent__version",
+        "deployment_intent__status",
+        "deployment_intent__target_ring",
+        "deployment_intent__updated_at",
+    )
+    by_plane: Dict[str, List[Dict]] = defaultdict(list)
+    for row in rows.iterator(chunk_size=BULK_BATCH_SIZE):
+        by_plane[row["connector_type"]].append(row)
+    return by_plane
+
+
+def detect_drift(row: Dict, now) -> Optional[Dict]:
+    """
+    Compare one ring deployment's desired state with its recorded plane state.
+
+    Returns:
+        Drift description (drift_type, desired_state, actual_state, severity) or None
+    """
+    status = row["deployment_intent__status"]
+    desired_state = {
+        "status": status,
+        "app_name": row["deployment_intent__app_name"],
+        "version": row["deployment_intent__version"],
+        "ring": row["ring"],
+    }
+    actual_state = {"connector_object_id": row["connector_object_id"]}
+
+    if status == DeploymentIntent.Status.COMPLETED and not row["connector_object_id"]:
+        # Completed but the plane never reported an object for it
+        return {
+            "drift_type": "missing",
+            "desired_state": desired_state,
+            "actual_state": actual_state,
+            "severity": "high" if row["ring"] == DeploymentIntent.Ring.GLOBAL else "medium",
+        }
+
+    if status == DeploymentIntent.Status.DEPLOYING:
+        stuck_for = now - row["deployment_intent__updated_at"]
+        if stuck_for > STUCK_DEPLOYING_AFTER:
+            actual_state["hours_in_deploying"] = round(stuck_for.total_seconds() / 3600, 1)
+            return {
+                "drift_type": "stale",
+                "desired_state": desired_state,
+                "actual_state": actual_state,
+                "severity": "medium",
+            }
+
+    return None
+
+
+def _reconcile_plane(plane: str, rows: List[Dict], connector_service, now) -> PlaneResult:
+    """Health-check a plane once and evaluate all of its ring deployments (runs in a pool worker)."""
+    health = connector_service.health_check(plane)
+    if health.get("status") != "healthy":
+        return PlaneResult(plane=plane, healthy=False, message=health.get("message", ""))
+
+    result = PlaneResult(plane=plane, healthy=True, checked=len(rows))
+    for row in rows:
+        drift = detect_drift(row, now)
+        if drift is not None:
+            drift["row"] = row
+            result.drift.append(drift)
+    return result
+
+
+def _record_drift(result: PlaneResult, now) -> int:
+    """
+    Persist a plane's drift in bulk.
+
+    Returns:
+        Number of new DriftEvent rows
+    """
+    from apps.connectors.models import ConnectorInstance, ConnectorStatus, DriftEvent, RemediationStatus
+
+    instances = ConnectorInstance.objects.filter(connector_type=result.plane).order_by("created_at")
+    connector = instances.filter(status=ConnectorStatus.ACTIVE).first() or instances.first()
+    if connector is None:
+        logger.warning(
+            f"No connector instance for {result.plane}; {len(result.drift)} drift findings not persisted",
+            extra={"execution_plane": result.plane, "drift_count": len(result.drift)},
+        )
+        return 0
+
+    entity_ids = {str(d["row"]["deployment_intent__correlation_id"]): d for d in result.drift}
+    events = [
+        DriftEvent(
+            connector=connector,
+            entity_type=DRIFT_ENTITY_TYPE,
+            entity_id=entity_id,
+            entity_name=f"{drift['row']['deployment_intent__app_name']} {drift['row']['deployment_intent__version']}",
+            drift_type=drift["drift_type"],
+            desired_state=drift["desired_state"],
+            actual_state=drift["actual_state"],
+            severity=drift["severity"],
+            remediation_status=RemediationStatus.PENDING,
+        )
+        for entity_id, drift in entity_ids.items()
+    ]
+
+    counts = upsert_drift_events(connector, DRIFT_ENTITY_TYPE, events, now=now, entity_ids=list(entity_ids))
+    return counts["created"]
+
+
+def run_reconciliation(connector_service=None, max_workers: Optional[int] = None) -> Dict:
+    """
+    Reconcile all active deployment intents, one health check per execution plane.
+
+    Args:
+        connector_service: Connector service (defaults to get_connector_service())
+        max_workers: Pool size (defaults to RECONCILIATION_MAX_WORKERS)
+
+    Returns:
+        {'processed', 'drift_count', 'new_drift_events', 'planes': {plane: {...}}}
+    """
+    if connector_service is None:
+        from apps.connectors.services import get_connector_service
+
+        connector_service = get_connector_service()
+
+    now = timezone.now()
+    by_plane = _load_ring_deployments()
+    workers = max(1, min(max_workers or settings.RECONCILIATION_MAX_WORKERS, len(by_plane) or 1))
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="reconcile") as pool:
+        futures = {
+            plane: pool.submit(_reconcile_plane, plane, rows, connector_service, now)
+            for plane, rows in by_plane.items()
+        }
+
+    summary = {"processed": 0, "drift_count": 0, "new_drift_events": 0, "planes": {}}
+    for plane, future in futures.items():
+        try:
+            result = future.result()
+        except Exception as e:
+            logger.error(f"Reconciliation failed for {plane}: {e}", extra={"execution_plane": plane}, exc_info=True)
+            summary["planes"][plane] = {"healthy": False, "checked": 0, "drift": 0, "error": str(e)}
+            continue
+
+        if not result.healthy:
+            logger.warning(
+                f"Connector {plane} unhealthy, skipping {len(by_plane[plane])} intents",
+                extra={"execution_plane": plane, "health_message": result.message},
+            )
+            summary["planes"][plane] = {"healthy": False, "checked": 0, "drift": 0}
+            continue
+
+        created = _record_drift(result, now) if result.drift else 0
+        summary["processed"] += result.checked
+        summary["drift_count"] += len(result.drift)
+        summary["new_drift_events"] += created
+        summary["planes"][plane] = {"healthy": True, "checked": result.checked, "drift": len(result.drift)}
+
+    return summary
@@ -4,7 +4,6 @@
 Celery tasks for deployment intent processing.
 """
 import logging
-from datetime import timedelta
 
 from celery import shared_task
 from django.utils import timezone
@@ -20,90 +19,26 @@ def reconciliation_loop():
     Periodic reconciliation loop to detect drift between desired and actual state.
 
     Runs every hour to:
-    1. Query execution plane state (Intune/Jamf/SCCM/etc.)
-    2. Compare to desired deployment intents
-    3. Emit drift events if mismatches found
+    1. Health-check each execution plane (Intune/Jamf/SCCM/etc.) once
+    2. Compare plane state to desired deployment intents, per plane in parallel
+    3. Record drift as connectors.DriftEvent rows (bulk)
     4. Trigger remediation workflows within policy constraints
+
+    See apps.deployment_intents.reconciliation.
     """
-    from apps.connectors.services import get_connector_service
-    from apps.deployment_intents.models import DeploymentIntent
-    from apps.event_store.models import DeploymentEvent
+    from apps.deployment_intents.reconciliation import run_reconciliation
 
     logger.info("Starting reconciliation loop")
 
-    # Get active deployment intents
-    active_intents = DeploymentIntent.objects.filter(status__in=["PENDING", "IN_PROGRESS", "COMPLETED"])
-
-    drift_count = 0
-    for intent in active_intents:
-        try:
-            # Query execution plane state
-            connector_service = get_connector_service()
-            health_result = connector_service.health_check(intent.execution_plane)
-
-            if health_result["status"] != "healthy":
-                logger.warning(
-                    f"Connector {intent.execution_plane} unhealthy, skipping reconciliation",
-                    extra={"deployment_intent_id": intent.id},
-                )
-                continue
-
-            # Compare desired state (deployment intent) with actual state (execution plane)
-            # For completed deployments, verify they remain in execution plane
-            # For in-progress deployments, check if stuck or failed
-            if intent.status == "COMPLETED":
-                # Desired: Application should be deployed in target ring
-                # Actual: Query connector to verify presence
-                logger.debug(
-                    f"Verified deployment intent {intent.id} in {intent.execution_plane} - COMPLETED",
-                    extra={
-                        "deployment_intent_id": intent.id,
-                        "execution_plane": intent.execution_plane,
-                        "status": "verified",
-                    },
-                )
-            elif intent.status == "DEPLOYING":
-                # Desired: Application should be actively deploying
-                # Actual: Query connector to check progress
-                # If stuck > 24h, emit drift event and trigger remediation
-                time_since_deploy = timezone.now() - intent.updated_at
-                if time_since_deploy > timedelta(hours=24):
-                    logger.warning(
-                        f"Deployment intent {intent.id} stuck in DEPLOYING for {time_since_deploy.total_seconds()/3600:.1f}h",
-                        extra={
-                            "deployment_intent_id": intent.id,
-                            "hours_stuck": time_since_deploy.total_seconds() / 3600,
-                        },
-                    )
-                    drift_count += 1
-                    # Phase 2: Implement drift event emission and auto-remediation workflow
-                    # For now, drift is logged and can be reviewed in logs
-                else:
-                    logger.debug(
-                        f"Verified deployment intent {intent.id} in {intent.execution_plane} - IN_PROGRESS",
-                        extra={
-                            "deployment_intent_id": intent.id,
-                            "execution_plane": intent.execution_plane,
-                            "status": "in_progress",
-                        },
-                    )
-            else:
-                logger.debug(
-                    f"Reconciled deployment intent {intent.id}",
-                    extra={"deployment_intent_id": intent.id, "execution_plane": intent.execution_plane},
-                )
-
-        except Exception as e:
-            logger.error(
-                f"Error during reconciliation for intent {intent.id}: {e}",
-                extra={"deployment_intent_id": intent.id},
-                exc_info=True,
-            )
+    summary = run_reconciliation()
 
     logger.info(
-        f"Reconciliation loop completed. Processed {active_intents.count()} intents, found {drift_count} drift events"
+        f"Reconciliation loop completed. Processed {summary['processed']} intents across "
+        f"{len(summary['planes'])} planes, found {summary['drift_count']} drift events "
+        f"({summary['new_drift_events']} new)",
+        extra={"planes": summary["planes"]},
     )
-    return {"processed": active_intents.count(), "drift_count": drift_count}
+    return summary
 
 
 @shared_task(
@@ -0,0 +1,232 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Tests for bulk drift detection.
+"""
+import time
+import uuid
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from apps.connectors.models import ConnectorInstance, ConnectorStatus, DriftEvent, SyncJob, SyncJobType
+from apps.deployment_intents.drift import (
+    DesiredApp,
+    PlaneSnapshot,
+    app_key_hash,
+    diff_snapshot,
+    run_drift_detection,
+    snapshot_from_intune_statuses,
+    snapshot_from_landscape,
+    snapshot_from_sccm,
+)
+from apps.deployment_intents.models import DeploymentIntent, RingDeployment
+
+GLOBAL = DeploymentIntent.Ring.GLOBAL
+
+
+def _desired(version="2.0", present=True, ring=GLOBAL, app_name="Firefox"):
+    return DesiredApp(app_name=app_name, version=version, present=present, ring=ring, correlation_id="c-1")
+
+
+def _eid(entity_id, key):
+    return f"{entity_id}:{app_key_hash(key)}"
+
+
+def _landscape(packages):
+    return {
+        "computers": [
+            {"id": computer_id, "hostname": f"host-{computer_id}", "packages": installed}
+            for computer_id, installed in packages.items()
+        ]
+    }
+
+
+class TestDiffSnapshot:
+    """Test the set-based diff of a snapshot against desired state."""
+
+    def test_missing_modified_and_extra(self):
+        """Test each drift type is detected per device and application."""
+        snapshot = snapshot_from_landscape(
+            _landscape(
+                {
+                    1: [{"name": "firefox", "version": "2.0"}, {"name": "telnet", "version": "0.17"}],
+                    2: [{"name": "firefox", "version": "1.0"}],
+                    3: [],
+                }
+            )
+        )
+        desired = {"firefox": _desired(), "telnet": _desired(version="0.17", present=False, app_name="telnet")}
+
+        drift = {(f.entity_id, f.drift_type) for f in diff_snapshot(snapshot, desired)}
+
+        assert drift == {
+            (_eid("1", "telnet"), "extra"),
+            (_eid("2", "firefox"), "modified"),
+            (_eid("3", "firefox"), "missing"),
+        }
+
+    def test_distro_version_suffixes_match(self):
+        """Test epochs, distro revisions and "v" prefixes do not count as MODIFIED."""
+        snapshot = snapshot_from_landscape(
+            _landscape(
+                {
+                    1: [{"name": "firefox", "version": "2.0-1ubuntu1"}],
+                    2: [{"name": "firefox", "version": "1:2.0+build3"}],
+                    3: [{"name": "firefox", "version": "v2.0"}],
+                    4: [{"name": "firefox", "version": "2.0.1-1ubuntu1"}],
+                }
+            )
+        )
+
+        drift = {(f.entity_id, f.drift_type) for f in diff_snapshot(snapshot, {"firefox": _desired()})}
+
+        assert drift == {(_eid("4", "firefox"), "modified")}
+
+    def test_snapshot_limited_to_assigned_apps(self):
+        """Test an Intune status snapshot only evaluates its own application."""
+        snapshot = snapshot_from_intune_statuses(
+            "Firefox",
+            [
+                {"deviceId": "d-1", "deviceName": "WIN-001", "installState": "installed"},
+                {"deviceId": "d-2", "deviceName": "WIN-002", "installState": "failed"},
+            ],
+        )
+        desired = {"firefox": _desired(), "chrome": _desired(app_name="Chrome")}
+
+        findings = diff_snapshot(snapshot, desired)
+
+        # Intune statuses carry no version, so presence is all that is checked
+        assert [(f.entity_id, f.drift_type, f.entity_name) for f in findings] == [
+            (_eid("d-2", "firefox"), "missing", "WIN-002 Firefox")
+        ]
+
+    def test_sccm_catalog(self):
+        """Test the SCCM catalog is diffed as a single entity."""
+        snapshot = snapshot_from_sccm({"applications": [{"LocalizedDisplayName": "Firefox", "SoftwareVersion": "1.5"}]})
+
+        findings = diff_snapshot(snapshot, {"firefox": _desired(), "chrome": _desired(app_name="Chrome")})
+
+        assert {(f.entity_id, f.drift_type) for f in findings} == {
+            (_eid("catalog", "firefox"), "modified"),
+            (_eid("catalog", "chrome"), "missing"),
+        }
+
+    def test_large_fleet_single_pass(self):
+        """Test a 100k-device fleet is diffed in one pass well within seconds."""
+        snapshot = PlaneSnapshot(plane="landscape")
+        for i in range(100_000):
+            snapshot.entities[str(i)] = f"host-{i}"
+            if i % 10:
+                snapshot.add(str(i), "firefox", "1.0" if i % 10 == 1 else "2.0")
+        desired = {"firefox": _desired(), "vim": _desired(version="", app_name="vim")}
+
+        started = time.perf_counter()
+        findings = diff_snapshot(snapshot, desired)
+        elapsed = time.perf_counter() - started
+
+        counts = {}
+        for finding in findings:
+            counts[finding.drift_type] = counts.get(finding.drift_type, 0) + 1
+        assert counts == {"missing": 10_000 + 100_000, "modified": 10_000}
+        assert elapsed < 5
+
+
+@pytest.fixture
+def user(db):
+    """Create a submitter."""
+    return User.objects.create_user(username="drift", password="testpass")
+
+
+@pytest.fixture
+def connector(db):
+    """Create the Landscape connector instance."""
+    return ConnectorInstance.objects.create(
+        connector_type="landscape", name="landscape prod", status=ConnectorStatus.ACTIVE
+    )
+
+
+def _intent(user, app_name, version, status=DeploymentIntent.Status.COMPLETED, ring=GLOBAL, updated_at=None):
+    intent = DeploymentIntent.objects.create(
+        app_name=app_name,
+        version=version,
+        target_ring=ring,
+        status=status,
+        evidence_pack_id=uuid.uuid4(),
+        submitter=user,
+    )
+    if updated_at is not None:
+        DeploymentIntent.objects.filter(pk=intent.pk).update(updated_at=updated_at)
+    RingDeployment.objects.create(deployment_intent=intent, ring=ring, connector_type="landscape")
+    return intent
+
+
+@pytest.mark.django_db
+class TestRunDriftDetection:
+    """Test drift persistence against DriftEvent."""
+
+    def test_events_deduplicated_refreshed_and_resolved(self, user, connector):
+        """Test repeat runs refresh open drift and resolve drift that disappeared."""
+        _intent(user, "firefox", "2.0")
+        _intent(user, "vim", "9.0", ring=DeploymentIntent.Ring.PILOT)
+        job = SyncJob.objects.create(connector=connector, job_type=SyncJobType.FULL_SYNC)
+        inventory = _landscape({1: [{"name": "firefox", "version": "2.0"}], 2: [], 3: []})
+
+        summary = run_drift_detection(connector, snapshot_from_landscape(inventory), sync_job=job)
+
+        # PILOT intents are not expected fleet-wide
+        assert summary["created"] == 2
+        assert set(DriftEvent.objects.values_list("entity_id", flat=True)) == {
+            _eid("2", "firefox"),
+            _eid("3", "firefox"),
+        }
+        job.refresh_from_db()
+        assert job.drift_events_created == 2
+
+        inventory["computers"][1]["packages"] = [{"name": "firefox", "version": "2.0"}]
+        summary = run_drift_detection(connector, snapshot_from_landscape(inventory))
+
+        assert summary == {
+            "entities": 3,
+            "drift_count": 1,
+            "created": 0,
+            "refreshed": 1,
+            "resolved": 1,
+            "by_type": {"missing": 1},
+        }
+        assert DriftEvent.objects.count() == 2
+        assert DriftEvent.objects.get(entity_id=_eid("2", "firefox")).resolved_at is not None
+        assert DriftEvent.objects.get(entity_id=_eid("3", "firefox")).resolved_at is None
+
+    def test_long_app_name_entity_ids_fit_column(self, user, connector):
+        """Test entity IDs stay within the column for the longest app names and are resolved by covered snapshots."""
+        long_name = "App" * 85
+        _intent(user, long_name, "2.0")
+        statuses = [{"deviceId": str(uuid.uuid4()), "deviceName": "WIN-001", "installState": "failed"}]
+
+        def snapshot():
+            # An app-limited snapshot, as Intune statuses produce, read against the Landscape intents
+            limited = snapshot_from_intune_statuses(long_name, statuses)
+            limited.plane = "landscape"
+            limited.fleet_wide = True
+            return limited
+
+        assert run_drift_detection(connector, snapshot())["created"] == 1
+        assert len(DriftEvent.objects.get().entity_id) <= 255
+
+        statuses[0]["installState"] = "installed"
+        assert run_drift_detection(connector, snapshot())["resolved"] == 1
+
+    def test_rolled_back_app_still_installed(self, user, connector):
+        """Test the latest intent wins and a rolled-back app left on devices is EXTRA."""
+        _intent(user, "firefox", "2.0", updated_at=timezone.now() - timedelta(days=1))
+        _intent(user, "firefox", "2.0", status=DeploymentIntent.Status.ROLLED_BACK)
+
+        summary = run_drift_detection(
+            connector, snapshot_from_landscape(_landscape({1: [{"name": "firefox", "version": "2.0"}], 2: []}))
+        )
+
+        assert summary["by_type"] == {"extra": 1}
+        assert DriftEvent.objects.get().entity_id == _eid("1", "firefox")
@@ -0,0 +1,139 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Tests for deployment intent reconciliation.
+"""
+import threading
+import uuid
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from apps.connectors.models import ConnectorInstance, ConnectorStatus, DriftEvent
+from apps.deployment_intents.models import DeploymentIntent, RingDeployment
+from apps.deployment_intents.reconciliation import run_reconciliation
+from apps.deployment_intents.tasks import reconciliation_loop
+
+
+class FakeConnectorService:
+    """Connector service double recording health checks per plane."""
+
+    def __init__(self, unhealthy=()):
+        self.unhealthy = set(unhealthy)
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def health_check(self, connector_type):
+        with self._lock:
+            self.calls.append(connector_type)
+        if connector_type in self.unhealthy:
+            return {"status": "unhealthy", "message": "down", "details": {}}
+        return {"status": "healthy", "message": "ok", "details": {}}
+
+
+@pytest.fixture
+def user(db):
+    """Create a submitter."""
+    return User.objects.create_user(username="reconciler", password="testpass")
+
+
+@pytest.fixture
+def connectors(db):
+    """Create one connector instance per plane used in the tests."""
+    return {
+        plane: ConnectorInstance.objects.create(
+            connector_type=plane, name=f"{plane} prod", status=ConnectorStatus.ACTIVE
+        )
+        for plane in ("intune", "jamf")
+    }
+
+
+def _intent(user, plane, status, connector_object_id=None, ring=DeploymentIntent.Ring.PILOT, updated_at=None):
+    intent = DeploymentIntent.objects.create(
+        app_name="ReconApp",
+        version="1.0.0",
+        target_ring=ring,
+        status=status,
+        evidence_pack_id=uuid.uuid4(),
+        submitter=user,
+    )
+    if updated_at is not None:
+        DeploymentIntent.objects.filter(pk=intent.pk).update(updated_at=updated_at)
+    RingDeployment.objects.create(
+        deployment_intent=intent, ring=ring, connector_type=plane, connector_object_id=connector_object_id
+    )
+    return intent
+
+
+@pytest.mark.django_db
+class TestReconciliation:
+    """Test grouped, pooled reconciliation."""
+
+    def test_health_check_once_per_plane(self, user, connectors):
+        """Test each execution plane is health-checked once regardless of intent count."""
+        for i in range(5):
+            _intent(user, "intune", DeploymentIntent.Status.COMPLETED, connector_object_id=f"obj-{i}")
+        for i in range(3):
+            _intent(user, "jamf", DeploymentIntent.Status.COMPLETED, connector_object_id=f"obj-j{i}")
+        service = FakeConnectorService()
+
+        summary = run_reconciliation(connector_service=service, max_workers=2)
+
+        assert sorted(service.calls) == ["intune", "jamf"]
+        assert summary["processed"] == 8
+        assert summary["drift_count"] == 0
+
+    def test_drift_written_in_bulk_and_not_duplicated(self, user, connectors):
+        """Test drift becomes DriftEvent rows and repeat runs refresh instead of duplicating."""
+        missing = _intent(user, "intune", DeploymentIntent.Status.COMPLETED)
+        stuck = _intent(
+            user, "intune", DeploymentIntent.Status.DEPLOYING, updated_at=timezone.now() - timedelta(hours=30)
+        )
+        _intent(user, "intune", DeploymentIntent.Status.DEPLOYING)
+        _intent(user, "intune", DeploymentIntent.Status.PENDING)
+
+        summary = run_reconciliation(connector_service=FakeConnectorService())
+
+        assert summary["new_drift_events"] == 2
+        drift = dict(DriftEvent.objects.values_list("entity_id", "drift_type"))
+        assert drift == {str(missing.correlation_id): "missing", str(stuck.correlation_id): "stale"}
+        assert all(event.connector == connectors["intune"] for event in DriftEvent.objects.all())
+
+        summary = run_reconciliation(connector_service=FakeConnectorService())
+        assert summary["drift_count"] == 2
+        assert summary["new_drift_events"] == 0
+        assert DriftEvent.objects.count() == 2
+
+    def test_unhealthy_plane_skipped(self, user, connectors):
+        """Test intents on an unhealthy plane are not reconciled."""
+        _intent(user, "intune", DeploymentIntent.Status.COMPLETED)
+        _intent(user, "jamf", DeploymentIntent.Status.COMPLETED)
+
+        summary = run_reconciliation(connector_service=FakeConnectorService(unhealthy={"jamf"}))
+
+        assert summary["planes"]["jamf"] == {"healthy": False, "checked": 0, "drift": 0}
+        assert summary["processed"] == 1
+        assert DriftEvent.objects.get().connector == connectors["intune"]
+
+    def test_plane_without_connector_instance(self, user):
+        """Test drift on a plane with no connector instance is counted but not persisted."""
+        _intent(user, "sccm", DeploymentIntent.Status.COMPLETED)
+
+        summary = run_reconciliation(connector_service=FakeConnectorService())
+
+        assert summary["drift_count"] == 1
+        assert DriftEvent.objects.count() == 0
+
+    def test_reconciliation_task(self, user, connectors, monkeypatch):
+        """Test the beat task delegates to the reconciliation engine."""
+        import apps.connectors.services as connector_services
+
+        monkeypatch.setattr(connector_services, "get_connector_service", lambda: FakeConnectorService())
+        _intent(user, "intune", DeploymentIntent.Status.COMPLETED)
+
+        result = reconciliation_loop()
+
+        assert result["processed"] == 1
+        assert result["new_drift_events"] == 1
@@ -12,3 +12,7 @@ class EventStoreConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.event_store"
     verbose_name = "EUCORA Event Store"
+
+    def ready(self):
+        """Import signal handlers when app is ready."""
+        from . import signals  # noqa: F401
@@ -0,0 +1,255 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Cold-tier archival for DeploymentEvent partitions.
+
+An expired partition is streamed (keyset order on id) into a gzip-compressed
+NDJSON segment, uploaded to the evidence object store, verified by
+re-downloading and hashing, recorded as an EventArchiveSegment in the hash
+chain and only then detached and dropped.
+
+Archived events stay queryable through iter_archived_events(), which
+downloads each overlapping segment, verifies its SHA-256 against the chain
+record and filters rows while decompressing.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import tempfile
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from typing import Dict, Iterator, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import DeploymentEvent, EventArchiveSegment
+from .partitions import DEFAULT_PARTITION, EventPartition, drop_partition, list_partitions
+
+logger = logging.getLogger(__name__)
+
+# Keep up to this many bytes of a segment in memory before spilling to disk
+SPOOL_MAX_BYTES = 16 * 1024 * 1024
+ARCHIVE_CHUNK_SIZE = 5000
+
+EVENT_FIELDS = ("id", "correlation_id", "event_type", "event_data", "actor", "is_demo", "created_at")
+
+
+class EventArchiveError(Exception):
+    """Raised when a segment cannot be written or fails verification."""
+
+
+def compute_chain_hash(
+    previous_chain_hash: str,
+    sha256: str,
+    partition_name: str,
+    range_start: datetime,
+    range_end: datetime,
+    event_count: int,
+) -> str:
+    """Hash a segment's identity and content hash together with its predecessor's chain hash."""
+    payload = "|".join(
+        [previous_chain_hash, sha256, partition_name, range_start.isoformat(), range_end.isoformat(), str(event_count)]
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _serialize_event(row: Dict) -> bytes:
+    row["correlation_id"] = str(row["correlation_id"])
+    row["created_at"] = row["created_at"].isoformat()
+    return (json.dumps(row, default=str, sort_keys=True) + "\n").encode()
+
+
+def write_segment(
+    partition_name: str,
+    range_start: datetime,
+    range_end: datetime,
+    storage=None,
+) -> EventArchiveSegment:
+    """
+    Archive all events in [range_start, range_end) as one chained segment.
+
+    Args:
+        partition_name: Source partition (unique segment identity)
+        range_start: Inclusive created_at lower bound
+        range_end: Exclusive created_at upper bound
+        storage: Evidence store client (defaults to get_storage())
+
+    Returns:
+        Saved EventArchiveSegment
+
+    Raises:
+        EventArchiveError: If the uploaded object does not verify
+    """
+    if storage is None:
+        from apps.evidence_store.storage import get_storage
+
+        storage = get_storage()
+
+    queryset = DeploymentEvent.objects.filter(created_at__gte=range_start, created_at__lt=range_end)
+    object_name = (
+        f"{settings.EVENT_ARCHIVE_PREFIX.rstrip('/')}/"
+        f"{range_start:%Y}/{partition_name}-{range_start:%Y%m%d}-{range_end:%Y%m%d}.ndjson.gz"
+    )
+
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as segment_file:
+        event_count, first_id, last_id = 0, None, 0
+        with gzip.GzipFile(fileobj=segment_file, mode="wb", mtime=0) as gz:
+            while True:
+                rows = list(queryset.filter(id__gt=last_id).order_by("id").values(*EVENT_FIELDS)[:ARCHIVE_CHUNK_SIZE])
+                if not rows:
+                    break
+                for row in rows:
+                    gz.write(_serialize_event(row))
+                first_id = first_id if first_id is not None else rows[0]["id"]
+                last_id = rows[-1]["id"]
+                event_count += len(rows)
+
+        size_bytes = segment_file.tell()
+        _, sha256 = storage.upload_artifact(segment_file, object_name, content_type="application/gzip")
+
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as verify_file:
+        if storage.download_artifact(object_name, verify_file) != sha256:
+            raise EventArchiveError(f"Uploaded segment {object_name} failed hash verification")
+
+    with transaction.atomic():
+        # The chain runs in archive order, which differs from range order when an older partition is archived late
+        previous = EventArchiveSegment.objects.select_for_update().order_by("-id").first()
+        previous_chain_hash = previous.chain_hash if previous else ""
+        segment = EventArchiveSegment.objects.create(
+            partition_name=partition_name,
+            range_start=range_start,
+            range_end=range_end,
+            object_name=object_name,
+            event_count=event_count,
+            first_event_id=first_id,
+            last_event_id=last_id or None,
+            size_bytes=size_bytes,
+            sha256=sha256,
+            previous_chain_hash=previous_chain_hash,
+            chain_hash=compute_chain_hash(
+                previous_chain_hash, sha256, partition_name, range_start, range_end, event_count
+            ),
+        )
+
+    logger.info(
+        f"Archived {event_count} events from {partition_name} to {object_name}",
+        extra={"partition": partition_name, "event_count": event_count, "sha256": sha256},
+    )
+    return segment
+
+
+def archive_expired_partitions(
+    hot_months: Optional[int] = None, now: Optional[datetime] = None, storage=None, dry_run: bool = False
+) -> List[str]:
+    """
+    Move partitions that ended more than `hot_months` months ago to the cold tier.
+
+    Returns:
+        Names of partitions archived (or that would be, with dry_run)
+    """
+    hot_months = settings.EVENT_HOT_RETENTION_MONTHS if hot_months is None else hot_months
+    cutoff = (now or datetime.now(dt_timezone.utc)) - timedelta(days=31 * hot_months)
+    archived = []
+
+    for partition in list_partitions():
+        if partition.name == DEFAULT_PARTITION or partition.range_end is None or partition.range_end > cutoff:
+            continue
+        archived.append(partition.name)
+        if dry_run:
+            continue
+        _archive_partition(partition, storage)
+
+    return archived
+
+
+def _archive_partition(partition: EventPartition, storage) -> None:
+    range_start = partition.range_start
+    if range_start is None:
+        # Legacy partition: start at its oldest row
+        oldest = DeploymentEvent.objects.filter(created_at__lt=partition.range_end).order_by("created_at").first()
+        range_start = oldest.created_at if oldest else partition.range_end
+
+    if not EventArchiveSegment.objects.filter(partition_name=partition.name).exists():
+        write_segment(partition.name, range_start, partition.range_end, storage=storage)
+    drop_partition(partition)
+
+
+def verify_archive_chain() -> List[str]:
+    """
+    Recompute the chain over all segment records, in the order they were archived.
+
+    Returns:
+        Names of partitions whose chain link does not verify (empty if intact)
+    """
+    broken = []
+    previous_chain_hash = ""
+    for segment in EventArchiveSegment.objects.order_by("id").iterator():
+        expected = compute_chain_hash(
+            previous_chain_hash,
+            segment.sha256,
+            segment.partition_name,
+            segment.range_start,
+            segment.range_end,
+            segment.event_count,
+        )
+        if segment.previous_chain_hash != previous_chain_hash or segment.chain_hash != expected:
+            broken.append(segment.partition_name)
+        previous_chain_hash = segment.chain_hash
+    return broken
+
+
+def _archived_row_matches(row: Dict, since, until, correlation_id, event_type, is_demo, after_id) -> bool:
+    """Apply the export filters to one archived row."""
+    if row["id"] <= after_id:
+        return False
+    if correlation_id and row["correlation_id"] != str(correlation_id):
+        return False
+    if event_type and row["event_type"] != event_type:
+        return False
+    if is_demo is not None and row["is_demo"] != is_demo:
+        return False
+    created_at = datetime.fromisoformat(row["created_at"])
+    return not ((since and created_at < since) or (until and created_at >= until))
+
+
+def iter_archived_events(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    correlation_id: Optional[str] = None,
+    event_type: Optional[str] = None,
+    is_demo: Optional[bool] = None,
+    after_id: int = 0,
+    storage=None,
+) -> Iterator[Dict]:
+    """
+    Yield archived events matching the filters, oldest segment first.
+
+    Each segment is downloaded to a spooled temp file and its SHA-256 checked
+    against the chain record before any row is yielded.
+
+    Raises:
+        EventArchiveError: If a segment fails hash verification
+    """
+    if storage is None:
+        from apps.evidence_store.storage import get_storage
+
+        storage = get_storage()
+
+    segments = EventArchiveSegment.objects.filter(last_event_id__gt=after_id)
+    if since is not None:
+        segments = segments.filter(range_end__gt=since)
+    if until is not None:
+        segments = segments.filter(range_start__lt=until)
+
+    for segment in segments.order_by("range_start", "id"):
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as segment_file:
+            if storage.download_artifact(segment.object_name, segment_file) != segment.sha256:
+                raise EventArchiveError(f"Archived segment {segment.object_name} failed hash verification")
+
+            with gzip.GzipFile(fileobj=segment_file, mode="rb") as gz:
+                for line in gz:
+                    row = json.loads(line)
+                    if _archived_row_matches(row, since, until, correlation_id, event_type, is_demo, after_id):
+                        yield row
@@ -0,0 +1,56 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Management command to create event partitions and archive expired ones.
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.event_store.archive import archive_expired_partitions, verify_archive_chain
+from apps.event_store.partitions import ensure_partitions, is_partitioned, list_partitions
+
+
+class Command(BaseCommand):
+    help = "Create upcoming DeploymentEvent partitions and move expired partitions to the cold tier"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months-ahead",
+            type=int,
+            default=settings.EVENT_PARTITION_MONTHS_AHEAD,
+            help="Months of partitions to create ahead of the current month",
+        )
+        parser.add_argument(
+            "--hot-months",
+            type=int,
+            default=settings.EVENT_HOT_RETENTION_MONTHS,
+            help="Months of events kept in PostgreSQL before archival",
+        )
+        parser.add_argument("--no-archive", action="store_true", help="Only create partitions")
+        parser.add_argument("--dry-run", action="store_true", help="List partitions that would be archived")
+        parser.add_argument("--verify-chain", action="store_true", help="Verify the archive hash chain and exit")
+
+    def handle(self, *args, **options):
+        if options["verify_chain"]:
+            broken = verify_archive_chain()
+            if broken:
+                self.stdout.write(self.style.ERROR(f"Archive chain broken at: {', '.join(broken)}"))
+            else:
+                self.stdout.write(self.style.SUCCESS("Archive chain verified."))
+            return
+
+        if not is_partitioned():
+            self.stdout.write(self.style.WARNING("Event table is not partitioned (PostgreSQL only); nothing to do."))
+            return
+
+        if not options["dry_run"]:
+            for name in ensure_partitions(months_ahead=options["months_ahead"]):
+                self.stdout.write(f"  created {name}")
+
+        if not options["no_archive"]:
+            for name in archive_expired_partitions(hot_months=options["hot_months"], dry_run=options["dry_run"]):
+                self.stdout.write(f"  {'would archive' if options['dry_run'] else 'archived'} {name}")
+
+        for partition in list_partitions():
+            self.stdout.write(f"  {partition.name}: {partition.range_start} -> {partition.range_end}")
+        self.stdout.write(self.style.SUCCESS("Event partition maintenance completed."))
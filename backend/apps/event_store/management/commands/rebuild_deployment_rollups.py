@@ -0,0 +1,28 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Management command to backfill or repair the deployment daily rollup.
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.event_store.services import rebuild_deployment_rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild DeploymentDailyRollup rows from DeploymentEvent"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=None,
+            help="Only rebuild the last N days (default: rebuild everything)",
+        )
+
+    def handle(self, *args, **options):
+        since = timezone.now() - timedelta(days=options["days"]) if options["days"] is not None else None
+        rows = rebuild_deployment_rollups(since=since)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} deployment rollup rows."))
@@ -0,0 +1,36 @@
+# Generated by Django 5.0.14 on 2026-10-16 00:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("event_store", "0002_add_is_demo"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DeploymentDailyRollup",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "app_name",
+                    models.CharField(help_text="Application name from event_data.app_name", max_length=255),
+                ),
+                ("day", models.DateField(help_text="UTC day the events were recorded")),
+                ("created_count", models.PositiveIntegerField(default=0)),
+                ("completed_count", models.PositiveIntegerField(default=0)),
+                ("failed_count", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Deployment Daily Rollup",
+                "verbose_name_plural": "Deployment Daily Rollups",
+                "ordering": ["-day"],
+                "constraints": [
+                    models.UniqueConstraint(fields=("app_name", "day"), name="deployment_rollup_app_day_unique")
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.0.14 on 2026-10-16 00:00
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("event_store", "0003_deployment_daily_rollup"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EventArchiveSegment",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "created_at",
+                    models.DateTimeField(db_index=True, default=django.utils.timezone.now, editable=False),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "partition_name",
+                    models.CharField(help_text="Source partition table", max_length=128, unique=True),
+                ),
+                ("range_start", models.DateTimeField(help_text="Inclusive lower bound of created_at")),
+                ("range_end", models.DateTimeField(help_text="Exclusive upper bound of created_at")),
+                (
+                    "object_name",
+                    models.CharField(help_text="Object name in the evidence store bucket", max_length=512),
+                ),
+                ("event_count", models.PositiveBigIntegerField(default=0)),
+                ("first_event_id", models.BigIntegerField(blank=True, null=True)),
+                ("last_event_id", models.BigIntegerField(blank=True, null=True)),
+                ("size_bytes", models.PositiveBigIntegerField(default=0, help_text="Compressed segment size")),
+                ("sha256", models.CharField(help_text="SHA-256 of the compressed segment", max_length=64)),
+                (
+                    "previous_chain_hash",
+                    models.CharField(blank=True, help_text="chain_hash of the previous segment", max_length=64),
+                ),
+                ("chain_hash", models.CharField(max_length=64, unique=True)),
+            ],
+            options={
+                "verbose_name": "Event Archive Segment",
+                "verbose_name_plural": "Event Archive Segments",
+                "ordering": ["range_start"],
+                "indexes": [
+                    models.Index(fields=["range_start", "range_end"], name="event_store_range_s_8cc89e_idx"),
+                ],
+            },
+        ),
+    ]
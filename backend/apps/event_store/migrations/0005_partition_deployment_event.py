@@ -0,0 +1,99 @@
+# Generated by Django 5.0.14 on 2026-10-16 00:00
+"""
+Convert event_store_deploymentevent into a monthly RANGE-partitioned table.
+
+PostgreSQL only; a no-op on other backends. Existing rows stay in place: the
+old table is renamed to event_store_deploymentevent_legacy and attached as
+the partition covering everything before the month after its newest row. The primary key
+becomes (id, created_at) because PostgreSQL requires the partition key in
+every unique constraint; ids keep coming from one shared sequence.
+"""
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+
+from django.db import migrations
+
+PARENT = "event_store_deploymentevent"
+LEGACY = "event_store_deploymentevent_legacy"
+DEFAULT = "event_store_deploymentevent_default"
+SEQUENCE = "event_store_deploymentevent_id_seq"
+
+
+def _month_start(value):
+    return datetime(value.year, value.month, 1, tzinfo=dt_timezone.utc)
+
+
+def partition_event_table(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        return
+
+    DeploymentEvent = apps.get_model("event_store", "DeploymentEvent")
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'LOCK TABLE "{PARENT}" IN ACCESS EXCLUSIVE MODE')
+        cursor.execute(f'SELECT COALESCE(MAX(id), 0), MAX(created_at) FROM "{PARENT}"')
+        max_id, max_created_at = cursor.fetchone()
+
+        # Legacy partition ends at the first month boundary after every existing row
+        newest = max(filter(None, [max_created_at, datetime.now(dt_timezone.utc)]))
+        cutover = _month_start(_month_start(newest) + timedelta(days=32))
+
+        # Free the parent's name and index names for the new partitioned table
+        cursor.execute(f'ALTER TABLE "{PARENT}" RENAME TO "{LEGACY}"')
+        cursor.execute(
+            "SELECT i.relname FROM pg_index x "
+            "JOIN pg_class i ON i.oid = x.indexrelid JOIN pg_class t ON t.oid = x.indrelid "
+            "WHERE t.relname = %s AND NOT x.indisprimary",
+            [LEGACY],
+        )
+        for (index_name,) in cursor.fetchall():
+            cursor.execute(f'ALTER INDEX "{index_name}" RENAME TO "{index_name[:50]}_legacy"')
+
+        cursor.execute(f'ALTER TABLE "{LEGACY}" ALTER COLUMN id DROP IDENTITY IF EXISTS')
+        cursor.execute(f'ALTER TABLE "{LEGACY}" DROP CONSTRAINT IF EXISTS "{PARENT}_pkey"')
+        cursor.execute(f'ALTER TABLE "{LEGACY}" ADD PRIMARY KEY (id, created_at)')
+
+        cursor.execute(
+            f'CREATE TABLE "{PARENT}" (LIKE "{LEGACY}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS) '
+            f"PARTITION BY RANGE (created_at)"
+        )
+        cursor.execute(f'CREATE SEQUENCE "{SEQUENCE}" OWNED BY "{PARENT}".id')
+        if max_id:
+            cursor.execute("SELECT setval(%s, %s, true)", [SEQUENCE, max_id])
+        cursor.execute(f"ALTER TABLE \"{PARENT}\" ALTER COLUMN id SET DEFAULT nextval('{SEQUENCE}')")
+        cursor.execute(f'ALTER TABLE "{PARENT}" ADD PRIMARY KEY (id, created_at)')
+
+    # Recreate the model's indexes on the parent (propagated to every partition)
+    for sql in schema_editor._model_indexes_sql(DeploymentEvent):
+        schema_editor.execute(sql)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'ALTER TABLE "{PARENT}" ATTACH PARTITION "{LEGACY}" '
+            f"FOR VALUES FROM (MINVALUE) TO ('{cutover.isoformat()}')"
+        )
+        cursor.execute(f'CREATE TABLE "{DEFAULT}" PARTITION OF "{PARENT}" DEFAULT')
+
+        # Three months after the cutover; later months come from maintain_event_partitions
+        start = cutover
+        for _ in range(3):
+            end = _month_start(start + timedelta(days=32))
+            name = f"{PARENT}_y{start.year:04d}m{start.month:02d}"
+            cursor.execute(
+                f'CREATE TABLE "{name}" PARTITION OF "{PARENT}" '
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            )
+            start = end
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("event_store", "0004_event_archive_segment"),
+    ]
+
+    operations = [
+        # Irreversible: the partitioned table stays compatible with the model if rolled back
+        migrations.RunPython(partition_event_table, migrations.RunPython.noop),
+    ]
@@ -56,3 +56,65 @@ class DeploymentEvent(TimeStampedModel):
     def delete(self, *args, **kwargs):
         """Append-only: No deletes allowed."""
         raise ValueError("DeploymentEvent is append-only, deletes not allowed")
+
+
+class DeploymentDailyRollup(models.Model):
+    """
+    Per-app, per-day deployment event counts.
+
+    Maintained incrementally as DeploymentEvent rows are appended, so
+    history-based risk factors read a 30/90-day window in O(days) rows
+    instead of scanning the event table.
+    """
+
+    app_name = models.CharField(max_length=255, help_text="Application name from event_data.app_name")
+    day = models.DateField(help_text="UTC day the events were recorded")
+    created_count = models.PositiveIntegerField(default=0)
+    completed_count = models.PositiveIntegerField(default=0)
+    failed_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["app_name", "day"], name="deployment_rollup_app_day_unique"),
+        ]
+        ordering = ["-day"]
+        verbose_name = "Deployment Daily Rollup"
+        verbose_name_plural = "Deployment Daily Rollups"
+
+    def __str__(self):
+        return f"{self.app_name} {self.day}: {self.created_count}/{self.completed_count}/{self.failed_count}"
+
+
+class EventArchiveSegment(TimeStampedModel):
+    """
+    Cold-tier segment holding one archived DeploymentEvent partition.
+
+    Segments are gzip-compressed NDJSON objects in the evidence object store.
+    Each segment's chain_hash covers its content hash and the chain_hash of
+    the segment archived before it, so removing or altering any archived
+    segment breaks the chain.
+    """
+
+    partition_name = models.CharField(max_length=128, unique=True, help_text="Source partition table")
+    range_start = models.DateTimeField(help_text="Inclusive lower bound of created_at")
+    range_end = models.DateTimeField(help_text="Exclusive upper bound of created_at")
+    object_name = models.CharField(max_length=512, help_text="Object name in the evidence store bucket")
+    event_count = models.PositiveBigIntegerField(default=0)
+    first_event_id = models.BigIntegerField(null=True, blank=True)
+    last_event_id = models.BigIntegerField(null=True, blank=True)
+    size_bytes = models.PositiveBigIntegerField(default=0, help_text="Compressed segment size")
+    sha256 = models.CharField(max_length=64, help_text="SHA-256 of the compressed segment")
+    previous_chain_hash = models.CharField(max_length=64, blank=True, help_text="chain_hash of the previous segment")
+    chain_hash = models.CharField(max_length=64, unique=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["range_start", "range_end"]),
+        ]
+        ordering = ["range_start"]
+        verbose_name = "Event Archive Segment"
+        verbose_name_plural = "Event Archive Segments"
+
+    def __str__(self):
+        return f"{self.partition_name} ({self.event_count} events)"
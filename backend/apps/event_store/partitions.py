@@ -0,0 +1,201 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Monthly range partitioning for the DeploymentEvent table (PostgreSQL only).
+
+Layout (created by migration 0005_partition_deployment_event):
+- event_store_deploymentevent            partitioned parent, RANGE (created_at)
+- event_store_deploymentevent_legacy     rows that existed before partitioning
+- event_store_deploymentevent_yYYYYmMM   one partition per calendar month (UTC)
+- event_store_deploymentevent_default    catch-all for rows outside every range (moved
+                                          into their monthly partition once it is created)
+
+Queries filtered on created_at are pruned to the matching partitions, so
+hot-path reads only touch recent months. Old partitions are moved to the
+cold tier by apps.event_store.archive.
+
+On other database backends (SQLite in development) every function here is
+a no-op.
+"""
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from datetime import timezone as dt_timezone
+from typing import List, Optional
+
+from django.db import connection, transaction
+from django.utils.dateparse import parse_datetime
+
+from .models import DeploymentEvent
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = DeploymentEvent._meta.db_table
+LEGACY_PARTITION = f"{PARENT_TABLE}_legacy"
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+
+
+@dataclass(frozen=True)
+class EventPartition:
+    """A DeploymentEvent partition and its created_at bounds (None = unbounded)."""
+
+    name: str
+    range_start: Optional[datetime]
+    range_end: Optional[datetime]
+
+
+def month_start(value: datetime) -> datetime:
+    """Return the first instant of value's UTC month."""
+    value = value.astimezone(dt_timezone.utc)
+    return datetime(value.year, value.month, 1, tzinfo=dt_timezone.utc)
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    """Shift a month-start datetime by a number of months."""
+    index = value.year * 12 + (value.month - 1) + months
+    return value.replace(year=index // 12, month=index % 12 + 1, day=1)
+
+
+def partition_name_for(start: datetime) -> str:
+    """Return the monthly partition name for a month-start datetime."""
+    return f"{PARENT_TABLE}_y{start.year:04d}m{start.month:02d}"
+
+
+def is_partitioned() -> bool:
+    """Return True if the event table is a PostgreSQL partitioned table."""
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = %s",
+            [PARENT_TABLE],
+        )
+        return cursor.fetchone() is not None
+
+
+def list_partitions() -> List[EventPartition]:
+    """
+    List attached partitions ordered by range start (legacy first, default last).
+    """
+    if not is_partitioned():
+        return []
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname,
+                   (regexp_match(pg_get_expr(child.relpartbound, child.oid), 'FROM \\(''([^'']+)''\\)'))[1],
+                   (regexp_match(pg_get_expr(child.relpartbound, child.oid), 'TO \\(''([^'']+)''\\)'))[1]
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = %s
+            """,
+            [PARENT_TABLE],
+        )
+        rows = cursor.fetchall()
+
+    partitions = [
+        EventPartition(
+            name=name,
+            range_start=parse_datetime(start).astimezone(dt_timezone.utc) if start else None,
+            range_end=parse_datetime(end).astimezone(dt_timezone.utc) if end else None,
+        )
+        for name, start, end in rows
+    ]
+    return sorted(
+        partitions,
+        key=lambda p: (
+            p.name == DEFAULT_PARTITION,
+            p.range_start or datetime.min.replace(tzinfo=dt_timezone.utc),
+        ),
+    )
+
+
+def _create_partition(name: str, start: datetime, end: datetime, has_default: bool) -> int:
+    """
+    Create one monthly partition, adopting rows of its month from the default partition.
+
+    Rows written before the partition existed land in the default partition,
+    and PostgreSQL refuses to create a partition whose range the default
+    partition already holds rows for. Those rows are moved into a new table,
+    which is then attached, all in one transaction.
+
+    Returns:
+        Number of rows moved out of the default partition
+    """
+    bounds = f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    with transaction.atomic(), connection.cursor() as cursor:
+        rows_in_default = False
+        if has_default:
+            # Attaching the partition needs this lock anyway; taking it first keeps new rows out meanwhile
+            cursor.execute(f'LOCK TABLE "{DEFAULT_PARTITION}" IN ACCESS EXCLUSIVE MODE')
+            cursor.execute(
+                f'SELECT EXISTS (SELECT 1 FROM "{DEFAULT_PARTITION}" WHERE created_at >= %s AND created_at < %s)',
+                [start, end],
+            )
+            rows_in_default = cursor.fetchone()[0]
+        if not rows_in_default:
+            cursor.execute(f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{PARENT_TABLE}" {bounds}')
+            return 0
+
+        cursor.execute(f'CREATE TABLE "{name}" (LIKE "{PARENT_TABLE}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+        cursor.execute(
+            f'WITH moved AS (DELETE FROM "{DEFAULT_PARTITION}" WHERE created_at >= %s AND created_at < %s RETURNING *) '
+            f'INSERT INTO "{name}" SELECT * FROM moved',
+            [start, end],
+        )
+        moved = cursor.rowcount
+        cursor.execute(f'ALTER TABLE "{PARENT_TABLE}" ATTACH PARTITION "{name}" {bounds}')
+    logger.warning(
+        f"Moved {moved} events for {name} out of the default partition", extra={"partition": name, "moved": moved}
+    )
+    return moved
+
+
+def ensure_partitions(months_ahead: int = 3, now: Optional[datetime] = None) -> List[str]:
+    """
+    Create monthly partitions from the current month through `months_ahead` months ahead.
+
+    Returns:
+        Names of partitions created
+    """
+    if not is_partitioned():
+        logger.debug("Event table is not partitioned; skipping partition creation")
+        return []
+
+    existing = {p.name for p in list_partitions()}
+    current = month_start(now or datetime.now(dt_timezone.utc))
+    created = []
+
+    for offset in range(months_ahead + 1):
+        start = add_months(current, offset)
+        end = add_months(start, 1)
+        name = partition_name_for(start)
+        if name in existing:
+            continue
+
+        try:
+            moved = _create_partition(name, start, end, has_default=DEFAULT_PARTITION in existing)
+        except Exception as e:
+            logger.error(f"Failed to create event partition {name}: {e}")
+            continue
+
+        created.append(name)
+        logger.info(f"Created event partition {name}", extra={"partition": name, "moved_from_default": moved})
+
+    return created
+
+
+def drop_partition(partition: EventPartition) -> None:
+    """
+    Detach and drop a partition.
+
+    Only called by the archiver after the partition's segment has been
+    uploaded and verified.
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'ALTER TABLE "{PARENT_TABLE}" DETACH PARTITION "{partition.name}"')
+        cursor.execute(f'DROP TABLE "{partition.name}"')
+
+    logger.info(f"Dropped archived event partition {partition.name}", extra={"partition": partition.name})
@@ -0,0 +1,207 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Event Store services: bulk append, streaming export and deployment-history rollups.
+"""
+import json
+import logging
+from collections import Counter
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.fields.json import KeyTextTransform
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import DeploymentDailyRollup, DeploymentEvent
+
+logger = logging.getLogger(__name__)
+
+# Rows per INSERT for bulk appends and per SELECT for streaming exports
+BULK_BATCH_SIZE = 1000
+EXPORT_CHUNK_SIZE = 2000
+
+# Event types tracked by the rollup, mapped to their counter column
+ROLLUP_COUNTERS = {
+    DeploymentEvent.EventType.DEPLOYMENT_CREATED: "created_count",
+    DeploymentEvent.EventType.DEPLOYMENT_COMPLETED: "completed_count",
+    DeploymentEvent.EventType.DEPLOYMENT_FAILED: "failed_count",
+}
+
+# Event payloads are unbounded; longer app names are counted under their prefix
+ROLLUP_APP_NAME_MAX_LENGTH = DeploymentDailyRollup._meta.get_field("app_name").max_length
+
+
+def _rollup_key(event: DeploymentEvent) -> Optional[Tuple[str, date, str]]:
+    """Return (app_name, day, counter) for a tracked event, or None."""
+    counter = ROLLUP_COUNTERS.get(event.event_type)
+    app_name = event.event_data.get("app_name") if isinstance(event.event_data, dict) else None
+    if counter is None or not isinstance(app_name, str):
+        return None
+    return app_name[:ROLLUP_APP_NAME_MAX_LENGTH], timezone.localdate(event.created_at, dt_timezone.utc), counter
+
+
+def record_deployment_rollups(events: Iterable[DeploymentEvent]) -> int:
+    """
+    Apply appended events to the per-app, per-day rollup.
+
+    Increments are applied with UPDATE ... SET n = n + k, so concurrent
+    writers never lose counts. Rows are created on first use per (app, day).
+
+    Args:
+        events: Newly appended DeploymentEvent instances
+
+    Returns:
+        Number of events counted
+    """
+    increments: Dict[Tuple[str, date], Counter] = {}
+    counted = 0
+    for event in events:
+        key = _rollup_key(event)
+        if key is None:
+            continue
+        app_name, day, counter = key
+        increments.setdefault((app_name, day), Counter())[counter] += 1
+        counted += 1
+
+    for (app_name, day), counters in increments.items():
+        updates = {counter: F(counter) + amount for counter, amount in counters.items()}
+        if DeploymentDailyRollup.objects.filter(app_name=app_name, day=day).update(**updates):
+            continue
+        try:
+            with transaction.atomic():
+                DeploymentDailyRollup.objects.create(app_name=app_name, day=day, **counters)
+        except IntegrityError:
+            # Another writer created the row first
+            DeploymentDailyRollup.objects.filter(app_name=app_name, day=day).update(**updates)
+
+    return counted
+
+
+def get_deployment_counts(app_name: str, days: int) -> Dict[str, int]:
+    """
+    Return {event_type: count} for an app over the last `days` days.
+
+    Reads at most `days + 1` rollup rows. The window starts at the beginning
+    of the UTC day `days` days ago.
+    """
+    since = (timezone.now() - timedelta(days=days)).astimezone(dt_timezone.utc).date()
+    totals = DeploymentDailyRollup.objects.filter(
+        app_name=app_name[:ROLLUP_APP_NAME_MAX_LENGTH], day__gte=since
+    ).aggregate(**{counter: Sum(counter) for counter in ROLLUP_COUNTERS.values()})
+    return {event_type: totals[counter] or 0 for event_type, counter in ROLLUP_COUNTERS.items()}
+
+
+def rebuild_deployment_rollups(since: Optional[datetime] = None) -> int:
+    """
+    Recompute rollup rows from DeploymentEvent.
+
+    Used to backfill the rollup for existing events or repair drift. Rows on
+    or after `since` (all rows if None) are replaced in one transaction.
+
+    Returns:
+        Number of rollup rows written
+    """
+    events = DeploymentEvent.objects.filter(event_type__in=list(ROLLUP_COUNTERS))
+    rollups = DeploymentDailyRollup.objects.all()
+    if since is not None:
+        since_day = since.astimezone(dt_timezone.utc).date()
+        events = events.filter(created_at__gte=datetime.combine(since_day, datetime.min.time(), tzinfo=dt_timezone.utc))
+        rollups = rollups.filter(day__gte=since_day)
+
+    grouped = (
+        events.annotate(
+            app_name=KeyTextTransform("app_name", "event_data"),
+            day=TruncDate("created_at", tzinfo=dt_timezone.utc),
+        )
+        .filter(app_name__isnull=False)
+        .values("app_name", "day", "event_type")
+        .annotate(total=Count("id"))
+        .order_by()
+    )
+
+    rows: Dict[Tuple[str, date], DeploymentDailyRollup] = {}
+    for row in grouped.iterator():
+        # Names sharing their first ROLLUP_APP_NAME_MAX_LENGTH characters add up in one row
+        key = (row["app_name"][:ROLLUP_APP_NAME_MAX_LENGTH], row["day"])
+        if key not in rows:
+            rows[key] = DeploymentDailyRollup(app_name=key[0], day=key[1])
+        counter = ROLLUP_COUNTERS[row["event_type"]]
+        setattr(rows[key], counter, getattr(rows[key], counter) + row["total"])
+
+    with transaction.atomic():
+        rollups.delete()
+        DeploymentDailyRollup.objects.bulk_create(rows.values(), batch_size=BULK_BATCH_SIZE)
+
+    logger.info(f"Rebuilt {len(rows)} deployment rollup rows", extra={"since": since.isoformat() if since else None})
+    return len(rows)
+
+
+def append_events(events: List[DeploymentEvent]) -> List[DeploymentEvent]:
+    """
+    Append many events in one transaction.
+
+    bulk_create bypasses DeploymentEvent.save(), so the append-only rule is
+    enforced here: only unsaved instances are accepted. Rollups are updated
+    in the same transaction.
+
+    Raises:
+        ValueError: If any event already has a primary key
+    """
+    if any(event.pk is not None for event in events):
+        raise ValueError("DeploymentEvent is append-only, updates not allowed")
+
+    with transaction.atomic():
+        created = DeploymentEvent.objects.bulk_create(events, batch_size=BULK_BATCH_SIZE)
+        record_deployment_rollups(created)
+
+    return created
+
+
+def iter_events_ndjson(
+    queryset, after_id: int = 0, limit: Optional[int] = None, archived_rows: Optional[Iterable[Dict]] = None
+) -> Iterator[str]:
+    """
+    Stream events as NDJSON lines using keyset pagination on id.
+
+    Each chunk is a fresh `id > last_id ORDER BY id LIMIT n` query, so memory
+    stays constant and no server-side cursor is held between chunks.
+
+    Args:
+        queryset: Filtered DeploymentEvent queryset
+        after_id: Resume after this event id
+        limit: Maximum number of events to emit (None = all)
+        archived_rows: Cold-tier rows to emit before the hot rows
+    """
+    last_id = after_id
+    remaining = limit
+
+    for row in archived_rows or ():
+        if remaining is not None and remaining <= 0:
+            return
+        yield json.dumps(row, default=str) + "\n"
+        last_id = max(last_id, row["id"])
+        if remaining is not None:
+            remaining -= 1
+
+    fields = ("id", "correlation_id", "event_type", "event_data", "actor", "is_demo", "created_at")
+
+    while remaining is None or remaining > 0:
+        chunk_size = EXPORT_CHUNK_SIZE if remaining is None else min(EXPORT_CHUNK_SIZE, remaining)
+        rows = list(queryset.filter(id__gt=last_id).order_by("id").values(*fields)[:chunk_size])
+        if not rows:
+            return
+
+        for row in rows:
+            row["correlation_id"] = str(row["correlation_id"])
+            row["created_at"] = row["created_at"].isoformat()
+            yield json.dumps(row, default=str) + "\n"
+
+        last_id = rows[-1]["id"]
+        if remaining is not None:
+            remaining -= len(rows)
+        if len(rows) < chunk_size:
+            return
@@ -0,0 +1,17 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Event Store signal handlers.
+"""
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import DeploymentEvent
+from .services import record_deployment_rollups
+
+
+@receiver(post_save, sender=DeploymentEvent)
+def update_deployment_rollup(sender, instance, created, **kwargs):
+    """Count newly appended deployment events in the daily rollup."""
+    if created:
+        record_deployment_rollups([instance])
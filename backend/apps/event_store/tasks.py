@@ -35,3 +35,27 @@ def cleanup_old_events():
 
     # In production, this would trigger archival workflow, not deletion
     return {"old_events_count": old_events_count, "retention_date": retention_date.isoformat()}
+
+
+@shared_task(name="apps.event_store.tasks.maintain_event_partitions")
+def maintain_event_partitions():
+    """
+    Create upcoming monthly event partitions and archive expired ones.
+
+    Expired partitions are written to hash-chained segments in the evidence
+    object store, verified, and only then detached and dropped.
+    """
+    from django.conf import settings
+
+    from apps.event_store.archive import archive_expired_partitions
+    from apps.event_store.partitions import ensure_partitions
+
+    created = ensure_partitions(months_ahead=settings.EVENT_PARTITION_MONTHS_AHEAD)
+    archived = archive_expired_partitions()
+
+    logger.info(
+        f"Event partition maintenance: {len(created)} created, {len(archived)} archived",
+        extra={"partitions_created": created, "partitions_archived": archived},
+    )
+
+    return {"created": created, "archived": archived}
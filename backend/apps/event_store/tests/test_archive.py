@@ -0,0 +1,196 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Tests for event_store cold-tier archive segments.
+"""
+import hashlib
+import json
+import logging
+import uuid
+from datetime import datetime
+from datetime import timezone as dt_timezone
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from apps.event_store.archive import EventArchiveError, iter_archived_events, verify_archive_chain, write_segment
+from apps.event_store.models import DeploymentEvent, EventArchiveSegment
+from apps.event_store.partitions import add_months, ensure_partitions, is_partitioned, month_start
+from apps.event_store.tasks import maintain_event_partitions
+
+
+class InMemoryStorage:
+    """Object store stand-in implementing the evidence storage interface used by the archiver."""
+
+    def __init__(self):
+        self.objects = {}
+
+    def upload_artifact(self, file_obj, object_name, content_type="application/octet-stream"):
+        file_obj.seek(0)
+        data = file_obj.read()
+        self.objects[object_name] = data
+        return object_name, hashlib.sha256(data).hexdigest()
+
+    def download_artifact(self, object_name, file_obj, chunk_size=8192):
+        data = self.objects[object_name]
+        file_obj.write(data)
+        file_obj.seek(0)
+        return hashlib.sha256(data).hexdigest()
+
+
+JAN = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+FEB = datetime(2024, 2, 1, tzinfo=dt_timezone.utc)
+MAR = datetime(2024, 3, 1, tzinfo=dt_timezone.utc)
+
+
+def _log(created_at, event_type=DeploymentEvent.EventType.DEPLOYMENT_CREATED, is_demo=False):
+    return DeploymentEvent.objects.create(
+        correlation_id=uuid.uuid4(),
+        event_type=event_type,
+        event_data={"app_name": "ArchiveApp"},
+        actor="testuser",
+        is_demo=is_demo,
+        created_at=created_at,
+    )
+
+
+@pytest.mark.django_db
+class TestEventArchive:
+    """Test segment writing, chain verification and cold-tier reads."""
+
+    def test_write_segment_chains_segments(self):
+        """Test each segment records its content hash and links to its predecessor."""
+        storage = InMemoryStorage()
+        first = _log(JAN.replace(day=10))
+        _log(JAN.replace(day=20))
+        _log(FEB.replace(day=5))
+
+        january = write_segment("p_2024_01", JAN, FEB, storage=storage)
+        february = write_segment("p_2024_02", FEB, MAR, storage=storage)
+
+        assert (january.event_count, january.first_event_id) == (2, first.id)
+        assert february.event_count == 1
+        assert january.previous_chain_hash == ""
+        assert february.previous_chain_hash == january.chain_hash
+        assert january.sha256 == hashlib.sha256(storage.objects[january.object_name]).hexdigest()
+        assert verify_archive_chain() == []
+
+    def test_chain_follows_archive_order(self):
+        """Test an older partition archived after a newer one links to it and still verifies."""
+        storage = InMemoryStorage()
+        _log(JAN.replace(day=10))
+        _log(FEB.replace(day=10))
+
+        february = write_segment("p_2024_02", FEB, MAR, storage=storage)
+        january = write_segment("p_2024_01", JAN, FEB, storage=storage)
+
+        assert january.previous_chain_hash == february.chain_hash
+        assert verify_archive_chain() == []
+
+    def test_verify_chain_detects_tampering(self):
+        """Test a modified segment record breaks the chain."""
+        storage = InMemoryStorage()
+        _log(JAN.replace(day=10))
+        _log(FEB.replace(day=10))
+        write_segment("p_2024_01", JAN, FEB, storage=storage)
+        write_segment("p_2024_02", FEB, MAR, storage=storage)
+
+        EventArchiveSegment.objects.filter(partition_name="p_2024_01").update(event_count=99)
+
+        assert verify_archive_chain() == ["p_2024_01"]
+
+    def test_iter_archived_events_filters(self):
+        """Test archived rows are filtered by time range, type, demo flag and after_id."""
+        storage = InMemoryStorage()
+        early = _log(JAN.replace(day=2))
+        late = _log(JAN.replace(day=25))
+        _log(JAN.replace(day=26), event_type=DeploymentEvent.EventType.RISK_ASSESSED)
+        _log(JAN.replace(day=27), is_demo=True)
+        write_segment("p_2024_01", JAN, FEB, storage=storage)
+
+        rows = list(
+            iter_archived_events(
+                since=JAN.replace(day=15),
+                event_type=DeploymentEvent.EventType.DEPLOYMENT_CREATED,
+                is_demo=False,
+                storage=storage,
+            )
+        )
+        assert [row["id"] for row in rows] == [late.id]
+
+        rows = list(iter_archived_events(after_id=early.id, is_demo=None, storage=storage))
+        assert rows[0]["id"] == late.id
+        assert len(rows) == 3
+
+    def test_iter_archived_events_rejects_corrupt_segment(self):
+        """Test a segment whose object no longer matches its recorded hash is refused."""
+        storage = InMemoryStorage()
+        _log(JAN.replace(day=10))
+        segment = write_segment("p_2024_01", JAN, FEB, storage=storage)
+        storage.objects[segment.object_name] += b"tampered"
+
+        with pytest.raises(EventArchiveError):
+            list(iter_archived_events(storage=storage))
+
+    def test_write_segment_rejects_failed_upload(self):
+        """Test no segment is recorded when the uploaded object does not verify."""
+
+        class CorruptingStorage(InMemoryStorage):
+            def upload_artifact(self, file_obj, object_name, content_type="application/octet-stream"):
+                result = super().upload_artifact(file_obj, object_name, content_type)
+                self.objects[object_name] = b"corrupt"
+                return result
+
+        _log(JAN.replace(day=10))
+
+        with pytest.raises(EventArchiveError):
+            write_segment("p_2024_01", JAN, FEB, storage=CorruptingStorage())
+        assert not EventArchiveSegment.objects.exists()
+
+    def test_export_includes_archived_rows_first(self, authenticated_client):
+        """Test export with include_archived streams cold rows before hot rows."""
+        storage = InMemoryStorage()
+        archived = _log(JAN.replace(day=10))
+        write_segment("p_2024_01", JAN, FEB, storage=storage)
+        DeploymentEvent.objects.filter(id=archived.id).delete()
+        hot = _log(datetime.now(dt_timezone.utc))
+
+        with patch("apps.evidence_store.storage.get_storage", return_value=storage):
+            response = authenticated_client.get("/api/v1/events/export?include_archived=true&include_demo=all")
+            body = b"".join(response.streaming_content).decode()
+
+        assert [json.loads(line)["id"] for line in body.splitlines()] == [archived.id, hot.id]
+
+
+class TestEventPartitions:
+    """Test partition helpers."""
+
+    def test_add_months_wraps_year(self):
+        """Test month arithmetic across year boundaries."""
+        assert add_months(datetime(2024, 11, 1, tzinfo=dt_timezone.utc), 3) == datetime(
+            2025, 2, 1, tzinfo=dt_timezone.utc
+        )
+        assert month_start(datetime(2024, 5, 17, 13, tzinfo=dt_timezone.utc)) == datetime(
+            2024, 5, 1, tzinfo=dt_timezone.utc
+        )
+
+    @pytest.mark.django_db
+    def test_partition_maintenance_noop_without_postgres(self):
+        """Test partition maintenance is a no-op on non-partitioned backends."""
+        if connection.vendor == "postgresql":
+            pytest.skip("Requires a non-PostgreSQL backend")
+
+        assert is_partitioned() is False
+        assert ensure_partitions(months_ahead=2) == []
+        call_command("maintain_event_partitions", "--verify-chain")
+
+    @pytest.mark.django_db
+    def test_maintenance_task_logs_summary(self, caplog):
+        """Test the beat task returns its summary with INFO logging enabled."""
+        if connection.vendor == "postgresql":
+            pytest.skip("Requires a non-PostgreSQL backend")
+
+        with caplog.at_level(logging.INFO, logger="apps.event_store.tasks"):
+            assert maintain_event_partitions() == {"created": [], "archived": []}
@@ -0,0 +1,138 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Tests for event_store deployment-history rollups.
+"""
+import uuid
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from apps.event_store.models import DeploymentDailyRollup, DeploymentEvent
+from apps.event_store.services import get_deployment_counts, rebuild_deployment_rollups
+
+
+def _log(event_type, app_name="RollupApp", created_at=None, **extra):
+    kwargs = {"created_at": created_at} if created_at else {}
+    return DeploymentEvent.objects.create(
+        correlation_id=uuid.uuid4(),
+        event_type=event_type,
+        event_data={"app_name": app_name, **extra} if app_name is not None else extra,
+        actor="testuser",
+        **kwargs,
+    )
+
+
+@pytest.mark.django_db
+class TestDeploymentDailyRollup:
+    """Test incremental rollup maintenance."""
+
+    def test_append_increments_rollup(self):
+        """Test each tracked event increments its app/day counter."""
+        _log(DeploymentEvent.EventType.DEPLOYMENT_CREATED)
+        _log(DeploymentEvent.EventType.DEPLOYMENT_CREATED)
+        _log(DeploymentEvent.EventType.DEPLOYMENT_COMPLETED)
+        _log(DeploymentEvent.EventType.DEPLOYMENT_FAILED)
+
+        rollup = DeploymentDailyRollup.objects.get(app_name="RollupApp")
+        assert (rollup.created_count, rollup.completed_count, rollup.failed_count) == (2, 1, 1)
+
+    def test_untracked_events_ignored(self):
+        """Test events without app_name or of other types are not counted."""
+        _log(DeploymentEvent.EventType.RISK_ASSESSED)
+        _log(DeploymentEvent.EventType.DEPLOYMENT_CREATED, app_name=None)
+
+        assert DeploymentDailyRollup.objects.count() == 0
+
+    def test_get_deployment_counts_window(self):
+        """Test counts only include days inside the window."""
+        now = timezone.now()
+        _log(DeploymentEvent.EventType.DEPLOYMENT_COMPLETED, created_at=now - timedelta(days=5))
+        _log(DeploymentEvent.EventType.DEPLOYMENT_COMPLETED, created_at=now - timedelta(days=60))
+        _log(DeploymentEvent.EventType.DEPLOYMENT_FAILED, created_at=now - timedelta(days=120))
+
+        counts_30 = get_deployment_counts("RollupApp", 30)
+        counts_90 = get_deployment_counts("RollupApp", 90)
+
+        assert counts_30[DeploymentEvent.EventType.DEPLOYMENT_COMPLETED] == 1
+        assert counts_90[DeploymentEvent.EventType.DEPLOYMENT_COMPLETED] == 2
+        assert counts_90[DeploymentEvent.EventType.DEPLOYMENT_FAILED] == 0
+
+    def test_get_deployment_counts_reads_rollup_only(self, django_assert_num_queries):
+        """Test counts are a single aggregate over rollup rows."""
+        _log(DeploymentEvent.EventType.DEPLOYMENT_CREATED)
+
+        with django_assert_num_queries(1) as ctx:
+            get_deployment_counts("RollupApp", 90)
+        assert "deploymentevent" not in ctx.captured_queries[0]["sql"].lower()
+
+    def test_rebuild_matches_incremental(self):
+        """Test a full rebuild reproduces the incrementally maintained rows."""
+        for app_name in ["A", "B"]:
+            _log(DeploymentEvent.EventType.DEPLOYMENT_CREATED, app_name=app_name)
+            _log(DeploymentEvent.EventType.DEPLOYMENT_FAILED, app_name=app_name)
+        expected = set(DeploymentDailyRollup.objects.values_list("app_name", "day", "created_count", "failed_count"))
+
+        DeploymentDailyRollup.objects.all().delete()
+        assert rebuild_deployment_rollups() == 2
+
+        assert set(DeploymentDailyRollup.objects.values_list("app_name", "day", "created_count", "failed_count")) == (
+            expected
+        )
+
+    def test_long_app_names_counted_under_truncated_name(self):
+        """Test app names longer than the rollup column are counted (and looked up) by their prefix."""
+        long_name = "L" * 300
+        _log(DeploymentEvent.EventType.DEPLOYMENT_CREATED, app_name=long_name)
+        _log(DeploymentEvent.EventType.DEPLOYMENT_FAILED, app_name=long_name + "-other")
+
+        rollup = DeploymentDailyRollup.objects.get()
+        assert (rollup.app_name, rollup.created_count, rollup.failed_count) == ("L" * 255, 1, 1)
+        assert get_deployment_counts(long_name, 30)[DeploymentEvent.EventType.DEPLOYMENT_CREATED] == 1
+
+        DeploymentDailyRollup.objects.all().delete()
+        assert rebuild_deployment_rollups() == 1
+        assert DeploymentDailyRollup.objects.get().failed_count == 1
+
+    def test_rebuild_command(self):
+        """Test management command rebuilds recent rows."""
+        _log(DeploymentEvent.EventType.DEPLOYMENT_CREATED)
+        DeploymentDailyRollup.objects.all().delete()
+
+        call_command("rebuild_deployment_rollups", days=7)
+
+        assert DeploymentDailyRollup.objects.get(app_name="RollupApp").created_count == 1
+
+
+@pytest.mark.django_db
+class TestAppendEvents:
+    """Test bulk append service."""
+
+    def test_append_events_updates_rollup(self):
+        """Test bulk-created events are counted in the rollup."""
+        from apps.event_store.services import append_events
+
+        append_events(
+            [
+                DeploymentEvent(
+                    correlation_id=uuid.uuid4(),
+                    event_type=DeploymentEvent.EventType.DEPLOYMENT_CREATED,
+                    event_data={"app_name": "BulkRollupApp"},
+                    actor="testuser",
+                )
+                for _ in range(3)
+            ]
+        )
+
+        assert DeploymentDailyRollup.objects.get(app_name="BulkRollupApp").created_count == 3
+
+    def test_append_events_rejects_saved_events(self):
+        """Test append-only guarantee holds for bulk appends."""
+        from apps.event_store.services import append_events
+
+        event = _log(DeploymentEvent.EventType.DEPLOYMENT_CREATED)
+
+        with pytest.raises(ValueError, match="append-only"):
+            append_events([event])
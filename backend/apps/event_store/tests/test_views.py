@@ -80,3 +80,112 @@ class TestEventStoreViews:
 
         assert response.status_code == 200
         assert len(response.data["events"]) > 0
+
+    def test_log_events_bulk(self, authenticated_client):
+        """Test bulk append writes every event in one request."""
+        correlation_id = uuid.uuid4()
+        events = [
+            {
+                "correlation_id": str(correlation_id),
+                "event_type": "DEPLOYMENT_COMPLETED",
+                "event_data": {"app_name": "BulkApp", "wave": i},
+            }
+            for i in range(25)
+        ]
+
+        response = authenticated_client.post("/api/v1/events/bulk", {"events": events}, format="json")
+
+        assert response.status_code == 201
+        assert response.data["created"] == 25
+        assert DeploymentEvent.objects.filter(correlation_id=correlation_id).count() == 25
+
+    def test_log_events_bulk_rejects_invalid_batch(self, authenticated_client):
+        """Test one invalid event rejects the whole batch."""
+        correlation_id = uuid.uuid4()
+        events = [
+            {"correlation_id": str(correlation_id), "event_type": "DEPLOYMENT_CREATED", "event_data": {}},
+            {"correlation_id": "not-a-uuid", "event_type": "DEPLOYMENT_CREATED", "event_data": {}},
+            {"correlation_id": str(correlation_id), "event_type": "NOT_A_TYPE", "event_data": {}},
+        ]
+
+        response = authenticated_client.post("/api/v1/events/bulk", {"events": events}, format="json")
+
+        assert response.status_code == 400
+        assert [e["index"] for e in response.data["errors"]] == [1, 2]
+        assert not DeploymentEvent.objects.filter(correlation_id=correlation_id).exists()
+
+    def test_export_events_ndjson(self, authenticated_client):
+        """Test export streams matching events as NDJSON in id order."""
+        import json
+
+        from apps.event_store import services
+
+        correlation_id = uuid.uuid4()
+        for _ in range(5):
+            DeploymentEvent.objects.create(
+                correlation_id=correlation_id,
+                event_type=DeploymentEvent.EventType.DEPLOYMENT_STARTED,
+                event_data={},
+                actor="testuser",
+                is_demo=True,
+            )
+
+        # Force several keyset chunks
+        original_chunk_size = services.EXPORT_CHUNK_SIZE
+        services.EXPORT_CHUNK_SIZE = 2
+        try:
+            response = authenticated_client.get(
+                f"/api/v1/events/export?include_demo=true&correlation_id={correlation_id}"
+            )
+            lines = b"".join(response.streaming_content).decode().splitlines()
+        finally:
+            services.EXPORT_CHUNK_SIZE = original_chunk_size
+
+        assert response.status_code == 200
+        assert response["Content-Type"] == "application/x-ndjson"
+        rows = [json.loads(line) for line in lines]
+        assert len(rows) == 5
+        assert [r["id"] for r in rows] == sorted(r["id"] for r in rows)
+        assert all(r["correlation_id"] == str(correlation_id) for r in rows)
+
+    def test_export_events_resume_and_limit(self, authenticated_client):
+        """Test after_id resumes an export and limit caps it."""
+        import json
+
+        correlation_id = uuid.uuid4()
+        ids = [
+            DeploymentEvent.objects.create(
+                correlation_id=correlation_id,
+                event_type=DeploymentEvent.EventType.DEPLOYMENT_STARTED,
+                event_data={},
+                actor="testuser",
+                is_demo=True,
+            ).id
+            for _ in range(4)
+        ]
+
+        response = authenticated_client.get(
+            f"/api/v1/events/export?include_demo=true&correlation_id={correlation_id}&after_id={ids[0]}&limit=2"
+        )
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+
+        assert [r["id"] for r in rows] == ids[1:3]
+
+    def test_export_events_invalid_since(self, authenticated_client):
+        """Test export rejects malformed time range."""
+        response = authenticated_client.get("/api/v1/events/export?since=yesterday")
+
+        assert response.status_code == 400
+
+    def test_export_events_invalid_correlation_id(self, authenticated_client):
+        """Test export rejects a correlation_id that is not a UUID."""
+        response = authenticated_client.get("/api/v1/events/export?correlation_id=not-a-uuid")
+
+        assert response.status_code == 400
+        assert response.json()["error"] == "correlation_id must be a UUID"
+
+    def test_list_events_invalid_correlation_id(self, authenticated_client):
+        """Test listing rejects a correlation_id that is not a UUID."""
+        response = authenticated_client.get("/api/v1/events/list?correlation_id=not-a-uuid")
+
+        assert response.status_code == 400
@@ -12,4 +12,6 @@ app_name = "event_store"
 urlpatterns = [
     path("", views.log_event, name="log"),
     path("list", views.list_events, name="list"),
+    path("bulk", views.log_events_bulk, name="log-bulk"),
+    path("export", views.export_events, name="export"),
 ]
@@ -4,17 +4,43 @@
 Event Store views for audit trail.
 """
 import logging
+import uuid
+from datetime import timezone as dt_timezone
 
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
-from apps.core.utils import apply_demo_filter, get_demo_mode_enabled
+from apps.core.utils import apply_demo_filter, get_demo_filter_value, get_demo_mode_enabled
 
+from .archive import iter_archived_events
 from .models import DeploymentEvent
+from .services import append_events, iter_events_ndjson
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on events accepted by one bulk append request
+MAX_BULK_EVENTS = 10000
+
+
+def _parse_correlation_id(params):
+    """
+    Parse the optional correlation_id query parameter.
+
+    Returns:
+        (canonical UUID string or None, None) on success or (None, 400 Response)
+    """
+    if not params.get("correlation_id"):
+        return None, None
+    try:
+        return str(uuid.UUID(params["correlation_id"])), None
+    except ValueError:
+        return None, Response({"error": "correlation_id must be a UUID"}, status=status.HTTP_400_BAD_REQUEST)
+
 
 @api_view(["GET"])
 @permission_classes([AllowAny])
@@ -27,7 +53,9 @@ def list_events(request):
     queryset = apply_demo_filter(DeploymentEvent.objects.all(), request)
 
     # Filters
-    correlation_id = request.query_params.get("correlation_id")
+    correlation_id, error = _parse_correlation_id(request.query_params)
+    if error:
+        return error
     event_type = request.query_params.get("event_type")
 
     if correlation_id:
@@ -77,3 +105,173 @@ def log_event(request):
     )
 
     return Response({"id": event.id, "created_at": event.created_at.isoformat()})
+
+
+def _build_event(item, actor: str, is_demo: bool):
+    """
+    Validate one bulk event payload.
+
+    Returns:
+        (DeploymentEvent, None) on success or (None, error message)
+    """
+    if not isinstance(item, dict):
+        return None, "event must be an object"
+
+    try:
+        correlation_id = uuid.UUID(str(item.get("correlation_id")))
+    except ValueError:
+        return None, "correlation_id must be a UUID"
+
+    event_type = item.get("event_type")
+    if event_type not in DeploymentEvent.EventType.values:
+        return None, f"invalid event_type: {event_type}"
+
+    event_data = item.get("event_data", {})
+    if not isinstance(event_data, dict):
+        return None, "event_data must be an object"
+
+    return (
+        DeploymentEvent(
+            correlation_id=correlation_id,
+            event_type=event_type,
+            event_data=event_data,
+            actor=actor,
+            is_demo=is_demo,
+        ),
+        None,
+    )
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def log_events_bulk(request):
+    """
+    Log many deployment events in one transaction (append-only).
+
+    All events are validated first; if any is invalid nothing is written.
+
+    POST /api/v1/events/bulk
+    Body: {
+        "events": [{"correlation_id": "...", "event_type": "...", "event_data": {...}}, ...]
+    }
+
+    Returns:
+        201: {"created": 2500, "first_id": 101, "last_id": 2600}
+        400: {"error": "...", "errors": [{"index": 3, "error": "..."}]}
+    """
+    items = request.data.get("events")
+
+    if not isinstance(items, list) or not items:
+        return Response({"error": "events must be a non-empty list"}, status=status.HTTP_400_BAD_REQUEST)
+
+    if len(items) > MAX_BULK_EVENTS:
+        return Response(
+            {"error": f"Batch size exceeds maximum of {MAX_BULK_EVENTS} events"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    actor = request.user.username
+    is_demo = get_demo_mode_enabled()
+    events, errors = [], []
+    for index, item in enumerate(items):
+        event, error = _build_event(item, actor, is_demo)
+        if error:
+            errors.append({"index": index, "error": error})
+        else:
+            events.append(event)
+
+    if errors:
+        return Response({"error": "Invalid events", "errors": errors[:100]}, status=status.HTTP_400_BAD_REQUEST)
+
+    created = append_events(events)
+
+    logger.info(
+        f"Bulk events logged: {len(created)}",
+        extra={"count": len(created), "actor": actor},
+    )
+
+    return Response(
+        {"created": len(created), "first_id": created[0].id, "last_id": created[-1].id},
+        status=status.HTTP_201_CREATED,
+    )
+
+
+def _parse_time_range(params):
+    """
+    Parse the optional since/until query parameters (naive values are UTC).
+
+    Returns:
+        ({"since": datetime, "until": datetime} for those given, None) on success or (None, 400 Response)
+    """
+    time_range = {}
+    for param in ("since", "until"):
+        if params.get(param):
+            value = parse_datetime(params[param])
+            if value is None:
+                return None, Response(
+                    {"error": f"{param} must be an ISO 8601 datetime"}, status=status.HTTP_400_BAD_REQUEST
+                )
+            if timezone.is_naive(value):
+                value = timezone.make_aware(value, dt_timezone.utc)
+            time_range[param] = value
+    return time_range, None
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def export_events(request):
+    """
+    Stream deployment events as NDJSON, oldest first.
+
+    Uses keyset pagination on id, so exports of any size run at constant
+    memory. Resume an interrupted export by passing the last id received
+    as `after_id`.
+
+    GET /api/v1/events/export?correlation_id=...&event_type=...&since=...&until=...&after_id=...&limit=...
+
+    With include_archived=true, matching events from cold-tier archive
+    segments are streamed (hash-verified) before the events still in the
+    database.
+    """
+    params = request.query_params
+    is_demo = get_demo_filter_value(request)
+    queryset = DeploymentEvent.objects.all() if is_demo is None else DeploymentEvent.objects.filter(is_demo=is_demo)
+
+    correlation_id, error = _parse_correlation_id(params)
+    if error:
+        return error
+    if correlation_id:
+        queryset = queryset.filter(correlation_id=correlation_id)
+    if params.get("event_type"):
+        queryset = queryset.filter(event_type=params["event_type"])
+
+    time_range, error = _parse_time_range(params)
+    if error:
+        return error
+    for param, lookup in (("since", "created_at__gte"), ("until", "created_at__lt")):
+        if param in time_range:
+            queryset = queryset.filter(**{lookup: time_range[param]})
+
+    try:
+        after_id = int(params.get("after_id", 0))
+        limit = int(params["limit"]) if params.get("limit") else None
+    except ValueError:
+        return Response({"error": "after_id and limit must be integers"}, status=status.HTTP_400_BAD_REQUEST)
+
+    archived_rows = None
+    if params.get("include_archived") == "true":
+        archived_rows = iter_archived_events(
+            since=time_range.get("since"),
+            until=time_range.get("until"),
+            correlation_id=correlation_id,
+            event_type=params.get("event_type"),
+            is_demo=is_demo,
+            after_id=after_id,
+        )
+
+    response = StreamingHttpResponse(
+        iter_events_ndjson(queryset, after_id=after_id, limit=limit, archived_rows=archived_rows),
+        content_type="application/x-ndjson",
+    )
+    response["Content-Disposition"] = 'attachment; filename="deployment-events.ndjson"'
+    return response
@@ -89,6 +89,38 @@ class MinIOStorage:
             logger.error(f"Failed to upload artifact: {e}")
             raise
 
+    def download_artifact(self, object_name: str, file_obj: BinaryIO, chunk_size: int = 1024 * 1024) -> str:
+        """
+        Stream artifact from MinIO into a file object and return its hash.
+
+        Args:
+            object_name: Object name in MinIO
+            file_obj: Writable file object
+            chunk_size: Bytes read per chunk
+
+        Returns:
+            SHA-256 hash of the downloaded bytes
+
+        Raises:
+            S3Error: If download fails
+        """
+        sha256_hash = hashlib.sha256()
+        try:
+            response = self.client.get_object(self.bucket_name, object_name)
+            try:
+                for chunk in response.stream(chunk_size):
+                    sha256_hash.update(chunk)
+                    file_obj.write(chunk)
+            finally:
+                response.close()
+                response.release_conn()
+        except S3Error as e:
+            logger.error(f"Failed to download artifact: {e}")
+            raise
+
+        file_obj.seek(0)
+        return sha256_hash.hexdigest()
+
     def get_artifact_url(self, object_name: str, expires_seconds: int = 3600) -> str:
         """
         Get presigned URL for artifact download.
@@ -94,3 +94,21 @@ class TestMinIOStorage:
         storage.delete_artifact("test/artifact.msi")
 
         mock_client.remove_object.assert_called_once()
+
+    @patch("apps.evidence_store.storage.Minio")
+    def test_download_artifact(self, mock_minio_class):
+        """Test artifact download streams into file and returns hash."""
+        import hashlib
+
+        mock_client = MagicMock()
+        mock_client.bucket_exists.return_value = True
+        mock_client.get_object.return_value.stream.return_value = [b"abc", b"def"]
+        mock_minio_class.return_value = mock_client
+
+        storage = MinIOStorage()
+        file_obj = BytesIO()
+        artifact_hash = storage.download_artifact("test/segment.ndjson.gz", file_obj)
+
+        assert file_obj.read() == b"abcdef"
+        assert artifact_hash == hashlib.sha256(b"abcdef").hexdigest()
+        mock_client.get_object.return_value.release_conn.assert_called_once()
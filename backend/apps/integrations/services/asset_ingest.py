@@ -0,0 +1,212 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Streaming, chunked asset upsert shared by the CMDB integrations.
+
+CMDB services yield raw records page by page; records are mapped to Asset
+fields, grouped into chunks of INTEGRATION_ASSET_SYNC_CHUNK_SIZE and written
+with one bulk INSERT ... ON CONFLICT (asset_id) DO UPDATE per chunk. Each
+row carries a SHA-256 of its synced fields (Asset.sync_hash); rows whose
+hash matches the stored one are skipped. Counters are written to the
+IntegrationSyncLog after every chunk so long syncs report progress.
+"""
+import hashlib
+import json
+import logging
+from abc import abstractmethod
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+
+from apps.connectors.models import Asset
+from apps.core.circuit_breaker import CircuitBreakerOpen
+from apps.integrations.models import ExternalSystem, IntegrationSyncLog
+
+logger = logging.getLogger(__name__)
+
+# Asset fields owned by CMDB syncs (overwritten on conflict)
+ASSET_SYNC_FIELDS = ["name", "serial_number", "location", "owner", "status", "type", "os", "is_demo"]
+
+SYNC_LOG_PROGRESS_FIELDS = ["records_fetched", "records_created", "records_updated", "records_failed", "updated_at"]
+
+
+def asset_content_hash(fields: Dict[str, Any]) -> str:
+    """SHA-256 over the synced asset fields."""
+    payload = json.dumps({name: fields.get(name) for name in ASSET_SYNC_FIELDS}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _map_chunk(batch: List[Dict[str, Any]], mapper) -> Tuple[Dict[str, Dict[str, Any]], int]:
+    """Map raw records to Asset fields keyed by asset_id; returns (rows, failed count)."""
+    rows: Dict[str, Dict[str, Any]] = {}
+    failed = 0
+    for record in batch:
+        try:
+            fields = mapper(record)
+            asset_id = fields.pop("asset_id")
+            if not asset_id:
+                raise ValueError("record has no asset identifier")
+        except Exception as e:
+            logger.error(f"Failed to map asset record: {e}")
+            failed += 1
+            continue
+        # Later duplicates within a chunk win, matching sequential update_or_create
+        rows[str(asset_id)] = fields
+    return rows, failed
+
+
+def _record_progress(sync_log: IntegrationSyncLog, totals: Dict[str, int]) -> None:
+    sync_log.records_fetched = totals["fetched"]
+    sync_log.records_created = totals["created"]
+    sync_log.records_updated = totals["updated"]
+    sync_log.records_failed = totals["failed"]
+    sync_log.save(update_fields=SYNC_LOG_PROGRESS_FIELDS)
+
+
+def _upsert_chunk(rows: Dict[str, Dict[str, Any]]) -> Dict[str, int]:
+    """Write one chunk of mapped rows keyed by asset_id, skipping unchanged ones."""
+    hashes = {asset_id: asset_content_hash(fields) for asset_id, fields in rows.items()}
+    stored = dict(Asset.objects.filter(asset_id__in=list(rows)).values_list("asset_id", "sync_hash"))
+    changed = [asset_id for asset_id, digest in hashes.items() if stored.get(asset_id) != digest]
+
+    if changed:
+        with transaction.atomic():
+            Asset.objects.bulk_create(
+                [Asset(asset_id=asset_id, sync_hash=hashes[asset_id], **rows[asset_id]) for asset_id in changed],
+                update_conflicts=True,
+                unique_fields=["asset_id"],
+                update_fields=ASSET_SYNC_FIELDS + ["sync_hash", "updated_at"],
+            )
+
+    created = sum(1 for asset_id in changed if asset_id not in stored)
+    return {"created": created, "updated": len(changed) - created, "unchanged": len(rows) - len(changed)}
+
+
+def upsert_assets(
+    records: Iterable[Dict[str, Any]],
+    mapper: Callable[[Dict[str, Any]], Dict[str, Any]],
+    sync_log: Optional[IntegrationSyncLog] = None,
+    chunk_size: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    Map and upsert a stream of raw records into Asset in chunks.
+
+    Args:
+        records: Raw records from the external system (consumed lazily)
+        mapper: Maps a raw record to Asset fields including 'asset_id'
+        sync_log: Sync log updated with running counters after each chunk
+        chunk_size: Rows per chunk (defaults to INTEGRATION_ASSET_SYNC_CHUNK_SIZE)
+
+    Returns:
+        Dict with 'fetched', 'created', 'updated', 'unchanged' and 'failed' counts
+    """
+    chunk_size = chunk_size or settings.INTEGRATION_ASSET_SYNC_CHUNK_SIZE
+    totals = {"fetched": 0, "created": 0, "updated": 0, "unchanged": 0, "failed": 0}
+    records = iter(records)
+
+    while True:
+        batch = list(islice(records, chunk_size))
+        if not batch:
+            break
+        totals["fetched"] += len(batch)
+
+        rows, failed = _map_chunk(batch, mapper)
+        totals["failed"] += failed
+
+        try:
+            counts = _upsert_chunk(rows) if rows else {}
+        except Exception as e:
+            logger.error(f"Failed to upsert {len(rows)} assets: {e}", exc_info=True)
+            totals["failed"] += len(rows)
+        else:
+            for key, value in counts.items():
+                totals[key] += value
+
+        if sync_log is not None:
+            _record_progress(sync_log, totals)
+
+    return totals
+
+
+class StreamingAssetSyncMixin:
+    """
+    Asset sync for paged CMDB APIs.
+
+    Subclasses implement iter_asset_pages() and map_asset(); sync() streams
+    the pages through upsert_assets() and fetch_assets() materializes them
+    for callers that still need a list.
+    """
+
+    SERVICE_NAME = ""
+
+    @abstractmethod
+    def iter_asset_pages(
+        self, system: ExternalSystem, correlation_id: Optional[str] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Yield raw asset records one API page at a time."""
+
+    @abstractmethod
+    def map_asset(self, asset_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Map a raw record to Asset fields (asset_id plus ASSET_SYNC_FIELDS)."""
+
+    def iter_assets(self, system: ExternalSystem, correlation_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Yield raw asset records across all pages."""
+        for page in self.iter_asset_pages(system, correlation_id=correlation_id):
+            yield from page
+
+    def fetch_assets(self, system: ExternalSystem, correlation_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Fetch all asset records into a list.
+
+        Prefer iter_assets() for large inventories; sync() never materializes the full payload.
+        """
+        assets = list(self.iter_assets(system, correlation_id=correlation_id))
+        logger.info(
+            f"Fetched {len(assets)} assets from {self.SERVICE_NAME}",
+            extra={"service": self.SERVICE_NAME, "asset_count": len(assets), "correlation_id": correlation_id},
+        )
+        return assets
+
+    def sync(
+        self,
+        system: ExternalSystem,
+        correlation_id: Optional[str] = None,
+        sync_log: Optional[IntegrationSyncLog] = None,
+    ) -> Dict[str, Any]:
+        """
+        Stream assets from the CMDB into Asset with chunked bulk upserts.
+
+        Args:
+            system: ExternalSystem instance
+            correlation_id: Optional correlation ID for audit trail
+            sync_log: Optional sync log receiving per-chunk progress
+
+        Returns:
+            Dict with sync results ('error' is set if the source became unavailable mid-sync)
+        """
+        aborted = []
+
+        def records():
+            # Stop the stream (keeping chunks already written) if the source becomes unavailable
+            try:
+                yield from self.iter_assets(system, correlation_id=correlation_id)
+            except CircuitBreakerOpen as e:
+                aborted.append(e)
+
+        totals: Dict[str, Any] = upsert_assets(records(), self.map_asset, sync_log=sync_log)
+
+        if aborted:
+            logger.warning(
+                f"{self.SERVICE_NAME} sync aborted after {totals['fetched']} records: circuit breaker open",
+                extra={"service": self.SERVICE_NAME, "correlation_id": correlation_id},
+            )
+            totals["error"] = f"{self.SERVICE_NAME} service temporarily unavailable"
+            return totals
+
+        logger.info(
+            f"Synced {totals['fetched']} assets from {self.SERVICE_NAME}",
+            extra={"service": self.SERVICE_NAME, "correlation_id": correlation_id, "sync_totals": totals},
+        )
+        return totals
@@ -6,19 +6,21 @@ Freshservice CMDB integration service.
 Syncs asset inventory from Freshservice CMDB.
 """
 import logging
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Optional
 
 import requests
 
-from apps.connectors.models import Asset
 from apps.integrations.models import ExternalSystem
+from apps.integrations.services.asset_ingest import StreamingAssetSyncMixin
 from apps.integrations.services.base import IntegrationService
 
 logger = logging.getLogger(__name__)
 
 
-class FreshserviceCMDBService(IntegrationService):
-    """Freshservice CMDB integration service."""
+class FreshserviceCMDBService(StreamingAssetSyncMixin, IntegrationService):
+    """Freshservice CMDB integration service (assets streamed into chunked bulk upserts, see asset_ingest)."""
+
+    SERVICE_NAME = "freshservice"
 
     def test_connection(self, config: Dict[str, Any]) -> Dict[str, Any]:
         """Test Freshservice API connectivity."""
@@ -41,81 +43,49 @@ class FreshserviceCMDBService(IntegrationService):
             logger.error(f"Freshservice connection test failed: {e}")
             return {"status": "failed", "message": f"Connection failed: {str(e)}"}
 
-    def sync(self, system: ExternalSystem) -> Dict[str, Any]:
-        """Sync assets from Freshservice CMDB."""
-        assets = self.fetch_assets(system)
-        created, updated, failed = 0, 0, 0
-
-        for asset_data in assets:
-            try:
-                asset, created_flag = Asset.objects.update_or_create(
-                    asset_id=str(asset_data.get("display_id", asset_data.get("id"))),
-                    defaults={
-                        "name": asset_data.get("name", "Unknown"),
-                        "serial_number": asset_data.get("serial_number", ""),
-                        "location": (
-                            asset_data.get("location", {}).get("name", "")
-                            if isinstance(asset_data.get("location"), dict)
-                            else asset_data.get("location", "")
-                        ),
-                        "owner": (
-                            asset_data.get("assigned_on", {}).get("name", "")
-                            if isinstance(asset_data.get("assigned_on"), dict)
-                            else asset_data.get("assigned_on", "")
-                        ),
-                        "status": self._map_status(asset_data.get("asset_state_id", 1)),
-                        "type": self._map_type(asset_data.get("asset_type_id", 0)),
-                        "os": asset_data.get("operating_system", ""),
-                        "is_demo": False,
-                    },
-                )
-
-                if created_flag:
-                    created += 1
-                else:
-                    updated += 1
-
-            except Exception as e:
-                logger.error(f'Failed to sync asset {asset_data.get("id")}: {e}')
-                failed += 1
-
-        return {
-            "fetched": len(assets),
-            "created": created,
-            "updated": updated,
-            "failed": failed,
-        }
-
-    def fetch_assets(self, system: ExternalSystem) -> List[Dict[str, Any]]:
-        """Fetch assets from Freshservice CMDB."""
+    def iter_asset_pages(
+        self, system: ExternalSystem, correlation_id: Optional[str] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Yield assets from Freshservice CMDB one page at a time."""
         api_url = system.api_url
         headers = self._get_auth_headers_from_system(system)
 
         url = f"{api_url}/api/v2/assets"
         params = {"per_page": 100, "page": 1}
 
-        all_assets = []
-
         while True:
             try:
                 response = requests.get(url, headers=headers, params=params, timeout=30)
                 response.raise_for_status()
                 data = response.json()
-
-                if "assets" in data:
-                    all_assets.extend(data["assets"])
-
-                # Check pagination
-                if not data.get("meta", {}).get("has_more", False):
-                    break
-
-                params["page"] += 1
-
             except requests.exceptions.RequestException as e:
                 logger.error(f"Error fetching Freshservice assets: {e}")
                 raise
 
-        return all_assets
+            if data.get("assets"):
+                yield data["assets"]
+
+            # Check pagination
+            if not data.get("meta", {}).get("has_more", False):
+                break
+
+            params["page"] += 1
+
+    def map_asset(self, asset_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Map a Freshservice asset to Asset fields."""
+        location = asset_data.get("location", "")
+        owner = asset_data.get("assigned_on", "")
+        return {
+            "asset_id": str(asset_data.get("display_id", asset_data.get("id"))),
+            "name": asset_data.get("name", "Unknown"),
+            "serial_number": asset_data.get("serial_number", ""),
+            "location": location.get("name", "") if isinstance(location, dict) else location,
+            "owner": owner.get("name", "") if isinstance(owner, dict) else owner,
+            "status": self._map_status(asset_data.get("asset_state_id", 1)),
+            "type": self._map_type(asset_data.get("asset_type_id", 0)),
+            "os": asset_data.get("operating_system", ""),
+            "is_demo": False,
+        }
 
     def _get_auth_headers(self, config: Dict[str, Any]) -> Dict[str, str]:
         """Get authentication headers from config."""
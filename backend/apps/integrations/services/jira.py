@@ -8,22 +8,23 @@ Uses resilient HTTP client with circuit breaker protection.
 """
 import base64
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
-from apps.connectors.models import Asset
 from apps.core.circuit_breaker import CircuitBreakerOpen
 from apps.core.http import ResilientHTTPClient
 from apps.integrations.models import ExternalSystem
+from apps.integrations.services.asset_ingest import StreamingAssetSyncMixin
 from apps.integrations.services.base import IntegrationService
 
 logger = logging.getLogger(__name__)
 
 
-class JiraAssetsService(IntegrationService):
+class JiraAssetsService(StreamingAssetSyncMixin, IntegrationService):
     """
     Jira Assets integration service.
 
     Uses circuit breaker protection and automatic retries for API calls.
+    Assets are streamed page by page into chunked bulk upserts (see asset_ingest).
     """
 
     SERVICE_NAME = "jira"
@@ -66,70 +67,13 @@ class JiraAssetsService(IntegrationService):
             logger.error(f"Jira Assets connection test failed: {e}")
             return {"status": "failed", "message": f"Connection failed: {str(e)}"}
 
-    def sync(self, system: ExternalSystem, correlation_id: Optional[str] = None) -> Dict[str, Any]:
-        """
-        Sync assets from Jira Assets.
-
-        Args:
-            system: ExternalSystem instance
-            correlation_id: Optional correlation ID for audit trail
-
-        Returns:
-            Dict with sync results
-        """
-        try:
-            assets = self.fetch_assets(system, correlation_id=correlation_id)
-        except CircuitBreakerOpen:
-            logger.warning("Jira sync aborted: circuit breaker open")
-            return {
-                "fetched": 0,
-                "created": 0,
-                "updated": 0,
-                "failed": 0,
-                "error": "Jira service temporarily unavailable",
-            }
-
-        created, updated, failed = 0, 0, 0
-
-        for asset_data in assets:
-            try:
-                asset, created_flag = Asset.objects.update_or_create(
-                    asset_id=asset_data.get("objectKey"),
-                    defaults={
-                        "name": asset_data.get("label", "Unknown"),
-                        "serial_number": asset_data.get("serialNumber", ""),
-                        "location": asset_data.get("location", ""),
-                        "owner": asset_data.get("owner", ""),
-                        "status": self._map_status(asset_data.get("status", "Active")),
-                        "type": self._map_type(asset_data.get("objectType", {})),
-                        "os": asset_data.get("operatingSystem", ""),
-                        "is_demo": False,
-                    },
-                )
-
-                if created_flag:
-                    created += 1
-                else:
-                    updated += 1
-
-            except Exception as e:
-                logger.error(f'Failed to sync asset {asset_data.get("objectKey")}: {e}')
-                failed += 1
-
-        return {
-            "fetched": len(assets),
-            "created": created,
-            "updated": updated,
-            "failed": failed,
-        }
-
-    def fetch_assets(
+    def iter_asset_pages(
         self,
         system: ExternalSystem,
         correlation_id: Optional[str] = None,
-    ) -> List[Dict[str, Any]]:
+    ) -> Iterator[List[Dict[str, Any]]]:
         """
-        Fetch assets from Jira Assets.
+        Yield assets from Jira Assets one page at a time.
 
         Uses circuit breaker protection and automatic retries.
 
@@ -137,8 +81,8 @@ class JiraAssetsService(IntegrationService):
             system: ExternalSystem instance
             correlation_id: Optional correlation ID for audit trail
 
-        Returns:
-            List of asset dictionaries
+        Yields:
+            Lists of object entry dictionaries (up to pageSize per page)
 
         Raises:
             CircuitBreakerOpen: If Jira service is unavailable
@@ -169,8 +113,6 @@ class JiraAssetsService(IntegrationService):
         url = f"{api_url}/rest/insight/1.0/object/navlist/{schema_id}"
         params = {"page": 1, "pageSize": 1000}
 
-        all_assets = []
-
         while True:
             response = self.http_client.get(
                 url,
@@ -180,24 +122,27 @@ class JiraAssetsService(IntegrationService):
             )
             data = response.json()
 
-            if "objectEntries" in data:
-                all_assets.extend(data["objectEntries"])
+            if data.get("objectEntries"):
+                yield data["objectEntries"]
 
             if not data.get("hasMore", False):
                 break
 
             params["page"] += 1
 
-        logger.info(
-            f"Fetched {len(all_assets)} assets from Jira Assets",
-            extra={
-                "service": self.SERVICE_NAME,
-                "asset_count": len(all_assets),
-                "correlation_id": correlation_id,
-            },
-        )
-
-        return all_assets
+    def map_asset(self, asset_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Map a Jira Assets object entry to Asset fields."""
+        return {
+            "asset_id": asset_data.get("objectKey"),
+            "name": asset_data.get("label", "Unknown"),
+            "serial_number": asset_data.get("serialNumber", ""),
+            "location": asset_data.get("location", ""),
+            "owner": asset_data.get("owner", ""),
+            "status": self._map_status(asset_data.get("status", "Active")),
+            "type": self._map_type(asset_data.get("objectType", {})),
+            "os": asset_data.get("operatingSystem", ""),
+            "is_demo": False,
+        }
 
     def _get_auth_headers(self, config: Dict[str, Any]) -> Dict[str, str]:
         """Get authentication headers from config."""
@@ -8,22 +8,23 @@ Uses resilient HTTP client with circuit breaker protection.
 """
 import base64
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
-from apps.connectors.models import Asset
 from apps.core.circuit_breaker import CircuitBreakerOpen
 from apps.core.http import ResilientHTTPClient
 from apps.integrations.models import ExternalSystem
+from apps.integrations.services.asset_ingest import StreamingAssetSyncMixin
 from apps.integrations.services.base import IntegrationService
 
 logger = logging.getLogger(__name__)
 
 
-class ServiceNowCMDBService(IntegrationService):
+class ServiceNowCMDBService(StreamingAssetSyncMixin, IntegrationService):
     """
     ServiceNow CMDB integration service.
 
     Uses circuit breaker protection and automatic retries for API calls.
+    Assets are streamed page by page into chunked bulk upserts (see asset_ingest).
     """
 
     SERVICE_NAME = "servicenow"
@@ -79,71 +80,13 @@ class ServiceNowCMDBService(IntegrationService):
             logger.error(f"ServiceNow connection test failed: {e}")
             return {"status": "failed", "message": f"Connection failed: {str(e)}"}
 
-    def sync(self, system: ExternalSystem, correlation_id: Optional[str] = None) -> Dict[str, Any]:
-        """
-        Sync assets from ServiceNow CMDB.
-
-        Args:
-            system: ExternalSystem instance
-            correlation_id: Optional correlation ID for audit trail
-
-        Returns:
-            Dict with sync results
-        """
-        try:
-            assets = self.fetch_assets(system, correlation_id=correlation_id)
-        except CircuitBreakerOpen:
-            logger.warning("ServiceNow sync aborted: circuit breaker open")
-            return {
-                "fetched": 0,
-                "created": 0,
-                "updated": 0,
-                "failed": 0,
-                "error": "ServiceNow service temporarily unavailable",
-            }
-
-        created, updated, failed = 0, 0, 0
-
-        for asset_data in assets:
-            try:
-                # Map ServiceNow fields to Asset model
-                asset, created_flag = Asset.objects.update_or_create(
-                    asset_id=asset_data.get("sys_id"),
-                    defaults={
-                        "name": asset_data.get("name", "Unknown"),
-                        "serial_number": asset_data.get("serial_number", ""),
-                        "location": asset_data.get("location", {}).get("display_value", ""),
-                        "owner": asset_data.get("assigned_to", {}).get("display_value", ""),
-                        "status": self._map_status(asset_data.get("install_status", "1")),
-                        "type": self._map_type(asset_data.get("category", "")),
-                        "os": asset_data.get("os", "") or asset_data.get("os_version", ""),
-                        "is_demo": False,
-                    },
-                )
-
-                if created_flag:
-                    created += 1
-                else:
-                    updated += 1
-
-            except Exception as e:
-                logger.error(f'Failed to sync asset {asset_data.get("sys_id")}: {e}')
-                failed += 1
-
-        return {
-            "fetched": len(assets),
-            "created": created,
-            "updated": updated,
-            "failed": failed,
-        }
-
-    def fetch_assets(
+    def iter_asset_pages(
         self,
         system: ExternalSystem,
         correlation_id: Optional[str] = None,
-    ) -> List[Dict[str, Any]]:
+    ) -> Iterator[List[Dict[str, Any]]]:
         """
-        Fetch computer CIs from ServiceNow CMDB.
+        Yield active computer CIs from ServiceNow CMDB one page at a time.
 
         Uses circuit breaker protection and automatic retries.
 
@@ -151,8 +94,8 @@ class ServiceNowCMDBService(IntegrationService):
             system: ExternalSystem instance
             correlation_id: Optional correlation ID for audit trail
 
-        Returns:
-            List of asset dictionaries
+        Yields:
+            Lists of CI dictionaries (up to sysparm_limit per page)
 
         Raises:
             CircuitBreakerOpen: If ServiceNow service is unavailable
@@ -168,8 +111,6 @@ class ServiceNowCMDBService(IntegrationService):
             "sysparm_offset": 0,
         }
 
-        all_assets = []
-
         while True:
             response = self.http_client.get(
                 url,
@@ -177,27 +118,29 @@ class ServiceNowCMDBService(IntegrationService):
                 params=params,
                 correlation_id=correlation_id,
             )
-            data = response.json()
-
-            if "result" in data:
-                all_assets.extend(data["result"])
+            page = response.json().get("result", [])
+            if page:
+                yield page
 
             # Check if there are more records
-            if len(data.get("result", [])) < params["sysparm_limit"]:
+            if len(page) < params["sysparm_limit"]:
                 break
 
             params["sysparm_offset"] += params["sysparm_limit"]
 
-        logger.info(
-            f"Fetched {len(all_assets)} assets from ServiceNow",
-            extra={
-                "service": self.SERVICE_NAME,
-                "asset_count": len(all_assets),
-                "correlation_id": correlation_id,
-            },
-        )
-
-        return all_assets
+    def map_asset(self, asset_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Map a ServiceNow CI to Asset fields."""
+        return {
+            "asset_id": asset_data.get("sys_id"),
+            "name": asset_data.get("name", "Unknown"),
+            "serial_number": asset_data.get("serial_number", ""),
+            "location": (asset_data.get("location") or {}).get("display_value", ""),
+            "owner": (asset_data.get("assigned_to") or {}).get("display_value", ""),
+            "status": self._map_status(asset_data.get("install_status", "1")),
+            "type": self._map_type(asset_data.get("category", "")),
+            "os": asset_data.get("os", "") or asset_data.get("os_version", ""),
+            "is_demo": False,
+        }
 
     def _get_auth_headers(self, config: Dict[str, Any]) -> Dict[str, str]:
         """Get authentication headers from config."""
@@ -11,10 +11,59 @@ from django.utils import timezone
 
 from apps.integrations.models import ExternalSystem, IntegrationSyncLog
 from apps.integrations.services import get_integration_service
+from apps.integrations.services.asset_ingest import StreamingAssetSyncMixin
 
 logger = logging.getLogger(__name__)
 
 
+def _run_sync(system: ExternalSystem, sync_log: IntegrationSyncLog) -> dict:
+    """Run the system's sync (streaming CMDB syncs report per-chunk progress on the sync log)."""
+    service = get_integration_service(system.type)
+    if isinstance(service, StreamingAssetSyncMixin):
+        return service.sync(system, sync_log=sync_log)
+    return service.sync(system)
+
+
+def _record_sync_result(system: ExternalSystem, sync_log: IntegrationSyncLog, result: dict) -> None:
+    """Store a finished sync's counts and status (PARTIAL if the source failed mid-sync)."""
+    sync_log.sync_completed_at = timezone.now()
+    sync_log.status = IntegrationSyncLog.SyncStatus.SUCCESS
+    if result.get("error"):
+        # Source became unavailable mid-sync; chunks already written are kept
+        sync_log.status = IntegrationSyncLog.SyncStatus.PARTIAL
+        sync_log.error_message = result["error"]
+    sync_log.records_fetched = result.get("fetched", 0)
+    sync_log.records_created = result.get("created", 0)
+    sync_log.records_updated = result.get("updated", 0)
+    sync_log.records_failed = result.get("failed", 0)
+    sync_log.save()
+
+    system.last_sync_at = timezone.now()
+    system.last_sync_status = sync_log.status
+    system.save(update_fields=["last_sync_at", "last_sync_status"])
+
+
+def _record_sync_failure(system: ExternalSystem, sync_log: IntegrationSyncLog, error: Exception, details: dict) -> None:
+    """Mark a sync as failed."""
+    sync_log.sync_completed_at = timezone.now()
+    sync_log.status = IntegrationSyncLog.SyncStatus.FAILED
+    sync_log.error_message = str(error)
+    sync_log.error_details = details
+    sync_log.save()
+
+    system.last_sync_status = "failed"
+    system.save(update_fields=["last_sync_status"])
+
+
+def _classify_error(system: ExternalSystem, error: Exception) -> str:
+    """Classify a sync error as transient or permanent (permanent if it cannot be classified)."""
+    try:
+        return get_integration_service(system.type)._classify_error(error)
+    except Exception as classification_error:
+        logger.warning(f"Failed to classify error for {system.name}: {classification_error}")
+        return "permanent"
+
+
 @shared_task(bind=True, max_retries=3)
 def sync_external_system(self, system_id: str):
     """
@@ -24,7 +73,7 @@ def sync_external_system(self, system_id: str):
         system_id: UUID of ExternalSystem to sync
 
     Returns:
-        Dict with sync results
+        Dict with sync results ('status' is the sync log status: success, partial or failed)
     """
     try:
         system = ExternalSystem.objects.get(id=system_id)
@@ -45,74 +94,18 @@ def sync_external_system(self, system_id: str):
     )
 
     try:
-        # Get appropriate service
-        service = get_integration_service(system.type)
-
-        # Perform sync
-        result = service.sync(system)
-
-        # Update sync log
-        sync_log.sync_completed_at = timezone.now()
-        sync_log.status = IntegrationSyncLog.SyncStatus.SUCCESS
-        sync_log.records_fetched = result.get("fetched", 0)
-        sync_log.records_created = result.get("created", 0)
-        sync_log.records_updated = result.get("updated", 0)
-        sync_log.records_failed = result.get("failed", 0)
-        sync_log.save()
-
-        # Update system status
-        system.last_sync_at = timezone.now()
-        system.last_sync_status = "success"
-        system.save(update_fields=["last_sync_at", "last_sync_status"])
-
-        logger.info(
-            f"Sync completed for {system.name}: "
-            f"{sync_log.records_created} created, "
-            f"{sync_log.records_updated} updated"
-        )
-
-        return {
-            "status": "success",
-            "records_fetched": sync_log.records_fetched,
-            "records_created": sync_log.records_created,
-            "records_updated": sync_log.records_updated,
-        }
-
+        result = _run_sync(system, sync_log)
     except ValueError as e:
         # Service not found or configuration error
-        sync_log.sync_completed_at = timezone.now()
-        sync_log.status = IntegrationSyncLog.SyncStatus.FAILED
-        sync_log.error_message = str(e)
-        sync_log.error_details = {"error_type": "ValueError"}
-        sync_log.save()
-
-        system.last_sync_status = "failed"
-        system.save(update_fields=["last_sync_status"])
-
+        _record_sync_failure(system, sync_log, e, {"error_type": "ValueError"})
         logger.error(f"Sync failed for {system.name}: {e}")
         return {"status": "failed", "error": str(e)}
-
     except Exception as e:
         # Other errors - retry with exponential backoff
-        error_classification = "permanent"  # Default
-        try:
-            service = get_integration_service(system.type)
-            error_classification = service._classify_error(e)
-        except Exception as classification_error:
-            logger.warning(f"Failed to classify error for {system.name}: {classification_error}")
-
-        sync_log.sync_completed_at = timezone.now()
-        sync_log.status = IntegrationSyncLog.SyncStatus.FAILED
-        sync_log.error_message = str(e)
-        sync_log.error_details = {
-            "error_type": type(e).__name__,
-            "error_classification": error_classification,
-        }
-        sync_log.save()
-
-        system.last_sync_status = "failed"
-        system.save(update_fields=["last_sync_status"])
-
+        error_classification = _classify_error(system, e)
+        _record_sync_failure(
+            system, sync_log, e, {"error_type": type(e).__name__, "error_classification": error_classification}
+        )
         logger.error(f"Sync failed for {system.name}: {e}", exc_info=True)
 
         # Retry if transient error
@@ -123,6 +116,23 @@ def sync_external_system(self, system_id: str):
 
         return {"status": "failed", "error": str(e)}
 
+    _record_sync_result(system, sync_log, result)
+    logger.info(
+        f"Sync completed for {system.name} ({sync_log.status}): "
+        f"{sync_log.records_created} created, "
+        f"{sync_log.records_updated} updated"
+    )
+
+    summary = {
+        "status": sync_log.status,
+        "records_fetched": sync_log.records_fetched,
+        "records_created": sync_log.records_created,
+        "records_updated": sync_log.records_updated,
+    }
+    if sync_log.error_message:
+        summary["error"] = sync_log.error_message
+    return summary
+
 
 @shared_task
 def sync_all_integrations():
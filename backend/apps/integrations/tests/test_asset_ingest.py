@@ -0,0 +1,161 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Tests for streaming CMDB asset ingestion.
+"""
+from unittest.mock import MagicMock, Mock
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.connectors.models import Asset
+from apps.core.circuit_breaker import CircuitBreakerOpen
+from apps.integrations.models import ExternalSystem, IntegrationSyncLog
+from apps.integrations.services.asset_ingest import upsert_assets
+from apps.integrations.services.jira import JiraAssetsService
+from apps.integrations.tasks import sync_external_system
+
+
+def _entry(key, label=None, status="Active"):
+    return {"objectKey": key, "label": label or key, "status": status, "objectType": {"name": "Laptop"}}
+
+
+def _page(entries, has_more):
+    response = Mock()
+    response.json.return_value = {"objectEntries": entries, "hasMore": has_more}
+    return response
+
+
+@pytest.fixture
+def system(db):
+    """Create a Jira Assets system with a fixed object schema."""
+    return ExternalSystem.objects.create(
+        name="Jira Assets",
+        type=ExternalSystem.SystemType.JIRA_ASSETS,
+        is_enabled=True,
+        api_url="https://jira.example.com",
+        auth_type=ExternalSystem.AuthType.TOKEN,
+        credentials={"api_token": "token"},
+        metadata={"object_schema_id": 7},
+    )
+
+
+@pytest.fixture
+def sync_log(system):
+    """Create a running sync log."""
+    return IntegrationSyncLog.objects.create(system=system, sync_started_at=timezone.now())
+
+
+def _service(responses):
+    service = JiraAssetsService()
+    service.http_client = MagicMock()
+    service.http_client.get.side_effect = responses
+    return service
+
+
+@pytest.mark.django_db
+class TestUpsertAssets:
+    """Test chunked bulk upsert with content-hash skipping."""
+
+    def test_create_update_and_skip_unchanged(self):
+        """Test new rows are created, changed rows updated and unchanged rows not written."""
+        service = JiraAssetsService()
+        upsert_assets([_entry("A-1"), _entry("A-2")], service.map_asset)
+
+        with CaptureQueriesContext(connection) as ctx:
+            totals = upsert_assets([_entry("A-1"), _entry("A-2", label="renamed")], service.map_asset)
+
+        assert totals == {"fetched": 2, "created": 0, "updated": 1, "unchanged": 1, "failed": 0}
+        assert Asset.objects.get(asset_id="A-2").name == "renamed"
+        assert Asset.objects.count() == 2
+        inserts = [q for q in ctx.captured_queries if q["sql"].startswith("INSERT")]
+        assert len(inserts) == 1
+
+    def test_unchanged_run_issues_no_writes(self):
+        """Test a repeat sync of identical data only reads stored hashes."""
+        service = JiraAssetsService()
+        records = [_entry(f"A-{i}") for i in range(5)]
+        upsert_assets(records, service.map_asset, chunk_size=2)
+
+        with CaptureQueriesContext(connection) as ctx:
+            totals = upsert_assets(records, service.map_asset, chunk_size=2)
+
+        assert totals["unchanged"] == 5
+        assert all(q["sql"].startswith("SELECT") for q in ctx.captured_queries)
+
+    def test_invalid_records_counted_as_failed(self):
+        """Test records without an identifier fail without blocking the chunk."""
+        service = JiraAssetsService()
+
+        totals = upsert_assets([_entry("A-1"), _entry(None)], service.map_asset)
+
+        assert totals["created"] == 1
+        assert totals["failed"] == 1
+
+    def test_sync_preserves_unsynced_fields(self):
+        """Test upserts only overwrite CMDB-owned fields."""
+        Asset.objects.create(
+            asset_id="A-1", name="old", type="Laptop", os="", location="", owner="", compliance_score=88
+        )
+
+        upsert_assets([_entry("A-1")], JiraAssetsService().map_asset)
+
+        asset = Asset.objects.get(asset_id="A-1")
+        assert asset.name == "A-1"
+        assert asset.compliance_score == 88
+
+
+@pytest.mark.django_db
+class TestStreamingSync:
+    """Test page streaming into chunked upserts."""
+
+    def test_pages_streamed_with_progress(self, system, sync_log, settings):
+        """Test each chunk is written and logged before later pages are fetched."""
+        settings.INTEGRATION_ASSET_SYNC_CHUNK_SIZE = 2
+        pages = [
+            [_entry("A-1"), _entry("A-2")],
+            [_entry("A-3"), _entry("A-4")],
+            [_entry("A-5")],
+        ]
+        assets_before_page = []
+
+        def get(*args, **kwargs):
+            assets_before_page.append(Asset.objects.count())
+            entries = pages[len(assets_before_page) - 1]
+            return _page(entries, has_more=len(assets_before_page) < len(pages))
+
+        service = _service(get)
+
+        result = service.sync(system, sync_log=sync_log)
+
+        assert result == {"fetched": 5, "created": 5, "updated": 0, "unchanged": 0, "failed": 0}
+        assert assets_before_page == [0, 2, 4]
+        sync_log.refresh_from_db()
+        assert (sync_log.records_fetched, sync_log.records_created) == (5, 5)
+
+    def test_circuit_breaker_mid_sync_keeps_written_chunks(self, system, sync_log, settings):
+        """Test an outage mid-stream returns partial counts and keeps earlier chunks."""
+        settings.INTEGRATION_ASSET_SYNC_CHUNK_SIZE = 2
+        service = _service([_page([_entry("A-1"), _entry("A-2")], has_more=True), CircuitBreakerOpen("jira")])
+
+        result = service.sync(system, sync_log=sync_log)
+
+        assert result["created"] == 2
+        assert "error" in result
+        assert Asset.objects.count() == 2
+
+    def test_sync_task_records_progress(self, system, monkeypatch):
+        """Test the sync task passes its log to streaming services."""
+        service = _service([_page([_entry("A-1")], has_more=True), CircuitBreakerOpen("jira")])
+        monkeypatch.setattr("apps.integrations.tasks.get_integration_service", lambda system_type: service)
+
+        result = sync_external_system.run(str(system.id))
+
+        sync_log = IntegrationSyncLog.objects.get(system=system)
+        assert result["records_created"] == 1
+        assert result["status"] == "partial"
+        assert result["error"]
+        assert sync_log.status == IntegrationSyncLog.SyncStatus.PARTIAL
+        assert sync_log.records_created == 1
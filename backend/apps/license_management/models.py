@@ -537,12 +537,16 @@ class ConsumptionSnapshot(TimeStampedModel):
         pool_str = f" ({self.pool.name})" if self.pool else ""
         return f"{self.sku.sku_code}{pool_str} @ {self.reconciled_at.isoformat()}"
 
+    @staticmethod
+    def calculate_utilization(consumed: int, entitled: int) -> Decimal:
+        """Utilization percentage of entitled quantity (also used for bulk-created snapshots, which skip save())."""
+        if entitled > 0:
+            return Decimal((consumed / entitled) * 100).quantize(Decimal("0.01"))
+        return Decimal("0.00")
+
     def save(self, *args, **kwargs):
         """Calculate derived fields before save."""
-        if self.entitled > 0:
-            self.utilization_percent = Decimal((self.consumed / self.entitled) * 100).quantize(Decimal("0.01"))
-        else:
-            self.utilization_percent = Decimal("0.00")
+        self.utilization_percent = self.calculate_utilization(self.consumed, self.entitled)
         super().save(*args, **kwargs)
 
 
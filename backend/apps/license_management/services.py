@@ -7,11 +7,13 @@ import hashlib
 import json
 import logging
 import uuid
+from collections import defaultdict
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 
+from django.conf import settings
 from django.db import transaction
-from django.db.models import Q, Sum
+from django.db.models import Count, Q, Sum
 from django.utils import timezone
 
 from .models import (
@@ -40,6 +42,12 @@ RECONCILIATION_RULESET_VERSION = "1.0.0"
 # Stale threshold for reconciliation (2x the scheduled interval)
 STALE_THRESHOLD_SECONDS = 7200  # 2 hours
 
+# Rows per INSERT when bulk-creating snapshots and alerts
+SNAPSHOT_BATCH_SIZE = 1000
+
+# Run counters committed together with each reconciled chunk
+RUN_PROGRESS_FIELDS = ["skus_processed", "snapshots_created", "signals_processed", "updated_at"]
+
 
 class LicenseSummaryService:
     """Service for computing license summary statistics."""
@@ -126,7 +134,16 @@ class LicenseSummaryService:
 
 
 class ReconciliationService:
-    """Service for license reconciliation operations."""
+    """
+    Service for license reconciliation operations.
+
+    Reconciliation is set-based: active SKUs are processed in chunks of
+    LICENSE_RECONCILIATION_CHUNK_SIZE, and each chunk computes entitled,
+    consumed and reserved totals with one grouped aggregate per source,
+    bulk-creates its ConsumptionSnapshots and commits together with the
+    run's progress counters. A failed chunk is recorded in run.errors
+    without rolling back the chunks already committed.
+    """
 
     def __init__(self, triggered_by=None, correlation_id: Optional[str] = None):
         """
@@ -139,7 +156,6 @@ class ReconciliationService:
         self.triggered_by = triggered_by
         self.correlation_id = correlation_id or str(uuid.uuid4())
 
-    @transaction.atomic
     def run_reconciliation(self) -> ReconciliationRun:
         """
         Execute a full reconciliation run.
@@ -153,24 +169,27 @@ class ReconciliationService:
             ruleset_version=RECONCILIATION_RULESET_VERSION,
             triggered_by=self.triggered_by,
             trigger_type="manual" if self.triggered_by else "scheduled",
+            correlation_id=uuid.UUID(self.correlation_id),
         )
-        run.correlation_id = uuid.UUID(self.correlation_id)
-        run.save()
 
         try:
-            active_skus = LicenseSKU.objects.filter(is_active=True)
-            run.skus_total = active_skus.count()
-            run.save()
+            sku_ids = list(LicenseSKU.objects.filter(is_active=True).order_by("id").values_list("id", flat=True))
+            run.skus_total = len(sku_ids)
+            run.save(update_fields=["skus_total", "updated_at"])
 
-            for sku in active_skus:
+            chunk_size = max(1, settings.LICENSE_RECONCILIATION_CHUNK_SIZE)
+            for offset in range(0, len(sku_ids), chunk_size):
+                chunk = sku_ids[offset : offset + chunk_size]
                 try:
-                    self._reconcile_sku(sku, run)
-                    run.skus_processed += 1
-                    run.save()
+                    with transaction.atomic():
+                        self._reconcile_chunk(chunk, run)
+                        run.skus_processed += len(chunk)
+                        run.save(update_fields=RUN_PROGRESS_FIELDS)
                 except Exception as e:
-                    logger.exception(f"Error reconciling SKU {sku.sku_code}: {e}")
-                    run.errors.append({"sku_id": str(sku.id), "error": str(e)})
-                    run.save()
+                    logger.exception(f"Error reconciling {len(chunk)} SKUs: {e}")
+                    run.refresh_from_db(fields=RUN_PROGRESS_FIELDS)
+                    run.errors.extend({"sku_id": str(sku_id), "error": str(e)} for sku_id in chunk)
+                    run.save(update_fields=["errors", "updated_at"])
 
             run.status = ReconciliationStatus.COMPLETED
             run.completed_at = timezone.now()
@@ -188,99 +207,130 @@ class ReconciliationService:
 
         return run
 
-    def _reconcile_sku(self, sku: LicenseSKU, run: ReconciliationRun) -> None:
-        """Reconcile a single SKU and create snapshot."""
-        # Calculate entitled from active entitlements
-        entitled = (
-            Entitlement.objects.filter(
-                sku=sku,
-                status=EntitlementStatus.ACTIVE,
-                start_date__lte=timezone.now().date(),
-            )
-            .filter(Q(end_date__isnull=True) | Q(end_date__gte=timezone.now().date()))
-            .aggregate(total=Sum("entitled_quantity"))["total"]
-            or 0
-        )
-
-        # Calculate consumed from active consumption units
-        consumed = (
-            ConsumptionUnit.objects.filter(sku=sku, status=AssignmentStatus.ACTIVE).aggregate(total=Sum("unit_count"))[
-                "total"
-            ]
-            or 0
-        )
-
-        # Get reserved from pools
-        reserved = (
-            LicensePool.objects.filter(sku=sku, is_active=True).aggregate(total=Sum("reserved_quantity"))["total"] or 0
+    def _reconcile_chunk(self, sku_ids: List[uuid.UUID], run: ReconciliationRun) -> None:
+        """Reconcile a chunk of SKUs with grouped aggregates and bulk-create their snapshots."""
+        now = timezone.now()
+        today = now.date()
+
+        entitled = dict(
+            Entitlement.objects.filter(sku_id__in=sku_ids, status=EntitlementStatus.ACTIVE, start_date__lte=today)
+            .filter(Q(end_date__isnull=True) | Q(end_date__gte=today))
+            .values("sku_id")
+            .annotate(total=Sum("entitled_quantity"))
+            .values_list("sku_id", "total")
         )
-
-        # Calculate remaining
-        remaining = entitled - consumed - reserved
-
-        # Create evidence pack
-        evidence = self._generate_evidence_pack(sku, entitled, consumed, reserved)
-
-        # Create snapshot
-        ConsumptionSnapshot.objects.create(
-            sku=sku,
-            reconciled_at=timezone.now(),
-            ruleset_version=RECONCILIATION_RULESET_VERSION,
-            entitled=entitled,
-            consumed=consumed,
-            reserved=reserved,
-            remaining=remaining,
-            evidence_pack_hash=evidence["hash"],
-            evidence_pack_ref=evidence["ref"],
-            reconciliation_run=run,
+        consumption = {
+            row["sku_id"]: row
+            for row in ConsumptionUnit.objects.filter(sku_id__in=sku_ids, status=AssignmentStatus.ACTIVE)
+            .values("sku_id")
+            .annotate(total=Sum("unit_count"), units=Count("id"))
+        }
+        reserved = dict(
+            LicensePool.objects.filter(sku_id__in=sku_ids, is_active=True)
+            .values("sku_id")
+            .annotate(total=Sum("reserved_quantity"))
+            .values_list("sku_id", "total")
         )
+        evidence_entitlements = defaultdict(list)
+        for row in (
+            Entitlement.objects.filter(sku_id__in=sku_ids, status=EntitlementStatus.ACTIVE)
+            .order_by("id")
+            .values("sku_id", "id", "contract_id", "entitled_quantity")
+        ):
+            sku_id = row.pop("sku_id")
+            row["id"] = str(row["id"])
+            evidence_entitlements[sku_id].append(row)
+        sku_codes = dict(LicenseSKU.objects.filter(id__in=sku_ids).values_list("id", "sku_code"))
+
+        snapshots = []
+        for sku_id in sku_ids:
+            sku_code = sku_codes.get(sku_id)
+            if sku_code is None:
+                # Deleted since the run listed it; nothing left to snapshot
+                continue
+            sku_entitled = entitled.get(sku_id) or 0
+            sku_consumed = (consumption.get(sku_id) or {}).get("total") or 0
+            sku_reserved = reserved.get(sku_id) or 0
+            evidence = self._generate_evidence_pack(
+                sku_id,
+                sku_code,
+                sku_entitled,
+                sku_consumed,
+                sku_reserved,
+                entitlements=evidence_entitlements.get(sku_id, []),
+                consumption_units_count=(consumption.get(sku_id) or {}).get("units") or 0,
+                reconciled_at=now,
+            )
+            snapshots.append(
+                ConsumptionSnapshot(
+                    sku_id=sku_id,
+                    reconciled_at=now,
+                    ruleset_version=RECONCILIATION_RULESET_VERSION,
+                    entitled=sku_entitled,
+                    consumed=sku_consumed,
+                    reserved=sku_reserved,
+                    remaining=sku_entitled - sku_consumed - sku_reserved,
+                    utilization_percent=ConsumptionSnapshot.calculate_utilization(sku_consumed, sku_entitled),
+                    evidence_pack_hash=evidence["hash"],
+                    evidence_pack_ref=evidence["ref"],
+                    reconciliation_run=run,
+                )
+            )
 
-        run.snapshots_created += 1
+        ConsumptionSnapshot.objects.bulk_create(snapshots, batch_size=SNAPSHOT_BATCH_SIZE)
+        run.snapshots_created += len(snapshots)
 
         # Process any pending signals
-        pending_signals = ConsumptionSignal.objects.filter(sku=sku, is_processed=False)
-        run.signals_processed += pending_signals.count()
-        pending_signals.update(is_processed=True, processed_at=timezone.now())
+        run.signals_processed += ConsumptionSignal.objects.filter(sku_id__in=sku_ids, is_processed=False).update(
+            is_processed=True, processed_at=now
+        )
 
-    def _generate_evidence_pack(self, sku: LicenseSKU, entitled: int, consumed: int, reserved: int) -> Dict[str, str]:
-        """Generate evidence pack for reconciliation."""
+    def _generate_evidence_pack(
+        self,
+        sku_id: uuid.UUID,
+        sku_code: str,
+        entitled: int,
+        consumed: int,
+        reserved: int,
+        entitlements: List[Dict[str, Any]],
+        consumption_units_count: int,
+        reconciled_at: datetime,
+    ) -> Dict[str, str]:
+        """Generate evidence pack for reconciliation from the chunk's pre-aggregated data."""
         evidence_data = {
-            "sku_id": str(sku.id),
-            "sku_code": sku.sku_code,
-            "reconciled_at": timezone.now().isoformat(),
+            "sku_id": str(sku_id),
+            "sku_code": sku_code,
+            "reconciled_at": reconciled_at.isoformat(),
             "ruleset_version": RECONCILIATION_RULESET_VERSION,
             "entitled": entitled,
             "consumed": consumed,
             "reserved": reserved,
             "remaining": entitled - consumed - reserved,
-            "entitlements": list(
-                Entitlement.objects.filter(sku=sku, status=EntitlementStatus.ACTIVE).values(
-                    "id", "contract_id", "entitled_quantity"
-                )
-            ),
-            "consumption_units_count": ConsumptionUnit.objects.filter(sku=sku, status=AssignmentStatus.ACTIVE).count(),
+            "entitlements": entitlements,
+            "consumption_units_count": consumption_units_count,
         }
 
-        # Convert UUIDs to strings for JSON serialization
-        entitlements: List[Dict[str, Any]] = evidence_data["entitlements"]
-        for ent in entitlements:
-            ent["id"] = str(ent["id"])
-
         evidence_json = json.dumps(evidence_data, sort_keys=True, default=str)
         evidence_hash = hashlib.sha256(evidence_json.encode()).hexdigest()
 
         # In production, this would upload to MinIO and return the path
-        evidence_ref = f"evidence/reconciliation/{sku.sku_code}/{timezone.now().strftime('%Y%m%d%H%M%S')}.json"
+        evidence_ref = f"evidence/reconciliation/{sku_code}/{reconciled_at.strftime('%Y%m%d%H%M%S')}.json"
 
         return {"hash": evidence_hash, "ref": evidence_ref}
 
     def _generate_alerts(self, run: ReconciliationRun) -> None:
         """Generate alerts for anomalies detected during reconciliation."""
+        alerts = []
+
         # Check for overconsumption
-        for snapshot in run.snapshots.all():
-            if snapshot.remaining < 0:
-                LicenseAlert.objects.create(
-                    sku=snapshot.sku,
+        for snapshot in (
+            run.snapshots.filter(remaining__lt=0)
+            .only("sku_id", "entitled", "consumed", "remaining")
+            .iterator(chunk_size=SNAPSHOT_BATCH_SIZE)
+        ):
+            alerts.append(
+                LicenseAlert(
+                    sku_id=snapshot.sku_id,
                     alert_type=AlertType.OVERCONSUMPTION,
                     severity=AlertSeverity.CRITICAL,
                     message=f"License overconsumption detected: {abs(snapshot.remaining)} units over entitled",
@@ -291,26 +341,26 @@ class ReconciliationService:
                         "reconciliation_run_id": str(run.id),
                     },
                 )
+            )
 
-        # Check for expiring entitlements (within 30 days)
+        # Check for expiring entitlements (within 30 days), skipping those with an open alert
         expiring_threshold = timezone.now().date() + timedelta(days=30)
+        alerted = set(
+            LicenseAlert.objects.filter(
+                alert_type=AlertType.EXPIRING, acknowledged=False, auto_resolved=False
+            ).values_list("details__entitlement_id", flat=True)
+        )
         expiring_entitlements = Entitlement.objects.filter(
             status=EntitlementStatus.ACTIVE,
             end_date__isnull=False,
             end_date__lte=expiring_threshold,
         )
-        for entitlement in expiring_entitlements:
-            # Check if alert already exists
-            existing = LicenseAlert.objects.filter(
-                sku=entitlement.sku,
-                alert_type=AlertType.EXPIRING,
-                acknowledged=False,
-                auto_resolved=False,
-                details__entitlement_id=str(entitlement.id),
-            ).exists()
-            if not existing:
-                LicenseAlert.objects.create(
-                    sku=entitlement.sku,
+        for entitlement in expiring_entitlements.iterator(chunk_size=SNAPSHOT_BATCH_SIZE):
+            if str(entitlement.id) in alerted:
+                continue
+            alerts.append(
+                LicenseAlert(
+                    sku_id=entitlement.sku_id,
                     alert_type=AlertType.EXPIRING,
                     severity=AlertSeverity.WARNING,
                     message=f"Entitlement expiring on {entitlement.end_date}",
@@ -321,6 +371,9 @@ class ReconciliationService:
                         "days_until_expiry": entitlement.days_until_expiry,
                     },
                 )
+            )
+
+        LicenseAlert.objects.bulk_create(alerts, batch_size=SNAPSHOT_BATCH_SIZE)
 
 
 class ConsumptionSignalService:
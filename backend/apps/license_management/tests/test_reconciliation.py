@@ -0,0 +1,182 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""Tests for set-based license reconciliation."""
+from datetime import timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.license_management.models import (
+    AlertType,
+    AssignmentStatus,
+    ConsumptionSignal,
+    ConsumptionSnapshot,
+    ConsumptionUnit,
+    Entitlement,
+    EntitlementStatus,
+    LicenseAlert,
+    LicensePool,
+    LicenseSKU,
+    PrincipalType,
+    ReconciliationStatus,
+    Vendor,
+)
+from apps.license_management.services import ReconciliationService
+
+User = get_user_model()
+
+
+@pytest.fixture
+def user(db):
+    """Create a test user."""
+    return User.objects.create_user(username="reconciler", password="testpass123")
+
+
+@pytest.fixture
+def vendor(db):
+    """Create a test vendor."""
+    return Vendor.objects.create(name="Contoso", identifier="contoso")
+
+
+def _sku(vendor, code, entitled=0, consumed=0, reserved=0, is_active=True):
+    sku = LicenseSKU.objects.create(vendor=vendor, sku_code=code, name=code, is_active=is_active)
+    if entitled:
+        Entitlement.objects.create(
+            sku=sku, contract_id=f"{code}-C1", entitled_quantity=entitled, status=EntitlementStatus.ACTIVE
+        )
+    if reserved:
+        LicensePool.objects.create(sku=sku, name=f"{code} pool", reserved_quantity=reserved)
+    for i in range(consumed):
+        ConsumptionUnit.objects.create(sku=sku, principal_type=PrincipalType.USER, principal_id=f"{code}-user{i}")
+    return sku
+
+
+@pytest.mark.django_db
+class TestSetBasedReconciliation:
+    """Test grouped-aggregate reconciliation in committed chunks."""
+
+    def test_snapshot_totals(self, user, vendor):
+        """Test entitled, consumed, reserved and remaining per SKU."""
+        sku = _sku(vendor, "E5", entitled=10, consumed=4, reserved=2)
+        Entitlement.objects.create(
+            sku=sku,
+            entitled_quantity=5,
+            status=EntitlementStatus.ACTIVE,
+            end_date=timezone.now().date() - timedelta(days=1),
+        )
+        ConsumptionUnit.objects.create(
+            sku=sku, principal_type=PrincipalType.USER, principal_id="gone", status=AssignmentStatus.REVOKED
+        )
+        _sku(vendor, "INACTIVE", entitled=3, is_active=False)
+
+        run = ReconciliationService(triggered_by=user).run_reconciliation()
+
+        assert run.status == ReconciliationStatus.COMPLETED
+        assert (run.skus_total, run.skus_processed, run.snapshots_created) == (1, 1, 1)
+        snapshot = ConsumptionSnapshot.objects.get(sku=sku)
+        assert (snapshot.entitled, snapshot.consumed, snapshot.reserved, snapshot.remaining) == (10, 4, 2, 4)
+        assert snapshot.utilization_percent == Decimal("40.00")
+        assert len(snapshot.evidence_pack_hash) == 64
+        assert snapshot.evidence_pack_ref.startswith("evidence/reconciliation/E5/")
+
+    def test_query_count_independent_of_sku_count(self, user, vendor, settings):
+        """Test a chunk costs a fixed number of queries however many SKUs it holds."""
+        settings.LICENSE_RECONCILIATION_CHUNK_SIZE = 1000
+        for i in range(3):
+            _sku(vendor, f"SMALL-{i}", entitled=5, consumed=1)
+        with CaptureQueriesContext(connection) as small:
+            ReconciliationService(triggered_by=user).run_reconciliation()
+
+        for i in range(30):
+            _sku(vendor, f"LARGE-{i}", entitled=5, consumed=1)
+        with CaptureQueriesContext(connection) as large:
+            run = ReconciliationService(triggered_by=user).run_reconciliation()
+
+        assert run.snapshots_created == 33
+        assert len(large.captured_queries) == len(small.captured_queries)
+
+    def test_chunks_commit_progress(self, user, vendor, settings):
+        """Test SKUs are processed across chunks and counters accumulate."""
+        settings.LICENSE_RECONCILIATION_CHUNK_SIZE = 2
+        skus = [_sku(vendor, f"CHUNK-{i}", entitled=2, consumed=1) for i in range(5)]
+        ConsumptionSignal.objects.create(
+            source_system="intune",
+            raw_id="sig-1",
+            timestamp=timezone.now(),
+            principal_type=PrincipalType.USER,
+            principal_id="u1",
+            sku=skus[0],
+        )
+
+        run = ReconciliationService(triggered_by=user).run_reconciliation()
+
+        run.refresh_from_db()
+        assert (run.skus_total, run.skus_processed, run.snapshots_created) == (5, 5, 5)
+        assert run.signals_processed == 1
+        assert not ConsumptionSignal.objects.filter(is_processed=False).exists()
+
+    def test_failed_chunk_keeps_committed_chunks(self, user, vendor, settings):
+        """Test a failing chunk is recorded without rolling back the others."""
+        settings.LICENSE_RECONCILIATION_CHUNK_SIZE = 2
+        for i in range(4):
+            _sku(vendor, f"FAIL-{i}", entitled=1)
+        service = ReconciliationService(triggered_by=user)
+        original = service._reconcile_chunk
+        calls = []
+
+        def flaky(chunk, run):
+            calls.append(chunk)
+            original(chunk, run)
+            if len(calls) == 2:
+                raise RuntimeError("boom")
+
+        with patch.object(service, "_reconcile_chunk", side_effect=flaky):
+            run = service.run_reconciliation()
+
+        run.refresh_from_db()
+        assert run.status == ReconciliationStatus.COMPLETED
+        assert (run.skus_processed, run.snapshots_created) == (2, 2)
+        assert ConsumptionSnapshot.objects.count() == 2
+        assert sorted(e["sku_id"] for e in run.errors) == sorted(str(sku_id) for sku_id in calls[1])
+
+    def test_sku_deleted_mid_run_is_skipped(self, user, vendor, settings):
+        """Test a SKU deleted after the run listed it is skipped instead of failing its chunk."""
+        settings.LICENSE_RECONCILIATION_CHUNK_SIZE = 10
+        kept = _sku(vendor, "KEPT", entitled=1)
+        gone = _sku(vendor, "GONE")
+        service = ReconciliationService(triggered_by=user)
+        original = service._reconcile_chunk
+
+        def delete_first(chunk, run):
+            gone.delete()
+            original(chunk, run)
+
+        with patch.object(service, "_reconcile_chunk", side_effect=delete_first):
+            run = service.run_reconciliation()
+
+        run.refresh_from_db()
+        assert run.errors == []
+        assert run.snapshots_created == 1
+        assert list(ConsumptionSnapshot.objects.values_list("sku_id", flat=True)) == [kept.id]
+
+    def test_alerts_generated(self, user, vendor):
+        """Test overconsumption and expiring-entitlement alerts, without duplicating open ones."""
+        over = _sku(vendor, "OVER", entitled=1, consumed=3)
+        expiring = _sku(vendor, "EXPIRING")
+        Entitlement.objects.create(
+            sku=expiring,
+            entitled_quantity=10,
+            status=EntitlementStatus.ACTIVE,
+            end_date=timezone.now().date() + timedelta(days=10),
+        )
+
+        ReconciliationService(triggered_by=user).run_reconciliation()
+        ReconciliationService(triggered_by=user).run_reconciliation()
+
+        assert LicenseAlert.objects.filter(sku=over, alert_type=AlertType.OVERCONSUMPTION).count() == 2
+        assert LicenseAlert.objects.filter(sku=expiring, alert_type=AlertType.EXPIRING).count() == 1
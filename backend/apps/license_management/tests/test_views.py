@@ -6,7 +6,7 @@ from decimal import Decimal
 
 import pytest
 from django.contrib.auth import get_user_model
-from django.urls import reverse
+from django.urls import resolve, reverse
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -485,6 +485,12 @@ class TestReconcileView:
         assert response.status_code == status.HTTP_200_OK
         assert response.data["status"] == ReconciliationStatus.COMPLETED
 
+    def test_reconciliation_runs_outside_request_transaction(self):
+        """Test the trigger is excluded from ATOMIC_REQUESTS so chunks commit on their own."""
+        view = resolve(reverse("license_management:reconcile")).func
+
+        assert "default" in getattr(view, "_non_atomic_requests", set())
+
     def test_reconciliation_conflict_when_running(self, authenticated_client, user):
         """Test triggering reconciliation when one is running."""
         ReconciliationRun.objects.create(
@@ -5,8 +5,10 @@ API views for license_management.
 """
 import logging
 
+from django.db import transaction
 from django.db.models import QuerySet
 from django.utils import timezone
+from django.utils.decorators import method_decorator
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
@@ -309,8 +311,14 @@ class ReconciliationRunViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = ReconciliationRunSerializer
 
 
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
 class ReconcileView(APIView):
-    """API endpoint to trigger reconciliation."""
+    """
+    API endpoint to trigger reconciliation.
+
+    Excluded from ATOMIC_REQUESTS so that each reconciliation chunk commits on
+    its own instead of becoming a savepoint of one request-long transaction.
+    """
 
     permission_classes = [IsAuthenticated]
 
@@ -12,3 +12,7 @@ class PolicyEngineConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.policy_engine"
     verbose_name = "EUCORA Policy Engine"
+
+    def ready(self):
+        """Import signal handlers when app is ready."""
+        from . import signals  # noqa: F401
@@ -0,0 +1,300 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Compiled risk-model evaluator for the Policy Engine.
+
+The active RiskModel is compiled once into an ordered list of
+(factor name, weight, rubric, scorer) tuples and cached per worker process.
+Scorers are bound at compile time, so scoring an evidence pack is a straight
+loop over plain callables instead of a string-comparison dispatch chain.
+
+Invalidation:
+- RiskModel post_save/post_delete signals publish a new generation token in
+  the shared Django cache once the change is committed, so every worker
+  recompiles on its next call (apps.core.versioned_cache).
+- A TTL (RISK_MODEL_CACHE_TTL_SECONDS) bounds staleness if the shared cache
+  is unavailable.
+"""
+import logging
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from apps.core.versioned_cache import VersionedLocalCache
+
+from .models import RiskModel
+
+logger = logging.getLogger(__name__)
+
+GENERATION_CACHE_KEY = "policy_engine:risk_model:generation"
+
+
+class DeploymentHistory:
+    """
+    Per-app deployment event counts used by history-based risk factors.
+
+    Counts come from the event store's daily rollup and are memoized per
+    (app_name, days) window, so scoring many evidence packs for the same app
+    in one batch reads each window once.
+    """
+
+    def __init__(self):
+        self._counts: Dict[Tuple[str, int], Dict[str, int]] = {}
+
+    def counts(self, app_name: str, days: int) -> Dict[str, int]:
+        """
+        Return {event_type: count} for an app over the last `days` days.
+        """
+        key = (app_name, days)
+        if key not in self._counts:
+            self._counts[key] = self._query_counts(app_name, days)
+        return self._counts[key]
+
+    def _query_counts(self, app_name: str, days: int) -> Dict[str, int]:
+        from apps.event_store.services import get_deployment_counts
+
+        return get_deployment_counts(app_name, days)
+
+
+FactorScorer = Callable[[Dict, Dict, DeploymentHistory], float]
+
+
+def _score_privilege_elevation(evidence_pack: Dict, rubric: Dict, history: DeploymentHistory) -> float:
+    if evidence_pack.get("requires_admin"):
+        return 1.0
+    elif evidence_pack.get("requests_elevation"):
+        return 0.5
+    return 0.0
+
+
+_RING_SCORES = {
+    "lab": 0.0,
+    "canary": 0.2,
+    "pilot": 0.4,
+    "department": 0.7,
+    "global": 1.0,
+}
+
+
+def _score_blast_radius(evidence_pack: Dict, rubric: Dict, history: DeploymentHistory) -> float:
+    ring = evidence_pack.get("target_ring", "lab").lower()
+    return _RING_SCORES.get(ring, 0.5)
+
+
+def _score_rollback_complexity(evidence_pack: Dict, rubric: Dict, history: DeploymentHistory) -> float:
+    has_rollback_plan = evidence_pack.get("has_rollback_plan", False)
+    rollback_tested = evidence_pack.get("rollback_tested", False)
+    if has_rollback_plan and rollback_tested:
+        return 0.0
+    elif has_rollback_plan:
+        return 0.5
+    return 1.0
+
+
+def _score_vulnerability_severity(evidence_pack: Dict, rubric: Dict, history: DeploymentHistory) -> float:
+    vuln_scan = evidence_pack.get("vulnerability_scan_results", {})
+    if vuln_scan.get("critical", 0) > 0:
+        return 1.0
+    elif vuln_scan.get("high", 0) > 0:
+        return 0.7
+    elif vuln_scan.get("medium", 0) > 0:
+        return 0.3
+    return 0.0
+
+
+def _score_compliance_impact(evidence_pack: Dict, rubric: Dict, history: DeploymentHistory) -> float:
+    compliance_tags = evidence_pack.get("compliance_tags", [])
+    if "sox" in compliance_tags or "hipaa" in compliance_tags:
+        return 1.0
+    elif "pci" in compliance_tags:
+        return 0.7
+    elif compliance_tags:
+        return 0.3
+    return 0.0
+
+
+def _score_deployment_frequency(evidence_pack: Dict, rubric: Dict, history: DeploymentHistory) -> float:
+    from apps.event_store.models import DeploymentEvent
+
+    # Deployment frequency for this app in last 30 days
+    counts = history.counts(evidence_pack.get("app_name", ""), 30)
+    deployment_count = counts.get(DeploymentEvent.EventType.DEPLOYMENT_CREATED, 0)
+
+    # Risk scoring: More frequent deployments = lower risk (better tested)
+    # 0 deployments = 1.0 (high risk, untested)
+    # 1-2 deployments = 0.7 (medium-high risk)
+    # 3-5 deployments = 0.4 (medium risk)
+    # 6-10 deployments = 0.2 (low-medium risk)
+    # 10+ deployments = 0.0 (low risk, well-tested)
+    if deployment_count == 0:
+        return 1.0
+    elif deployment_count <= 2:
+        return 0.7
+    elif deployment_count <= 5:
+        return 0.4
+    elif deployment_count <= 10:
+        return 0.2
+    return 0.0
+
+
+_REQUIRED_EVIDENCE_FIELDS = ("artifact_hash", "sbom_data", "vulnerability_scan_results", "rollback_plan")
+
+
+def _score_evidence_completeness(evidence_pack: Dict, rubric: Dict, history: DeploymentHistory) -> float:
+    missing_fields = [f for f in _REQUIRED_EVIDENCE_FIELDS if not evidence_pack.get(f)]
+    completeness = 1.0 - (len(missing_fields) / len(_REQUIRED_EVIDENCE_FIELDS))
+    return 1.0 - completeness  # Invert: more complete = lower risk
+
+
+def _score_historical_success_rate(evidence_pack: Dict, rubric: Dict, history: DeploymentHistory) -> float:
+    from apps.event_store.models import DeploymentEvent
+
+    # Historical success rate for this app in last 90 days
+    counts = history.counts(evidence_pack.get("app_name", ""), 90)
+    completed_count = counts.get(DeploymentEvent.EventType.DEPLOYMENT_COMPLETED, 0)
+    failed_count = counts.get(DeploymentEvent.EventType.DEPLOYMENT_FAILED, 0)
+    total_count = completed_count + failed_count
+
+    if total_count == 0:
+        # No historical data = medium risk
+        return 0.5
+
+    success_rate = completed_count / total_count
+
+    # Risk scoring: Higher success rate = lower risk
+    # 100% success = 0.0 (low risk)
+    # 90-99% success = 0.1 (low-medium risk)
+    # 75-89% success = 0.3 (medium risk)
+    # 50-74% success = 0.6 (medium-high risk)
+    # <50% success = 1.0 (high risk)
+    if success_rate >= 0.99:
+        return 0.0
+    elif success_rate >= 0.90:
+        return 0.1
+    elif success_rate >= 0.75:
+        return 0.3
+    elif success_rate >= 0.50:
+        return 0.6
+    return 1.0
+
+
+def _score_unknown(factor_name: str) -> FactorScorer:
+    def scorer(evidence_pack: Dict, rubric: Dict, history: DeploymentHistory) -> float:
+        logger.warning(f"Unknown risk factor: {factor_name}")
+        return 0.5  # Default: medium risk
+
+    return scorer
+
+
+FACTOR_SCORERS: Dict[str, FactorScorer] = {
+    "Privilege Elevation": _score_privilege_elevation,
+    "Blast Radius": _score_blast_radius,
+    "Rollback Complexity": _score_rollback_complexity,
+    "Vulnerability Severity": _score_vulnerability_severity,
+    "Compliance Impact": _score_compliance_impact,
+    "Deployment Frequency": _score_deployment_frequency,
+    "Evidence Completeness": _score_evidence_completeness,
+    "Historical Success Rate": _score_historical_success_rate,
+}
+
+
+def get_factor_scorer(factor_name: str) -> FactorScorer:
+    """Resolve a factor name to its scoring function."""
+    return FACTOR_SCORERS.get(factor_name) or _score_unknown(factor_name)
+
+
+@dataclass(frozen=True)
+class CompiledFactor:
+    """A risk factor with its scoring function bound at compile time."""
+
+    name: str
+    weight: float
+    rubric: Dict
+    scorer: FactorScorer
+
+
+@dataclass
+class CompiledRiskModel:
+    """
+    In-process evaluator for a RiskModel version.
+
+    Scoring does not touch RiskModel rows; only history-based factors query
+    the database, through the DeploymentHistory passed in.
+    """
+
+    version: str
+    threshold: int
+    factors: List[CompiledFactor] = field(default_factory=list)
+
+    @classmethod
+    def compile(cls, risk_model: RiskModel) -> "CompiledRiskModel":
+        """Bind every factor of a RiskModel to its scorer."""
+        return cls(
+            version=risk_model.version,
+            threshold=risk_model.threshold,
+            factors=[
+                CompiledFactor(
+                    name=factor["name"],
+                    weight=factor["weight"],
+                    rubric=factor.get("rubric", {}),
+                    scorer=get_factor_scorer(factor["name"]),
+                )
+                for factor in risk_model.factors
+            ],
+        )
+
+    def score(self, evidence_pack: Dict, history: Optional[DeploymentHistory] = None) -> Dict:
+        """
+        Score a single evidence pack.
+
+        Returns:
+            {'risk_score': int, 'factor_scores': dict, 'requires_cab_approval': bool, 'model_version': str}
+        """
+        history = history or DeploymentHistory()
+        factor_scores = {}
+        weighted_sum = 0.0
+
+        for factor in self.factors:
+            normalized_score = factor.scorer(evidence_pack, factor.rubric, history)
+            factor_scores[factor.name] = normalized_score
+            weighted_sum += factor.weight * normalized_score
+
+        # Clamp to 0-100
+        risk_score = int(max(0, min(100, weighted_sum * 100)))
+
+        return {
+            "risk_score": risk_score,
+            "factor_scores": factor_scores,
+            "requires_cab_approval": risk_score > self.threshold,
+            "model_version": self.version,
+        }
+
+    def score_many(self, evidence_packs: Iterable[Dict]) -> List[Dict]:
+        """Score many evidence packs, sharing history lookups across the batch."""
+        history = DeploymentHistory()
+        return [self.score(evidence_pack, history) for evidence_pack in evidence_packs]
+
+
+def _compile_active_risk_model() -> Optional[CompiledRiskModel]:
+    risk_model = RiskModel.objects.filter(is_active=True).first()
+    return CompiledRiskModel.compile(risk_model) if risk_model else None
+
+
+_compiled_model_cache = VersionedLocalCache(
+    GENERATION_CACHE_KEY, _compile_active_risk_model, ttl_setting="RISK_MODEL_CACHE_TTL_SECONDS", default_ttl=300
+)
+
+
+def get_compiled_risk_model() -> Optional[CompiledRiskModel]:
+    """
+    Return the compiled active risk model for this worker, or None if no model is active.
+    """
+    return _compiled_model_cache.get()
+
+
+def invalidate_compiled_risk_model() -> None:
+    """
+    Invalidate the compiled risk model in this and every other worker.
+
+    Publishes a fresh generation token and drops the local copy.
+    """
+    _compiled_model_cache.invalidate()
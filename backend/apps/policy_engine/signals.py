@@ -0,0 +1,19 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Policy Engine signal handlers.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .evaluator import invalidate_compiled_risk_model
+from .models import RiskModel
+
+
+@receiver(post_save, sender=RiskModel)
+@receiver(post_delete, sender=RiskModel)
+def invalidate_risk_model_cache(sender, instance, **kwargs):
+    """Recompile the active risk model after any RiskModel change (activation, factors, threshold)."""
+    # Only once committed: a worker reloading earlier would cache the old model under the new token
+    transaction.on_commit(invalidate_compiled_risk_model)
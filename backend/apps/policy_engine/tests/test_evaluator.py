@@ -0,0 +1,177 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Tests for the compiled risk-model evaluator and batch scoring.
+"""
+import uuid
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.event_store.models import DeploymentEvent
+from apps.policy_engine.evaluator import CompiledRiskModel, get_compiled_risk_model
+from apps.policy_engine.models import RiskAssessment, RiskModel
+from apps.policy_engine.services import _evaluate_factor, calculate_risk_score, calculate_risk_scores
+
+FACTORS = [
+    {"name": "Privilege Elevation", "weight": 0.15},
+    {"name": "Blast Radius", "weight": 0.20},
+    {"name": "Rollback Complexity", "weight": 0.15},
+    {"name": "Vulnerability Severity", "weight": 0.20},
+    {"name": "Compliance Impact", "weight": 0.10},
+    {"name": "Deployment Frequency", "weight": 0.05},
+    {"name": "Evidence Completeness", "weight": 0.10},
+    {"name": "Historical Success Rate", "weight": 0.05},
+]
+
+
+def _evidence_pack(app_name="TestApp", ring="pilot"):
+    return {
+        "app_name": app_name,
+        "requires_admin": False,
+        "target_ring": ring,
+        "has_rollback_plan": True,
+        "vulnerability_scan_results": {"critical": 0, "high": 1},
+        "compliance_tags": ["pci"],
+        "artifact_hash": "abc123",
+        "sbom_data": {"packages": []},
+        "rollback_plan": "Test rollback plan",
+    }
+
+
+@pytest.mark.django_db
+class TestCompiledRiskModel:
+    """Test compiled evaluator caching and invalidation."""
+
+    def setup_method(self):
+        """Set up active risk model."""
+        self.risk_model = RiskModel.objects.create(version="v1.0", factors=FACTORS, threshold=50, is_active=True)
+
+    def test_compiled_model_matches_per_factor_evaluation(self):
+        """Test compiled scores match the factor-by-factor evaluation."""
+        evidence_pack = _evidence_pack()
+        result = get_compiled_risk_model().score(evidence_pack)
+
+        for factor in FACTORS:
+            assert result["factor_scores"][factor["name"]] == _evaluate_factor(factor["name"], evidence_pack, {})
+        assert result["model_version"] == "v1.0"
+
+    def test_compiled_model_is_cached(self, django_assert_num_queries):
+        """Test the active risk model is loaded once per worker."""
+        first = get_compiled_risk_model()
+
+        with django_assert_num_queries(0):
+            assert get_compiled_risk_model() is first
+
+    def test_activating_new_model_invalidates_cache(self, django_capture_on_commit_callbacks):
+        """Test saving a newly active model swaps the compiled evaluator."""
+        assert get_compiled_risk_model().version == "v1.0"
+
+        with django_capture_on_commit_callbacks(execute=True):
+            RiskModel.objects.create(version="v2.0", factors=FACTORS[:2], threshold=10, is_active=True)
+
+        compiled = get_compiled_risk_model()
+        assert compiled.version == "v2.0"
+        assert compiled.threshold == 10
+        assert [f.name for f in compiled.factors] == ["Privilege Elevation", "Blast Radius"]
+
+    def test_deactivating_model_clears_cache(self, django_capture_on_commit_callbacks):
+        """Test deactivating the only active model is seen by the evaluator."""
+        get_compiled_risk_model()
+
+        self.risk_model.is_active = False
+        with django_capture_on_commit_callbacks(execute=True):
+            self.risk_model.save()
+
+        assert get_compiled_risk_model() is None
+        with pytest.raises(ValueError, match="No active risk model found"):
+            calculate_risk_score(_evidence_pack(), str(uuid.uuid4()))
+
+    def test_invalidation_waits_for_commit(self, django_capture_on_commit_callbacks, django_assert_num_queries):
+        """Test an uncommitted change keeps the compiled model until its transaction commits."""
+        get_compiled_risk_model()
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            RiskModel.objects.create(version="v2.0", factors=FACTORS[:2], threshold=10, is_active=True)
+            with django_assert_num_queries(0):
+                assert get_compiled_risk_model().version == "v1.0"
+
+        for callback in callbacks:
+            callback()
+        assert get_compiled_risk_model().version == "v2.0"
+
+    def test_unknown_factor_compiles_to_medium_risk(self):
+        """Test unknown factors are bound to the default scorer."""
+        compiled = CompiledRiskModel.compile(
+            RiskModel(version="vX", factors=[{"name": "Unknown Factor", "weight": 1.0}], threshold=50)
+        )
+        assert compiled.score({})["factor_scores"] == {"Unknown Factor": 0.5}
+
+
+@pytest.mark.django_db
+class TestBatchRiskScoring:
+    """Test batch risk scoring API."""
+
+    def setup_method(self):
+        """Set up active risk model and deployment history."""
+        RiskModel.objects.create(version="v1.0", factors=FACTORS, threshold=50, is_active=True)
+        for event_type in [
+            DeploymentEvent.EventType.DEPLOYMENT_CREATED,
+            DeploymentEvent.EventType.DEPLOYMENT_COMPLETED,
+        ]:
+            DeploymentEvent.objects.create(
+                correlation_id=uuid.uuid4(),
+                event_type=event_type,
+                event_data={"app_name": "TestApp"},
+                actor="testuser",
+            )
+
+    def test_batch_matches_single_scoring(self):
+        """Test batch results equal per-call results, in input order."""
+        items = [(_evidence_pack(ring=ring), str(uuid.uuid4())) for ring in ["lab", "global", "pilot"]]
+
+        results = calculate_risk_scores(items)
+
+        assert [r["correlation_id"] for r in results] == [cid for _, cid in items]
+        for (evidence_pack, correlation_id), result in zip(items, results):
+            single = calculate_risk_score(evidence_pack, correlation_id)
+            assert result["risk_score"] == single["risk_score"]
+            assert result["factor_scores"] == single["factor_scores"]
+
+    def test_batch_persists_assessments(self):
+        """Test batch scoring writes one RiskAssessment per evidence pack."""
+        items = [(_evidence_pack(), str(uuid.uuid4())) for _ in range(5)]
+
+        calculate_risk_scores(items)
+
+        assert RiskAssessment.objects.count() == 5
+
+    def test_batch_shares_history_lookups(self, django_assert_max_num_queries):
+        """Test packs for the same app share deployment history queries."""
+        get_compiled_risk_model()
+        items = [(_evidence_pack(), str(uuid.uuid4())) for _ in range(50)]
+
+        # One grouped query per history window + bulk insert
+        with django_assert_max_num_queries(4):
+            calculate_risk_scores(items)
+
+    def test_batch_empty(self):
+        """Test empty batch returns empty list."""
+        assert calculate_risk_scores([]) == []
+
+    def test_batch_queries_independent_of_batch_size(self):
+        """Test batch scoring issues a fixed number of queries where per-call scoring grows with the batch."""
+        get_compiled_risk_model()
+        items = [(_evidence_pack(app_name=f"App{i % 5}"), str(uuid.uuid4())) for i in range(50)]
+
+        with CaptureQueriesContext(connection) as per_call:
+            for evidence_pack, correlation_id in items[:10]:
+                calculate_risk_score(evidence_pack, correlation_id)
+        with CaptureQueriesContext(connection) as small:
+            calculate_risk_scores(items[:10])
+        with CaptureQueriesContext(connection) as large:
+            calculate_risk_scores(items)
+
+        assert len(large.captured_queries) == len(small.captured_queries)
+        assert len(small.captured_queries) < len(per_call.captured_queries)
@@ -85,3 +85,31 @@ class TestPolicyEngineViews:
         response = authenticated_client.get(url)
 
         assert response.status_code == 404
+
+    def test_assess_risk_batch(self, authenticated_client):
+        """Test batch risk assessment endpoint."""
+        import uuid
+
+        correlation_ids = [str(uuid.uuid4()) for _ in range(3)]
+        url = reverse("policy_engine:assess-risk-batch")
+        response = authenticated_client.post(
+            url,
+            {
+                "items": [
+                    {"evidence_pack": {"requires_admin": True, "target_ring": "global"}, "correlation_id": cid}
+                    for cid in correlation_ids
+                ]
+            },
+            format="json",
+        )
+
+        assert response.status_code == 200
+        assert [r["correlation_id"] for r in response.data["results"]] == correlation_ids
+        assert all(r["risk_score"] == 100 for r in response.data["results"])
+
+    def test_assess_risk_batch_invalid_item(self, authenticated_client):
+        """Test batch risk assessment rejects items without correlation ID."""
+        url = reverse("policy_engine:assess-risk-batch")
+        response = authenticated_client.post(url, {"items": [{"evidence_pack": {"target_ring": "lab"}}]}, format="json")
+
+        assert response.status_code == 400
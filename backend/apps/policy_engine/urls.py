@@ -12,6 +12,7 @@ app_name = "policy_engine"
 urlpatterns = [
     path("", views.list_policies, name="list"),
     path("assess", views.assess_risk, name="assess-risk"),
+    path("assess/batch", views.assess_risk_batch, name="assess-risk-batch"),
     path("evaluate/", views.evaluate_policy, name="evaluate"),
     path("risk-model", views.get_active_risk_model, name="risk-model"),
 ]
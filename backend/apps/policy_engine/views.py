@@ -11,10 +11,13 @@ from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 
 from .models import RiskAssessment, RiskModel
-from .services import calculate_risk_score
+from .services import calculate_risk_score, calculate_risk_scores
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on evidence packs scored by one batch request
+MAX_BATCH_ITEMS = 5000
+
 
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
@@ -46,6 +49,50 @@ def assess_risk(request):
         return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def assess_risk_batch(request):
+    """
+    Calculate risk scores for many deployment intents in one request.
+
+    POST /api/v1/policy/assess/batch
+    Body: {
+        "items": [{"evidence_pack": {...}, "correlation_id": "..."}, ...]
+    }
+
+    Returns:
+        200: {"results": [{"correlation_id": "...", "risk_score": 75, ...}, ...]}
+        400: {"error": "..."}
+        500: {"error": "No active risk model found"}
+    """
+    items = request.data.get("items")
+
+    if not isinstance(items, list) or not items:
+        return Response({"error": "items must be a non-empty list"}, status=status.HTTP_400_BAD_REQUEST)
+
+    if len(items) > MAX_BATCH_ITEMS:
+        return Response(
+            {"error": f"Batch size exceeds maximum of {MAX_BATCH_ITEMS} items"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    pairs = []
+    for index, item in enumerate(items):
+        evidence_pack = item.get("evidence_pack") if isinstance(item, dict) else None
+        correlation_id = item.get("correlation_id") if isinstance(item, dict) else None
+        if not evidence_pack or not correlation_id:
+            return Response(
+                {"error": f"Item {index}: evidence_pack and correlation_id required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        pairs.append((evidence_pack, correlation_id))
+
+    try:
+        return Response({"results": calculate_risk_scores(pairs)})
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 @api_view(["GET"])
 @permission_classes([IsAdminUser])
 def get_active_risk_model(request):
@@ -0,0 +1,266 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Telemetry services: compliance statistics and platform metrics snapshots.
+
+Each dashboard payload is computed with a handful of aggregate queries
+(vulnerability totals are summed over the JSON scan results in the
+database) and cached as a snapshot per demo-filter variant. Reads serve the
+snapshot while it is younger than its max age (COMPLIANCE_STATS_MAX_AGE_SECONDS,
+PLATFORM_METRICS_MAX_AGE_SECONDS); the refresh_compliance_stats_snapshots
+beat task recomputes them ahead of expiry.
+"""
+import logging
+import random
+import time
+from datetime import timedelta
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Avg, Case, Count, IntegerField, Q, Sum, When
+from django.db.models.fields.json import KeyTextTransform
+from django.db.models.functions import Cast, Coalesce
+from django.db.models.lookups import Regex
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+COMPLIANCE_STATS_CACHE_KEY = "telemetry:compliance_stats:{variant}"
+PLATFORM_METRICS_CACHE_KEY = "telemetry:platform_metrics:{variant}"
+
+# is_demo filter value -> cache key variant
+DEMO_VARIANTS = {None: "all", True: "demo", False: "live"}
+
+SEVERITIES = (
+    ("critical", "Critical", "#E74C3C"),
+    ("high", "High", "#F39C12"),
+    ("medium", "Medium", "#F1C40F"),
+    ("low", "Low", "#3498DB"),
+)
+
+OS_COLORS = {
+    "Windows 11": "#0078D7",
+    "Windows 10": "#00BCF2",
+    "macOS Sonoma": "#FF3B30",
+    "macOS Ventura": "#FF3B30",
+    "macOS": "#FF3B30",
+    "Ubuntu 22.04": "#E95420",
+    "Ubuntu": "#E95420",
+    "Windows Server 2022": "#0078D7",
+    "RHEL 9": "#EE0000",
+    "RHEL": "#EE0000",
+    "iOS 17": "#000000",
+    "iOS 16": "#000000",
+    "iOS": "#000000",
+    "Android 14": "#3DDC84",
+    "Android 13": "#3DDC84",
+    "Android": "#3DDC84",
+}
+
+TREND_WEEKS = 8
+
+# Scan result counts that are safe to cast to an integer column (others are skipped)
+INTEGER_COUNT_PATTERN = r"^-?[0-9]{1,9}$"
+
+
+def _filter_demo(queryset, is_demo: Optional[bool]):
+    return queryset if is_demo is None else queryset.filter(is_demo=is_demo)
+
+
+def get_vulnerability_totals(evidence_packs) -> Dict[str, int]:
+    """
+    Sum vulnerability counts by severity over evidence packs in one query.
+
+    Packs without scan results, whose results are not a JSON object, or
+    whose count for a severity is not an integer, contribute nothing to it.
+    """
+    return evidence_packs.aggregate(
+        **{severity: Coalesce(Sum(_scan_count(severity)), 0) for severity, _, _ in SEVERITIES}
+    )
+
+
+def _scan_count(severity: str) -> Case:
+    """A pack's count for one severity as an integer, or NULL if the stored value is not one."""
+    value = KeyTextTransform(severity, "vulnerability_scan_results")
+    return Case(
+        When(Regex(value, INTEGER_COUNT_PATTERN), then=Cast(value, IntegerField())),
+        default=None,
+        output_field=IntegerField(),
+    )
+
+
+def _compliance_trend(active_assets, active_count: int, avg_compliance: float) -> list:
+    """Build the weekly trend from the oldest quarter of active assets toward today's average."""
+    oldest_ids = active_assets.order_by("created_at").values("id")[: max(1, active_count // 4)]
+    base_score = active_assets.filter(id__in=oldest_ids).aggregate(avg=Avg("compliance_score"))["avg"]
+    if base_score is None:
+        base_score = avg_compliance - 5
+    base_score = max(60, min(95, base_score))
+
+    trend = []
+    now = timezone.now()
+    for i in range(TREND_WEEKS):
+        week_start = now - timedelta(days=(TREND_WEEKS - i) * 7)
+
+        # Progress from base_score to the current average, with ±2 points of variation
+        progress = i / (TREND_WEEKS - 1) if TREND_WEEKS > 1 else 1.0
+        week_score = base_score + (avg_compliance - base_score) * progress
+        week_score = max(60, min(100, week_score + random.uniform(-2.0, 2.0)))
+
+        # For the most recent week, use actual current average
+        if i == TREND_WEEKS - 1:
+            week_score = avg_compliance
+
+        trend.append({"date": week_start.strftime("%b %d"), "score": round(week_score, 1)})
+    return trend
+
+
+def build_compliance_stats(is_demo: Optional[bool]) -> Dict:
+    """
+    Compute the compliance dashboard payload from the database.
+
+    Args:
+        is_demo: Demo filter value (None = all rows)
+    """
+    from apps.connectors.models import Asset
+    from apps.deployment_intents.models import DeploymentIntent
+    from apps.evidence_store.models import EvidencePack
+
+    assets = _filter_demo(Asset.objects.all(), is_demo)
+    active_assets = assets.filter(status="Active")
+
+    asset_totals = assets.aggregate(
+        total=Count("id"),
+        active=Count("id", filter=Q(status="Active")),
+        avg_compliance=Avg("compliance_score", filter=Q(status="Active")),
+    )
+    avg_compliance = asset_totals["avg_compliance"] or 0
+
+    os_distribution = assets.values("os").annotate(count=Count("id")).order_by("-count")[:10]
+    os_dist_data = [
+        {"name": item["os"], "value": item["count"], "color": OS_COLORS.get(item["os"], "#888888")}
+        for item in os_distribution
+    ]
+
+    vulnerabilities = get_vulnerability_totals(_filter_demo(EvidencePack.objects.all(), is_demo))
+    vulnerability_data = [
+        {"name": name, "value": vulnerabilities[severity], "color": color} for severity, name, color in SEVERITIES
+    ]
+
+    # Policy conflicts: CAB-gated deployments still open or rejected; pending updates: not yet deployed
+    deployment_totals = _filter_demo(DeploymentIntent.objects.all(), is_demo).aggregate(
+        policy_conflicts=Count(
+            "id", filter=Q(requires_cab_approval=True, status__in=["PENDING", "AWAITING_CAB", "REJECTED"])
+        ),
+        pending_updates=Count("id", filter=Q(status__in=["PENDING", "AWAITING_CAB", "APPROVED"])),
+    )
+
+    return {
+        "overall_compliance": round(avg_compliance, 1),
+        "critical_vulnerabilities": vulnerabilities["critical"],
+        "policy_conflicts": deployment_totals["policy_conflicts"],
+        "pending_updates": deployment_totals["pending_updates"],
+        "compliance_trend": _compliance_trend(active_assets, asset_totals["active"], avg_compliance),
+        "vulnerability_data": vulnerability_data,
+        "os_distribution": os_dist_data,
+        "total_assets": asset_totals["total"],
+        "active_assets": asset_totals["active"],
+    }
+
+
+def _store_snapshot(key: str, payload: Dict, max_age: int) -> Dict:
+    try:
+        # Keep the entry past its max age so a slow refresh never leaves readers with nothing cached
+        cache.set(key, {"computed_at": time.time(), "payload": payload}, timeout=max_age * 2)
+    except Exception as e:
+        logger.warning(f"Failed to cache snapshot {key}: {e}")
+    return payload
+
+
+def _load_snapshot(key: str, max_age: int) -> Optional[Dict]:
+    try:
+        snapshot = cache.get(key)
+    except Exception:
+        return None
+    if snapshot and time.time() - snapshot["computed_at"] < max_age:
+        return snapshot["payload"]
+    return None
+
+
+def refresh_compliance_stats(is_demo: Optional[bool]) -> Dict:
+    """
+    Recompute and cache the compliance snapshot for one demo-filter variant.
+    """
+    return _store_snapshot(
+        COMPLIANCE_STATS_CACHE_KEY.format(variant=DEMO_VARIANTS[is_demo]),
+        build_compliance_stats(is_demo),
+        settings.COMPLIANCE_STATS_MAX_AGE_SECONDS,
+    )
+
+
+def get_compliance_stats(is_demo: Optional[bool]) -> Dict:
+    """
+    Return the compliance payload, served from the cached snapshot when fresh.
+
+    A snapshot older than COMPLIANCE_STATS_MAX_AGE_SECONDS (or missing) is
+    recomputed inline.
+    """
+    payload = _load_snapshot(
+        COMPLIANCE_STATS_CACHE_KEY.format(variant=DEMO_VARIANTS[is_demo]), settings.COMPLIANCE_STATS_MAX_AGE_SECONDS
+    )
+    return payload if payload is not None else refresh_compliance_stats(is_demo)
+
+
+def build_platform_metrics(is_demo: Optional[bool]) -> Dict:
+    """
+    Compute deployment intent and asset counts by status (two grouped queries).
+    """
+    from apps.connectors.models import Asset
+    from apps.deployment_intents.models import DeploymentIntent
+
+    deployments_by_status = dict(
+        _filter_demo(DeploymentIntent.objects.all(), is_demo)
+        .values("status")
+        .annotate(count=Count("id"))
+        .order_by()
+        .values_list("status", "count")
+    )
+    assets_by_status = dict(
+        _filter_demo(Asset.objects.all(), is_demo)
+        .values("status")
+        .annotate(count=Count("id"))
+        .order_by()
+        .values_list("status", "count")
+    )
+
+    return {
+        "deployment_intents_total": sum(deployments_by_status.values()),
+        "deployment_intents_by_status": deployments_by_status,
+        "assets_total": sum(assets_by_status.values()),
+        "assets_by_status": assets_by_status,
+        "timestamp": timezone.now().isoformat(),
+    }
+
+
+def refresh_platform_metrics(is_demo: Optional[bool]) -> Dict:
+    """
+    Recompute and cache the platform metrics snapshot for one demo-filter variant.
+    """
+    return _store_snapshot(
+        PLATFORM_METRICS_CACHE_KEY.format(variant=DEMO_VARIANTS[is_demo]),
+        build_platform_metrics(is_demo),
+        settings.PLATFORM_METRICS_MAX_AGE_SECONDS,
+    )
+
+
+def get_platform_metrics(is_demo: Optional[bool]) -> Dict:
+    """
+    Return platform metrics, served from the cached snapshot when fresh.
+
+    The payload's timestamp is when the snapshot was computed.
+    """
+    payload = _load_snapshot(
+        PLATFORM_METRICS_CACHE_KEY.format(variant=DEMO_VARIANTS[is_demo]), settings.PLATFORM_METRICS_MAX_AGE_SECONDS
+    )
+    return payload if payload is not None else refresh_platform_metrics(is_demo)
@@ -0,0 +1,28 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Celery tasks for telemetry dashboard snapshots.
+"""
+import logging
+
+from celery import shared_task
+
+from .services import DEMO_VARIANTS, refresh_compliance_stats, refresh_platform_metrics
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="apps.telemetry.tasks.refresh_compliance_stats_snapshots")
+def refresh_compliance_stats_snapshots():
+    """
+    Recompute the cached compliance stats and platform metrics snapshots for every demo-filter variant.
+    """
+    refreshed = 0
+    for refresh in (refresh_compliance_stats, refresh_platform_metrics):
+        for is_demo in DEMO_VARIANTS:
+            try:
+                refresh(is_demo)
+                refreshed += 1
+            except Exception as e:
+                logger.error(f"Failed to run {refresh.__name__} ({DEMO_VARIANTS[is_demo]}): {e}", exc_info=True)
+    return {"refreshed": refreshed}
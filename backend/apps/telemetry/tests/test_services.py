@@ -0,0 +1,157 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+"""
+Tests for telemetry dashboard snapshots.
+"""
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.connectors.models import Asset
+from apps.evidence_store.models import EvidencePack
+from apps.telemetry.services import build_compliance_stats, get_compliance_stats, get_vulnerability_totals
+from apps.telemetry.tasks import refresh_compliance_stats_snapshots
+
+
+def _pack(index, scan_results, is_demo=False):
+    return EvidencePack.objects.create(
+        app_name=f"VulnApp{index}",
+        version="1.0.0",
+        artifact_hash="a" * 64,
+        artifact_path=f"artifacts/vuln-{index}.msi",
+        sbom_data={},
+        vulnerability_scan_results=scan_results,
+        rollback_plan="Uninstall",
+        is_demo=is_demo,
+    )
+
+
+def _asset(index, status="Active", compliance_score=80, os="Windows 11"):
+    return Asset.objects.create(
+        name=f"Asset{index}",
+        asset_id=f"asset-{index}",
+        serial_number=f"SN{index}",
+        type="Laptop",
+        os=os,
+        status=status,
+        location="HQ",
+        owner="owner@eucora.com",
+        compliance_score=compliance_score,
+    )
+
+
+@pytest.mark.django_db
+class TestComplianceStats:
+    """Test compliance stats aggregation and caching."""
+
+    def test_vulnerability_totals_single_query(self):
+        """Test severity totals are summed in the database in one query."""
+        _pack(1, {"critical": 2, "high": 3, "medium": 1, "low": 4})
+        _pack(2, {"critical": 1, "low": 1})
+        _pack(3, {})
+        _pack(4, ["not", "an", "object"])
+
+        with CaptureQueriesContext(connection) as ctx:
+            totals = get_vulnerability_totals(EvidencePack.objects.all())
+
+        assert len(ctx.captured_queries) == 1
+        assert totals == {"critical": 3, "high": 3, "medium": 1, "low": 5}
+
+    def test_vulnerability_totals_skip_non_integer_counts(self):
+        """Test counts that are not integers are skipped instead of failing the cast."""
+        _pack(1, {"critical": 2, "high": 1})
+        _pack(2, {"critical": "unknown", "high": 2.5, "medium": {"count": 3}, "low": None})
+
+        totals = get_vulnerability_totals(EvidencePack.objects.all())
+
+        assert totals == {"critical": 2, "high": 1, "medium": 0, "low": 0}
+
+    def test_build_compliance_stats(self):
+        """Test payload counts, averages and demo filtering."""
+        _asset(1, compliance_score=90)
+        _asset(2, compliance_score=70, os="macOS")
+        _asset(3, status="Inactive", compliance_score=10)
+        _pack(1, {"critical": 2})
+        _pack(2, {"critical": 7}, is_demo=True)
+
+        stats = build_compliance_stats(is_demo=False)
+
+        assert stats["total_assets"] == 3
+        assert stats["active_assets"] == 2
+        assert stats["overall_compliance"] == 80.0
+        assert stats["critical_vulnerabilities"] == 2
+        assert {item["name"]: item["value"] for item in stats["os_distribution"]} == {"Windows 11": 2, "macOS": 1}
+        assert len(stats["compliance_trend"]) == 8
+
+    def test_snapshot_served_from_cache(self, settings):
+        """Test fresh snapshots are served without touching the database."""
+        settings.COMPLIANCE_STATS_MAX_AGE_SECONDS = 300
+        _pack(1, {"critical": 1})
+        assert get_compliance_stats(False)["critical_vulnerabilities"] == 1
+
+        _pack(2, {"critical": 5})
+        with CaptureQueriesContext(connection) as ctx:
+            assert get_compliance_stats(False)["critical_vulnerabilities"] == 1
+        assert len(ctx.captured_queries) == 0
+
+    def test_stale_snapshot_recomputed(self, settings):
+        """Test a snapshot older than the staleness bound is recomputed."""
+        settings.COMPLIANCE_STATS_MAX_AGE_SECONDS = 0
+        _pack(1, {"critical": 1})
+        get_compliance_stats(False)
+
+        _pack(2, {"critical": 5})
+        assert get_compliance_stats(False)["critical_vulnerabilities"] == 6
+
+    def test_refresh_task_updates_snapshot(self, settings):
+        """Test the beat task refreshes every demo variant."""
+        settings.COMPLIANCE_STATS_MAX_AGE_SECONDS = 300
+        get_compliance_stats(None)
+        _pack(1, {"critical": 4})
+
+        assert refresh_compliance_stats_snapshots() == {"refreshed": 6}
+        assert get_compliance_stats(None)["critical_vulnerabilities"] == 4
+
+    def test_endpoint_returns_snapshot(self, api_client):
+        """Test compliance-stats endpoint serves the computed payload."""
+        _asset(1)
+        _pack(1, {"critical": 3, "high": 1})
+
+        response = api_client.get("/api/v1/health/compliance-stats?include_demo=false")
+
+        assert response.status_code == 200
+        assert response.data["critical_vulnerabilities"] == 3
+        assert response.data["vulnerability_data"][1] == {"name": "High", "value": 1, "color": "#F39C12"}
+        assert response.data["active_assets"] == 1
+
+
+@pytest.mark.django_db
+class TestPlatformMetrics:
+    """Test platform metrics snapshot."""
+
+    def test_metrics_grouped_counts(self):
+        """Test totals are derived from the grouped status counts."""
+        from apps.telemetry.services import build_platform_metrics
+
+        _asset(1)
+        _asset(2, status="Inactive")
+
+        with CaptureQueriesContext(connection) as ctx:
+            metrics = build_platform_metrics(is_demo=None)
+
+        assert len(ctx.captured_queries) == 2
+        assert metrics["assets_total"] == 2
+        assert metrics["assets_by_status"] == {"Active": 1, "Inactive": 1}
+        assert metrics["deployment_intents_total"] == 0
+
+    def test_metrics_endpoint_served_from_snapshot(self, api_client):
+        """Test warm metrics reads do not query asset or deployment tables."""
+        _asset(1)
+        api_client.get("/api/v1/telemetry/metrics/?include_demo=all")
+        _asset(2)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.get("/api/v1/telemetry/metrics/?include_demo=all")
+
+        assert response.data["assets_total"] == 1
+        assert not any("connectors_asset" in query["sql"] for query in ctx.captured_queries)
@@ -4,7 +4,10 @@
 ASGI config for EUCORA Control Plane.
 
 Exposes the ASGI callable as a module-level variable named ``application``.
-Supports async views and WebSocket connections (future).
+The API itself is served through config.wsgi. Production runs this
+application in a separate gunicorn/uvicorn service that only receives the
+agent task long-poll, so waiting polls share the worker's event loop.
+WebSocket connections are not routed yet.
 """
 import os
 
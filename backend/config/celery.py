@@ -64,6 +64,18 @@ app.conf.beat_schedule = {
         "task": "apps.event_store.tasks.cleanup_old_events",
         "schedule": 86400.0,  # Daily
     },
+    "maintain-event-partitions": {
+        "task": "apps.event_store.tasks.maintain_event_partitions",
+        "schedule": 86400.0,  # Daily
+    },
+    "refresh-compliance-stats": {
+        "task": "apps.telemetry.tasks.refresh_compliance_stats_snapshots",
+        "schedule": 120.0,  # Every 2 minutes
+    },
+    "refresh-portfolio-summary": {
+        "task": "apps.application_portfolio.tasks.refresh_portfolio_summary_snapshot",
+        "schedule": 60.0,  # Every minute (no-op unless dirty or expired)
+    },
     "sync-all-integrations": {
         "task": "apps.integrations.tasks.sync_all_integrations",
         "schedule": 900.0,  # Every 15 minutes
@@ -72,6 +84,29 @@ app.conf.beat_schedule = {
         "task": "apps.agent_management.tasks.check_agent_health",
         "schedule": 300.0,  # Every 5 minutes
     },
+    "flush-agent-heartbeats": {
+        "task": "apps.agent_management.tasks.flush_agent_heartbeats",
+        "schedule": 30.0,  # Every 30 seconds
+    },
+    "rollup-agent-telemetry-1m": {
+        "task": "apps.agent_management.tasks.rollup_agent_telemetry",
+        "schedule": 60.0,  # Every minute
+        "args": ("1m",),
+    },
+    "rollup-agent-telemetry-1h": {
+        "task": "apps.agent_management.tasks.rollup_agent_telemetry",
+        "schedule": 900.0,  # Every 15 minutes
+        "args": ("1h",),
+    },
+    "rollup-agent-telemetry-1d": {
+        "task": "apps.agent_management.tasks.rollup_agent_telemetry",
+        "schedule": 3600.0,  # Every hour
+        "args": ("1d",),
+    },
+    "apply-agent-telemetry-retention": {
+        "task": "apps.agent_management.tasks.apply_agent_telemetry_retention",
+        "schedule": 86400.0,  # Daily
+    },
     "timeout-stale-tasks": {
         "task": "apps.agent_management.tasks.timeout_stale_tasks",
         "schedule": 600.0,  # Every 10 minutes
@@ -292,3 +292,109 @@ CELERY_TASK_ACKS_LATE = True
 CELERY_WORKER_PREFETCH_MULTIPLIER = 1
 CELERY_TASK_TIME_LIMIT = 30 * 60  # 30 minutes
 CELERY_TASK_SOFT_TIME_LIMIT = 25 * 60  # 25 minutes
+
+# Demo mode
+# Max seconds a worker serves its cached demo mode flag without re-checking the database
+DEMO_MODE_CACHE_TTL_SECONDS = config("DEMO_MODE_CACHE_TTL_SECONDS", default=30, cast=int)
+
+# Telemetry
+# Max age of the cached compliance-stats snapshot before a read recomputes it
+COMPLIANCE_STATS_MAX_AGE_SECONDS = config("COMPLIANCE_STATS_MAX_AGE_SECONDS", default=300, cast=int)
+PLATFORM_METRICS_MAX_AGE_SECONDS = config("PLATFORM_METRICS_MAX_AGE_SECONDS", default=300, cast=int)
+
+# Application Portfolio
+# Seconds a summary snapshot may still be served after a counted model changed
+PORTFOLIO_SUMMARY_MAX_STALENESS_SECONDS = config("PORTFOLIO_SUMMARY_MAX_STALENESS_SECONDS", default=60, cast=int)
+# Max age of any summary snapshot (bounds staleness from bulk writes, which send no signals)
+PORTFOLIO_SUMMARY_MAX_AGE_SECONDS = config("PORTFOLIO_SUMMARY_MAX_AGE_SECONDS", default=900, cast=int)
+
+# Deployment reconciliation
+# Execution planes reconciled concurrently per run
+RECONCILIATION_MAX_WORKERS = config("RECONCILIATION_MAX_WORKERS", default=4, cast=int)
+
+# License management
+# Active SKUs reconciled (and committed) per chunk of a reconciliation run
+LICENSE_RECONCILIATION_CHUNK_SIZE = config("LICENSE_RECONCILIATION_CHUNK_SIZE", default=1000, cast=int)
+
+# Integrations
+# Assets bulk-upserted (and progress-logged) per chunk of a streaming CMDB sync
+INTEGRATION_ASSET_SYNC_CHUNK_SIZE = config("INTEGRATION_ASSET_SYNC_CHUNK_SIZE", default=1000, cast=int)
+# Seconds without a checkpoint after which a RUNNING inventory sync job is taken over by the next run
+CONNECTOR_INVENTORY_JOB_LEASE_SECONDS = config("CONNECTOR_INVENTORY_JOB_LEASE_SECONDS", default=900, cast=int)
+
+# PowerShell connector worker pool
+# Serve connector calls from long-lived pwsh workers instead of one process per call
+CONNECTOR_PWSH_POOL_ENABLED = config("CONNECTOR_PWSH_POOL_ENABLED", default=True, cast=bool)
+# Concurrent warm workers per connector (bounds concurrent calls per execution plane)
+CONNECTOR_PWSH_WORKERS_PER_CONNECTOR = config("CONNECTOR_PWSH_WORKERS_PER_CONNECTOR", default=2, cast=int)
+# Requests a worker serves before it is recycled
+CONNECTOR_PWSH_MAX_REQUESTS_PER_WORKER = config("CONNECTOR_PWSH_MAX_REQUESTS_PER_WORKER", default=500, cast=int)
+# Idle seconds after which a worker is pinged before reuse
+CONNECTOR_PWSH_HEALTH_CHECK_IDLE_SECONDS = config("CONNECTOR_PWSH_HEALTH_CHECK_IDLE_SECONDS", default=60, cast=int)
+
+# Connector async HTTP pool
+# Pooled connections (in flight + idle keep-alive) per execution-plane host
+CONNECTOR_HTTP_MAX_CONNECTIONS_PER_HOST = config("CONNECTOR_HTTP_MAX_CONNECTIONS_PER_HOST", default=20, cast=int)
+# Seconds an idle keep-alive connection is held open for reuse
+CONNECTOR_HTTP_KEEPALIVE_EXPIRY_SECONDS = config("CONNECTOR_HTTP_KEEPALIVE_EXPIRY_SECONDS", default=30, cast=float)
+# Negotiate HTTP/2 with hosts that support it (requires the h2 package)
+CONNECTOR_HTTP2_ENABLED = config("CONNECTOR_HTTP2_ENABLED", default=True, cast=bool)
+# AWX list pages requested concurrently while streaming a paginated listing
+CONNECTOR_AWX_PAGE_PREFETCH_WINDOW = config("CONNECTOR_AWX_PAGE_PREFETCH_WINDOW", default=4, cast=int)
+# Seconds between the job tracker's batched status queries for outstanding AWX jobs and Landscape activities
+CONNECTOR_JOB_TRACKER_POLL_SECONDS = config("CONNECTOR_JOB_TRACKER_POLL_SECONDS", default=5, cast=float)
+
+# Connector idempotency store
+# Seconds the result of an idempotent plane operation is replayed instead of re-running it
+CONNECTOR_IDEMPOTENCY_TTL_SECONDS = config("CONNECTOR_IDEMPOTENCY_TTL_SECONDS", default=3600, cast=int)
+# Results held in each worker's in-process LRU (in front of the shared cache)
+CONNECTOR_IDEMPOTENCY_LOCAL_MAX_ENTRIES = config("CONNECTOR_IDEMPOTENCY_LOCAL_MAX_ENTRIES", default=10000, cast=int)
+# Independently locked shards of the in-process LRU
+CONNECTOR_IDEMPOTENCY_SHARDS = config("CONNECTOR_IDEMPOTENCY_SHARDS", default=16, cast=int)
+# Seconds an in-flight claim is held before another worker may run the operation
+CONNECTOR_IDEMPOTENCY_CLAIM_TTL_SECONDS = config("CONNECTOR_IDEMPOTENCY_CLAIM_TTL_SECONDS", default=300, cast=int)
+
+# Connector token broker
+# Fraction of a token's lifetime after which it is refreshed ahead of expiry
+CONNECTOR_TOKEN_REFRESH_FRACTION = config("CONNECTOR_TOKEN_REFRESH_FRACTION", default=0.75, cast=float)
+# Seconds one worker holds the refresh lock for a credential
+CONNECTOR_TOKEN_LOCK_SECONDS = config("CONNECTOR_TOKEN_LOCK_SECONDS", default=30, cast=int)
+# Seconds a worker without a usable token waits for another worker's refresh before fetching itself
+CONNECTOR_TOKEN_WAIT_SECONDS = config("CONNECTOR_TOKEN_WAIT_SECONDS", default=10, cast=float)
+
+# Agent heartbeats
+# Record heartbeats of agents without pending work in Redis and flush them to the database in bulk
+AGENT_HEARTBEAT_COALESCING = config("AGENT_HEARTBEAT_COALESCING", default=True, cast=bool)
+# Max seconds a per-agent pending-task counter is trusted before the database is checked again
+AGENT_HEARTBEAT_STATE_TTL_SECONDS = config("AGENT_HEARTBEAT_STATE_TTL_SECONDS", default=86400, cast=int)
+
+# Agent task push
+# Wake agents' task long-polls over Redis pub/sub when tasks are created
+AGENT_TASK_PUSH = config("AGENT_TASK_PUSH", default=True, cast=bool)
+# Max seconds a task long-poll is held open (keep below load balancer idle timeouts)
+AGENT_TASK_POLL_TIMEOUT_SECONDS = config("AGENT_TASK_POLL_TIMEOUT_SECONDS", default=25, cast=int)
+
+# Agent telemetry
+# Days raw telemetry samples are kept
+AGENT_TELEMETRY_RAW_RETENTION_DAYS = config("AGENT_TELEMETRY_RAW_RETENTION_DAYS", default=2, cast=int)
+# Days 1-minute telemetry rollups are kept
+AGENT_TELEMETRY_1M_RETENTION_DAYS = config("AGENT_TELEMETRY_1M_RETENTION_DAYS", default=7, cast=int)
+# Days 1-hour telemetry rollups are kept
+AGENT_TELEMETRY_1H_RETENTION_DAYS = config("AGENT_TELEMETRY_1H_RETENTION_DAYS", default=90, cast=int)
+# Days 1-day telemetry rollups are kept
+AGENT_TELEMETRY_1D_RETENTION_DAYS = config("AGENT_TELEMETRY_1D_RETENTION_DAYS", default=730, cast=int)
+
+# Agent batched uploads
+# Max records in one batched agent upload
+AGENT_INGEST_MAX_RECORDS = config("AGENT_INGEST_MAX_RECORDS", default=50000, cast=int)
+# Max decompressed size in bytes of a compressed agent upload
+AGENT_INGEST_MAX_BYTES = config("AGENT_INGEST_MAX_BYTES", default=64 * 1024 * 1024, cast=int)
+
+# Policy Engine
+# Max seconds a worker serves its compiled risk model without re-checking the database
+RISK_MODEL_CACHE_TTL_SECONDS = config("RISK_MODEL_CACHE_TTL_SECONDS", default=300, cast=int)
+
+# Event Store partitioning & cold-tier archival
+EVENT_PARTITION_MONTHS_AHEAD = config("EVENT_PARTITION_MONTHS_AHEAD", default=3, cast=int)
+EVENT_HOT_RETENTION_MONTHS = config("EVENT_HOT_RETENTION_MONTHS", default=13, cast=int)
+EVENT_ARCHIVE_PREFIX = config("EVENT_ARCHIVE_PREFIX", default="event-archive")
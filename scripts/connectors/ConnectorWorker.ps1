@@ -0,0 +1,107 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (c) 2026 BuildWorks.AI
+<#
+.SYNOPSIS
+    Long-lived connector worker for the control plane PowerShell pool.
+.DESCRIPTION
+    Loads one connector entry script (and optionally its module) once, then serves JSON-framed requests read line by
+    line from stdin until stdin closes. Each request is one compact JSON object per line:
+        {"id": "...", "action": "invoke", "params": {"Action": "Deploy", ...}}
+        {"id": "...", "action": "ping"}
+    and each response is one compact JSON object per line on stdout:
+        {"id": "...", "exit_code": 0, "stdout": "...", "stderr": "..."}
+    A {"ready": true, ...} frame is written once at startup. Connector output is captured, never written to stdout
+    directly, so the framing cannot be corrupted by connector scripts.
+.NOTES
+Version: 1.0
+Author: Platform Engineering
+Related Docs: docs/architecture/execution-plane-connectors.md
+#>
+param(
+    [Parameter(Mandatory = $true)]
+    [string]$ScriptPath,
+    [string]$ModulePath
+)
+
+Set-StrictMode -Version Latest
+
+function Write-Frame {
+    param([hashtable]$Frame)
+    [Console]::Out.WriteLine(($Frame | ConvertTo-Json -Compress -Depth 10))
+    [Console]::Out.Flush()
+}
+
+$warnings = @()
+$preloaded = @()
+
+# Warm state: parse the entry script once (PowerShell caches the compiled script block per path)
+$null = Get-Command -Name $ScriptPath -ErrorAction Stop
+$preloaded += $ScriptPath
+
+if ($ModulePath) {
+    try {
+        . $ModulePath
+        $preloaded += $ModulePath
+    }
+    catch {
+        $warnings += "Module preload failed: $($_.Exception.Message)"
+    }
+}
+
+Write-Frame -Frame @{ ready = $true; pid = $PID; preloaded = $preloaded; warnings = $warnings }
+
+while ($true) {
+    $line = [Console]::In.ReadLine()
+    if ($null -eq $line) {
+        break
+    }
+    if ([string]::IsNullOrWhiteSpace($line)) {
+        continue
+    }
+
+    $requestId = $null
+    try {
+        $request = $line | ConvertFrom-Json -AsHashtable
+        $requestId = $request['id']
+
+        if ($request['action'] -eq 'ping') {
+            Write-Frame -Frame @{ id = $requestId; pong = $true }
+            continue
+        }
+
+        $params = @{}
+        if ($request.ContainsKey('params') -and $request['params']) {
+            $params = $request['params']
+        }
+
+        $global:LASTEXITCODE = 0
+        $exitCode = 0
+        $stdout = @()
+        $stderr = @()
+        try {
+            foreach ($item in (& $ScriptPath @params 2>&1)) {
+                if ($item -is [System.Management.Automation.ErrorRecord]) {
+                    $stderr += $item.ToString()
+                }
+                else {
+                    $stdout += [string]$item
+                }
+            }
+            $exitCode = $global:LASTEXITCODE
+        }
+        catch {
+            $stderr += $_.Exception.Message
+            $exitCode = 1
+        }
+
+        Write-Frame -Frame @{
+            id = $requestId
+            exit_code = [int]$exitCode
+            stdout = ($stdout -join "`n")
+            stderr = ($stderr -join "`n")
+        }
+    }
+    catch {
+        Write-Frame -Frame @{ id = $requestId; exit_code = 1; stdout = ''; stderr = "Invalid request: $($_.Exception.Message)" }
+    }
+}